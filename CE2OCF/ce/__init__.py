@@ -1 +1,26 @@
+from CE2OCF.ce.datasheet import *
 from CE2OCF.ce.parser import *
+
+# The mock generators pull in Faker, the pydantic CE models and the xml transforms, none of which are needed to convert
+# a datasheet. Keep them importable from here for backwards compatibility, but only load them on first access.
+_LAZY_MOCK_EXPORTS = {
+    "convert_ce_answers_xml_to_json_string",
+    "generate_mock_ce_json_str",
+    "generate_mock_ce_xml_tree",
+    "generate_mock_objs",
+    "generate_mock_xml_elements",
+    "mock_bylawvars",
+    "mock_company",
+    "mock_director",
+    "mock_formvars",
+    "mock_stockholder",
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_MOCK_EXPORTS:
+        from CE2OCF.ce import mocks
+
+        return getattr(mocks, name)
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
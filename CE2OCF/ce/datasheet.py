@@ -0,0 +1,263 @@
+"""
+A normalized, typed view over one questionnaire's CE datasheet items.
+
+CE hands every answer back as strings inside a "values" list, and the flat list of ContractExpressVarObjs has to be
+filtered by name / repetition on every lookup (see CE2OCF.ce.parser). NormalizedDatasheet indexes the items by name and
+repetition once, decodes each item's value the first time it's read, and keeps typed (int, Decimal, date, bool) forms
+of values so converting a questionnaire doesn't re-parse the same strings in every repetition.
+
+It's still a list of ContractExpressVarObjs, so anything that takes datasheet items - the crawler, parsers, custom
+post-processors - takes a NormalizedDatasheet, and extract_ce_variable_val() uses its index when it gets one.
+"""
+from __future__ import annotations
+
+import datetime
+import functools
+from decimal import Decimal, InvalidOperation
+from typing import Any, Callable, Iterable, Mapping
+
+from CE2OCF.types.dictionaries import ContractExpressVarObj
+
+# Spellings of true / false CE (and pydantic) use for booleans, compared case-insensitively
+CE_TRUE_VALUES = frozenset({"1", "on", "t", "true", "y", "yes"})
+CE_FALSE_VALUES = frozenset({"0", "off", "f", "false", "n", "no"})
+
+_NOT_FOUND = object()
+
+
+def decode_ce_values(values: list[Any]) -> Any:
+    """
+    CE convention for a variable's value - values[0] if there's exactly one value, None if there are none and the
+    whole list if there are several.
+    """
+    if len(values) > 1:
+        return values
+    elif len(values) == 1:
+        return values[0]
+    else:
+        return None
+
+
+@functools.lru_cache(maxsize=4096)
+def ce_value_as_int(value: str | int) -> int:
+    return int(value)
+
+
+@functools.lru_cache(maxsize=4096)
+def ce_value_as_decimal(value: str | int | float) -> Decimal:
+    try:
+        return Decimal(str(value).strip().replace(",", ""))
+    except InvalidOperation:
+        msg = f"CE value {value!r} isn't a number"
+        raise ValueError(msg) from None
+
+
+@functools.lru_cache(maxsize=4096)
+def ce_value_as_date(value: str | datetime.date) -> datetime.date:
+    if isinstance(value, datetime.date):
+        return value
+    return datetime.date.fromisoformat(value)
+
+
+@functools.lru_cache(maxsize=256)
+def ce_value_as_bool(value: str | bool) -> bool:
+    if isinstance(value, bool):
+        return value
+    normalized = str(value).strip().lower()
+    if normalized in CE_TRUE_VALUES:
+        return True
+    if normalized in CE_FALSE_VALUES:
+        return False
+    msg = f"CE value {value!r} isn't a boolean"
+    raise ValueError(msg)
+
+
+def _parse_repetition(repetition: Any) -> int | None:
+    # "[3]" -> 3. Anything else is treated like no repetition, i.e. it matches every repetition number.
+    if isinstance(repetition, str):
+        try:
+            return int(repetition[1:-1])
+        except ValueError:
+            return None
+    return None
+
+
+class NormalizedDatasheet(list):
+    """
+    CE datasheet items plus indexes and decoded values. Built once per questionnaire - treat it as read-only, since
+    the index isn't updated if the list is modified afterwards.
+
+    Args:
+        ce_jsons: List of ContractExpressVarObjs
+    """
+
+    def __init__(self, ce_jsons: Iterable[ContractExpressVarObj] = ()):
+        super().__init__(ce_jsons)
+        self._first_by_name: dict[str, int] = {}
+        self._first_by_name_and_repetition: dict[tuple[str, int | None], int] = {}
+        for position, ce_obj in enumerate(self):
+            name = ce_obj["name"]
+            self._first_by_name.setdefault(name, position)
+            self._first_by_name_and_repetition.setdefault((name, _parse_repetition(ce_obj.get("repetition"))), position)
+        self._values: dict[int, Any] = {}
+
+    def position_of(self, name: str, repetition: int | None = None) -> int | None:
+        """
+        Index lookup with the same matching rules as CE2OCF.ce.parser.get_ce_variables() - with a repetition, items
+        without a "[n]" repetition match too.
+
+        Returns: Position of the first matching item, or None
+
+        """
+        if repetition is None:
+            return self._first_by_name.get(name)
+
+        positions = [
+            position
+            for position in (
+                self._first_by_name_and_repetition.get((name, repetition)),
+                self._first_by_name_and_repetition.get((name, None)),
+            )
+            if position is not None
+        ]
+        return min(positions) if positions else None
+
+    def find(self, name: str, repetition: int | None = None) -> ContractExpressVarObj | None:
+        position = self.position_of(name, repetition)
+        return None if position is None else self[position]
+
+    def value_at(self, position: int) -> Any:
+        """
+        Returns: Decoded value of the item at position (see decode_ce_values()), decoded on first read
+        """
+        value = self._values.get(position, _NOT_FOUND)
+        if value is _NOT_FOUND:
+            ce_obj = self[position]
+            if "values" not in ce_obj or not isinstance(ce_obj["values"], list):
+                msg = f"CE Obj \n{ce_obj}\n is NOT a valid CE object. No values field or values is not a list"
+                raise ValueError(msg)
+            value = self._values[position] = decode_ce_values(ce_obj["values"])
+        return value
+
+    def value(self, name: str, repetition: int | None = None, default: Any = None) -> Any:
+        """
+        Returns: Decoded value of the first matching item, or default if there isn't one
+        """
+        position = self.position_of(name, repetition)
+        return default if position is None else self.value_at(position)
+
+    def _typed_value(self, converter, name: str, repetition: int | None, default: Any) -> Any:
+        value = self.value(name, repetition)
+        if value is None or value == "":
+            return default
+        if isinstance(value, list):
+            msg = f"CE variable {name} has several values, use list_value()"
+            raise ValueError(msg)
+        return converter(value)
+
+    def int_value(self, name: str, repetition: int | None = None, default: Any = None) -> Any:
+        return self._typed_value(ce_value_as_int, name, repetition, default)
+
+    def decimal_value(self, name: str, repetition: int | None = None, default: Any = None) -> Any:
+        return self._typed_value(ce_value_as_decimal, name, repetition, default)
+
+    def date_value(self, name: str, repetition: int | None = None, default: Any = None) -> Any:
+        return self._typed_value(ce_value_as_date, name, repetition, default)
+
+    def bool_value(self, name: str, repetition: int | None = None, default: Any = None) -> Any:
+        return self._typed_value(ce_value_as_bool, name, repetition, default)
+
+    def list_value(self, name: str, repetition: int | None = None) -> list[Any]:
+        """
+        Returns: Raw values list of the first matching item - empty if there's no match
+        """
+        ce_obj = self.find(name, repetition)
+        return [] if ce_obj is None else ce_obj["values"]
+
+
+def normalize_datasheet(ce_jsons: Iterable[ContractExpressVarObj]) -> NormalizedDatasheet:
+    """
+    Returns: ce_jsons as a NormalizedDatasheet, without rebuilding it if it already is one
+    """
+    if isinstance(ce_jsons, NormalizedDatasheet):
+        return ce_jsons
+    return NormalizedDatasheet(ce_jsons)
+
+
+class RepetitionTable:
+    """
+    Repeated CE variables pivoted into one column per variable, indexed by repetition number. Each cell holds what
+    extract_ce_variable_val() returns for that variable and repetition - the "_S1" variable stands in for repetition 1
+    (and for later repetitions with no value of their own) - so a whole column can be read at once.
+
+    Args:
+        ce_jsons: List of ContractExpressVarObjs or a NormalizedDatasheet
+        variable_names: Repeated variables to pivot
+        repeat_count: Number of repetitions
+        same_as_first: Variables whose first value is used for every repetition, like a RepeatableDataMap's
+                       repeated_variables
+        overrides: Variable name -> value to use for every repetition instead of the datasheet's
+        static_first_repetition_name_formatter: Same as extract_ce_variable_val()'s. None to ignore "_S1" variables.
+    """
+
+    __slots__ = ("repeat_count", "columns")
+
+    def __init__(
+        self,
+        ce_jsons: Iterable[ContractExpressVarObj],
+        variable_names: Iterable[str],
+        repeat_count: int,
+        same_as_first: Iterable[str] = (),
+        overrides: Mapping[str, Any] | None = None,
+        static_first_repetition_name_formatter: Callable[[str], str] | None = lambda n: f"{n}_S1",
+    ):
+        datasheet = normalize_datasheet(ce_jsons)
+        same_as_first = set(same_as_first)
+        overrides = {} if overrides is None else overrides
+
+        self.repeat_count = repeat_count
+        self.columns: dict[str, list[Any]] = {}
+        for name in variable_names:
+            first_position = (
+                None
+                if static_first_repetition_name_formatter is None
+                else datasheet.position_of(static_first_repetition_name_formatter(name))
+            )
+
+            if name in overrides:
+                self.columns[name] = [overrides[name]] * repeat_count
+            elif name in same_as_first:
+                position = first_position if first_position is not None else datasheet.position_of(name)
+                self.columns[name] = [None if position is None else datasheet.value_at(position)] * repeat_count
+            else:
+                column = []
+                for repetition in range(1, repeat_count + 1):
+                    position = datasheet.position_of(name, repetition)
+                    if first_position is not None and (repetition == 1 or position is None):
+                        position = first_position
+                    column.append(None if position is None else datasheet.value_at(position))
+                self.columns[name] = column
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.columns
+
+    def column(self, name: str) -> list[Any]:
+        """
+        Returns: Values of variable name for repetitions 1 to repeat_count
+        """
+        return self.columns[name]
+
+    def cell(self, name: str, repetition: int) -> Any:
+        """
+        Returns: Value of variable name for 1-indexed repetition
+        """
+        if not 1 <= repetition <= self.repeat_count:
+            msg = f"Repetition must be between 1 and {self.repeat_count}, got {repetition}"
+            raise ValueError(msg)
+        return self.columns[name][repetition - 1]
+
+    def row(self, repetition: int) -> dict[str, Any]:
+        """
+        Returns: Variable name -> value for 1-indexed repetition
+        """
+        return {name: self.cell(name, repetition) for name in self.columns}
@@ -2,11 +2,11 @@ from __future__ import annotations
 
 from typing import Any, Callable
 
+from CE2OCF.ce.datasheet import NormalizedDatasheet, decode_ce_values
 from CE2OCF.types.dictionaries import ContractExpressVarObj
 from CE2OCF.utils.log_utils import logger
 
 from ..types.exceptions import VariableNotFoundError
-from .mocks import *  # noqa
 
 """
 # Var name roots for variables that can have multiple instances, which, due to weirdness of CE naming conventions,
@@ -122,12 +122,7 @@ def get_ce_obj_value(ce_obj: ContractExpressVarObj, raw_values_only: bool = Fals
     if raw_values_only:
         return ce_obj["values"]
     else:
-        if len(ce_obj["values"]) > 1:
-            return ce_obj["values"]
-        elif len(ce_obj["values"]) == 1:
-            return ce_obj["values"][0]
-        else:
-            return None
+        return decode_ce_values(ce_obj["values"])
 
 
 def extract_ce_variable_val(
@@ -195,6 +190,13 @@ def extract_ce_variable_val(
 
     for name, repetition in search_values:
         logger.debug(f"extract_ce_variable_val() - look for name {name} and repetition {repetition}")
+        if isinstance(ce_response_objs, NormalizedDatasheet):
+            # Same first match, from the index instead of a scan
+            position = ce_response_objs.position_of(name, repetition)
+            if position is not None:
+                return ce_response_objs.value_at(position)
+            continue
+
         matching_var_objs = get_ce_variables(
             ce_jsons=ce_response_objs,
             name=name,
@@ -1,3 +1,6 @@
+from .analysis import *
+from .compiled import *
 from .definitions import *
 from .loaders import *
+from .overrides import *
 from .parsers import *
@@ -0,0 +1,142 @@
+"""
+Static analysis of loaded datamaps. Datamaps only ever read a small, fixed set of CE variables, but datasheets carry
+every questionnaire answer, so knowing up front which variable names a datamap can possibly read lets us prune a
+datasheet down to just those items before traversal.
+"""
+from __future__ import annotations
+
+import re
+from typing import Any, Callable, Iterable
+
+from pydantic import BaseModel
+
+from CE2OCF.datamap.compiled import (
+    CompiledModel,
+    CompiledRepeatableDataMap,
+    CompiledStaticField,
+)
+from CE2OCF.datamap.definitions import (
+    OverridableBoolField,
+    OverridableFloatField,
+    OverridableIntField,
+    OverridableStringField,
+)
+from CE2OCF.types.dictionaries import ContractExpressVarObj
+from CE2OCF.utils.string_templating_utils import (
+    MUSTACHE_CAPTURE_REGEX,
+    str_is_template_expression,
+)
+
+
+def _collect_variable_names(datamap: Any, names: set[str], include_leaves: bool = False) -> None:
+    # include_leaves also collects the leaf strings themselves - whole |...| templates and <<LOOP_INDEX>> - since a
+    # value_overrides key matching a leaf replaces it too (see handle_str_datamap())
+    if isinstance(datamap, str):
+        if include_leaves:
+            names.add(datamap)
+        if str_is_template_expression(datamap):
+            for mustache_var in re.findall(MUSTACHE_CAPTURE_REGEX, datamap[1:-1]):
+                var_name = mustache_var[2:-2].strip()
+                if include_leaves or var_name != "<<LOOP_INDEX>>":
+                    names.add(var_name)
+        elif datamap != "<<LOOP_INDEX>>":
+            names.add(datamap)
+
+    elif isinstance(datamap, list):
+        for item in datamap:
+            _collect_variable_names(item, names, include_leaves)
+
+    elif isinstance(datamap, dict):
+        # Mirrors handle_dict_datamap() - {"static": ...} and {"val": ...} values are never looked up
+        if len(datamap) == 1 and "static" in datamap:
+            return
+        for value in datamap.values():
+            if isinstance(value, dict) and "val" in value:
+                continue
+            _collect_variable_names(value, names, include_leaves)
+
+    elif isinstance(
+        datamap,
+        (OverridableStringField, OverridableFloatField, OverridableBoolField, OverridableIntField, CompiledStaticField),
+    ):
+        return
+
+    elif isinstance(datamap, CompiledRepeatableDataMap):
+        for value in (datamap.repeated_variables, datamap.repeat_count, datamap.repeated_pattern):
+            _collect_variable_names(value, names, include_leaves)
+
+    elif isinstance(datamap, CompiledModel):
+        for _, value in datamap.fields:
+            _collect_variable_names(value, names, include_leaves)
+
+    elif isinstance(datamap, BaseModel):
+        # Covers RepeatableDataMaps too - repeat_count, repeated_variables and repeated_pattern are just fields
+        for field_name in datamap.__fields__:
+            _collect_variable_names(getattr(datamap, field_name), names, include_leaves)
+
+
+def collect_datamap_variable_names(
+    datamap: dict[str, Any] | BaseModel | CompiledModel | str | list,
+    static_first_repetition_name_formatter: Callable[[str], str] | None = lambda n: f"{n}_S1",
+) -> set[str]:
+    """
+    Collect every CE variable name traverse_datamap() could look up for this datamap: plain variable leaves, the
+    mustache references inside |...| templates, repeat_count and repeated_variables. Values in value_overrides are
+    only ever swapped in for names that appear in the datamap, so this is a superset of what any traversal reads.
+
+    WARNING - post-processors are passed the full list of ce jsons and can read whatever they like from it. Names they
+    read that aren't in the datamap aren't (and can't be) found by this analysis.
+
+    Args:
+        datamap: Loaded datamap
+        static_first_repetition_name_formatter: Same formatter passed to extract_ce_variable_val(). The formatted
+                                                variant of every name is included as well. None to skip.
+
+    Returns: Set of CE variable names
+
+    """
+    names: set[str] = set()
+    _collect_variable_names(datamap, names)
+
+    if static_first_repetition_name_formatter is not None:
+        names.update([static_first_repetition_name_formatter(name) for name in names])
+
+    return names
+
+
+def collect_datamap_override_keys(datamap: dict[str, Any] | BaseModel | CompiledModel | str | list) -> set[str]:
+    """
+    Collect every value_overrides key that can change what traverse_datamap() returns for this datamap - the variable
+    names from collect_datamap_variable_names() plus whole |...| templates and <<LOOP_INDEX>>, which can be overridden
+    too. Overrides for any other key are never read, so two override mappings that agree on these keys traverse the
+    datamap the same way.
+
+    Args:
+        datamap: Loaded datamap
+
+    Returns: Set of value_overrides keys
+
+    """
+    keys: set[str] = set()
+    _collect_variable_names(datamap, keys, include_leaves=True)
+    return keys
+
+
+def prune_ce_jsons_to_variable_names(
+    ce_jsons: list[ContractExpressVarObj],
+    variable_names: Iterable[str],
+) -> list[ContractExpressVarObj]:
+    """
+    Drop every ContractExpressVarObj whose name isn't in variable_names. Order is preserved, so lookups that take the
+    first match still return the same object.
+
+    Args:
+        ce_jsons: List of ContractExpressVarObjs
+        variable_names: Names to keep (see collect_datamap_variable_names())
+
+    Returns: Pruned list of ContractExpressVarObjs
+
+    """
+    if not isinstance(variable_names, (set, frozenset)):
+        variable_names = set(variable_names)
+    return [ce_obj for ce_obj in ce_jsons if ce_obj["name"] in variable_names]
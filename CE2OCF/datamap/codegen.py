@@ -0,0 +1,598 @@
+"""
+Generate a plain python module from a datamap so converting a questionnaire doesn't have to interpret the datamap at
+all. generate_datamap_module_source() walks a compiled datamap (see CE2OCF.datamap.compiled) once and writes out a
+convert() function with the traversal unrolled - variable names, override checks, templates and <<LOOP_INDEX>> are
+resolved when the module is generated, while registered post-processors are still looked up on the datamap model
+classes on every call, just like the crawler does. convert(ce_jsons) returns the same thing as
+traverse_datamap(datamap, None, ce_jsons).
+
+Generated modules record the sha256 of the datamap json and a fingerprint of the model class + library version they
+were generated from. load_generated_datamap_converter() regenerates a module whenever either one changes, and the
+command line entry point does the same for modules you keep with your own code:
+
+    python -m CE2OCF.datamap.codegen CE2OCF.ocf.datamaps.RepeatableStockholderDataMap stockholders.json converter.py
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import importlib
+import importlib.util
+import json
+import os
+import re
+import sys
+import types
+from pathlib import Path
+from typing import Any, Callable
+
+from pydantic import BaseModel
+
+from CE2OCF import __version__
+from CE2OCF.datamap.compiled import (
+    CompiledModel,
+    CompiledRepeatableDataMap,
+    CompiledStaticField,
+    _model_fingerprint,
+    compile_datamap,
+)
+from CE2OCF.datamap.crawler import _call_post_processor
+from CE2OCF.datamap.definitions import FieldPostProcessorModel
+from CE2OCF.utils.log_utils import logger
+from CE2OCF.utils.string_templating_utils import (
+    MUSTACHE_CAPTURE_REGEX,
+    str_is_template_expression,
+)
+
+GENERATED_FUNCTION_NAME = "convert"
+
+_HEADER_PATTERN = re.compile(r'^(DATAMAP_DIGEST|MODEL_FINGERPRINT) = "([0-9a-f]+)"$', re.MULTILINE)
+
+# Converters imported by this process, keyed on (module path, datamap digest, model fingerprint)
+_loaded_converters: dict[tuple[str, str, str], Callable] = {}
+
+
+class _ModuleWriter:
+    """
+    Builds the source of one generated module. Every model node in the datamap gets its own function - everything
+    beneath a model (variable lookups, templates, lists, dicts, static fields) is inlined into that function.
+
+    Variable names in the generated code mirror the crawler's: ce_jsons, overrides, iteration, fail (whether
+    VariableNotFoundErrors propagate) and pending (batch post-processor values waiting on the current repetitions).
+    """
+
+    def __init__(self):
+        self.model_classes: dict[str, type] = {}
+        self.default_fields: list[str] = []
+        self.scopes: list[str] = []
+        self.functions: list[list[str]] = []
+        self._counter = 0
+
+    def unique_name(self, prefix: str) -> str:
+        self._counter += 1
+        return f"{prefix}_{self._counter}"
+
+    def class_name(self, model_class: type) -> str:
+        name = model_class.__name__
+        if self.model_classes.setdefault(name, model_class) is not model_class:
+            msg = f"Datamap uses two different model classes named {name}"
+            raise ValueError(msg)
+        if model_class.__qualname__ != name:
+            msg = f"Datamap model class {model_class.__qualname__} must be defined at module level"
+            raise ValueError(msg)
+        return name
+
+    def literal(self, value: Any) -> str:
+        # Python source for a value that came out of a datamap json
+        if isinstance(value, CompiledStaticField):
+            return f"CompiledStaticField({self.class_name(value.model_class)}, {value.static!r})"
+        if isinstance(value, list):
+            return "[" + ", ".join(self.literal(item) for item in value) + "]"
+        if isinstance(value, dict):
+            return "{" + ", ".join(f"{key!r}: {self.literal(item)}" for key, item in value.items()) + "}"
+        if value is None or isinstance(value, (str, bool, int, float)):
+            return repr(value)
+        msg = f"Can't generate a literal for datamap value {value!r}"
+        raise TypeError(msg)
+
+    # traverse_datamap() -------------------------------------------------------------------------------------------
+    def traverse(
+        self,
+        lines: list[str],
+        indent: str,
+        node: Any,
+        target: str,
+        post_processor: str | None,
+        in_repetition: bool,
+        fail: str,
+    ) -> None:
+        """
+        Append code that sets target to what traverse_datamap(node, ...) returns.
+
+        Args:
+            lines: Lines of the function being generated
+            indent: Indent of the generated code
+            node: Compiled datamap node
+            target: Variable name to assign the result to
+            post_processor: Name of a local holding the field's post-processor (None at runtime if there isn't one),
+                            or None if node can't have one
+            in_repetition: Whether node is traversed once per repetition, i.e. iteration is set
+            fail: Expression for traverse_datamap()'s fail_on_missing_variable
+        """
+        may_be_empty = True
+        start = None
+        if post_processor is not None and isinstance(node, (list, dict, CompiledModel)):
+            # Batch post-processed values inside node have to be applied before post_processor sees node's value
+            start = self.unique_name("start")
+            lines.append(f"{indent}{start} = len(pending) if pending is not None else 0")
+
+        if isinstance(node, str):
+            lines.append(f"{indent}{target} = {self.string_leaf(node, post_processor, in_repetition, fail)}")
+        elif isinstance(node, (bool, int, float)) or node is None:
+            lines.append(f"{indent}{target} = {node!r}")
+            may_be_empty = False
+        elif isinstance(node, list):
+            lines.append(f"{indent}{target} = []")
+            for item in node:
+                item_target = self.unique_name("item")
+                self.traverse(lines, indent, item, item_target, None, in_repetition, "False")
+                lines.append(f"{indent}if {item_target} != {{}} and {item_target} is not None:")
+                lines.append(f"{indent}    {target}.append({item_target})")
+            may_be_empty = False
+        elif isinstance(node, dict) and len(node) == 1 and "static" in node:
+            lines.append(f"{indent}{target} = {self.literal(node['static'])}")
+        elif isinstance(node, dict):
+            lines.append(f"{indent}{target} = {{}}")
+            for key, value in node.items():
+                if isinstance(value, dict) and "val" in value:
+                    lines.append(f"{indent}{target}[{key!r}] = {self.literal(value['val'])}")
+                    continue
+                value_target = self.unique_name("value")
+                lines.append(f"{indent}try:")
+                self.traverse(lines, indent + "    ", value, value_target, None, in_repetition, "False")
+                lines.append(f"{indent}    {target}[{key!r}] = {value_target}")
+                lines.append(f"{indent}except VariableNotFoundError as e:")
+                lines.append(f"{indent}    if {fail}:")
+                lines.append(f"{indent}        raise VariableNotFoundError from e")
+        elif isinstance(node, CompiledStaticField):
+            static = node.static if isinstance(node.static, bool) else str(node.static)
+            lines.append(f"{indent}{target} = {static!r}")
+            may_be_empty = False
+        elif isinstance(node, CompiledRepeatableDataMap):
+            function_name = self.repeatable_function(node)
+            lines.append(f"{indent}{target} = {function_name}(ce_jsons, overrides, {fail}, defaults)")
+            may_be_empty = False
+        elif isinstance(node, CompiledModel):
+            function_name = self.model_function(node, in_repetition)
+            iteration = "iteration" if in_repetition else "None"
+            lines.append(
+                f"{indent}{target} = {function_name}(ce_jsons, {iteration}, overrides, {fail}, pending, defaults)"
+            )
+        else:
+            msg = f"Unexpected value for datamap: {node!r} {type(node)}"
+            raise TypeError(msg)
+
+        if post_processor is not None:
+            lines.append(f"{indent}if {post_processor} is not None:")
+            if start is not None:
+                lines.append(f"{indent}    if pending is not None and len(pending) > {start}:")
+                lines.append(f"{indent}        _apply_batch_post_processors(pending, ce_jsons, start={start})")
+            lines.append(f"{indent}    {target} = _call_post_processor({post_processor}, {target}, ce_jsons)")
+            may_be_empty = True
+
+        if may_be_empty:
+            lines.append(f"{indent}if {target} == {{}}:")
+            lines.append(f"{indent}    {target} = None")
+
+    def string_leaf(self, datamap: str, post_processor: str | None, in_repetition: bool, fail: str) -> str:
+        # Expression equivalent to handle_string_datamap()
+        if str_is_template_expression(datamap):
+            value = self.template(datamap[1:-1], post_processor, in_repetition, fail)
+        elif datamap == "<<LOOP_INDEX>>":
+            value = "iteration" if in_repetition else "_loop_index_outside_repetition()"
+        elif in_repetition:
+            value = (
+                f"extract_ce_variable_val({datamap!r}, ce_jsons, repetition_number=iteration, "
+                f"fail_on_missing_variable={fail})"
+            )
+        else:
+            value = f"extract_ce_variable_val({datamap!r}, ce_jsons, fail_on_missing_variable={fail})"
+        return f"(overrides[{datamap!r}] if {datamap!r} in overrides else {value})"
+
+    def template(self, template: str, post_processor: str | None, in_repetition: bool, fail: str) -> str:
+        # The template is split at its {{variables}} here rather than on every lookup. Each variable is looked up like
+        # lookup_straight_var() does, which applies the field's post-processor to it too.
+        parts = []
+        for position, part in enumerate(re.split(MUSTACHE_CAPTURE_REGEX, template)):
+            if position % 2 == 0:
+                if part:
+                    parts.append(repr(part))
+                continue
+            value = self.string_leaf(part[2:-2].strip(), None, in_repetition, fail)
+            if post_processor is not None:
+                parts.append(f"_template_value(_post_processed({post_processor}, {value}, ce_jsons))")
+            else:
+                parts.append(f"_template_value(_empty_to_none({value}))")
+
+        expression = " + ".join(parts) if parts else "''"
+        if in_repetition:
+            # Variable values can bring in [...] expressions of their own, so this can't be skipped for templates
+            # without brackets
+            return f"eval_compiled_expression({expression})"
+        return f"({expression})"
+
+    # Models -------------------------------------------------------------------------------------------------------
+    def model_function(self, node: CompiledModel, in_repetition: bool) -> str:
+        # traverse_field_post_processor_model() or handle_base_model_datamap(), depending on the model class
+        class_name = self.class_name(node.model_class)
+        function_name = self.unique_name(f"_{class_name}")
+        has_post_processors = issubclass(node.model_class, FieldPostProcessorModel)
+
+        lines = [f"def {function_name}(ce_jsons, iteration, overrides, fail, pending, defaults):", "    result = {}"]
+        if has_post_processors:
+            lines.append(f"    post_processors = {class_name}.get_postprocessors()")
+
+        for field_name, value in node.fields:
+            target = self.unique_name("value")
+            lines.append("    try:")
+            if not has_post_processors:
+                self.field_value(lines, node, field_name, value, target, None, in_repetition, "False")
+                lines += [
+                    f"        result[{field_name!r}] = {target}",
+                    "    except VariableNotFoundError as e:",
+                    "        if fail:",
+                    "            raise VariableNotFoundError from e",
+                ]
+                continue
+
+            post_processor, batch, start = (self.unique_name(prefix) for prefix in ("post_processor", "batch", "start"))
+            lines += [
+                f"        {post_processor} = post_processors.get({field_name!r})",
+                f"        {batch} = None",
+                f"        if {post_processor} is not None and pending is not None and "
+                f"is_batch_post_processor({post_processor}):",
+                f"            {batch}, {post_processor} = {post_processor}, None",
+                f"            {start} = len(pending)",
+            ]
+            self.field_value(lines, node, field_name, value, target, post_processor, in_repetition, "fail")
+            warning = f"{{msg}} but fail_on_missing_variable is set to False, so return result without {field_name}"
+            lines += [
+                f"        if {batch} is not None:",
+                f"            if len(pending) > {start}:",
+                f"                _apply_batch_post_processors(pending, ce_jsons, start={start})",
+                f"            pending.append(_PendingBatchValue({batch}, result, {field_name!r}, {target}))",
+                f"        result[{field_name!r}] = {target}",
+                "    except VariableNotFoundError as e:",
+                f'        msg = f"traverse_field_post_processor_model() - Variable {field_name} not found: {{e}}"',
+                "        if fail:",
+                "            raise VariableNotFoundError(msg) from e",
+                f"        logger.warning(f{warning!r})",
+            ]
+
+        lines.append("    return result")
+        self.functions.append(lines)
+        return function_name
+
+    def field_value(
+        self,
+        lines: list[str],
+        node: CompiledModel,
+        field_name: str,
+        value: Any,
+        target: str,
+        post_processor: str | None,
+        in_repetition: bool,
+        fail: str,
+    ) -> None:
+        if field_name not in node.factory_fields:
+            self.traverse(lines, "        ", value, target, post_processor, in_repetition, fail)
+            return
+
+        # Values from a default_factory (generated ids, today's date...) are made once per convert() call, like they're
+        # made once each time a datamap is loaded, and then left to the crawler
+        class_name = self.class_name(node.model_class)
+        default_key = f"{class_name}.{field_name}"
+        self.default_fields.append(f"{default_key!r}: {class_name}.__fields__[{field_name!r}]")
+        iteration = "iteration" if in_repetition else "None"
+        lines += [
+            f"        {target} = traverse_datamap(",
+            f"            defaults[{default_key!r}],",
+            f"            {field_name!r},",
+            "            ce_jsons,",
+            f"            post_processor={post_processor},",
+            f"            iteration={iteration},",
+            "            value_overrides=overrides,",
+            f"            fail_on_missing_variable={fail},",
+            "        )",
+        ]
+
+    def repeatable_function(self, node: CompiledRepeatableDataMap) -> str:
+        # handle_repeatable_model_datamap(). repeat_count and repeated_variables are resolved by the crawler - that
+        # happens once per call and needs the same post-processor handling.
+        class_name = self.class_name(node.model_class)
+        function_name = self.unique_name(f"_{class_name}")
+        self.scopes.append(
+            f"{function_name!r}: CompiledRepeatableDataMap({class_name}, (('repeated_variables', "
+            f"{self.literal(node.repeated_variables)}), ('repeat_count', {self.literal(node.repeat_count)}), "
+            f"('repeated_pattern', None)))"
+        )
+
+        lines = [
+            f"def {function_name}(ce_jsons, overrides, fail, defaults):",
+            f"    repeat_count, overrides = _resolve_repetition_scope(_SCOPES[{function_name!r}], ce_jsons, overrides, "
+            f"fail, True)",
+            "    results = []",
+            "    with _batched_post_processing(ce_jsons):",
+            "        pending = _pending_batch_values.get()",
+            "        for iteration in range(1, repeat_count + 1):",
+        ]
+        self.traverse(lines, "            ", node.repeated_pattern, "repetition", None, True, "False")
+        lines += ["            results.append(repetition)", "    return results"]
+        self.functions.append(lines)
+        return function_name
+
+    def model_imports(self) -> list[str]:
+        by_module: dict[str, list[str]] = {}
+        for name, model_class in sorted(self.model_classes.items()):
+            by_module.setdefault(model_class.__module__, []).append(name)
+        return [f"from {module} import {', '.join(names)}" for module, names in sorted(by_module.items())]
+
+    def module_source(self, datamap: CompiledModel, datamap_digest: str, model_fingerprint: str) -> str:
+        body: list[str] = []
+        self.traverse(body, "    ", datamap, "result", None, False, "fail_on_missing_variable")
+
+        source = [
+            '"""',
+            f"Generated by CE2OCF {__version__} from a {datamap.model_class.__name__} datamap. Don't edit - regenerate "
+            "with CE2OCF.datamap.codegen.",
+            '"""',
+            "from CE2OCF.ce import extract_ce_variable_val",
+            "from CE2OCF.datamap.codegen import (",
+            "    _empty_to_none,",
+            "    _loop_index_outside_repetition,",
+            "    _post_processed,",
+            "    _template_value,",
+            ")",
+            "from CE2OCF.datamap.compiled import CompiledRepeatableDataMap, CompiledStaticField",
+            "from CE2OCF.datamap.crawler import (",
+            "    _apply_batch_post_processors,",
+            "    _batched_post_processing,",
+            "    _call_post_processor,",
+            "    _pending_batch_values,",
+            "    _PendingBatchValue,",
+            "    _resolve_repetition_scope,",
+            "    traverse_datamap,",
+            ")",
+            "from CE2OCF.datamap.definitions import is_batch_post_processor",
+            "from CE2OCF.types.exceptions import VariableNotFoundError",
+            "from CE2OCF.utils.log_utils import logger",
+            "from CE2OCF.utils.string_templating_utils import eval_compiled_expression",
+            *self.model_imports(),
+            "",
+            f'DATAMAP_DIGEST = "{datamap_digest}"',
+            f'MODEL_FINGERPRINT = "{model_fingerprint}"',
+            "",
+            "_DEFAULT_FIELDS = {",
+            *(f"    {default_field}," for default_field in self.default_fields),
+            "}",
+            "_SCOPES = {",
+            *(f"    {scope}," for scope in self.scopes),
+            "}",
+            "",
+        ]
+        for function in self.functions:
+            source += ["", *function, ""]
+        source += [
+            "",
+            f"def {GENERATED_FUNCTION_NAME}(ce_jsons, value_overrides=None, fail_on_missing_variable=False):",
+            '    """',
+            "    Same result as traverse_datamap(datamap, None, ce_jsons, value_overrides=value_overrides,",
+            "    fail_on_missing_variable=fail_on_missing_variable)",
+            '    """',
+            "    overrides = {} if value_overrides is None else value_overrides",
+            "    pending = _pending_batch_values.get()",
+            "    defaults = {key: field.get_default() for key, field in _DEFAULT_FIELDS.items()}",
+            *body,
+            "    return result",
+            "",
+        ]
+        return "\n".join(source)
+
+
+def _empty_to_none(value: Any) -> Any:
+    return None if value == {} else value
+
+
+def _post_processed(post_processor: Callable | None, value: Any, ce_jsons: list) -> Any:
+    if post_processor is not None:
+        value = _call_post_processor(post_processor, value, ce_jsons)
+    return _empty_to_none(value)
+
+
+def _template_value(value: Any) -> str:
+    # Same as lookup_straight_var()
+    if value is None:
+        return ""
+    assert isinstance(value, (str, int))
+    return str(value)
+
+
+def _loop_index_outside_repetition():
+    msg = "You used reserved variable name <<LOOP_INDEX>> in a non-repeating pattern... can't do that"
+    raise ValueError(msg)
+
+
+def generate_datamap_module_source(
+    datamap_json: dict[str, Any],
+    model_class: type[BaseModel],
+    datamap_digest: str | None = None,
+) -> str:
+    """
+    Generate the source of a module whose convert(ce_jsons, value_overrides=None, fail_on_missing_variable=False)
+    function returns the same result as traversing datamap_json (as a model_class datamap) with traverse_datamap().
+
+    Args:
+        datamap_json: Parsed datamap json
+        model_class: Datamap model class, e.g. RepeatableStockholderDataMap
+        datamap_digest: sha256 hex digest of the datamap json file, recorded in the module. Defaults to a digest of
+                        datamap_json itself.
+
+    Returns: Python source
+
+    Raises: ValueError if the datamap is invalid
+
+    """
+    if datamap_digest is None:
+        datamap_digest = hashlib.sha256(json.dumps(datamap_json, sort_keys=True).encode()).hexdigest()
+    compiled = compile_datamap(datamap_json, model_class, datamap_digest)
+    return _ModuleWriter().module_source(compiled, datamap_digest, _model_fingerprint(model_class))
+
+
+def read_generated_module_header(module_path: Path | str) -> dict[str, str]:
+    """
+    Returns: {"DATAMAP_DIGEST": ..., "MODEL_FINGERPRINT": ...} recorded in a generated module, empty if the file doesn't
+             exist or isn't a generated module
+    """
+    try:
+        source = Path(module_path).read_text()
+    except FileNotFoundError:
+        return {}
+    return dict(_HEADER_PATTERN.findall(source))
+
+
+def generated_module_is_current(module_path: Path | str, source_json: Path | str, model_class: type[BaseModel]) -> bool:
+    """
+    Returns: True if module_path was generated from the current contents of source_json, model_class and library
+             version
+    """
+    return read_generated_module_header(module_path) == {
+        "DATAMAP_DIGEST": hashlib.sha256(Path(source_json).read_bytes()).hexdigest(),
+        "MODEL_FINGERPRINT": _model_fingerprint(model_class),
+    }
+
+
+def write_generated_datamap_module(
+    source_json: Path | str,
+    model_class: type[BaseModel],
+    module_path: Path | str,
+    force: bool = False,
+) -> bool:
+    """
+    (Re)generate module_path from source_json unless it's already current.
+
+    Args:
+        source_json: Path to datamap json
+        model_class: Datamap model class
+        module_path: Where to write the generated module
+        force: Regenerate even if module_path is current
+
+    Returns: True if the module was written
+
+    """
+    if not force and generated_module_is_current(module_path, source_json, model_class):
+        return False
+
+    datamap_bytes = Path(source_json).read_bytes()
+    source = generate_datamap_module_source(
+        json.loads(datamap_bytes), model_class, hashlib.sha256(datamap_bytes).hexdigest()
+    )
+
+    module_path = Path(module_path)
+    module_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = module_path.with_name(f"{module_path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(source)
+    os.replace(tmp_path, module_path)
+    logger.info(f"Generated {model_class.__name__} converter for {source_json} at {module_path}")
+    return True
+
+
+def _import_generated_module(module_path: Path, module_name: str) -> types.ModuleType:
+    spec = importlib.util.spec_from_file_location(module_name, module_path)
+    if spec is None or spec.loader is None:
+        msg = f"Can't import generated datamap module {module_path}"
+        raise ImportError(msg)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_generated_datamap_converter(
+    source_json: Path | str,
+    model_class: type[BaseModel],
+    module_path: Path | str | None = None,
+) -> Callable:
+    """
+    Generated module equivalent of traverse_datamap(model_class.parse_file(source_json), None, ...). The module is
+    regenerated whenever the datamap json, the model class or the library version changes.
+
+    Args:
+        source_json: Path to datamap json
+        model_class: Datamap model class
+        module_path: Where to keep the generated module. None to generate it in memory. Modules are imported, so
+                     only put them somewhere only trusted users can write to - unlike compiled datamap artifacts, they
+                     aren't signed, so they're never kept in the shared cache directory.
+
+    Returns: convert(ce_jsons, value_overrides=None, fail_on_missing_variable=False) function
+
+    """
+    datamap_bytes = Path(source_json).read_bytes()
+    datamap_digest = hashlib.sha256(datamap_bytes).hexdigest()
+    model_fingerprint = _model_fingerprint(model_class)
+    module_key = hashlib.sha256(f"{model_fingerprint}/{datamap_digest}".encode()).hexdigest()
+
+    converter_key = (str(module_path), datamap_digest, model_fingerprint)
+    if converter_key in _loaded_converters:
+        return _loaded_converters[converter_key]
+
+    module_name = f"CE2OCF_generated_{module_key}"
+    if module_path is None:
+        module = types.ModuleType(module_name)
+        source = generate_datamap_module_source(json.loads(datamap_bytes), model_class, datamap_digest)
+        # source is generated right here from the datamap json, the same input traverse_datamap() would interpret
+        exec(compile(source, f"<{model_class.__name__} converter>", "exec"), module.__dict__)  # noqa: S102
+    else:
+        write_generated_datamap_module(source_json, model_class, module_path)
+        module = _import_generated_module(Path(module_path), module_name)
+
+    converter = _loaded_converters[converter_key] = getattr(module, GENERATED_FUNCTION_NAME)
+    return converter
+
+
+def _resolve_model_class(name: str) -> type[BaseModel]:
+    # "package.module.ClassName", or just "ClassName" for the models in CE2OCF.ocf.datamaps
+    module_name, _, class_name = name.rpartition(".")
+    model_class = getattr(importlib.import_module(module_name or "CE2OCF.ocf.datamaps"), class_name, None)
+    if not (isinstance(model_class, type) and issubclass(model_class, BaseModel)):
+        msg = f"{name} is not a datamap model class"
+        raise ValueError(msg)
+    return model_class
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m CE2OCF.datamap.codegen",
+        description="Generate a python module that converts CE datasheet items with a fixed datamap.",
+    )
+    parser.add_argument("model_class", help="Datamap model class, e.g. RepeatableStockholderDataMap or a dotted path")
+    parser.add_argument("datamap_json", type=Path, help="Datamap json")
+    parser.add_argument("module_path", type=Path, help="Generated module path")
+    parser.add_argument("--force", action="store_true", help="Regenerate even if the module is current")
+    parser.add_argument(
+        "--check", action="store_true", help="Don't write anything, exit with status 1 if the module is out of date"
+    )
+    args = parser.parse_args(argv)
+
+    model_class = _resolve_model_class(args.model_class)
+    if args.check:
+        if generated_module_is_current(args.module_path, args.datamap_json, model_class):
+            return 0
+        sys.stderr.write(f"{args.module_path} is out of date with {args.datamap_json}\n")
+        return 1
+
+    written = write_generated_datamap_module(args.datamap_json, model_class, args.module_path, force=args.force)
+    sys.stdout.write(f"{'Generated' if written else 'Up to date:'} {args.module_path}\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
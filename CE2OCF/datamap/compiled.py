@@ -0,0 +1,511 @@
+"""
+Lightweight alternative to loading datamaps as pydantic models. The pydantic datamap classes stay the authoring API -
+they define the shape of a datamap and the post-processors registered for each part of it - but instead of building a
+tree of validated model instances, compile_datamap() checks a datamap json against a json schema generated from the
+model class (once per distinct datamap) and then builds a tree of small, slotted nodes the crawler traverses directly.
+The datamaps shipped in CE2OCF/datamap/defaults are checked against their schemas by the test suite instead, so loading
+them never imports jsonschema.
+
+Values are coerced the same way pydantic v1 would coerce them (first matching member of a Union wins, numbers become
+strings in str fields, unset fields take their defaults, unknown keys are dropped) so traversing a compiled datamap
+gives the same result as traversing the model.
+"""
+from __future__ import annotations
+
+import functools
+import hashlib
+import hmac
+import json
+import os
+import pickle
+import types
+import typing
+from pathlib import Path
+from typing import Any, Union
+
+from pydantic import BaseModel
+
+from CE2OCF import __version__
+from CE2OCF.datamap.definitions import (
+    OverridableBoolField,
+    OverridableFloatField,
+    OverridableIntField,
+    OverridableStringField,
+    RepeatableDataMap,
+)
+from CE2OCF.utils.log_utils import logger
+
+OVERRIDABLE_FIELD_TYPES = (OverridableStringField, OverridableFloatField, OverridableBoolField, OverridableIntField)
+
+# Same spellings pydantic v1 accepts for bools
+_TRUE_VALUES = {"1", "on", "t", "true", "y", "yes"}
+_FALSE_VALUES = {"0", "off", "f", "false", "n", "no"}
+_INT_STRING_PATTERN = r"^\s*[+-]?\d+\s*$"
+_FLOAT_STRING_PATTERN = r"^\s*[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?\s*$"
+
+_NONE_TYPE = type(None)
+
+# X | Y unions (types.UnionType) only exist on python 3.10+
+_UNION_ORIGINS = (Union, getattr(types, "UnionType", Union))
+
+DATAMAP_CACHE_DIR_ENV_VAR = "CE2OCF_DATAMAP_CACHE_DIR"
+DATAMAP_CACHE_KEY_ENV_VAR = "CE2OCF_DATAMAP_CACHE_KEY"
+COMPILED_DATAMAP_ARTIFACT_SUFFIX = ".datamap.pickle"
+
+# Set with set_compiled_datamap_cache_dir(). Each falls back to its environment variable when None.
+_compiled_datamap_cache_settings: dict[str, Any] = {"cache_dir": None, "cache_key": None}
+
+_ARTIFACT_SIGNATURE_SIZE = hashlib.sha256().digest_size
+
+# Datamaps in here ship with the package and are validated by the test suite, not on every cold load
+_PACKAGED_DATAMAP_DIR = (Path(__file__).parent / "defaults").resolve()
+
+# (model class, sha256 of datamap json) pairs that have already passed schema validation
+_validated_datamaps: set[tuple[type, str]] = set()
+
+
+class CompiledStaticField:
+    """
+    Compiled equivalent of the Overridable*Field models - a fixed value that's never looked up.
+    """
+
+    __slots__ = ("model_class", "static")
+
+    def __init__(self, model_class: type[BaseModel], static: str | float | bool | int):
+        self.model_class = model_class
+        self.static = static
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.model_class.__name__}, static={self.static!r})"
+
+
+class CompiledModel:
+    """
+    Compiled equivalent of a datamap model instance. fields holds (field name, compiled value) pairs in the model's
+    field order and model_class is the pydantic class it was compiled from, which is where the crawler looks up
+    registered post-processors. factory_fields names the fields whose values came from a default_factory (generated
+    ids, today's date...) - those are generated again whenever a compiled datamap is unpickled, just as they would be
+    by loading the datamap again.
+    """
+
+    __slots__ = ("model_class", "fields", "factory_fields")
+
+    def __init__(
+        self,
+        model_class: type[BaseModel],
+        fields: tuple[tuple[str, Any], ...],
+        factory_fields: frozenset[str] = frozenset(),
+    ):
+        self.model_class = model_class
+        self.fields = fields
+        self.factory_fields = factory_fields
+
+    def __reduce__(self):
+        fields = tuple((name, None if name in self.factory_fields else value) for name, value in self.fields)
+        return _restore_compiled_model, (type(self), self.model_class, fields, self.factory_fields)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.model_class.__name__}, fields={dict(self.fields)!r})"
+
+
+class CompiledRepeatableDataMap(CompiledModel):
+    """
+    Compiled equivalent of a RepeatableDataMap instance.
+    """
+
+    __slots__ = ("repeated_variables", "repeat_count", "repeated_pattern")
+
+    def __init__(
+        self,
+        model_class: type[BaseModel],
+        fields: tuple[tuple[str, Any], ...],
+        factory_fields: frozenset[str] = frozenset(),
+    ):
+        super().__init__(model_class, fields, factory_fields)
+        field_values = dict(fields)
+        self.repeated_variables = field_values["repeated_variables"]
+        self.repeat_count = field_values["repeat_count"]
+        self.repeated_pattern = field_values["repeated_pattern"]
+
+
+def _restore_compiled_model(
+    node_class: type[CompiledModel],
+    model_class: type[BaseModel],
+    fields: tuple[tuple[str, Any], ...],
+    factory_fields: frozenset[str],
+) -> CompiledModel:
+    if factory_fields:
+        fields = tuple(
+            (name, model_class.__fields__[name].get_default() if name in factory_fields else value)
+            for name, value in fields
+        )
+    return node_class(model_class, fields, factory_fields)
+
+
+class _NoMatchError(Exception):
+    pass
+
+
+def _union_members(annotation: Any) -> tuple | None:
+    if typing.get_origin(annotation) in _UNION_ORIGINS:
+        return typing.get_args(annotation)
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def datamap_json_schema(annotation: Any) -> dict[str, Any]:
+    """
+    Generate a json schema that accepts exactly the json values compile_datamap() can coerce to annotation. Unlike
+    pydantic's own schema(), Optional fields accept null and str / int / float / bool fields accept the same loose
+    inputs pydantic v1 does.
+
+    Args:
+        annotation: Datamap model class (or any field annotation used in one)
+
+    Returns: Json schema dict
+
+    """
+    if annotation is Any:
+        return {}
+    if annotation is _NONE_TYPE:
+        return {"type": "null"}
+    if annotation is str:
+        return {"type": ["string", "number", "boolean"]}
+    if annotation is bool:
+        return {
+            "anyOf": [
+                {"type": "boolean"},
+                {"enum": [0, 1]},
+                {"type": "string", "enum": sorted(_TRUE_VALUES | _FALSE_VALUES)},
+            ]
+        }
+    if annotation is int:
+        return {"anyOf": [{"type": "number"}, {"type": "string", "pattern": _INT_STRING_PATTERN}]}
+    if annotation is float:
+        return {"anyOf": [{"type": "number"}, {"type": "string", "pattern": _FLOAT_STRING_PATTERN}]}
+    if annotation in (list, typing.List):
+        return {"type": "array"}
+    if annotation in (dict, typing.Dict):
+        return {"type": "object"}
+
+    members = _union_members(annotation)
+    if members is not None:
+        return {"anyOf": [datamap_json_schema(member) for member in members]}
+
+    origin = typing.get_origin(annotation)
+    if origin is list:
+        (item_annotation,) = typing.get_args(annotation) or (Any,)
+        return {"type": "array", "items": datamap_json_schema(item_annotation)}
+    if origin is dict:
+        return {"type": "object"}
+
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return {
+            "type": "object",
+            "properties": {
+                field.alias: datamap_json_schema(field.annotation) for field in annotation.__fields__.values()
+            },
+            "required": [field.alias for field in annotation.__fields__.values() if field.required],
+        }
+
+    msg = f"Compiled datamaps don't support fields of type {annotation!r}"
+    raise TypeError(msg)
+
+
+def _coerce(value: Any, annotation: Any) -> Any:
+    if annotation is Any:
+        return value
+
+    members = _union_members(annotation)
+    if members is not None:
+        for member in members:
+            try:
+                return _coerce(value, member)
+            except _NoMatchError:
+                continue
+        raise _NoMatchError
+
+    if value is None:
+        if annotation is _NONE_TYPE:
+            return None
+        raise _NoMatchError
+    if annotation is _NONE_TYPE:
+        raise _NoMatchError
+
+    if annotation is str:
+        if isinstance(value, str):
+            return value
+        if isinstance(value, (int, float)):
+            return str(value)
+        raise _NoMatchError
+    if annotation is bool:
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, int) and value in (0, 1):
+            return bool(value)
+        if isinstance(value, str) and value.lower() in _TRUE_VALUES | _FALSE_VALUES:
+            return value.lower() in _TRUE_VALUES
+        raise _NoMatchError
+    if annotation in (int, float):
+        if isinstance(value, (str, int, float)):
+            try:
+                return annotation(value)
+            except ValueError:
+                raise _NoMatchError from None
+        raise _NoMatchError
+
+    if annotation in (list, typing.List):
+        if isinstance(value, list):
+            return list(value)
+        raise _NoMatchError
+    if annotation in (dict, typing.Dict):
+        if isinstance(value, dict):
+            return dict(value)
+        raise _NoMatchError
+
+    origin = typing.get_origin(annotation)
+    if origin is list:
+        if not isinstance(value, list):
+            raise _NoMatchError
+        (item_annotation,) = typing.get_args(annotation) or (Any,)
+        return [_coerce(item, item_annotation) for item in value]
+    if origin is dict:
+        if isinstance(value, dict):
+            return dict(value)
+        raise _NoMatchError
+
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        if not isinstance(value, dict):
+            raise _NoMatchError
+        return _compile_model(value, annotation)
+
+    msg = f"Compiled datamaps don't support fields of type {annotation!r}"
+    raise TypeError(msg)
+
+
+def _compile_model(value: dict[str, Any], model_class: type[BaseModel]) -> CompiledModel | CompiledStaticField:
+    fields = []
+    factory_fields = set()
+    for field in model_class.__fields__.values():
+        if field.alias in value:
+            fields.append((field.name, _coerce(value[field.alias], field.annotation)))
+        elif field.required:
+            raise _NoMatchError
+        else:
+            # Like pydantic, defaults aren't validated... e.g. {"static": "US"} stays a dict
+            fields.append((field.name, field.get_default()))
+            if field.default_factory is not None:
+                factory_fields.add(field.name)
+
+    if model_class in OVERRIDABLE_FIELD_TYPES:
+        return CompiledStaticField(model_class, fields[0][1])
+    if issubclass(model_class, RepeatableDataMap):
+        return CompiledRepeatableDataMap(model_class, tuple(fields), frozenset(factory_fields))
+    return CompiledModel(model_class, tuple(fields), frozenset(factory_fields))
+
+
+def validate_datamap_json(datamap_json: dict[str, Any], model_class: type[BaseModel]) -> None:
+    """
+    Validate datamap_json against datamap_json_schema(model_class).
+
+    Args:
+        datamap_json: Parsed datamap json
+        model_class: Datamap model class
+
+    Returns: None
+
+    Raises: ValueError if the datamap is invalid
+
+    """
+    # jsonschema is slow to import and is only needed on the first load of each datamap
+    from jsonschema import Draft7Validator
+
+    error = next(iter(Draft7Validator(datamap_json_schema(model_class)).iter_errors(datamap_json)), None)
+    if error is not None:
+        location = "/".join(str(part) for part in error.absolute_path) or "<root>"
+        msg = f"Invalid {model_class.__name__} datamap at {location}: {error.message}"
+        raise ValueError(msg)
+
+
+def compile_datamap(
+    datamap_json: dict[str, Any],
+    model_class: type[BaseModel],
+    datamap_digest: str | None = None,
+    validate: bool = True,
+) -> CompiledModel:
+    """
+    Validate datamap_json against the schema for model_class and compile it into a node tree the crawler can traverse
+    in place of model_class.parse_obj(datamap_json).
+
+    Args:
+        datamap_json: Parsed datamap json
+        model_class: Datamap model class, e.g. RepeatableStockholderDataMap
+        datamap_digest: Optional digest identifying datamap_json. If this datamap / model pair has been validated
+                        before, schema validation is skipped.
+        validate: If False, skip schema validation. A datamap that doesn't fit model_class still raises ValueError,
+                  just without the location of the problem.
+
+    Returns: Compiled datamap
+
+    Raises: ValueError if the datamap is invalid
+
+    """
+    if validate and (datamap_digest is None or (model_class, datamap_digest) not in _validated_datamaps):
+        validate_datamap_json(datamap_json, model_class)
+        if datamap_digest is not None:
+            _validated_datamaps.add((model_class, datamap_digest))
+
+    try:
+        compiled = _compile_model(datamap_json, model_class)
+    except _NoMatchError:
+        msg = f"Datamap does not match {model_class.__name__}"
+        raise ValueError(msg) from None
+
+    if not isinstance(compiled, CompiledModel):
+        msg = f"{model_class.__name__} is a field type, not a datamap"
+        raise ValueError(msg)
+    return compiled
+
+
+def set_compiled_datamap_cache_dir(cache_dir: Path | str | None, cache_key: bytes | str | None = None) -> None:
+    """
+    Set the directory load_compiled_datamap() keeps compiled datamap artifacts in. Overrides the
+    CE2OCF_DATAMAP_CACHE_DIR environment variable. None goes back to using the environment variable.
+
+    Artifacts are pickles, so each one is signed with an HMAC of cache_key (or the CE2OCF_DATAMAP_CACHE_KEY
+    environment variable) and only unpickled if its signature checks out - anyone who can write to the directory but
+    doesn't know the key can't get code run by the processes reading it. Give every process sharing the directory
+    the same secret key. Without a key the directory isn't used at all.
+
+    Args:
+        cache_dir: Cache directory. Can be shared by any number of processes.
+        cache_key: Secret key artifacts are signed with. None goes back to using the environment variable.
+
+    Returns: None
+
+    """
+    _compiled_datamap_cache_settings["cache_dir"] = Path(cache_dir) if cache_dir is not None else None
+    _compiled_datamap_cache_settings["cache_key"] = cache_key.encode() if isinstance(cache_key, str) else cache_key
+
+
+def get_compiled_datamap_cache_dir() -> Path | None:
+    """
+    Returns: Directory compiled datamap artifacts are cached in, or None if on-disk caching is off
+    """
+    if _compiled_datamap_cache_settings["cache_dir"] is not None:
+        return _compiled_datamap_cache_settings["cache_dir"]
+    env_cache_dir = os.environ.get(DATAMAP_CACHE_DIR_ENV_VAR)
+    return Path(env_cache_dir) if env_cache_dir else None
+
+
+def _get_compiled_datamap_cache_key() -> bytes | None:
+    if _compiled_datamap_cache_settings["cache_key"] is not None:
+        return _compiled_datamap_cache_settings["cache_key"]
+    env_cache_key = os.environ.get(DATAMAP_CACHE_KEY_ENV_VAR)
+    return env_cache_key.encode() if env_cache_key else None
+
+
+@functools.lru_cache(maxsize=None)
+def _log_missing_cache_key(cache_dir: Path) -> None:
+    # Once per directory, not on every load
+    logger.info(
+        f"Not caching compiled datamaps in {cache_dir}: set {DATAMAP_CACHE_KEY_ENV_VAR} (or pass cache_key to "
+        "set_compiled_datamap_cache_dir()) to sign them"
+    )
+
+
+class _ArtifactSignatureError(ValueError):
+    pass
+
+
+def _sign_artifact(payload: bytes, cache_key: bytes) -> bytes:
+    return hmac.new(cache_key, payload, hashlib.sha256).digest()
+
+
+@functools.lru_cache(maxsize=None)
+def _model_fingerprint(model_class: type[BaseModel]) -> str:
+    # Editing a datamap model changes its schema, which invalidates artifacts compiled against the old model
+    return hashlib.sha256(
+        f"{__version__}/{model_class.__module__}.{model_class.__qualname__}/".encode()
+        + json.dumps(datamap_json_schema(model_class), sort_keys=True, default=repr).encode()
+    ).hexdigest()
+
+
+def compiled_datamap_artifact_path(cache_dir: Path | str, model_class: type[BaseModel], datamap_digest: str) -> Path:
+    """
+    Args:
+        cache_dir: Cache directory
+        model_class: Datamap model class
+        datamap_digest: sha256 hex digest of the datamap json file
+
+    Returns: Path the compiled artifact for this datamap / model / library version is cached at
+
+    """
+    artifact_key = hashlib.sha256(f"{_model_fingerprint(model_class)}/{datamap_digest}".encode()).hexdigest()
+    return Path(cache_dir) / f"{artifact_key}{COMPILED_DATAMAP_ARTIFACT_SUFFIX}"
+
+
+def _write_compiled_datamap_artifact(artifact_path: Path, compiled: CompiledModel, cache_key: bytes) -> None:
+    artifact_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = artifact_path.with_name(f"{artifact_path.name}.{os.getpid()}.tmp")
+    payload = pickle.dumps(compiled, protocol=pickle.HIGHEST_PROTOCOL)
+    # HMAC signature first, then the pickle it signs
+    tmp_path.write_bytes(_sign_artifact(payload, cache_key) + payload)
+    os.replace(tmp_path, artifact_path)
+
+
+def _read_compiled_datamap_artifact(artifact_path: Path, cache_key: bytes) -> CompiledModel:
+    artifact_bytes = artifact_path.read_bytes()
+    signature, payload = artifact_bytes[:_ARTIFACT_SIGNATURE_SIZE], artifact_bytes[_ARTIFACT_SIGNATURE_SIZE:]
+    if not hmac.compare_digest(signature, _sign_artifact(payload, cache_key)):
+        msg = "Artifact signature doesn't match the cache key"
+        raise _ArtifactSignatureError(msg)
+    # Only artifacts signed with our cache key get this far
+    return pickle.loads(payload)  # noqa: S301
+
+
+def load_compiled_datamap(source_json: Path, model_class: type[BaseModel]) -> CompiledModel:
+    """
+    Compiled datamap equivalent of model_class.parse_file(source_json). If a cache directory and key are configured
+    (see set_compiled_datamap_cache_dir()), the compiled datamap is read from a signed, pickled artifact keyed on the
+    file's contents, the model and the library version, and written there on a miss so other processes don't have to
+    rebuild it. Artifacts with a bad signature are never unpickled or overwritten - they may belong to processes using
+    another key - so the datamap is compiled in memory instead. The datamaps shipped with the package are compiled
+    without schema validation (see compile_datamap()).
+
+    Args:
+        source_json: Path to datamap json
+        model_class: Datamap model class
+
+    Returns: Compiled datamap
+
+    """
+    datamap_bytes = Path(source_json).read_bytes()
+    datamap_digest = hashlib.sha256(datamap_bytes).hexdigest()
+    validate = Path(source_json).resolve().parent != _PACKAGED_DATAMAP_DIR
+
+    cache_dir = get_compiled_datamap_cache_dir()
+    cache_key = _get_compiled_datamap_cache_key()
+    if cache_dir is None or cache_key is None:
+        if cache_dir is not None:
+            _log_missing_cache_key(cache_dir)
+        return compile_datamap(json.loads(datamap_bytes), model_class, datamap_digest, validate)
+
+    artifact_path = compiled_datamap_artifact_path(cache_dir, model_class, datamap_digest)
+    try:
+        return _read_compiled_datamap_artifact(artifact_path, cache_key)
+    except FileNotFoundError:
+        pass
+    except _ArtifactSignatureError as e:
+        logger.warning(f"Not using compiled datamap artifact at {artifact_path}: {e}")
+        return compile_datamap(json.loads(datamap_bytes), model_class, datamap_digest, validate)
+    except Exception as e:
+        # Signed with our key, so ours to replace
+        logger.warning(f"Could not load compiled datamap artifact at {artifact_path}... rebuilding: {e}")
+
+    compiled = compile_datamap(json.loads(datamap_bytes), model_class, datamap_digest, validate)
+    try:
+        _write_compiled_datamap_artifact(artifact_path, compiled, cache_key)
+    except OSError as e:
+        logger.warning(f"Could not write compiled datamap artifact to {artifact_path}: {e}")
+    return compiled
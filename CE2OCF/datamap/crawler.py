@@ -7,11 +7,21 @@ to be called separately (though they could be, I suppose, if that were useful to
 """
 from __future__ import annotations
 
-from typing import Any, Callable
+import contextlib
+import math
+import multiprocessing
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from contextvars import ContextVar
+from typing import Any, Callable, Iterable, Iterator, NamedTuple
 
 from pydantic import BaseModel
 
-from CE2OCF.ce import extract_ce_variable_val
+from CE2OCF.ce import (
+    RepetitionTable,
+    ce_value_as_int,
+    extract_ce_variable_val,
+)
 from CE2OCF.datamap import (
     FieldPostProcessorModel,
     OverridableBoolField,
@@ -19,7 +29,15 @@ from CE2OCF.datamap import (
     OverridableIntField,
     OverridableStringField,
     RepeatableDataMap,
+    is_batch_post_processor,
+)
+from CE2OCF.datamap.analysis import collect_datamap_variable_names
+from CE2OCF.datamap.compiled import (
+    CompiledModel,
+    CompiledRepeatableDataMap,
+    CompiledStaticField,
 )
+from CE2OCF.datamap.overrides import OverrideScope
 from CE2OCF.types.dictionaries import ContractExpressVarObj
 from CE2OCF.types.exceptions import VariableNotFoundError
 from CE2OCF.utils.log_utils import logger
@@ -30,31 +48,116 @@ from CE2OCF.utils.string_templating_utils import (
 )
 
 
+def _datamap_class(datamap: Any) -> type:
+    # Compiled datamaps stand in for instances of the model class they were compiled from
+    if isinstance(datamap, (CompiledModel, CompiledStaticField)):
+        return datamap.model_class
+    return datamap.__class__
+
+
+def _datamap_fields(datamap: BaseModel | CompiledModel) -> Iterable[tuple[str, Any]]:
+    if isinstance(datamap, CompiledModel):
+        return datamap.fields
+    return ((field_name, getattr(datamap, field_name)) for field_name in datamap.__fields__)
+
+
+class _PendingBatchValue(NamedTuple):
+    post_processor: Callable
+    container: dict[str, Any]
+    field_name: str
+    value: Any
+
+
+# Values waiting on a batch post-processor, while traversing the repetitions of a RepeatableDataMap. None outside one.
+_pending_batch_values: ContextVar[list[_PendingBatchValue] | None] = ContextVar("_pending_batch_values", default=None)
+
+
+def _apply_batch_post_processors(
+    pending: list[_PendingBatchValue], ce_objs: list[ContractExpressVarObj], start: int = 0
+) -> None:
+    # Run each batch post-processor once over its pending values from pending[start:] and write the results back in
+    # place of the raw values
+    by_post_processor: dict[Callable, list[_PendingBatchValue]] = {}
+    for pending_value in pending[start:]:
+        by_post_processor.setdefault(pending_value.post_processor, []).append(pending_value)
+    del pending[start:]
+
+    for post_processor, pending_values in by_post_processor.items():
+        logger.debug(f"Apply batch post processor {post_processor} to {len(pending_values)} values")
+        results = post_processor([pending_value.value for pending_value in pending_values], ce_objs)
+        if len(results) != len(pending_values):
+            msg = (
+                f"Batch post processor {post_processor} returned {len(results)} values for {len(pending_values)} "
+                f"inputs"
+            )
+            raise ValueError(msg)
+        for pending_value, result in zip(pending_values, results):
+            pending_value.container[pending_value.field_name] = result
+
+
+@contextlib.contextmanager
+def _batched_post_processing(ce_objs: list[ContractExpressVarObj]) -> Iterator[None]:
+    # Defer batch post-processors for everything traversed in this block, then apply each one to all of its values
+    pending: list[_PendingBatchValue] = []
+    token = _pending_batch_values.set(pending)
+    try:
+        yield
+        _apply_batch_post_processors(pending, ce_objs)
+    finally:
+        _pending_batch_values.reset(token)
+
+
+def _call_post_processor(post_processor: Callable, value: Any, ce_objs: list[ContractExpressVarObj]) -> Any:
+    if is_batch_post_processor(post_processor):
+        return post_processor([value], ce_objs)[0]
+    return post_processor(value, ce_objs)
+
+
 def traverse_field_post_processor_model(
-    datamap: FieldPostProcessorModel,
+    datamap: FieldPostProcessorModel | CompiledModel,
     ce_objs: list[ContractExpressVarObj],
     iteration: int | None = None,
-    value_overrides: dict | None = None,
+    value_overrides: Mapping[str, Any] | None = None,
     fail_on_missing_variable: bool = False,
 ) -> dict[str, Any] | str | list | None:
     result = {}
 
     logger.debug(f"traverse_field_post_processor_model() - datamap is FieldPostProcessorModel: {datamap}")
-    for field_name, _ in datamap.__fields__.items():
+    post_processors = _datamap_class(datamap).get_postprocessors()
+    for field_name, value in _datamap_fields(datamap):
         try:
-            value = getattr(datamap, field_name)
             logger.debug(
                 f"traverse_field_post_processor_model() - field_name ({type(field_name)}): {field_name} / "
                 f"value ({type(value)}): {value}"
             )
 
-            if field_name in datamap.__class__.get_postprocessors():
+            pending = _pending_batch_values.get()
+            if (
+                field_name in post_processors
+                and pending is not None
+                and is_batch_post_processor(post_processors[field_name])
+            ):
+                logger.debug(f"Field {field_name} has a batch post processor... defer it until every repetition is in")
+                pending_start = len(pending)
+                resolved_val = traverse_datamap(
+                    value,
+                    field_name,
+                    ce_objs,
+                    iteration=iteration,
+                    value_overrides=value_overrides,
+                    fail_on_missing_variable=fail_on_missing_variable,
+                )
+                # Anything batched inside this field's value has to be final before its own batch runs
+                if len(pending) > pending_start:
+                    _apply_batch_post_processors(pending, ce_objs, start=pending_start)
+                pending.append(_PendingBatchValue(post_processors[field_name], result, field_name, resolved_val))
+            elif field_name in post_processors:
                 logger.debug(f"Field {field_name} exists in field_postprocessors()...")
                 resolved_val = traverse_datamap(
                     value,
                     field_name,
                     ce_objs,
-                    post_processor=datamap.__class__.get_postprocessors()[field_name],
+                    post_processor=post_processors[field_name],
                     iteration=iteration,
                     value_overrides=value_overrides,
                     fail_on_missing_variable=fail_on_missing_variable,
@@ -91,7 +194,7 @@ def lookup_straight_var(
     ce_objs: list[ContractExpressVarObj],
     post_processor: Callable | None = None,
     iteration: int | None = None,
-    value_overrides: dict[str, Any] | None = None,
+    value_overrides: Mapping[str, Any] | None = None,
     fail_on_missing_variable: bool = False,
 ) -> str:
     """
@@ -134,13 +237,13 @@ def handle_string_datamap(
     ce_objs: list[ContractExpressVarObj],
     post_processor: Callable | None = None,
     iteration: int | None = None,
-    value_overrides: dict[str, Any] | None = None,
+    value_overrides: Mapping[str, Any] | None = None,
     fail_on_missing_variable: bool = False,
 ) -> str:
     # Handle the case where datamap value is a string
     logger.debug(f"Detected terminal datamap leaf with value of {datamap}")
     # First check if we have an override value
-    if isinstance(value_overrides, dict) and datamap in value_overrides:
+    if isinstance(value_overrides, Mapping) and datamap in value_overrides:
         logger.debug(f"Variable name {datamap} for repetition {iteration} in value override dict")
         result = value_overrides[datamap]
     # If not... we're going to look up value from ce_json list
@@ -212,7 +315,7 @@ def handle_list_datamap(
     field_name: str | None,
     ce_objs: list[ContractExpressVarObj],
     iteration: int | None = None,
-    value_overrides: dict[str, Any] | None = None,
+    value_overrides: Mapping[str, Any] | None = None,
 ) -> list:
     # Handle the case where datamap is a list
 
@@ -242,7 +345,7 @@ def handle_dict_datamap(
     datamap: dict[str, Any],
     ce_objs: list[ContractExpressVarObj],
     iteration: int | None = None,
-    value_overrides: dict[str, Any] | None = None,
+    value_overrides: Mapping[str, Any] | None = None,
     fail_on_missing_variable: bool = False,
 ) -> str | float | bool | int | dict[str, Any]:
     # Handle the case where datamap is a dictionary
@@ -270,7 +373,13 @@ def handle_dict_datamap(
 
 
 def handle_overridable_datamap(
-    datamap: (OverridableStringField | OverridableFloatField | OverridableBoolField | OverridableIntField),
+    datamap: (
+        OverridableStringField
+        | OverridableFloatField
+        | OverridableBoolField
+        | OverridableIntField
+        | CompiledStaticField
+    ),
 ) -> str | float | bool | int:
     # Handle the case where datamap is an instance of OverridableStringField,
     # OverridableFloatField, OverridableBoolField, OverridableIntField
@@ -281,20 +390,16 @@ def handle_overridable_datamap(
     return datamap.static
 
 
-def handle_repeatable_model_datamap(
-    datamap: RepeatableDataMap,
-    field_name: str | None,
+def _resolve_repetition_scope(
+    datamap: RepeatableDataMap | CompiledRepeatableDataMap,
     ce_objs: list[ContractExpressVarObj],
-    value_overrides: dict[str, Any] | None = None,
-    fail_on_missing_variable: bool = False,
-    drop_null_leaves: bool = True,
-) -> list[dict[str, Any] | str | float | int | bool | list | None]:
-    if value_overrides is None:
-        value_overrides = {}
-
-    logger.debug(f"{datamap} is subclass of RepeatableDataMap")
-    result = []
-    repeat_count = int(
+    value_overrides: Mapping[str, Any],
+    fail_on_missing_variable: bool,
+    drop_null_leaves: bool,
+) -> tuple[int, Mapping[str, Any]]:
+    # Resolve repeat_count and lock repeated_variables in from the first repetition. Returns (repeat_count, overrides
+    # every repetition should be traversed with).
+    repeat_count = ce_value_as_int(
         lookup_straight_var(
             datamap.repeat_count,
             "repeat_count",
@@ -316,9 +421,11 @@ def handle_repeatable_model_datamap(
     if isinstance(repeated_variables, str):
         repeated_variables = [repeated_variables]
 
-    if "repeated_variables" in datamap.__class__.get_postprocessors():
+    if "repeated_variables" in _datamap_class(datamap).get_postprocessors():
         logger.debug("Post processor defined for repeated_variables")
-        repeated_variables = datamap.__class__.get_postprocessors()["repeated_variables"](repeated_variables, ce_objs)
+        repeated_variables = _call_post_processor(
+            _datamap_class(datamap).get_postprocessors()["repeated_variables"], repeated_variables, ce_objs
+        )
 
     logger.debug(f"Repeat variables with name after processing: {repeated_variables}")
 
@@ -338,38 +445,256 @@ def handle_repeatable_model_datamap(
     else:
         logger.debug("No repeat variable lookup")
 
+    return repeat_count, OverrideScope.layered(value_overrides, repeat_var_lookup)
+
+
+def _iter_repetitions(
+    repeated_pattern: Any,
+    field_name: str | None,
+    ce_objs: list[ContractExpressVarObj],
+    repeat_count: int,
+    value_overrides: Mapping[str, Any],
+    drop_null_leaves: bool,
+) -> Iterator[dict[str, Any] | str | float | int | bool | list | None]:
+    # Only one repetition is resolved at a time, so batch post-processors get one repetition's values per call
     for i in range(1, repeat_count + 1):
         logger.debug(f"Process obj repetition #{i}")
-        result.append(
+        with _batched_post_processing(ce_objs):
+            repetition = traverse_datamap(
+                repeated_pattern,
+                field_name,
+                ce_objs,
+                iteration=i,
+                value_overrides=value_overrides,
+                drop_null_leaves=drop_null_leaves,
+            )
+        yield repetition
+
+
+def handle_repeatable_model_datamap(
+    datamap: RepeatableDataMap | CompiledRepeatableDataMap,
+    field_name: str | None,
+    ce_objs: list[ContractExpressVarObj],
+    value_overrides: Mapping[str, Any] | None = None,
+    fail_on_missing_variable: bool = False,
+    drop_null_leaves: bool = True,
+    repetition_workers: int | None = None,
+) -> list[dict[str, Any] | str | float | int | bool | list | None]:
+    """
+    Resolve datamap.repeated_pattern once per repetition (1 to the resolved repeat_count), after first resolving
+    repeated_variables on the first repetition and locking them in as overrides for every repetition.
+
+    Args:
+        datamap: RepeatableDataMap
+        field_name: Field name we're resolving
+        ce_objs: List of ContractExpressVarObjs
+        value_overrides: Override values for variable names
+        fail_on_missing_variable: Raise VariableNotFoundError if repeat_count can't be found
+        drop_null_leaves: Passed through to traverse_datamap
+        repetition_workers: If > 1, resolve repetitions in a pool of up to this many forked worker processes.
+                            Output order and values are the same as sequential traversal. Only worth it for large
+                            repeat counts, and post-processors must not rely on side effects in the parent process.
+
+    Returns: List with one resolved object per repetition
+
+    """
+    if value_overrides is None:
+        value_overrides = {}
+
+    logger.debug(f"{datamap} is subclass of RepeatableDataMap")
+    repeat_count, repetition_overrides = _resolve_repetition_scope(
+        datamap, ce_objs, value_overrides, fail_on_missing_variable, drop_null_leaves
+    )
+
+    # From here on, every repetition only reads the datamap, ce_objs and overrides, so they can run in any order
+    if repetition_workers is not None and repetition_workers > 1 and repeat_count > 1:
+        if "fork" in multiprocessing.get_all_start_methods():
+            return _traverse_repetitions_in_worker_pool(
+                datamap.repeated_pattern,
+                field_name,
+                ce_objs,
+                repeat_count,
+                repetition_overrides,
+                drop_null_leaves,
+                repetition_workers,
+            )
+        logger.warning(
+            "handle_repeatable_model_datamap() - parallel repetitions need the fork start method, which isn't "
+            "available on this platform... traversing repetitions sequentially"
+        )
+
+    # Batch post-processors are applied once per field, to that field's values from every repetition
+    with _batched_post_processing(ce_objs):
+        return [
             traverse_datamap(
                 datamap.repeated_pattern,
                 field_name,
                 ce_objs,
                 iteration=i,
-                value_overrides={**value_overrides, **repeat_var_lookup},
+                value_overrides=repetition_overrides,
                 drop_null_leaves=drop_null_leaves,
             )
+            for i in range(1, repeat_count + 1)
+        ]
+
+
+def iter_repeatable_model_datamap(
+    datamap: RepeatableDataMap | CompiledRepeatableDataMap,
+    field_name: str | None,
+    ce_objs: list[ContractExpressVarObj],
+    value_overrides: Mapping[str, Any] | None = None,
+    fail_on_missing_variable: bool = False,
+    drop_null_leaves: bool = True,
+) -> Iterator[dict[str, Any] | str | float | int | bool | list | None]:
+    """
+    Streaming version of handle_repeatable_model_datamap(). repeat_count and repeated_variables are resolved when this
+    is called; each repetition is only resolved when the iterator reaches it, so no more than one is held at a time.
+
+    Args:
+        datamap: RepeatableDataMap
+        field_name: Field name we're resolving
+        ce_objs: List of ContractExpressVarObjs
+        value_overrides: Override values for variable names
+        fail_on_missing_variable: Raise VariableNotFoundError if repeat_count can't be found
+        drop_null_leaves: Passed through to traverse_datamap
+
+    Returns: Iterator yielding the same objects, in the same order, as handle_repeatable_model_datamap()
+
+    """
+    if not issubclass(_datamap_class(datamap), RepeatableDataMap):
+        msg = f"Expected a RepeatableDataMap, got {type(datamap)}"
+        raise ValueError(msg)
+
+    if value_overrides is None:
+        value_overrides = {}
+
+    repeat_count, repetition_overrides = _resolve_repetition_scope(
+        datamap, ce_objs, value_overrides, fail_on_missing_variable, drop_null_leaves
+    )
+    return _iter_repetitions(
+        datamap.repeated_pattern, field_name, ce_objs, repeat_count, repetition_overrides, drop_null_leaves
+    )
+
+
+def build_repetition_table(
+    datamap: RepeatableDataMap | CompiledRepeatableDataMap,
+    ce_objs: list[ContractExpressVarObj],
+    value_overrides: Mapping[str, Any] | None = None,
+    fail_on_missing_variable: bool = False,
+    drop_null_leaves: bool = True,
+) -> RepetitionTable:
+    """
+    Pivot every variable datamap.repeated_pattern reads into a RepetitionTable, with repeat_count and
+    repeated_variables resolved the same way handle_repeatable_model_datamap() resolves them.
+
+    Args:
+        datamap: RepeatableDataMap
+        ce_objs: List of ContractExpressVarObjs
+        value_overrides: Override values for variable names
+        fail_on_missing_variable: Raise VariableNotFoundError if repeat_count can't be found
+        drop_null_leaves: Passed through to traverse_datamap
+
+    Returns: RepetitionTable with a column per variable name in datamap.repeated_pattern
+
+    """
+    if not issubclass(_datamap_class(datamap), RepeatableDataMap):
+        msg = f"Expected a RepeatableDataMap, got {type(datamap)}"
+        raise ValueError(msg)
+
+    if value_overrides is None:
+        value_overrides = {}
+
+    repeat_count, repetition_overrides = _resolve_repetition_scope(
+        datamap, ce_objs, value_overrides, fail_on_missing_variable, drop_null_leaves
+    )
+    variable_names = collect_datamap_variable_names(
+        datamap.repeated_pattern, static_first_repetition_name_formatter=None
+    )
+    return RepetitionTable(
+        ce_objs,
+        variable_names,
+        repeat_count,
+        overrides={name: repetition_overrides[name] for name in variable_names if name in repetition_overrides},
+    )
+
+
+# Read-only traversal state for repetition worker processes. Set once per worker by _init_repetition_worker().
+_repetition_worker_state: dict[str, Any] = {}
+
+
+def _init_repetition_worker(
+    repeated_pattern: Any,
+    field_name: str | None,
+    ce_objs: list[ContractExpressVarObj],
+    value_overrides: Mapping[str, Any],
+    drop_null_leaves: bool,
+) -> None:
+    _repetition_worker_state.update(
+        repeated_pattern=repeated_pattern,
+        field_name=field_name,
+        ce_objs=ce_objs,
+        value_overrides=value_overrides,
+        drop_null_leaves=drop_null_leaves,
+    )
+
+
+def _traverse_repetition(iteration: int) -> dict[str, Any] | str | bool | float | int | list | None:
+    # Batch post-processors see one repetition's values per call in worker processes
+    with _batched_post_processing(_repetition_worker_state["ce_objs"]):
+        return traverse_datamap(
+            _repetition_worker_state["repeated_pattern"],
+            _repetition_worker_state["field_name"],
+            _repetition_worker_state["ce_objs"],
+            iteration=iteration,
+            value_overrides=_repetition_worker_state["value_overrides"],
+            drop_null_leaves=_repetition_worker_state["drop_null_leaves"],
+        )
+
+
+def _traverse_repetitions_in_worker_pool(
+    repeated_pattern: Any,
+    field_name: str | None,
+    ce_objs: list[ContractExpressVarObj],
+    repeat_count: int,
+    value_overrides: Mapping[str, Any],
+    drop_null_leaves: bool,
+    repetition_workers: int,
+) -> list[dict[str, Any] | str | float | int | bool | list | None]:
+    # Forked workers inherit the datamap, ce_objs and registered post-processors without pickling them. Only the
+    # repetition indices go out and the resolved objects come back, in order.
+    max_workers = min(repetition_workers, repeat_count)
+    logger.debug(f"Traverse {repeat_count} repetitions across {max_workers} worker processes")
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("fork"),
+        initializer=_init_repetition_worker,
+        initargs=(repeated_pattern, field_name, ce_objs, value_overrides, drop_null_leaves),
+    ) as executor:
+        return list(
+            executor.map(
+                _traverse_repetition,
+                range(1, repeat_count + 1),
+                chunksize=max(1, math.ceil(repeat_count / (max_workers * 4))),
+            )
         )
-    return result
 
 
 def handle_base_model_datamap(
-    datamap: BaseModel,
+    datamap: BaseModel | CompiledModel,
     field_name: str | None,
     ce_objs: list[ContractExpressVarObj],
     iteration: int | None = None,
-    value_overrides: dict[str, Any] | None = None,
+    value_overrides: Mapping[str, Any] | None = None,
     fail_on_missing_variable: bool = False,
     drop_null_leaves: bool = True,
 ) -> dict[str, Any]:
     # Handle the case where datamap is an instance of BaseModel
     logger.debug("Datamap is subclass of BaseModel")
     result = {}
-    for field_name, _ in datamap.__fields__.items():
+    for field_name, value in _datamap_fields(datamap):
         if field_name is not None:
             try:
                 logger.debug(f"\tHandle model attr {field_name}")
-                value = getattr(datamap, field_name)
                 logger.debug(f"\tHandle value: {value}")
                 resolved_val = traverse_datamap(
                     value,
@@ -392,19 +717,23 @@ def handle_base_model_datamap(
 
 
 def traverse_datamap(
-    datamap: dict[str, Any] | BaseModel | str | list | FieldPostProcessorModel,
+    datamap: dict[str, Any] | BaseModel | str | list | FieldPostProcessorModel | CompiledModel | CompiledStaticField,
     field_name: str | None,
     ce_objs: list[ContractExpressVarObj],
     post_processor: Callable | None = None,
     iteration: int | None = None,
-    value_overrides: dict[str, Any] | None = None,
+    value_overrides: Mapping[str, Any] | None = None,
     fail_on_missing_variable: bool = False,
     drop_null_leaves: bool = True,
+    repetition_workers: int | None = None,
 ) -> dict[str, Any] | str | bool | float | int | list | None:
     """
     Recursively traverse the CE-2-OCF datamap and generate the desired object.
 
     Args:
+        repetition_workers: If datamap is a RepeatableDataMap and this is > 1, resolve its repetitions across this many
+                            worker processes (see handle_repeatable_model_datamap()). Not passed down to nested
+                            datamaps.
         drop_null_leaves: If True, don't retain leaf keys where value is null / None
         fail_on_missing_variable: If set to true, if any CE variable is NOT found, the function will
                                 raise a ValueError. If set to False, you'll get a None. Helpful for debugging or
@@ -421,7 +750,8 @@ def traverse_datamap(
         datamap (Union[Dict[str, Any], BaseModel]): The current level of the datamap.
         field_name: Field name we're looking for.
         post_processor: A function to process the extracted value for field_name. Expects two args, raw value and the
-                        ce_json list
+                        ce_json list (or, for a batch_post_processor, a single item list of the raw value and the
+                        ce_json list)
         ce_objs (List[Any]): The list of objects to extract values from.
 
     Returns:
@@ -438,6 +768,10 @@ def traverse_datamap(
     if value_overrides is None:
         value_overrides = {}
 
+    # Where this field's batch post-processed values start, so they can be applied before post_processor sees them
+    pending = _pending_batch_values.get() if post_processor is not None else None
+    pending_start = len(pending) if pending is not None else 0
+
     result: str | bool | int | float | dict | list | None = None
 
     if isinstance(datamap, str):
@@ -475,6 +809,7 @@ def traverse_datamap(
             OverridableFloatField,
             OverridableBoolField,
             OverridableIntField,
+            CompiledStaticField,
         ),
     ):
         logger.debug(f"traverse_datamap() - datamap is instance of override type - type {type(datamap)}")
@@ -482,11 +817,11 @@ def traverse_datamap(
         if not isinstance(result, bool):
             result = str(result)
 
-    elif issubclass(datamap.__class__, FieldPostProcessorModel):
+    elif issubclass(_datamap_class(datamap), FieldPostProcessorModel):
         logger.debug(f"traverse_datamap() - datamap is subclass of FieldPostProcessorModel - type {type(datamap)}")
 
         # RepeatableDataMap is a sublass of FieldPostProcessorModel, so test for that here...
-        if issubclass(datamap.__class__, RepeatableDataMap):
+        if issubclass(_datamap_class(datamap), RepeatableDataMap):
             logger.debug(f"{datamap} is subclass of RepeatableDataMap")
             result = handle_repeatable_model_datamap(
                 datamap,  # typing has trouble interpreting the implications of issubclass... ignore warning
@@ -495,6 +830,7 @@ def traverse_datamap(
                 value_overrides=value_overrides,
                 fail_on_missing_variable=fail_on_missing_variable,
                 drop_null_leaves=drop_null_leaves,
+                repetition_workers=repetition_workers,
             )
 
         # And, if we're not looking at a RepeatableDataMap, use FieldPostProcessorModel regular logic
@@ -508,7 +844,7 @@ def traverse_datamap(
                 fail_on_missing_variable=fail_on_missing_variable,
             )
 
-    elif issubclass(datamap.__class__, BaseModel):
+    elif issubclass(_datamap_class(datamap), BaseModel):
         logger.debug(f"traverse_datamap() - datamap is subclass of BaseModel - type {type(datamap)}")
         result = handle_base_model_datamap(
             datamap,
@@ -529,7 +865,9 @@ def traverse_datamap(
         logger.debug(
             f"\tXXX - Datamap with name {field_name} has a postprocessor for this field... with initial value: {result}"
         )
-        result = post_processor(result, ce_objs)
+        if pending is not None and len(pending) > pending_start:
+            _apply_batch_post_processors(pending, ce_objs, start=pending_start)
+        result = _call_post_processor(post_processor, result, ce_objs)
         logger.debug(f"Post-processed value: {result}")
 
     if result == {}:
@@ -21,7 +21,9 @@ class FieldPostProcessorModel(BaseModel):
     @classmethod
     def register_handlers(cls, handlers: dict[str, Callable]) -> None:
         """
-        Register field postprocessors that will be applied after model initialization.
+        Register field postprocessors that will be applied after model initialization. Handlers are called with
+        (value, ce_jsons), or - if decorated with batch_post_processor - with (values, ce_jsons) for every value of the
+        field in a repeatable datamap at once.
 
         Parameters:
         -----------
@@ -39,6 +41,27 @@ class FieldPostProcessorModel(BaseModel):
         return cls._field_postprocessors
 
 
+def batch_post_processor(func: Callable) -> Callable:
+    """
+    Mark a field postprocessor as a batch postprocessor. Instead of (value, ce_jsons), it's called with
+    (values, ce_jsons) and must return a list with one processed value per value, in the same order.
+
+    Within a RepeatableDataMap, the field's values from every repetition are passed in one call. Anywhere else, values
+    is a single item list.
+
+    Args:
+        func: Postprocessor with signature (values: list, ce_jsons) -> list
+
+    Returns: func, marked as a batch postprocessor
+    """
+    func.batch_post_processor = True  # type: ignore[attr-defined]
+    return func
+
+
+def is_batch_post_processor(func: Callable) -> bool:
+    return getattr(func, "batch_post_processor", False) is True
+
+
 class OverridableStringField(BaseModel):
     static: str
 
@@ -1,7 +1,8 @@
 import json
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Union
 
+from CE2OCF.datamap.compiled import CompiledModel, load_compiled_datamap
 from CE2OCF.ocf.datamaps import (
     IssuerDataMap,
     RepeatableFullyVestedStockIssuanceDataMap,
@@ -68,35 +69,50 @@ def load_single_trigger_definitions(
 ########################################################################################################################
 # Datamap Loaders
 ########################################################################################################################
-def load_ce_to_ocf_issuer_datamap(source_json: Optional[Path] = None) -> IssuerDataMap:
+def load_ce_to_ocf_issuer_datamap(
+    source_json: Optional[Path] = None,
+    compiled: bool = False,
+) -> Union[IssuerDataMap, CompiledModel]:
     if source_json is None:
         source_json = DEFAULT_CE_TO_OCF_ISSUER_ONLY_PATH
+    if compiled:
+        return load_compiled_datamap(source_json, IssuerDataMap)
     return IssuerDataMap.parse_file(source_json)
 
 
-def load_ce_to_ocf_stock_class_datamap(source_json: Optional[Path] = None) -> StockClassDataMap:
+def load_ce_to_ocf_stock_class_datamap(
+    source_json: Optional[Path] = None,
+    compiled: bool = False,
+) -> Union[StockClassDataMap, CompiledModel]:
     """
     Loads a StockClassDataMap from a json configuration file at source_json. Defaults to the defaults in
     config/defaults. WARNING - DEFAULT IS FOR COMMON
 
     Args: source_json: son configuration file mapping ocf fields to ce json data fields. Defaults to
     DEFAULT_CE_TO_OCF_COMMON_STOCK_CLASS_ONLY_PATH
+    compiled: If True, skip pydantic and load the datamap as a CompiledModel (see load_compiled_datamap())
 
     Returns: StockClassDataMap
 
     """
     if source_json is None:
         source_json = DEFAULT_CE_TO_OCF_COMMON_STOCK_CLASS_ONLY_PATH
+    if compiled:
+        return load_compiled_datamap(source_json, StockClassDataMap)
     return StockClassDataMap.parse_file(source_json)
 
 
-def load_ce_to_ocf_stock_legend_datamap(source_json: Optional[Path] = None) -> StockLegendDataMap:
+def load_ce_to_ocf_stock_legend_datamap(
+    source_json: Optional[Path] = None,
+    compiled: bool = False,
+) -> Union[StockLegendDataMap, CompiledModel]:
     """
     Loads a StockLegendDataMap from a json configuration file at source_json. Defaults to the defaults in
     config/defaults. WARNING - DEFAULT IS FOR GUNDERSON COMMON LEGENDS
 
     Args: source_json: Json configuration file mapping ocf fields to ce json data fields. Defaults to
     DEFAULT_CE_TO_OCF_DATAMAP_COMMON_STOCK_LEGEND_ONLY_PATH
+    compiled: If True, skip pydantic and load the datamap as a CompiledModel (see load_compiled_datamap())
 
     Returns: StockLegendDataMap
 
@@ -104,16 +120,22 @@ def load_ce_to_ocf_stock_legend_datamap(source_json: Optional[Path] = None) -> S
     if source_json is None:
         source_json = DEFAULT_CE_TO_OCF_DATAMAP_COMMON_STOCK_LEGEND_ONLY_PATH
 
+    if compiled:
+        return load_compiled_datamap(source_json, StockLegendDataMap)
     return StockLegendDataMap.parse_file(source_json)
 
 
-def load_ce_to_ocf_stock_plan_datamap(source_json: Optional[Path] = None) -> StockPlanDataMap:
+def load_ce_to_ocf_stock_plan_datamap(
+    source_json: Optional[Path] = None,
+    compiled: bool = False,
+) -> Union[StockPlanDataMap, CompiledModel]:
     """
     Loads a StockPlanDataMap from a json configuration file at source_json. Defaults to the default datamap in
     config/defaults.
 
     :param source_json:Json configuration file mapping ocf fields to ce json data fields. Defaults to
     DEFAULT_CE_TO_OCF_STOCK_PLAN_ONLY_PATH
+    :param compiled: If True, skip pydantic and load the datamap as a CompiledModel (see load_compiled_datamap())
 
     :return: StockPlanDataMap
     """
@@ -121,16 +143,22 @@ def load_ce_to_ocf_stock_plan_datamap(source_json: Optional[Path] = None) -> Sto
     if source_json is None:
         source_json = DEFAULT_CE_TO_OCF_STOCK_PLAN_ONLY_PATH
 
+    if compiled:
+        return load_compiled_datamap(source_json, StockPlanDataMap)
     return StockPlanDataMap.parse_file(source_json)
 
 
-def load_ce_to_ocf_stakeholder_datamap(source_json: Optional[Path] = None) -> RepeatableStockholderDataMap:
+def load_ce_to_ocf_stakeholder_datamap(
+    source_json: Optional[Path] = None,
+    compiled: bool = False,
+) -> Union[RepeatableStockholderDataMap, CompiledModel]:
     """
     Loads a RepeatableStockholderDataMap from a json configuration file at source_json. Defaults to the defaults in
     config/defaults.
 
     Args: source_json: Json configuration file mapping ocf fields to ce json data fields. Defaults to
     DEFAULT_CE_TO_OCF_STOCKHOLDERS_ONLY_PATH
+    compiled: If True, skip pydantic and load the datamap as a CompiledModel (see load_compiled_datamap())
 
     Returns: RepeatableStockholderDataMap
 
@@ -138,48 +166,59 @@ def load_ce_to_ocf_stakeholder_datamap(source_json: Optional[Path] = None) -> Re
     if source_json is None:
         source_json = DEFAULT_CE_TO_OCF_STOCKHOLDERS_ONLY_PATH
 
+    if compiled:
+        return load_compiled_datamap(source_json, RepeatableStockholderDataMap)
     return RepeatableStockholderDataMap.parse_file(source_json)
 
 
 def load_ce_to_ocf_vesting_issuances_datamap(
     source_json: Optional[Path] = None,
-) -> RepeatableVestingStockIssuanceDataMap:
+    compiled: bool = False,
+) -> Union[RepeatableVestingStockIssuanceDataMap, CompiledModel]:
     """
     Loads a RepeatableVestingStockIssuanceDataMap from a json configuration file at source_json. Defaults to
     the defaults in config/defaults. Meant for use with issuances that can vest. Typically founder common.
 
     Args: source_json: Json configuration file mapping ocf fields to ce json data fields. Defaults to
     DEFAULT_CE_TO_OCF_COMMON_STOCK_ISSUANCE_ONLY_PATH
+    compiled: If True, skip pydantic and load the datamap as a CompiledModel (see load_compiled_datamap())
 
     Returns: RepeatableVestingStockIssuanceDataMap
     """
     if source_json is None:
         source_json = DEFAULT_CE_TO_OCF_COMMON_STOCK_ISSUANCE_ONLY_PATH
 
+    if compiled:
+        return load_compiled_datamap(source_json, RepeatableVestingStockIssuanceDataMap)
     return RepeatableVestingStockIssuanceDataMap.parse_file(source_json)
 
 
 def load_ce_to_ocf_vested_issuances_datamap(
     source_json: Optional[Path] = None,
-) -> RepeatableFullyVestedStockIssuanceDataMap:
+    compiled: bool = False,
+) -> Union[RepeatableFullyVestedStockIssuanceDataMap, CompiledModel]:
     """
     Loads a RepeatableFullyVestedStockIssuanceDataMap from a json configuration file at source_json. Defaults to
         the defaults in config/defaults. Meant for use with issuances that don't vest. Typically, founder preferred.
 
     Args: source_json: Json configuration file mapping ocf fields to ce json data fields. Defaults to
     DEFAULT_CE_TO_OCF_PREFERRED_STOCK_ISSUANCE_ONLY_PATH
+    compiled: If True, skip pydantic and load the datamap as a CompiledModel (see load_compiled_datamap())
 
     Returns: RepeatableFullyVestedStockIssuanceDataMap
     """
     if source_json is None:
         source_json = DEFAULT_CE_TO_OCF_PREFERRED_STOCK_ISSUANCE_ONLY_PATH
 
+    if compiled:
+        return load_compiled_datamap(source_json, RepeatableFullyVestedStockIssuanceDataMap)
     return RepeatableFullyVestedStockIssuanceDataMap.parse_file(source_json)
 
 
 def load_vesting_schedule_driving_enums_datamap(
     source_jsons: Optional[Path] = None,
-) -> RepeatableVestingScheduleDriversDataMap:
+    compiled: bool = False,
+) -> Union[RepeatableVestingScheduleDriversDataMap, CompiledModel]:
     """
     Loads a RepeatableVestingScheduleDriversDataMap from data map in source_jsons path. If none provided, use the
     default datamap in DEFAULT_CE_ENUMS_TO_OCF_VESTING_SCHEDULE_ONLY_PATH.
@@ -187,17 +226,21 @@ def load_vesting_schedule_driving_enums_datamap(
     Args:
         source_jsons: Json configuration file mapping ocf fields to ce json data fields. Defaults to
             DEFAULT_CE_ENUMS_TO_OCF_VESTING_SCHEDULE_ONLY_PATH
+        compiled: If True, skip pydantic and load the datamap as a CompiledModel (see load_compiled_datamap())
 
     Returns: RepeatableVestingScheduleDriversDataMap
     """
     if source_jsons is None:
         source_jsons = DEFAULT_CE_ENUMS_TO_OCF_VESTING_SCHEDULE_ONLY_PATH
+    if compiled:
+        return load_compiled_datamap(source_jsons, RepeatableVestingScheduleDriversDataMap)
     return RepeatableVestingScheduleDriversDataMap.parse_file(source_jsons)
 
 
 def load_vesting_events_driving_enums_datamap(
     source_jsons: Optional[Path] = None,
-) -> RepeatableVestingEventDriversDataMap:
+    compiled: bool = False,
+) -> Union[RepeatableVestingEventDriversDataMap, CompiledModel]:
     """
     Loads a RepeatableVestingEventDriversDataMap from data map in source_jsons path. If none provided, use the
     default datamap in DEFAULT_CE_ENUMS_TO_OCF_VESTING_SCHEDULE_ONLY_PATH.
@@ -205,10 +248,13 @@ def load_vesting_events_driving_enums_datamap(
     Args:
         source_jsons: Json configuration file mapping ocf fields to ce json data fields. Defaults to
             DEFAULT_CE_ENUMS_TO_OCF_VESTING_EVENTS_ONLY_PATH
+        compiled: If True, skip pydantic and load the datamap as a CompiledModel (see load_compiled_datamap())
 
     Returns: RepeatableVestingEventDriversDataMap
 
     """
     if source_jsons is None:
         source_jsons = DEFAULT_CE_ENUMS_TO_OCF_VESTING_EVENTS_ONLY_PATH
+    if compiled:
+        return load_compiled_datamap(source_jsons, RepeatableVestingEventDriversDataMap)
     return RepeatableVestingEventDriversDataMap.parse_file(source_jsons)
@@ -0,0 +1,64 @@
+"""
+Value overrides get layered on top of each other on the way down to the crawler - global overrides, then per-object
+overrides, then the parser version, then each repetition's locked-in repeated_variables. Rather than merging a new
+dict at every level, OverrideScope chains the layers together and looks names up through them, so adding a layer
+doesn't copy anything.
+"""
+from __future__ import annotations
+
+from collections import ChainMap
+from collections.abc import Mapping
+from typing import Any, Callable
+
+
+class OverrideScope(ChainMap):
+    """
+    Read-through stack of override mappings. Later layers win, just like {**lower, **higher}, but the layers are
+    referenced rather than copied, so callers must not mutate a mapping after handing it to a scope.
+    """
+
+    @classmethod
+    def layered(cls, *layers: Mapping[str, Any] | None) -> OverrideScope:
+        """
+        Build a scope from layers in increasing order of precedence. None / empty layers are skipped and the layers
+        of any OverrideScope (or other ChainMap) passed in are reused rather than nested.
+
+        Args:
+            *layers: Override mappings, lowest precedence first
+
+        Returns: OverrideScope
+
+        """
+        maps: list[Mapping[str, Any]] = []
+        for layer in layers:
+            if not layer:
+                continue
+            if isinstance(layer, ChainMap):
+                maps[:0] = [layer_map for layer_map in layer.maps if layer_map]
+            else:
+                maps.insert(0, layer)
+        return cls(*maps)
+
+    def push(self, overrides: Mapping[str, Any] | None) -> OverrideScope:
+        """
+        Returns: New scope with overrides on top of this one. This scope is left unchanged.
+        """
+        if not overrides:
+            return self
+        return self.layered(self, overrides)
+
+    def resolve(self, var_name: str, fallback: Callable[[], Any]) -> Any:
+        """
+        Override-first lookup - the override value for var_name if any layer has one, otherwise fallback().
+
+        Args:
+            var_name: Variable name
+            fallback: Called to look the value up elsewhere (e.g. the CE jsons) when there's no override
+
+        Returns: Resolved value
+
+        """
+        for layer in self.maps:
+            if var_name in layer:
+                return layer[var_name]
+        return fallback()
@@ -1,10 +1,14 @@
-import datetime
 import logging
 from pathlib import Path
-from typing import Callable, Literal, Optional
+from types import MappingProxyType
+from typing import Callable, Iterator, Literal, Mapping, Optional
 
 from CE2OCF import __version__ as version
-from CE2OCF.datamap.crawler import traverse_datamap
+from CE2OCF.ce.datasheet import ce_value_as_date
+from CE2OCF.datamap.crawler import (
+    iter_repeatable_model_datamap,
+    traverse_datamap,
+)
 from CE2OCF.datamap.loaders import (
     DEFAULT_CE_TO_OCF_DATAMAP_PREFERRED_STOCK_LEGEND_ONLY_PATH,
     DEFAULT_CE_TO_OCF_PREFERRED_STOCK_CLASS_ONLY_PATH,
@@ -18,6 +22,7 @@ from CE2OCF.datamap.loaders import (
     load_vesting_events_driving_enums_datamap,
     load_vesting_schedule_driving_enums_datamap,
 )
+from CE2OCF.datamap.overrides import OverrideScope
 from CE2OCF.ocf.datamaps import (
     FullyVestedStockIssuanceDataMap,
     IssuerDataMap,
@@ -40,14 +45,18 @@ from CE2OCF.types.exceptions import VariableNotFoundError
 
 logger = logging.getLogger(__name__)
 
+# Bottom layer of every parser's value overrides
+PARSER_VERSION_OVERRIDES = MappingProxyType({"PARSER_VERSION": version})
+
 
 def parse_ocf_issuer_from_ce_jsons(
     ce_jsons: list[ContractExpressVarObj],
     post_processors: Optional[dict[str, Callable]] = None,
     fail_on_missing_variable: bool = False,
     custom_datamap_path: Optional[Path] = None,
-    value_overrides: Optional[dict[str, str]] = None,
+    value_overrides: Optional[Mapping[str, str]] = None,
     clear_old_post_processors: bool = True,
+    use_compiled_datamap: bool = False,
 ) -> dict:
     """
     By default, loads our default ce to ocf issuer datamap (though you can provide a path your own JSON datamap) and
@@ -63,6 +72,7 @@ def parse_ocf_issuer_from_ce_jsons(
         value_overrides: If provided, pass to underlying datamap crawler to override specified lookup values in dict
         clear_old_post_processors: If True, unregister all handlers for IssuerDataMap before registering any provided
                                    as post_processors
+        use_compiled_datamap: If True, load datamaps with load_compiled_datamap() instead of pydantic
 
     Returns: Valid ocf issuer json
 
@@ -77,12 +87,12 @@ def parse_ocf_issuer_from_ce_jsons(
     if value_overrides is None:
         value_overrides = {}
 
-    issuer_datamap = load_ce_to_ocf_issuer_datamap(custom_datamap_path)
+    issuer_datamap = load_ce_to_ocf_issuer_datamap(custom_datamap_path, compiled=use_compiled_datamap)
     parsed_issuer_ocf = traverse_datamap(
         issuer_datamap,
         None,
         ce_jsons,
-        value_overrides={"PARSER_VERSION": version, **value_overrides},
+        value_overrides=OverrideScope.layered(PARSER_VERSION_OVERRIDES, value_overrides),
         fail_on_missing_variable=fail_on_missing_variable,
     )
 
@@ -96,8 +106,9 @@ def parse_stock_plan_from_ce_jsons(
     post_processors: Optional[dict[str, Callable]] = None,
     fail_on_missing_variable: bool = False,
     custom_datamap_path: Optional[Path] = None,
-    value_overrides: Optional[dict[str, str]] = None,
+    value_overrides: Optional[Mapping[str, str]] = None,
     clear_old_post_processors: bool = True,
+    use_compiled_datamap: bool = False,
 ) -> dict:
     """
      By default, loads our default ce to ocf stock plan datamap (though you can provide a path your own JSON datamap)
@@ -109,6 +120,7 @@ def parse_stock_plan_from_ce_jsons(
     :param custom_datamap_path:
     :param value_overrides:
     :param clear_old_post_processors:
+    :param use_compiled_datamap: If True, load datamaps with load_compiled_datamap() instead of pydantic
     :return: Valid OCF stock plan
     """
 
@@ -121,13 +133,13 @@ def parse_stock_plan_from_ce_jsons(
     if value_overrides is None:
         value_overrides = {}
 
-    stock_plan_datamap = load_ce_to_ocf_stock_plan_datamap(custom_datamap_path)
+    stock_plan_datamap = load_ce_to_ocf_stock_plan_datamap(custom_datamap_path, compiled=use_compiled_datamap)
 
     stock_plan_ocf = traverse_datamap(
         stock_plan_datamap,
         None,
         ce_jsons,
-        value_overrides={"PARSER_VERSION": version, **value_overrides},
+        value_overrides=OverrideScope.layered(PARSER_VERSION_OVERRIDES, value_overrides),
         fail_on_missing_variable=fail_on_missing_variable,
     )
 
@@ -142,8 +154,9 @@ def parse_ocf_stock_class_from_ce_jsons(
     post_processors: Optional[dict[str, Callable]] = None,
     fail_on_missing_variable: bool = False,
     custom_datamap_path: Optional[Path] = None,
-    value_overrides: Optional[dict[str, str]] = None,
+    value_overrides: Optional[Mapping[str, str]] = None,
     clear_old_post_processors: bool = True,
+    use_compiled_datamap: bool = False,
 ) -> dict:
     """
     By default, loads our default ce to ocf common stock class datamap (though you can provide a path your own JSON
@@ -160,6 +173,7 @@ def parse_ocf_stock_class_from_ce_jsons(
         custom_datamap_path: If you want to use a custom datamap, provide path to json file
         value_overrides: If provided, inject this into datamapper and look up values here first. If found, don't
                          check CE
+        use_compiled_datamap: If True, load datamaps with load_compiled_datamap() instead of pydantic
 
     Returns: Valid ocf stock class json
     """
@@ -174,10 +188,11 @@ def parse_ocf_stock_class_from_ce_jsons(
         value_overrides = {}
 
     if common_or_preferred == "COMMON":
-        stock_class_datamap = load_ce_to_ocf_stock_class_datamap(custom_datamap_path)
+        stock_class_datamap = load_ce_to_ocf_stock_class_datamap(custom_datamap_path, compiled=use_compiled_datamap)
     elif common_or_preferred == "PREFERRED":
         stock_class_datamap = load_ce_to_ocf_stock_class_datamap(
-            custom_datamap_path if custom_datamap_path else DEFAULT_CE_TO_OCF_PREFERRED_STOCK_CLASS_ONLY_PATH
+            custom_datamap_path if custom_datamap_path else DEFAULT_CE_TO_OCF_PREFERRED_STOCK_CLASS_ONLY_PATH,
+            compiled=use_compiled_datamap,
         )
     else:
         msg = "We only support COMMON or PREFERRED datamaps"
@@ -187,7 +202,7 @@ def parse_ocf_stock_class_from_ce_jsons(
         stock_class_datamap,
         None,
         ce_jsons,
-        value_overrides={"PARSER_VERSION": version, **value_overrides},
+        value_overrides=OverrideScope.layered(PARSER_VERSION_OVERRIDES, value_overrides),
         fail_on_missing_variable=fail_on_missing_variable,
     )
 
@@ -202,8 +217,9 @@ def parse_ocf_stock_legend_from_ce_jsons(
     post_processors: Optional[dict[str, Callable]] = None,
     fail_on_missing_variable: bool = False,
     custom_datamap_path: Optional[Path] = None,
-    value_overrides: Optional[dict[str, str]] = None,
+    value_overrides: Optional[Mapping[str, str]] = None,
     clear_old_post_processors: bool = True,
+    use_compiled_datamap: bool = False,
 ) -> dict:
     """
     By default, loads our default ce to ocf common stock legend datamap (though you can provide a path your own JSON
@@ -218,6 +234,7 @@ def parse_ocf_stock_legend_from_ce_jsons(
         fail_on_missing_variable: Set to True if you want to get an error if any data fields are missing.
         custom_datamap_path: If you want to use a custom datamap, provide path to json file
         value_overrides: If provided, inject this variable value lookup into parser which will override anything in CE
+        use_compiled_datamap: If True, load datamaps with load_compiled_datamap() instead of pydantic
 
     Returns: Valid ocf stock legend json
     """
@@ -232,10 +249,11 @@ def parse_ocf_stock_legend_from_ce_jsons(
         value_overrides = {}
 
     if common_or_preferred == "COMMON":
-        stock_legend_datamap = load_ce_to_ocf_stock_legend_datamap(custom_datamap_path)
+        stock_legend_datamap = load_ce_to_ocf_stock_legend_datamap(custom_datamap_path, compiled=use_compiled_datamap)
     elif common_or_preferred == "PREFERRED":
         stock_legend_datamap = load_ce_to_ocf_stock_legend_datamap(
-            custom_datamap_path if custom_datamap_path else DEFAULT_CE_TO_OCF_DATAMAP_PREFERRED_STOCK_LEGEND_ONLY_PATH
+            custom_datamap_path if custom_datamap_path else DEFAULT_CE_TO_OCF_DATAMAP_PREFERRED_STOCK_LEGEND_ONLY_PATH,
+            compiled=use_compiled_datamap,
         )
     else:
         msg = "We only support COMMON or PREFERRED datamaps"
@@ -245,7 +263,7 @@ def parse_ocf_stock_legend_from_ce_jsons(
         stock_legend_datamap,
         None,
         ce_jsons,
-        value_overrides={"PARSER_VERSION": version, **value_overrides},
+        value_overrides=OverrideScope.layered(PARSER_VERSION_OVERRIDES, value_overrides),
         fail_on_missing_variable=fail_on_missing_variable,
     )
 
@@ -254,13 +272,30 @@ def parse_ocf_stock_legend_from_ce_jsons(
     return ocf_stock_legend
 
 
+def _prepare_stakeholder_datamap(
+    post_processors: Optional[dict[str, Callable]],
+    clear_old_post_processors: bool,
+    custom_datamap_path: Optional[Path],
+    use_compiled_datamap: bool,
+):
+    if clear_old_post_processors:
+        RepeatableStockholderDataMap.clear_handlers()
+
+    if post_processors is not None:
+        RepeatableStockholderDataMap.register_handlers(post_processors)
+
+    return load_ce_to_ocf_stakeholder_datamap(custom_datamap_path, compiled=use_compiled_datamap)
+
+
 def parse_ocf_stakeholders_from_ce_json(
     ce_jsons: list[ContractExpressVarObj],
     post_processors: Optional[dict[str, Callable]] = None,
     clear_old_post_processors: bool = True,
     fail_on_missing_variable: bool = False,
     custom_datamap_path: Optional[Path] = None,
-    value_overrides: Optional[dict[str, str]] = None,
+    value_overrides: Optional[Mapping[str, str]] = None,
+    repetition_workers: Optional[int] = None,
+    use_compiled_datamap: bool = False,
 ) -> list[dict]:
     """
     By default, loads our default ce to ocf stakeholder datamap (though you can provide a path your own JSON datamap)
@@ -277,27 +312,26 @@ def parse_ocf_stakeholders_from_ce_json(
         fail_on_missing_variable: Set to True if you want to get an error if any data fields are missing.
         custom_datamap_path: If you want to use a custom datamap, provide path to json file
         value_overrides: If provided, inject this variable value lookup into parser which will override anything in CE
+        repetition_workers: If > 1, resolve repetitions across this many worker processes (see traverse_datamap())
+        use_compiled_datamap: If True, load datamaps with load_compiled_datamap() instead of pydantic
 
     Returns: List of valid ocf stakeholder objects
 
     """
-    if clear_old_post_processors:
-        RepeatableStockholderDataMap.clear_handlers()
-
-    if post_processors is not None:
-        RepeatableStockholderDataMap.register_handlers(post_processors)
+    stakeholder_datamap = _prepare_stakeholder_datamap(
+        post_processors, clear_old_post_processors, custom_datamap_path, use_compiled_datamap
+    )
 
     if value_overrides is None:
         value_overrides = {}
 
-    stakeholder_datamap = load_ce_to_ocf_stakeholder_datamap(custom_datamap_path)
-
     stockholders_ocf = traverse_datamap(
         stakeholder_datamap,
         None,
         ce_jsons,
-        value_overrides={"PARSER_VERSION": version, **value_overrides},
+        value_overrides=OverrideScope.layered(PARSER_VERSION_OVERRIDES, value_overrides),
         fail_on_missing_variable=fail_on_missing_variable,
+        repetition_workers=repetition_workers,
     )
 
     # TODO - improve type checking to check for actual target OCF schema
@@ -307,6 +341,88 @@ def parse_ocf_stakeholders_from_ce_json(
     return stockholders_ocf
 
 
+def iter_ocf_stakeholders_from_ce_json(
+    ce_jsons: list[ContractExpressVarObj],
+    post_processors: Optional[dict[str, Callable]] = None,
+    clear_old_post_processors: bool = True,
+    fail_on_missing_variable: bool = False,
+    custom_datamap_path: Optional[Path] = None,
+    value_overrides: Optional[Mapping[str, str]] = None,
+    use_compiled_datamap: bool = False,
+) -> Iterator[dict]:
+    """
+    Streaming version of parse_ocf_stakeholders_from_ce_json() - yields one stakeholder per repetition as it's
+    resolved instead of building the whole list. Post processors are registered when this is called, so don't
+    register others on RepeatableStockholderDataMap until the iterator is exhausted.
+
+    Args:
+        ce_jsons: List of CE Jsons matching schema defined in ContractExpressVarObj
+        post_processors (optional): See parse_ocf_stakeholders_from_ce_json()
+        clear_old_post_processors: See parse_ocf_stakeholders_from_ce_json()
+        fail_on_missing_variable: Set to True if you want to get an error if any data fields are missing.
+        custom_datamap_path: If you want to use a custom datamap, provide path to json file
+        value_overrides: If provided, inject this variable value lookup into parser which will override anything in CE
+        use_compiled_datamap: If True, load datamaps with load_compiled_datamap() instead of pydantic
+
+    Returns: Iterator over valid ocf stakeholder objects
+
+    """
+    stakeholder_datamap = _prepare_stakeholder_datamap(
+        post_processors, clear_old_post_processors, custom_datamap_path, use_compiled_datamap
+    )
+
+    if value_overrides is None:
+        value_overrides = {}
+
+    return iter_repeatable_model_datamap(  # type: ignore
+        stakeholder_datamap,
+        None,
+        ce_jsons,
+        value_overrides=OverrideScope.layered(PARSER_VERSION_OVERRIDES, value_overrides),
+        fail_on_missing_variable=fail_on_missing_variable,
+    )
+
+
+def _drop_fully_vested_vest_term_id(val, ce_jsons) -> str:
+    """
+    Raise a VariableNotFound exception if fully vested which will cause
+    the key to be dropped entirely.
+
+    Args:
+        val: Variable name
+        ce_jsons: List of ce jsons
+
+    Returns: Original value or, if fully vested, throw an error
+
+    """
+    if val.split("/")[0] == "Fully Vested":
+        raise VariableNotFoundError
+    else:
+        return val
+
+
+def _register_stock_issuance_handlers(
+    common_post_processors: Optional[dict[str, Callable]],
+    preferred_post_processors: Optional[dict[str, Callable]],
+    clear_old_post_processors: bool,
+):
+    if clear_old_post_processors:
+        VestingStockIssuanceDataMap.clear_handlers()
+        FullyVestedStockIssuanceDataMap.clear_handlers()
+
+    if common_post_processors is not None:
+        VestingStockIssuanceDataMap.register_handlers(common_post_processors)
+    else:
+        VestingStockIssuanceDataMap.register_handlers(
+            {
+                "vesting_terms_id": _drop_fully_vested_vest_term_id,
+            }
+        )
+
+    if preferred_post_processors is not None:
+        FullyVestedStockIssuanceDataMap.register_handlers(preferred_post_processors)
+
+
 def parse_ocf_stock_issuances_from_ce_json(
     ce_jsons: list[ContractExpressVarObj],
     fail_on_missing_variable: bool = False,
@@ -314,9 +430,11 @@ def parse_ocf_stock_issuances_from_ce_json(
     preferred_post_processors: Optional[dict[str, Callable]] = None,
     common_datamap_path: Optional[Path] = None,
     preferred_datamap_path: Optional[Path] = None,
-    common_value_overrides: Optional[dict[str, str]] = None,
-    preferred_value_overrides: Optional[dict[str, str]] = None,
+    common_value_overrides: Optional[Mapping[str, str]] = None,
+    preferred_value_overrides: Optional[Mapping[str, str]] = None,
     clear_old_post_processors: bool = True,
+    repetition_workers: Optional[int] = None,
+    use_compiled_datamap: bool = False,
 ) -> list[dict]:
     """
 
@@ -330,82 +448,110 @@ def parse_ocf_stock_issuances_from_ce_json(
         preferred_datamap_path:
         preferred_value_overrides:
         clear_old_post_processors:
+        repetition_workers:
+        use_compiled_datamap: If True, load datamaps with load_compiled_datamap() instead of pydantic
     Returns:
 
     """
 
-    def drop_fully_vested_vest_term_id(val, ce_jsons) -> str:
-        """
-        Raise a VariableNotFound exception if fully vested which will cause
-        the key to be dropped entirely.
-
-        Args:
-            val: Variable name
-            ce_jsons: List of ce jsons
-
-        Returns: Original value or, if fully vested, throw an error
-
-        """
-        if val.split("/")[0] == "Fully Vested":
-            raise VariableNotFoundError
-        else:
-            return val
-
     if common_value_overrides is None:
         common_value_overrides = {}
 
     if preferred_value_overrides is None:
         preferred_value_overrides = {}
 
-    if clear_old_post_processors:
-        VestingStockIssuanceDataMap.clear_handlers()
-        FullyVestedStockIssuanceDataMap.clear_handlers()
-
-    if common_post_processors is not None:
-        VestingStockIssuanceDataMap.register_handlers(common_post_processors)
-    else:
-        VestingStockIssuanceDataMap.register_handlers(
-            {
-                "vesting_terms_id": drop_fully_vested_vest_term_id,
-            }
-        )
-
-    if preferred_post_processors is not None:
-        FullyVestedStockIssuanceDataMap.register_handlers(preferred_post_processors)
+    _register_stock_issuance_handlers(common_post_processors, preferred_post_processors, clear_old_post_processors)
 
-    common_datamap = load_ce_to_ocf_vesting_issuances_datamap(common_datamap_path)
+    common_datamap = load_ce_to_ocf_vesting_issuances_datamap(common_datamap_path, compiled=use_compiled_datamap)
     common_issuances = traverse_datamap(
         common_datamap,
         None,
         ce_jsons,
-        value_overrides={"PARSER_VERSION": version, **common_value_overrides},
+        value_overrides=OverrideScope.layered(PARSER_VERSION_OVERRIDES, common_value_overrides),
         fail_on_missing_variable=fail_on_missing_variable,
+        repetition_workers=repetition_workers,
     )
     # TODO - improve type checking to check for actual target OCF schema
     assert isinstance(
         common_issuances, list
     ), f"Expected common_issuances to be list of dicts, got {type(common_issuances)}"
 
-    preferred_datamap = load_ce_to_ocf_vested_issuances_datamap(preferred_datamap_path)
+    preferred_datamap = load_ce_to_ocf_vested_issuances_datamap(preferred_datamap_path, compiled=use_compiled_datamap)
     pref_issuances = traverse_datamap(
         preferred_datamap,
         None,
         ce_jsons,
-        value_overrides={"PARSER_VERSION": version, **preferred_value_overrides},
+        value_overrides=OverrideScope.layered(PARSER_VERSION_OVERRIDES, preferred_value_overrides),
         fail_on_missing_variable=fail_on_missing_variable,
+        repetition_workers=repetition_workers,
     )
     assert isinstance(pref_issuances, list), f"Expected pref_issuances to be list of dicts, got {type(pref_issuances)}"
 
     return [*common_issuances, *pref_issuances]
 
 
+def iter_ocf_stock_issuances_from_ce_json(
+    ce_jsons: list[ContractExpressVarObj],
+    fail_on_missing_variable: bool = False,
+    common_post_processors: Optional[dict[str, Callable]] = None,
+    preferred_post_processors: Optional[dict[str, Callable]] = None,
+    common_datamap_path: Optional[Path] = None,
+    preferred_datamap_path: Optional[Path] = None,
+    common_value_overrides: Optional[Mapping[str, str]] = None,
+    preferred_value_overrides: Optional[Mapping[str, str]] = None,
+    clear_old_post_processors: bool = True,
+    use_compiled_datamap: bool = False,
+) -> Iterator[dict]:
+    """
+    Streaming version of parse_ocf_stock_issuances_from_ce_json() - yields common issuances, then preferred issuances,
+    one repetition at a time. Post processors are registered when this is called, so don't register others on the
+    issuance datamaps until the iterator is exhausted.
+
+    Args: Same as parse_ocf_stock_issuances_from_ce_json(), less repetition_workers
+
+    Returns: Iterator over the same issuances, in the same order, as parse_ocf_stock_issuances_from_ce_json()
+
+    """
+    if common_value_overrides is None:
+        common_value_overrides = {}
+
+    if preferred_value_overrides is None:
+        preferred_value_overrides = {}
+
+    _register_stock_issuance_handlers(common_post_processors, preferred_post_processors, clear_old_post_processors)
+
+    common_issuances = iter_repeatable_model_datamap(
+        load_ce_to_ocf_vesting_issuances_datamap(common_datamap_path, compiled=use_compiled_datamap),
+        None,
+        ce_jsons,
+        value_overrides=OverrideScope.layered(PARSER_VERSION_OVERRIDES, common_value_overrides),
+        fail_on_missing_variable=fail_on_missing_variable,
+    )
+    preferred_datamap = load_ce_to_ocf_vested_issuances_datamap(preferred_datamap_path, compiled=use_compiled_datamap)
+
+    def iter_issuances() -> Iterator[dict]:
+        yield from common_issuances  # type: ignore
+        # Like the list version, preferred repetition scope is only resolved once common issuances are done
+        yield from iter_repeatable_model_datamap(  # type: ignore
+            preferred_datamap,
+            None,
+            ce_jsons,
+            value_overrides=OverrideScope.layered(PARSER_VERSION_OVERRIDES, preferred_value_overrides),
+            fail_on_missing_variable=fail_on_missing_variable,
+        )
+
+    return iter_issuances()
+
+
 def parse_ocf_vesting_schedules_from_ce_json(
     ce_jsons: list[ContractExpressVarObj],
     post_processors: Optional[dict[str, Callable]] = None,
     fail_on_missing_variable: bool = False,
     custom_datamap_path: Optional[Path] = None,
     clear_old_post_processors: bool = True,
-    value_overrides: Optional[dict[str, str]] = None,
+    value_overrides: Optional[Mapping[str, str]] = None,
+    repetition_workers: Optional[int] = None,
+    use_compiled_datamap: bool = False,
 ) -> list[dict]:
     """
 
@@ -418,6 +564,8 @@ def parse_ocf_vesting_schedules_from_ce_json(
         custom_datamap_path: If you provide a Path, load the datamap from path instead of default
         clear_old_post_processors: If True, clear pre-existing post processors on top-level FieldPostProcessorDataMap
         value_overrides:
+        repetition_workers: If > 1, resolve repetitions across this many worker processes (see traverse_datamap())
+        use_compiled_datamap: If True, load datamaps with load_compiled_datamap() instead of pydantic
     Returns: OCF Jsons for Vesting Schedule Objects, Deduped
 
     """
@@ -434,14 +582,17 @@ def parse_ocf_vesting_schedules_from_ce_json(
     if value_overrides is None:
         value_overrides = {}
 
-    ce_to_vesting_enums_datamap = load_vesting_schedule_driving_enums_datamap(custom_datamap_path)
+    ce_to_vesting_enums_datamap = load_vesting_schedule_driving_enums_datamap(
+        custom_datamap_path, compiled=use_compiled_datamap
+    )
 
     vesting_schedle_ocfs = traverse_datamap(
         ce_to_vesting_enums_datamap,
         None,
         ce_jsons,
-        value_overrides={"PARSER_VERSION": version, **value_overrides},
+        value_overrides=OverrideScope.layered(PARSER_VERSION_OVERRIDES, value_overrides),
         fail_on_missing_variable=fail_on_missing_variable,
+        repetition_workers=repetition_workers,
     )
     # TODO - improve OCF dict typing
     assert isinstance(vesting_schedle_ocfs, list)
@@ -466,7 +617,9 @@ def parse_ocf_vesting_events_from_ce_json(
     fail_on_missing_variable: bool = False,
     custom_datamap_path: Optional[Path] = None,
     clear_old_post_processors: bool = True,
-    value_overrides: Optional[dict[str, str]] = None,
+    value_overrides: Optional[Mapping[str, str]] = None,
+    repetition_workers: Optional[int] = None,
+    use_compiled_datamap: bool = False,
 ) -> list[dict]:
     """
 
@@ -479,6 +632,8 @@ def parse_ocf_vesting_events_from_ce_json(
         custom_datamap_path:
         clear_old_post_processors:
         value_overrides:
+        repetition_workers:
+        use_compiled_datamap: If True, load datamaps with load_compiled_datamap() instead of pydantic
     Returns:
 
     """
@@ -491,7 +646,9 @@ def parse_ocf_vesting_events_from_ce_json(
     if value_overrides is None:
         value_overrides = {}
 
-    ce_vesting_enums_datamap = load_vesting_events_driving_enums_datamap(custom_datamap_path)
+    ce_vesting_enums_datamap = load_vesting_events_driving_enums_datamap(
+        custom_datamap_path, compiled=use_compiled_datamap
+    )
 
     # This is going to give us, for each stockholder_id - here just indicated by their index count but we typically
     # build the ids by STAKEHOLDER.{{index}}, so this'll be easy.  - which we can then use to generate required start
@@ -500,8 +657,9 @@ def parse_ocf_vesting_events_from_ce_json(
         ce_vesting_enums_datamap,
         None,
         ce_jsons,
-        value_overrides={"PARSER_VERSION": version, **value_overrides},
+        value_overrides=OverrideScope.layered(PARSER_VERSION_OVERRIDES, value_overrides),
         fail_on_missing_variable=fail_on_missing_variable,
+        repetition_workers=repetition_workers,
     )
 
     # TODO - improve ocf object typing
@@ -519,7 +677,7 @@ def parse_ocf_vesting_events_from_ce_json(
         # print(f"Generate vesting start events for values: {vesting_inputs}")
         generated_events.append(
             generate_vesting_start_event(
-                vesting_commencement_date=datetime.date.fromisoformat(vesting_schedule["vesting_commencement_date"]),
+                vesting_commencement_date=ce_value_as_date(vesting_schedule["vesting_commencement_date"]),
                 issuance_id=f"COMMON.ISSUANCE.{vesting_schedule['stockholder_id']}",
                 vesting_start_condition_id=generate_vesting_start_id(
                     vesting_schedule["vesting_schedule"]
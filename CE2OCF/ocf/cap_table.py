@@ -0,0 +1,268 @@
+"""
+Cap table summaries for converted companies - shares outstanding per stock class, per stakeholder and per stakeholder x
+class, fully diluted totals and ownership percentages.
+
+summarize_cap_table() makes one pass over a company's transactions, indexing issuances by security, stakeholder and
+class, and sums quantities as Decimals so totals are exact. summarize_cap_tables() does the same for a whole portfolio,
+sharing the parsed quantity cache across companies (generated packages repeat the same handful of quantity strings).
+"""
+from __future__ import annotations
+
+import functools
+from decimal import Decimal, localcontext
+from typing import Any, Iterable, Mapping, NamedTuple
+
+from CE2OCF.types.dictionaries import (
+    CE2OCFPipelineReturnType,
+    OcfFileContentsDict,
+)
+
+STOCK_ISSUANCE_OBJECT_TYPE = "TX_STOCK_ISSUANCE"
+PLAN_ISSUANCE_OBJECT_TYPES = ("TX_PLAN_SECURITY_ISSUANCE", "TX_EQUITY_COMPENSATION_ISSUANCE")
+
+# Transactions that take some quantity of an issued security off the cap table
+QUANTITY_REDUCING_OBJECT_TYPES = (
+    "TX_STOCK_CANCELLATION",
+    "TX_STOCK_REPURCHASE",
+    "TX_PLAN_SECURITY_CANCELLATION",
+    "TX_EQUITY_COMPENSATION_CANCELLATION",
+)
+
+# Transactions that undo an issuance entirely
+RETRACTION_OBJECT_TYPES = (
+    "TX_STOCK_RETRACTION",
+    "TX_PLAN_SECURITY_RETRACTION",
+    "TX_EQUITY_COMPENSATION_RETRACTION",
+)
+
+# Precision of ownership percentages - the quantities themselves are summed exactly
+PERCENTAGE_PRECISION = 28
+
+_ZERO = Decimal(0)
+
+
+class CapTableSummary(NamedTuple):
+    issuer_id: str | None
+    shares_outstanding: Decimal  # Stock only
+    plan_securities_outstanding: Decimal  # Options etc. issued from stock plans
+    plan_shares_available: Decimal  # Reserved by stock plans but not yet issued
+    fully_diluted_shares: Decimal
+    shares_authorized_by_class: dict[str, Decimal | None]
+    shares_outstanding_by_class: dict[str, Decimal]
+    holdings_by_stakeholder: dict[str, Decimal]  # Stock and plan securities
+    stock_holdings_by_stakeholder: dict[str, Decimal]  # Stock only
+    holdings_by_stakeholder_and_class: dict[tuple[str, str], Decimal]
+
+    def ownership_by_stakeholder(self, fully_diluted: bool = True) -> dict[str, Decimal]:
+        """
+        Args:
+            fully_diluted: Divide each stakeholder's stock and plan securities by fully diluted shares (True) or
+                           just their stock by stock outstanding (False)
+
+        Returns: Fraction of the company each stakeholder owns, e.g. Decimal("0.25") for 25%
+
+        """
+        if fully_diluted:
+            denominator, holdings_by_stakeholder = self.fully_diluted_shares, self.holdings_by_stakeholder
+        else:
+            denominator, holdings_by_stakeholder = self.shares_outstanding, self.stock_holdings_by_stakeholder
+        if not denominator:
+            return {stakeholder_id: _ZERO for stakeholder_id in self.holdings_by_stakeholder}
+
+        with localcontext() as context:
+            context.prec = PERCENTAGE_PRECISION
+            return {
+                stakeholder_id: holdings_by_stakeholder.get(stakeholder_id, _ZERO) / denominator
+                for stakeholder_id in self.holdings_by_stakeholder
+            }
+
+    def ownership_by_class(self) -> dict[str, Decimal]:
+        """
+        Returns: Fraction of shares outstanding in each stock class
+        """
+        if not self.shares_outstanding:
+            return {stock_class_id: _ZERO for stock_class_id in self.shares_outstanding_by_class}
+
+        with localcontext() as context:
+            context.prec = PERCENTAGE_PRECISION
+            return {
+                stock_class_id: outstanding / self.shares_outstanding
+                for stock_class_id, outstanding in self.shares_outstanding_by_class.items()
+            }
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_quantity(quantity: str) -> Decimal:
+    return Decimal(quantity)
+
+
+def _quantity(value: Any) -> Decimal:
+    if value is None:
+        return _ZERO
+    if isinstance(value, str):
+        return _parse_quantity(value)
+    return Decimal(str(value)) if isinstance(value, float) else Decimal(value)
+
+
+def _items(file_contents: Mapping[str, Any] | None) -> list[dict]:
+    if not file_contents:
+        return []
+    return file_contents.get("items", [])
+
+
+def _pipeline_contents(
+    ocf: CE2OCFPipelineReturnType | OcfFileContentsDict,
+) -> tuple[Mapping | None, list[dict], list[dict], list[dict]]:
+    """
+    Returns: issuer, stock classes, stock plans and transactions from either pipeline output or packaged file contents
+    """
+    if "OCF_TRANSACTIONS_FILE" in ocf:
+        files: Any = ocf
+        manifest = files["OCF_MANIFEST_FILE"]["contents"]
+        return (
+            manifest.get("issuer"),
+            _items(files["OCF_STOCK_CLASSES_FILE"]["contents"]),
+            _items(files["OCF_STOCK_PLANS_FILE"]["contents"]),
+            _items(files["OCF_TRANSACTIONS_FILE"]["contents"]),
+        )
+
+    pipeline_output: Any = ocf
+    return (
+        pipeline_output.get("issuer_ocf"),
+        _items(pipeline_output.get("stock_classes_ocf")),
+        _items(pipeline_output.get("stock_plans_ocf")),
+        _items(pipeline_output.get("transactions_ocf")),
+    )
+
+
+def summarize_cap_table(ocf: CE2OCFPipelineReturnType | OcfFileContentsDict) -> CapTableSummary:
+    """
+    Summarize one company's cap table.
+
+    Args:
+        ocf: Output of translate_ce_inc_questionnaire_datasheet_items_to_ocf() or the packaged OcfFileContentsDict
+
+    Returns: CapTableSummary
+
+    """
+    issuer, stock_classes, stock_plans, transactions = _pipeline_contents(ocf)
+
+    # security_id -> [stakeholder_id, stock_class_id, quantity, stock_plan_id]
+    securities: dict[str, list] = {}
+    reductions: list[tuple[str, Decimal]] = []
+    retracted: set[str] = set()
+
+    for transaction in transactions:
+        object_type = transaction.get("object_type")
+        if object_type == STOCK_ISSUANCE_OBJECT_TYPE or object_type in PLAN_ISSUANCE_OBJECT_TYPES:
+            securities[transaction["security_id"]] = [
+                transaction.get("stakeholder_id"),
+                transaction.get("stock_class_id"),
+                _quantity(transaction.get("quantity")),
+                transaction.get("stock_plan_id") if object_type in PLAN_ISSUANCE_OBJECT_TYPES else None,
+            ]
+        elif object_type in QUANTITY_REDUCING_OBJECT_TYPES:
+            reductions.append((transaction["security_id"], _quantity(transaction.get("quantity"))))
+        elif object_type in RETRACTION_OBJECT_TYPES:
+            retracted.add(transaction["security_id"])
+
+    # Transactions aren't guaranteed to be in date order, so apply reductions once every issuance is indexed
+    for security_id, quantity in reductions:
+        if security_id in securities:
+            securities[security_id][2] -= quantity
+    for security_id in retracted:
+        securities.pop(security_id, None)
+
+    shares_outstanding = _ZERO
+    plan_securities_outstanding = _ZERO
+    shares_outstanding_by_class: dict[str, Decimal] = {
+        stock_class["id"]: _ZERO for stock_class in stock_classes if "id" in stock_class
+    }
+    plan_issued: dict[str | None, Decimal] = {}
+    holdings_by_stakeholder: dict[str, Decimal] = {}
+    stock_holdings_by_stakeholder: dict[str, Decimal] = {}
+    holdings_by_stakeholder_and_class: dict[tuple[str, str], Decimal] = {}
+
+    for stakeholder_id, stock_class_id, quantity, stock_plan_id in securities.values():
+        if stock_plan_id is None:
+            shares_outstanding += quantity
+            shares_outstanding_by_class[stock_class_id] = (
+                shares_outstanding_by_class.get(stock_class_id, _ZERO) + quantity
+            )
+            stock_holdings_by_stakeholder[stakeholder_id] = (
+                stock_holdings_by_stakeholder.get(stakeholder_id, _ZERO) + quantity
+            )
+        else:
+            plan_securities_outstanding += quantity
+            plan_issued[stock_plan_id] = plan_issued.get(stock_plan_id, _ZERO) + quantity
+
+        holdings_by_stakeholder[stakeholder_id] = holdings_by_stakeholder.get(stakeholder_id, _ZERO) + quantity
+        key = (stakeholder_id, stock_class_id)
+        holdings_by_stakeholder_and_class[key] = holdings_by_stakeholder_and_class.get(key, _ZERO) + quantity
+
+    plan_shares_available = _ZERO
+    for stock_plan in stock_plans:
+        available = _quantity(stock_plan.get("initial_shares_reserved")) - plan_issued.get(stock_plan.get("id"), _ZERO)
+        if available > 0:
+            plan_shares_available += available
+
+    return CapTableSummary(
+        issuer_id=None if issuer is None else issuer.get("id"),
+        shares_outstanding=shares_outstanding,
+        plan_securities_outstanding=plan_securities_outstanding,
+        plan_shares_available=plan_shares_available,
+        fully_diluted_shares=shares_outstanding + plan_securities_outstanding + plan_shares_available,
+        shares_authorized_by_class={
+            stock_class["id"]: None
+            if stock_class.get("initial_shares_authorized") is None
+            else _quantity(stock_class["initial_shares_authorized"])
+            for stock_class in stock_classes
+            if "id" in stock_class
+        },
+        shares_outstanding_by_class=shares_outstanding_by_class,
+        holdings_by_stakeholder=holdings_by_stakeholder,
+        stock_holdings_by_stakeholder=stock_holdings_by_stakeholder,
+        holdings_by_stakeholder_and_class=holdings_by_stakeholder_and_class,
+    )
+
+
+def summarize_cap_tables(
+    ocfs: Iterable[CE2OCFPipelineReturnType | OcfFileContentsDict],
+) -> list[CapTableSummary]:
+    """
+    Summarize a portfolio of cap tables.
+
+    Args:
+        ocfs: Pipeline outputs or packaged OcfFileContentsDicts, one per company
+
+    Returns: One CapTableSummary per company, in input order
+
+    """
+    return [summarize_cap_table(ocf) for ocf in ocfs]
+
+
+def aggregate_cap_table_summaries(summaries: Iterable[CapTableSummary]) -> dict[str, Decimal]:
+    """
+    Portfolio-wide totals across many companies' summaries.
+
+    Args:
+        summaries: CapTableSummary objects
+
+    Returns: Dict with the summed shares_outstanding, plan_securities_outstanding, plan_shares_available and
+             fully_diluted_shares, plus the number of companies
+
+    """
+    totals = {
+        "companies": Decimal(0),
+        "shares_outstanding": _ZERO,
+        "plan_securities_outstanding": _ZERO,
+        "plan_shares_available": _ZERO,
+        "fully_diluted_shares": _ZERO,
+    }
+    for summary in summaries:
+        totals["companies"] += 1
+        totals["shares_outstanding"] += summary.shares_outstanding
+        totals["plan_securities_outstanding"] += summary.plan_securities_outstanding
+        totals["plan_shares_available"] += summary.plan_shares_available
+        totals["fully_diluted_shares"] += summary.fully_diluted_shares
+    return totals
@@ -0,0 +1,149 @@
+"""
+Diff two OCF packages - e.g. the package from a questionnaire's last export against a re-export - object by object.
+
+Whole files are compared first by md5 (the md5s packaging already computed, or those recorded in a zip's manifest), so
+files that didn't change aren't decoded or walked at all. Objects in files that did change are matched up by
+(object_type, id) and compared with != (interned objects that are the same object are skipped outright), so the work
+is proportional to the files that changed, not the whole package.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Iterable, NamedTuple, Union
+
+from CE2OCF.ocf.reader import MANIFEST_FILE_LIST_KEYS, OcfPackageReader
+from CE2OCF.types.dictionaries import OcfFileContentsDict
+
+DIFFED_FILE_TYPES = tuple(MANIFEST_FILE_LIST_KEYS.values())
+
+OcfPackageSource = Union[OcfFileContentsDict, OcfPackageReader, str, Path, bytes]
+
+
+class ObjectChange(NamedTuple):
+    file_type: str
+    object_type: str | None
+    object_id: str | None
+    old: dict | None
+    new: dict | None
+
+
+class OcfPackageDiff(NamedTuple):
+    added: list[ObjectChange]
+    removed: list[ObjectChange]
+    modified: list[ObjectChange]
+    # File types that were skipped because their md5s matched
+    unchanged_file_types: list[str]
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.added or self.removed or self.modified)
+
+
+class _PackageView:
+    """
+    The per file type md5s and objects of a package, whichever form it came in
+    """
+
+    def __init__(self, source: OcfPackageSource):
+        self._file_contents: OcfFileContentsDict | None = None
+        self._reader: OcfPackageReader | None = None
+        self._owns_reader = False
+
+        if isinstance(source, OcfPackageReader):
+            self._reader = source
+        elif isinstance(source, (str, Path, bytes, bytearray)):
+            self._reader = OcfPackageReader(source)
+            self._owns_reader = True
+        else:
+            self._file_contents = source
+
+    def close(self):
+        if self._owns_reader and self._reader is not None:
+            self._reader.close()
+
+    def issuer(self) -> dict:
+        if self._reader is not None:
+            return self._reader.issuer
+        assert self._file_contents is not None
+        return self._file_contents["OCF_MANIFEST_FILE"]["contents"].get("issuer", {})  # type: ignore
+
+    def file_md5s(self, file_type: str) -> tuple[str | None, ...]:
+        if self._reader is not None:
+            return tuple(md5 for _, md5 in self._reader.file_paths[file_type])
+        assert self._file_contents is not None
+        file_parts = self._file_contents.get(file_type)  # type: ignore
+        return (file_parts["md5"],) if file_parts else ()
+
+    def objects(self, file_type: str) -> list[dict]:
+        if self._reader is not None:
+            return self._reader.objects_in_files(file_type)
+        assert self._file_contents is not None
+        file_parts = self._file_contents.get(file_type)  # type: ignore
+        return file_parts["contents"].get("items", []) if file_parts else []
+
+
+def _keyed_objects(ocf_objects: Iterable[dict]) -> dict[tuple[Any, Any, int], dict]:
+    # Transaction ids aren't guaranteed unique, so repeats of an (object_type, id) pair are told apart by occurrence
+    keyed: dict[tuple[Any, Any, int], dict] = {}
+    occurrences: dict[tuple[Any, Any], int] = {}
+    for ocf_object in ocf_objects:
+        identity = (ocf_object.get("object_type"), ocf_object.get("id"))
+        occurrence = occurrences.get(identity, 0)
+        occurrences[identity] = occurrence + 1
+        keyed[(*identity, occurrence)] = ocf_object
+    return keyed
+
+
+def _objects_differ(old_object: dict, new_object: dict) -> bool:
+    # Equal interned objects are the same object. Anything else is compared directly - encoding and hashing both
+    # sides would cost more than the comparison itself.
+    return old_object is not new_object and old_object != new_object
+
+
+def diff_ocf_packages(old_package: OcfPackageSource, new_package: OcfPackageSource) -> OcfPackageDiff:
+    """
+    Report which OCF objects were added, removed or modified between two packages.
+
+    Args:
+        old_package: OcfFileContentsDict (e.g. from package_translated_ce_as_valid_ocf_files_contents()), an
+                     OcfPackageReader, or a zip archive / package directory path or zip bytes
+        new_package: Same, for the newer package. The two don't have to be in the same form.
+
+    Returns: OcfPackageDiff. Changes are in file order within each file type. Issuer changes are reported as a
+             modification in OCF_MANIFEST_FILE.
+
+    """
+    old_view, new_view = _PackageView(old_package), _PackageView(new_package)
+    added: list[ObjectChange] = []
+    removed: list[ObjectChange] = []
+    modified: list[ObjectChange] = []
+    unchanged_file_types: list[str] = []
+
+    try:
+        old_issuer, new_issuer = old_view.issuer(), new_view.issuer()
+        if old_issuer != new_issuer:
+            modified.append(ObjectChange("OCF_MANIFEST_FILE", "ISSUER", new_issuer.get("id"), old_issuer, new_issuer))
+
+        for file_type in DIFFED_FILE_TYPES:
+            old_md5s, new_md5s = old_view.file_md5s(file_type), new_view.file_md5s(file_type)
+            if old_md5s == new_md5s and None not in old_md5s:
+                unchanged_file_types.append(file_type)
+                continue
+
+            old_objects = _keyed_objects(old_view.objects(file_type))
+            new_objects = _keyed_objects(new_view.objects(file_type))
+
+            for key, new_object in new_objects.items():
+                old_object = old_objects.get(key)
+                if old_object is None:
+                    added.append(ObjectChange(file_type, key[0], key[1], None, new_object))
+                elif _objects_differ(old_object, new_object):
+                    modified.append(ObjectChange(file_type, key[0], key[1], old_object, new_object))
+            for key, old_object in old_objects.items():
+                if key not in new_objects:
+                    removed.append(ObjectChange(file_type, key[0], key[1], old_object, None))
+    finally:
+        old_view.close()
+        new_view.close()
+
+    return OcfPackageDiff(added, removed, modified, unchanged_file_types)
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import json
+import weakref
+
 from CE2OCF.datamap.loaders import (
     load_cic_event_definition,
     load_double_trigger_definitions,
@@ -34,8 +37,81 @@ from CE2OCF.types.enums import (
     SingleTriggerTypesEnum,
     VestingTypesEnum,
 )
+from CE2OCF.types.protocols import OcfEventGeneratorFunctionSig
+from CE2OCF.utils.frozen_utils import (
+    clear_interned_ocf_objects,
+    intern_ocf_object,
+)
 from CE2OCF.utils.log_utils import logger
 
+# (vesting schedule, single trigger) -> (cliff month, months of vesting credit on trigger, event generator) for the
+# time-served credit flavors of single trigger acceleration. Both schedules are 48 months.
+TIME_SERVED_ACCELERATION_PARAMETERS: dict[
+    tuple[VestingTypesEnum, SingleTriggerTypesEnum], tuple[int, int, OcfEventGeneratorFunctionSig]
+] = {
+    # These are CiC-based triggers
+    (VestingTypesEnum.FOUR_YR_NO_CLIFF, SingleTriggerTypesEnum.SIX_MONTHS_ALL_TIMES): (0, 6, cic_event_generator),
+    (VestingTypesEnum.FOUR_YR_NO_CLIFF, SingleTriggerTypesEnum.TWELVE_MONTHS_ALL_TIMES): (0, 12, cic_event_generator),
+    (VestingTypesEnum.FOUR_YR_NO_CLIFF, SingleTriggerTypesEnum.TWENTY_FOUR_MONTHS_ALL_TIMES): (
+        0,
+        24,
+        cic_event_generator,
+    ),
+    (VestingTypesEnum.FOUR_YR_NO_CLIFF, SingleTriggerTypesEnum.SIX_MONTHS_INVOLUNTARY_TERMINATION): (
+        0,
+        6,
+        generate_vesting_termination_event,
+    ),
+    (VestingTypesEnum.FOUR_YR_NO_CLIFF, SingleTriggerTypesEnum.TWELVE_MONTHS_INVOLUNTARY_TERMINATION): (
+        0,
+        12,
+        generate_vesting_termination_event,
+    ),
+    (VestingTypesEnum.FOUR_YR_NO_CLIFF, SingleTriggerTypesEnum.TWENTY_FOUR_MONTHS_INVOLUNTARY_TERMINATION): (
+        0,
+        24,
+        generate_vesting_termination_event,
+    ),
+    # Since these are OVER the cliff, we can just add 12/48 or 24/48 portion
+    (VestingTypesEnum.FOUR_YR_1_YR_CLIFF, SingleTriggerTypesEnum.SIX_MONTHS_ALL_TIMES): (12, 6, cic_event_generator),
+    (VestingTypesEnum.FOUR_YR_1_YR_CLIFF, SingleTriggerTypesEnum.TWELVE_MONTHS_ALL_TIMES): (
+        12,
+        12,
+        cic_event_generator,
+    ),
+    (VestingTypesEnum.FOUR_YR_1_YR_CLIFF, SingleTriggerTypesEnum.TWENTY_FOUR_MONTHS_ALL_TIMES): (
+        12,
+        24,
+        cic_event_generator,
+    ),
+    (VestingTypesEnum.FOUR_YR_1_YR_CLIFF, SingleTriggerTypesEnum.SIX_MONTHS_INVOLUNTARY_TERMINATION): (
+        12,
+        6,
+        generate_vesting_termination_event,
+    ),
+    (VestingTypesEnum.FOUR_YR_1_YR_CLIFF, SingleTriggerTypesEnum.TWELVE_MONTHS_INVOLUNTARY_TERMINATION): (
+        12,
+        12,
+        generate_vesting_termination_event,
+    ),
+    (VestingTypesEnum.FOUR_YR_1_YR_CLIFF, SingleTriggerTypesEnum.TWENTY_FOUR_MONTHS_INVOLUNTARY_TERMINATION): (
+        12,
+        24,
+        generate_vesting_termination_event,
+    ),
+}
+
+# Vesting schedules generated from our enums only differ by their schedule id, so we generate each combination once
+# with this placeholder as the id, keep the json, and stamp the real id in on later calls.
+VESTING_SCHEDULE_ID_PLACEHOLDER = "<<VESTING_SCHEDULE_ID>>"
+_vesting_schedule_templates: dict[
+    tuple[VestingTypesEnum, SingleTriggerTypesEnum | None, DoubleTriggerTypesEnum | None], str | None
+] = {}
+
+# Interned vesting schedules keyed by the raw (vesting_schedule, single_trigger, double_trigger) driver values. Weak,
+# like the intern table itself, so schedules no converted package uses any more are released.
+_interned_vesting_schedules: weakref.WeakValueDictionary[tuple, dict] = weakref.WeakValueDictionary()
+
 
 def generate_single_trigger_conditions_from_enumerations(
     single_trigger_type: SingleTriggerTypesEnum | str,
@@ -104,187 +180,28 @@ def generate_single_trigger_conditions_from_enumerations(
                 **single_trigger_vals,
             )
         )
-    else:
+    elif vesting_schedule_type == VestingTypesEnum.FULLY_VESTED:
+        # shouldn't be vesting conditions
+        pass
+    elif (vesting_schedule_type, single_trigger_type) in TIME_SERVED_ACCELERATION_PARAMETERS:
         # for acceleration where you get credited extra months of vesting... the resulting output
         # looks very different for a pure monthly schedule vs a schedule with a cliff.
-        if vesting_schedule_type == VestingTypesEnum.FOUR_YR_NO_CLIFF:
-            # These are CiC-based triggers
-            if single_trigger_type == SingleTriggerTypesEnum.TWENTY_FOUR_MONTHS_ALL_TIMES:
-                (
-                    start_condition_id,
-                    vest_cond_objs,
-                ) = generate_time_based_ocf_vesting_conditions_with_time_served_credit_acceleration(
-                    generate_vesting_start_id(vesting_schedule_id),
-                    end_month=48,
-                    cliff_month=0,
-                    months_of_vest_credit_on_trigger=24,
-                    ocf_event_generator=cic_event_generator,
-                )
-
-                condition_ocf_objs.extend(vest_cond_objs)
-
-            elif single_trigger_type == SingleTriggerTypesEnum.TWELVE_MONTHS_ALL_TIMES:
-                (
-                    start_condition_id,
-                    vest_cond_objs,
-                ) = generate_time_based_ocf_vesting_conditions_with_time_served_credit_acceleration(
-                    generate_vesting_start_id(vesting_schedule_id),
-                    end_month=48,
-                    cliff_month=0,
-                    months_of_vest_credit_on_trigger=12,
-                    ocf_event_generator=cic_event_generator,
-                )
-
-                condition_ocf_objs.extend(vest_cond_objs)
-
-            elif single_trigger_type == SingleTriggerTypesEnum.SIX_MONTHS_ALL_TIMES:
-                (
-                    start_condition_id,
-                    vest_cond_objs,
-                ) = generate_time_based_ocf_vesting_conditions_with_time_served_credit_acceleration(
-                    generate_vesting_start_id(vesting_schedule_id),
-                    end_month=48,
-                    cliff_month=0,
-                    months_of_vest_credit_on_trigger=6,
-                    ocf_event_generator=cic_event_generator,
-                )
-
-                condition_ocf_objs.extend(vest_cond_objs)
-            elif single_trigger_type == SingleTriggerTypesEnum.SIX_MONTHS_INVOLUNTARY_TERMINATION:
-                (
-                    start_condition_id,
-                    vest_cond_objs,
-                ) = generate_time_based_ocf_vesting_conditions_with_time_served_credit_acceleration(
-                    generate_vesting_start_id(vesting_schedule_id),
-                    end_month=48,
-                    cliff_month=0,
-                    months_of_vest_credit_on_trigger=6,
-                    ocf_event_generator=generate_vesting_termination_event,
-                )
-
-                condition_ocf_objs.extend(vest_cond_objs)
-
-            elif single_trigger_type == SingleTriggerTypesEnum.TWELVE_MONTHS_INVOLUNTARY_TERMINATION:
-                (
-                    start_condition_id,
-                    vest_cond_objs,
-                ) = generate_time_based_ocf_vesting_conditions_with_time_served_credit_acceleration(
-                    generate_vesting_start_id(vesting_schedule_id),
-                    end_month=48,
-                    cliff_month=0,
-                    months_of_vest_credit_on_trigger=12,
-                    ocf_event_generator=generate_vesting_termination_event,
-                )
-
-                condition_ocf_objs.extend(vest_cond_objs)
-
-            elif single_trigger_type == SingleTriggerTypesEnum.TWENTY_FOUR_MONTHS_INVOLUNTARY_TERMINATION:
-                (
-                    start_condition_id,
-                    vest_cond_objs,
-                ) = generate_time_based_ocf_vesting_conditions_with_time_served_credit_acceleration(
-                    generate_vesting_start_id(vesting_schedule_id),
-                    end_month=48,
-                    cliff_month=0,
-                    months_of_vest_credit_on_trigger=24,
-                    ocf_event_generator=generate_vesting_termination_event,
-                )
-
-                condition_ocf_objs.extend(vest_cond_objs)
-            else:
-                logger.debug("WARNING - Unexpected combination of acceleration and vesting...")
-
-        elif vesting_schedule_type == VestingTypesEnum.FOUR_YR_1_YR_CLIFF:
-            # Since these are OVER the cliff, we can just add 12/48 or 24/48 portion
-            if single_trigger_type == SingleTriggerTypesEnum.TWENTY_FOUR_MONTHS_INVOLUNTARY_TERMINATION:
-                (
-                    start_condition_id,
-                    vest_cond_objs,
-                ) = generate_time_based_ocf_vesting_conditions_with_time_served_credit_acceleration(
-                    generate_vesting_start_id(vesting_schedule_id),
-                    end_month=48,
-                    cliff_month=12,
-                    months_of_vest_credit_on_trigger=24,
-                    ocf_event_generator=generate_vesting_termination_event,
-                )
-
-                condition_ocf_objs.extend(vest_cond_objs)
-
-            elif single_trigger_type == SingleTriggerTypesEnum.TWELVE_MONTHS_INVOLUNTARY_TERMINATION:
-                (
-                    start_condition_id,
-                    vest_cond_objs,
-                ) = generate_time_based_ocf_vesting_conditions_with_time_served_credit_acceleration(
-                    generate_vesting_start_id(vesting_schedule_id),
-                    end_month=48,
-                    cliff_month=12,
-                    months_of_vest_credit_on_trigger=12,
-                    ocf_event_generator=generate_vesting_termination_event,
-                )
-                condition_ocf_objs.extend(vest_cond_objs)
-
-            elif single_trigger_type == SingleTriggerTypesEnum.SIX_MONTHS_INVOLUNTARY_TERMINATION:
-                (
-                    start_condition_id,
-                    vest_cond_objs,
-                ) = generate_time_based_ocf_vesting_conditions_with_time_served_credit_acceleration(
-                    generate_vesting_start_id(vesting_schedule_id),
-                    end_month=48,
-                    cliff_month=12,
-                    months_of_vest_credit_on_trigger=6,
-                    ocf_event_generator=generate_vesting_termination_event,
-                )
-                condition_ocf_objs.extend(vest_cond_objs)
-
-            elif single_trigger_type == SingleTriggerTypesEnum.TWELVE_MONTHS_ALL_TIMES:
-                (
-                    start_condition_id,
-                    vest_cond_objs,
-                ) = generate_time_based_ocf_vesting_conditions_with_time_served_credit_acceleration(
-                    generate_vesting_start_id(vesting_schedule_id),
-                    end_month=48,
-                    cliff_month=12,
-                    months_of_vest_credit_on_trigger=12,
-                    ocf_event_generator=cic_event_generator,
-                )
-
-                condition_ocf_objs.extend(vest_cond_objs)
-
-            elif single_trigger_type == SingleTriggerTypesEnum.TWENTY_FOUR_MONTHS_ALL_TIMES:
-                (
-                    start_condition_id,
-                    vest_cond_objs,
-                ) = generate_time_based_ocf_vesting_conditions_with_time_served_credit_acceleration(
-                    generate_vesting_start_id(vesting_schedule_id),
-                    end_month=48,
-                    cliff_month=12,
-                    months_of_vest_credit_on_trigger=24,
-                    ocf_event_generator=cic_event_generator,
-                )
-
-                condition_ocf_objs.extend(vest_cond_objs)
-
-            elif single_trigger_type == SingleTriggerTypesEnum.SIX_MONTHS_ALL_TIMES:
-                (
-                    start_condition_id,
-                    vest_cond_objs,
-                ) = generate_time_based_ocf_vesting_conditions_with_time_served_credit_acceleration(
-                    generate_vesting_start_id(vesting_schedule_id),
-                    end_month=48,
-                    cliff_month=12,
-                    months_of_vest_credit_on_trigger=6,
-                    ocf_event_generator=cic_event_generator,
-                )
-                condition_ocf_objs.extend(vest_cond_objs)
-            else:
-                logger.debug("WARNING - Unexpected combination of acceleration and vesting...")
-
-        elif vesting_schedule_type == VestingTypesEnum.FULLY_VESTED:
-            # shouldn't be vesting conditions
-            pass
-        else:
-            logger.debug("WARNING - Unexpected combination of acceleration and vesting...")
-            pass
+        cliff_month, months_of_vest_credit_on_trigger, ocf_event_generator = TIME_SERVED_ACCELERATION_PARAMETERS[
+            (vesting_schedule_type, single_trigger_type)
+        ]
+        (
+            start_condition_id,
+            vest_cond_objs,
+        ) = generate_time_based_ocf_vesting_conditions_with_time_served_credit_acceleration(
+            generate_vesting_start_id(vesting_schedule_id),
+            end_month=48,
+            cliff_month=cliff_month,
+            months_of_vest_credit_on_trigger=months_of_vest_credit_on_trigger,
+            ocf_event_generator=ocf_event_generator,
+        )
+        condition_ocf_objs.extend(vest_cond_objs)
+    else:
+        logger.debug("WARNING - Unexpected combination of acceleration and vesting...")
 
     return start_condition_id, condition_ocf_objs
 
@@ -489,6 +406,77 @@ def generate_ocf_vesting_schedule_from_enumerations(
     }
 
 
+def get_vesting_schedule_template(
+    schedule_choice: VestingTypesEnum,
+    single_trigger: SingleTriggerTypesEnum | None = None,
+    double_trigger: DoubleTriggerTypesEnum | None = None,
+) -> str | None:
+    """
+    Get the json for the vesting schedule generated by generate_ocf_vesting_schedule_from_enumerations() for this
+    combination of enums, with VESTING_SCHEDULE_ID_PLACEHOLDER in place of the schedule id. Generated on first request
+    for a given combination and cached for the life of the process.
+
+    Args:
+        schedule_choice: Vesting schedule type
+        single_trigger: Single trigger acceleration type, if any
+        double_trigger: Double trigger acceleration type, if any
+
+    Returns: Vesting schedule json template or None if this combination has no vesting schedule (e.g. Fully Vested)
+
+    """
+    key = (schedule_choice, single_trigger, double_trigger)
+    if key not in _vesting_schedule_templates:
+        vesting_schedule_ocf = generate_ocf_vesting_schedule_from_enumerations(
+            schedule_choice=schedule_choice.value,
+            schedule_id=VESTING_SCHEDULE_ID_PLACEHOLDER,
+            single_trigger=single_trigger,
+            double_trigger=double_trigger,
+        )
+        _vesting_schedule_templates[key] = None if vesting_schedule_ocf is None else json.dumps(vesting_schedule_ocf)
+
+    return _vesting_schedule_templates[key]
+
+
+def precompute_vesting_schedule_templates():
+    """
+    Eagerly build the template for every supported vesting schedule x single trigger x double trigger combination (see
+    get_vesting_schedule_template()). Useful to call before forking worker processes so they don't each build their own.
+    """
+    for schedule_choice in VestingTypesEnum:
+        if schedule_choice == VestingTypesEnum.CUSTOM:
+            continue
+        for single_trigger in (None, *SingleTriggerTypesEnum):
+            for double_trigger in (None, *DoubleTriggerTypesEnum):
+                get_vesting_schedule_template(schedule_choice, single_trigger, double_trigger)
+
+
+def generate_ocf_vesting_schedule_from_template(
+    schedule_choice: VestingTypesEnum,
+    schedule_id: str,
+    single_trigger: SingleTriggerTypesEnum | None = None,
+    double_trigger: DoubleTriggerTypesEnum | None = None,
+) -> dict | None:
+    """
+    Same output as generate_ocf_vesting_schedule_from_enumerations(), but built by stamping schedule_id into the cached
+    template for this combination of enums rather than generating every condition from scratch.
+
+    Args:
+        schedule_choice: Vesting schedule type
+        schedule_id: Id of the generated vesting schedule. Condition ids are derived from it.
+        single_trigger: Single trigger acceleration type, if any
+        double_trigger: Double trigger acceleration type, if any
+
+    Returns: Vesting schedule ocf dict or None if this combination has no vesting schedule (e.g. Fully Vested)
+
+    """
+    template = get_vesting_schedule_template(schedule_choice, single_trigger, double_trigger)
+    if template is None:
+        return None
+
+    # The placeholder only ever appears inside json strings, so swap in the json-escaped id
+    return json.loads(template.replace(VESTING_SCHEDULE_ID_PLACEHOLDER, json.dumps(schedule_id)[1:-1]))
+
+
 def generate_ocf_vesting_schedule_from_vesting_drivers(vesting_schedule_inputs: dict, *args) -> dict | None:
     logger.debug(
         f"generate_ocf_vesting_schedule_from_vesting_drivers - vesting_schedule_inputs: {vesting_schedule_inputs}"
@@ -521,10 +509,63 @@ def generate_ocf_vesting_schedule_from_vesting_drivers(vesting_schedule_inputs:
     schedule_id = f"{schedule_choice}/{single_trigger}/{double_trigger}"
     logger.debug(f"generate_ocf_vesting_schedule_from_vesting_drivers  - schedule_id: {schedule_id}")
 
-    vesting_schedule_ocf = generate_ocf_vesting_schedule_from_enumerations(
-        schedule_choice=schedule_choice,
+    try:
+        vesting_schedule_type = VestingTypesEnum(schedule_choice)
+    except ValueError:
+        # Let the generator raise its usual error for unsupported schedules
+        return generate_ocf_vesting_schedule_from_enumerations(
+            schedule_choice=schedule_choice,
+            schedule_id=schedule_id,
+            single_trigger=single_trigger,
+            double_trigger=double_trigger,
+        )
+
+    return generate_ocf_vesting_schedule_from_template(
+        schedule_choice=vesting_schedule_type,
         schedule_id=schedule_id,
         single_trigger=single_trigger,
         double_trigger=double_trigger,
     )
-    return vesting_schedule_ocf
+
+
+def generate_interned_ocf_vesting_schedule_from_vesting_drivers(vesting_schedule_inputs: dict, *args) -> dict | None:
+    """
+    Drop-in replacement for generate_ocf_vesting_schedule_from_vesting_drivers() that returns one shared, immutable
+    FrozenOcfDict (see CE2OCF.utils.frozen_utils) per combination of vesting drivers instead of building a new schedule
+    for every stakeholder. Acceleration conditions that repeat across schedules are shared too, and each object's json
+    is only encoded once when the package is written. Register it as the "vesting_schedule" post-processor to opt in:
+
+        {"vesting_schedule": generate_interned_ocf_vesting_schedule_from_vesting_drivers}
+
+    Args:
+        vesting_schedule_inputs: Dict with vesting_schedule, single_trigger and double_trigger values
+
+    Returns: Interned vesting schedule ocf or None if the drivers don't produce a schedule
+
+    """
+    key = (
+        vesting_schedule_inputs.get("vesting_schedule", None),
+        vesting_schedule_inputs.get("single_trigger", None),
+        vesting_schedule_inputs.get("double_trigger", None),
+    )
+    try:
+        hash(key)
+    except TypeError:
+        return intern_ocf_object(generate_ocf_vesting_schedule_from_vesting_drivers(vesting_schedule_inputs))
+
+    interned = _interned_vesting_schedules.get(key)
+    if interned is None:
+        interned = intern_ocf_object(generate_ocf_vesting_schedule_from_vesting_drivers(vesting_schedule_inputs))
+        if interned is not None:
+            _interned_vesting_schedules[key] = interned
+    return interned
+
+
+def clear_interned_vesting_schedules():
+    """
+    Stop sharing the vesting schedules (and every other interned OCF object) handed out so far by
+    generate_interned_ocf_vesting_schedule_from_vesting_drivers() with later calls. Schedules nothing uses any more are
+    released without this.
+    """
+    _interned_vesting_schedules.clear()
+    clear_interned_ocf_objects()
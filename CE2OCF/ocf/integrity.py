@@ -0,0 +1,226 @@
+"""
+Referential integrity checks for OCF packages. JSON schema validation (CE2OCF.ocf.validator) checks each object on its
+own; this checks that the ids objects use to point at each other resolve - stakeholders, stock classes, stock plans,
+legends, vesting terms, securities and vesting conditions - and that no vesting condition graph has a cycle.
+
+check_ocf_integrity() indexes every defined id in one pass over the package and checks every reference against those
+indexes in a second, so it's linear in the size of the package and cheap enough to run on every conversion.
+"""
+from __future__ import annotations
+
+from typing import Any, Iterable, Mapping, NamedTuple
+
+from CE2OCF.types.dictionaries import OcfFileContentsDict
+from CE2OCF.types.exceptions import OCFIntegrityError
+
+ISSUANCE_OBJECT_TYPES = (
+    "TX_STOCK_ISSUANCE",
+    "TX_PLAN_SECURITY_ISSUANCE",
+    "TX_EQUITY_COMPENSATION_ISSUANCE",
+    "TX_CONVERTIBLE_ISSUANCE",
+    "TX_WARRANT_ISSUANCE",
+)
+
+# Reference field -> what it points at. List-valued fields hold several references.
+REFERENCE_FIELDS = {
+    "stakeholder_id": "STAKEHOLDER",
+    "stock_class_id": "STOCK_CLASS",
+    "converts_to_stock_class_id": "STOCK_CLASS",
+    "stock_plan_id": "STOCK_PLAN",
+    "vesting_terms_id": "VESTING_TERMS",
+    "stock_legend_ids": "STOCK_LEGEND_TEMPLATE",
+    "balance_security_id": "SECURITY",
+    "resulting_security_ids": "SECURITY",
+}
+
+# Object types whose id other objects can reference by the REFERENCE_FIELDS above
+REFERENCEABLE_OBJECT_TYPES = ("STAKEHOLDER", "STOCK_CLASS", "STOCK_PLAN", "STOCK_LEGEND_TEMPLATE", "VESTING_TERMS")
+
+# Issues spelled out in an OCFIntegrityError's message. All of them are on the error's issues attribute.
+MAX_REPORTED_ISSUES = 10
+
+_FILE_TYPES = (
+    "OCF_STAKEHOLDERS_FILE",
+    "OCF_STOCK_CLASSES_FILE",
+    "OCF_STOCK_LEGEND_TEMPLATES_FILE",
+    "OCF_STOCK_PLANS_FILE",
+    "OCF_TRANSACTIONS_FILE",
+    "OCF_VALUATIONS_FILE",
+    "OCF_VESTING_TERMS_FILE",
+)
+
+
+class IntegrityIssue(NamedTuple):
+    file_type: str
+    object_id: str | None
+    field: str
+    reference: Any
+    message: str
+
+
+def _iter_objects(ocf_file_contents: OcfFileContentsDict | Mapping[str, Any]) -> Iterable[tuple[str, dict]]:
+    for file_type in _FILE_TYPES:
+        file_parts = ocf_file_contents.get(file_type)
+        if file_parts:
+            for ocf_object in file_parts["contents"].get("items", []):
+                yield file_type, ocf_object
+
+
+def _condition_graph_issues(vesting_terms: dict) -> list[IntegrityIssue]:
+    """
+    Dangling next_condition_ids / relative_to_condition_ids and cycles in one vesting terms' condition graph
+    """
+    issues = []
+    terms_id = vesting_terms.get("id")
+    conditions = {condition.get("id"): condition for condition in vesting_terms.get("vesting_conditions", [])}
+
+    for condition_id, condition in conditions.items():
+        for next_condition_id in condition.get("next_condition_ids", []):
+            if next_condition_id not in conditions:
+                issues.append(
+                    IntegrityIssue(
+                        "OCF_VESTING_TERMS_FILE",
+                        terms_id,
+                        "next_condition_ids",
+                        next_condition_id,
+                        f"Vesting condition {condition_id} lists unknown next condition {next_condition_id}",
+                    )
+                )
+        relative_to = condition.get("trigger", {}).get("relative_to_condition_id")
+        if relative_to is not None and relative_to not in conditions:
+            issues.append(
+                IntegrityIssue(
+                    "OCF_VESTING_TERMS_FILE",
+                    terms_id,
+                    "relative_to_condition_id",
+                    relative_to,
+                    f"Vesting condition {condition_id} is relative to unknown condition {relative_to}",
+                )
+            )
+
+    # Iterative three-color DFS so deep schedules can't hit the recursion limit
+    visiting, done = 1, 2
+    state: dict[str, int] = {}
+    for root_id in conditions:
+        if root_id in state:
+            continue
+        state[root_id] = visiting
+        stack = [(root_id, iter(conditions[root_id].get("next_condition_ids", [])))]
+        while stack:
+            condition_id, next_ids = stack[-1]
+            for next_id in next_ids:
+                if next_id not in conditions:
+                    continue
+                if state.get(next_id) == visiting:
+                    issues.append(
+                        IntegrityIssue(
+                            "OCF_VESTING_TERMS_FILE",
+                            terms_id,
+                            "next_condition_ids",
+                            next_id,
+                            f"Vesting condition graph has a cycle through {condition_id} -> {next_id}",
+                        )
+                    )
+                elif next_id not in state:
+                    state[next_id] = visiting
+                    stack.append((next_id, iter(conditions[next_id].get("next_condition_ids", []))))
+                    break
+            else:
+                state[condition_id] = done
+                stack.pop()
+
+    return issues
+
+
+def check_ocf_integrity(ocf_file_contents: OcfFileContentsDict | Mapping[str, Any]) -> list[IntegrityIssue]:
+    """
+    Find every dangling reference and vesting condition cycle in an OCF package.
+
+    Args:
+        ocf_file_contents: OcfFileContentsDict, e.g. from package_translated_ce_as_valid_ocf_files_contents() or
+                           OcfPackageReader.to_file_contents()
+
+    Returns: List of IntegrityIssues, empty if the package is consistent
+
+    """
+    # Pass 1 - index every id that can be referenced
+    defined_ids: dict[str, set] = {object_type: set() for object_type in REFERENCEABLE_OBJECT_TYPES}
+    defined_ids["SECURITY"] = set()
+    security_vesting_terms: dict[str, str | None] = {}
+    vesting_condition_ids: dict[str, set] = {}
+    issues: list[IntegrityIssue] = []
+
+    for _, ocf_object in _iter_objects(ocf_file_contents):
+        object_type = ocf_object.get("object_type")
+        if object_type in defined_ids:
+            defined_ids[object_type].add(ocf_object.get("id"))
+        if object_type in ISSUANCE_OBJECT_TYPES:
+            defined_ids["SECURITY"].add(ocf_object.get("security_id"))
+            security_vesting_terms[ocf_object.get("security_id")] = ocf_object.get("vesting_terms_id")
+        elif object_type == "VESTING_TERMS":
+            vesting_condition_ids[ocf_object.get("id")] = {
+                condition.get("id") for condition in ocf_object.get("vesting_conditions", [])
+            }
+            issues.extend(_condition_graph_issues(ocf_object))
+    all_vesting_condition_ids = set().union(*vesting_condition_ids.values())
+
+    # Pass 2 - check references
+    for file_type, ocf_object in _iter_objects(ocf_file_contents):
+        object_id = ocf_object.get("id")
+        object_type = ocf_object.get("object_type", "")
+
+        for field, target_type in REFERENCE_FIELDS.items():
+            references = ocf_object.get(field)
+            if references is None:
+                continue
+            for reference in references if isinstance(references, list) else [references]:
+                if reference not in defined_ids[target_type]:
+                    issues.append(
+                        IntegrityIssue(
+                            file_type, object_id, field, reference, f"{object_type} {object_id} {field} doesn't resolve"
+                        )
+                    )
+
+        # Issuances define their security_id; every other transaction references one
+        if object_type.startswith("TX_") and object_type not in ISSUANCE_OBJECT_TYPES and "security_id" in ocf_object:
+            security_id = ocf_object["security_id"]
+            if security_id not in defined_ids["SECURITY"]:
+                issues.append(
+                    IntegrityIssue(
+                        file_type,
+                        object_id,
+                        "security_id",
+                        security_id,
+                        f"{object_type} {object_id} references unknown security {security_id}",
+                    )
+                )
+
+        if "vesting_condition_id" in ocf_object:
+            condition_id = ocf_object["vesting_condition_id"]
+            # Check against the security's own vesting terms where we know them
+            terms_id = security_vesting_terms.get(ocf_object.get("security_id"))
+            valid_condition_ids = vesting_condition_ids.get(terms_id, all_vesting_condition_ids)
+            if condition_id not in valid_condition_ids:
+                issues.append(
+                    IntegrityIssue(
+                        file_type,
+                        object_id,
+                        "vesting_condition_id",
+                        condition_id,
+                        f"{object_type} {object_id} references unknown vesting condition {condition_id}",
+                    )
+                )
+
+    return issues
+
+
+def assert_ocf_integrity(ocf_file_contents: OcfFileContentsDict | Mapping[str, Any]):
+    """
+    Raise an OCFIntegrityError listing every issue check_ocf_integrity() finds.
+    """
+    issues = check_ocf_integrity(ocf_file_contents)
+    if issues:
+        summary = "; ".join(issue.message for issue in issues[:MAX_REPORTED_ISSUES])
+        more = f" (and {len(issues) - MAX_REPORTED_ISSUES} more)" if len(issues) > MAX_REPORTED_ISSUES else ""
+        msg = f"{len(issues)} referential integrity issue(s): {summary}{more}"
+        raise OCFIntegrityError(msg, issues)
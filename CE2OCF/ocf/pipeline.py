@@ -1,11 +1,38 @@
+import inspect
 import io
+import json
 import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Callable, Optional
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Union,
+)
 
 from CE2OCF import CAP_EXPRESS_ENGINE_VERSION, PARSER_OCF_VERSION
+from CE2OCF.ce.datasheet import normalize_datasheet
 from CE2OCF.datamap import (
+    DEFAULT_CE_TO_OCF_DATAMAP_PREFERRED_STOCK_LEGEND_ONLY_PATH,
+    DEFAULT_CE_TO_OCF_PREFERRED_STOCK_CLASS_ONLY_PATH,
+    OverrideScope,
+    collect_datamap_override_keys,
+    collect_datamap_variable_names,
+    load_ce_to_ocf_issuer_datamap,
+    load_ce_to_ocf_stakeholder_datamap,
+    load_ce_to_ocf_stock_class_datamap,
+    load_ce_to_ocf_stock_legend_datamap,
+    load_ce_to_ocf_stock_plan_datamap,
+    load_ce_to_ocf_vested_issuances_datamap,
+    load_ce_to_ocf_vesting_issuances_datamap,
+    load_vesting_events_driving_enums_datamap,
+    load_vesting_schedule_driving_enums_datamap,
     parse_ocf_issuer_from_ce_jsons,
     parse_ocf_stakeholders_from_ce_json,
     parse_ocf_stock_class_from_ce_jsons,
@@ -14,16 +41,263 @@ from CE2OCF.datamap import (
     parse_ocf_vesting_events_from_ce_json,
     parse_ocf_vesting_schedules_from_ce_json,
     parse_stock_plan_from_ce_jsons,
+    prune_ce_jsons_to_variable_names,
 )
+from CE2OCF.ocf.integrity import assert_ocf_integrity
 from CE2OCF.types.dictionaries import (
     CE2OCFPipelineReturnType,
     ContractExpressVarObj,
     OcfFileContentsDict,
+    OcfFileParts,
+    OcfShardedFileContentsDict,
 )
+from CE2OCF.utils.frozen_utils import encode_ocf_json
 from CE2OCF.utils.hash_utils import (
-    calculate_bytes_hash,
+    calculate_bytes_hash_and_crc32,
     dump_ocf_json_to_bytes,
 )
+from CE2OCF.utils.zip_utils import (
+    PrecompressedZipMember,
+    fits_without_zip64,
+    write_precompressed_zip_archive,
+)
+
+
+class _PipelineSection(NamedTuple):
+    """
+    One parser call made by translate_ce_inc_questionnaire_datasheet_items_to_ocf().
+
+    Args:
+        parser: Parser function, called with the datasheet items and these kwargs
+        pipeline_args: Parser kwarg -> name of the pipeline arg passed for it (custom datamaps and post-processors)
+        value_override_args: Parser value overrides kwarg -> name of the pipeline's value overrides arg, layered over
+                             the global overrides. Same order as the datamaps load_datamaps returns.
+        load_datamaps: Pipeline args -> every datamap the parser traverses
+        parser_kwargs: Fixed kwargs for the parser
+        takes_repetition_workers: Whether to pass repetition_workers through
+    """
+
+    parser: Callable
+    pipeline_args: dict[str, str]
+    value_override_args: dict[str, str]
+    load_datamaps: Callable[[Mapping[str, Any]], list]
+    parser_kwargs: dict[str, Any] = {}
+    takes_repetition_workers: bool = False
+
+
+_PIPELINE_SECTIONS: dict[str, _PipelineSection] = {
+    "issuer": _PipelineSection(
+        parse_ocf_issuer_from_ce_jsons,
+        {"custom_datamap_path": "issuer_ocf_custom_datamap", "post_processors": "issuer_ocf_post_processors"},
+        {"value_overrides": "issuer_value_overrides"},
+        lambda args: [load_ce_to_ocf_issuer_datamap(args["issuer_ocf_custom_datamap"], compiled=True)],
+    ),
+    "common_stock_legend": _PipelineSection(
+        parse_ocf_stock_legend_from_ce_jsons,
+        {
+            "custom_datamap_path": "common_stock_legend_custom_datamap",
+            "post_processors": "common_stock_legend_custom_post_processors",
+        },
+        {"value_overrides": "common_stock_legend_custom_value_overrides"},
+        lambda args: [load_ce_to_ocf_stock_legend_datamap(args["common_stock_legend_custom_datamap"], compiled=True)],
+    ),
+    "pref_stock_legend": _PipelineSection(
+        parse_ocf_stock_legend_from_ce_jsons,
+        {
+            "custom_datamap_path": "pref_stock_legend_custom_datamap",
+            "post_processors": "pref_stock_legend_custom_post_processors",
+        },
+        {"value_overrides": "pref_stock_legend_custom_value_overrides"},
+        lambda args: [
+            load_ce_to_ocf_stock_legend_datamap(
+                args["pref_stock_legend_custom_datamap"] or DEFAULT_CE_TO_OCF_DATAMAP_PREFERRED_STOCK_LEGEND_ONLY_PATH,
+                compiled=True,
+            )
+        ],
+        parser_kwargs={"common_or_preferred": "PREFERRED"},
+    ),
+    "common_stock_class": _PipelineSection(
+        parse_ocf_stock_class_from_ce_jsons,
+        {
+            "custom_datamap_path": "common_stock_class_custom_datamap",
+            "post_processors": "common_stock_class_custom_post_processors",
+        },
+        {"value_overrides": "common_stock_class_custom_value_overrides"},
+        lambda args: [load_ce_to_ocf_stock_class_datamap(args["common_stock_class_custom_datamap"], compiled=True)],
+    ),
+    "pref_stock_class": _PipelineSection(
+        parse_ocf_stock_class_from_ce_jsons,
+        {
+            "custom_datamap_path": "pref_stock_class_custom_datamap",
+            "post_processors": "pref_stock_class_custom_post_processors",
+        },
+        {"value_overrides": "pref_stock_class_custom_value_overrides"},
+        lambda args: [
+            load_ce_to_ocf_stock_class_datamap(
+                args["pref_stock_class_custom_datamap"] or DEFAULT_CE_TO_OCF_PREFERRED_STOCK_CLASS_ONLY_PATH,
+                compiled=True,
+            )
+        ],
+        parser_kwargs={"common_or_preferred": "PREFERRED"},
+    ),
+    "stock_plan": _PipelineSection(
+        parse_stock_plan_from_ce_jsons,
+        {"custom_datamap_path": "stock_plan_custom_datamap", "post_processors": "stock_plan_custom_post_processors"},
+        {"value_overrides": "stock_plan_custom_value_overrides"},
+        lambda args: [load_ce_to_ocf_stock_plan_datamap(args["stock_plan_custom_datamap"], compiled=True)],
+    ),
+    "stakeholders": _PipelineSection(
+        parse_ocf_stakeholders_from_ce_json,
+        {
+            "custom_datamap_path": "stakeholder_custom_datamap",
+            "post_processors": "stakeholder_custom_post_processors",
+        },
+        {"value_overrides": "stakeholder_custom_value_overrides"},
+        lambda args: [load_ce_to_ocf_stakeholder_datamap(args["stakeholder_custom_datamap"], compiled=True)],
+        takes_repetition_workers=True,
+    ),
+    "stock_issuances": _PipelineSection(
+        parse_ocf_stock_issuances_from_ce_json,
+        {
+            "common_datamap_path": "common_stock_issuance_custom_datamap",
+            "common_post_processors": "common_stock_issuance_custom_post_processors",
+            "preferred_datamap_path": "pref_stock_issuance_custom_datamap",
+            "preferred_post_processors": "pref_stock_issuance_custom_post_processors",
+        },
+        {
+            "common_value_overrides": "common_stock_issuance_custom_value_overrides",
+            "preferred_value_overrides": "pref_stock_issuance_custom_value_overrides",
+        },
+        lambda args: [
+            load_ce_to_ocf_vesting_issuances_datamap(args["common_stock_issuance_custom_datamap"], compiled=True),
+            load_ce_to_ocf_vested_issuances_datamap(args["pref_stock_issuance_custom_datamap"], compiled=True),
+        ],
+        takes_repetition_workers=True,
+    ),
+    "vesting_events": _PipelineSection(
+        parse_ocf_vesting_events_from_ce_json,
+        {
+            "custom_datamap_path": "vesting_event_custom_datamap",
+            "post_processors": "vesting_event_custom_post_processors",
+        },
+        {"value_overrides": "vesting_event_custom_value_overrides"},
+        lambda args: [load_vesting_events_driving_enums_datamap(args["vesting_event_custom_datamap"], compiled=True)],
+        takes_repetition_workers=True,
+    ),
+    "vesting_schedules": _PipelineSection(
+        parse_ocf_vesting_schedules_from_ce_json,
+        {
+            "custom_datamap_path": "vesting_schedule_custom_datamap",
+            "post_processors": "vesting_schedule_custom_post_processors",
+        },
+        {"value_overrides": "vesting_schedule_custom_value_overrides"},
+        lambda args: [
+            load_vesting_schedule_driving_enums_datamap(args["vesting_schedule_custom_datamap"], compiled=True)
+        ],
+        takes_repetition_workers=True,
+    ),
+}
+
+
+def _parse_pipeline_section(
+    section: _PipelineSection,
+    datasheet_items: list[ContractExpressVarObj],
+    global_overrides: Mapping[str, Any],
+    args: Mapping[str, Any],
+) -> Any:
+    kwargs = {parser_arg: args[pipeline_arg] for parser_arg, pipeline_arg in section.pipeline_args.items()}
+    kwargs.update(
+        {
+            parser_arg: OverrideScope.layered(global_overrides, args[pipeline_arg])
+            for parser_arg, pipeline_arg in section.value_override_args.items()
+        }
+    )
+    if section.takes_repetition_workers:
+        kwargs["repetition_workers"] = args["repetition_workers"]
+    return section.parser(
+        datasheet_items, use_compiled_datamap=args["use_compiled_datamaps"], **section.parser_kwargs, **kwargs
+    )
+
+
+def _build_global_overrides(
+    formation_date: datetime, currency: str, global_value_overrides: Optional[dict[str, str]]
+) -> OverrideScope:
+    # Passed down into every template so FORMATION_DATE and CURRENCY_TYPE can be set globally
+    return OverrideScope.layered(
+        {
+            "FORMATION_DATE": formation_date.date().isoformat(),
+            "CURRENCY_TYPE": currency,
+            "SEC_LAW_EXEMPTION": "4(a)(2)",
+        },
+        global_value_overrides,
+    )
+
+
+def _assemble_pipeline_return(section_results: Mapping[str, Any]) -> CE2OCFPipelineReturnType:
+    return {
+        "issuer_ocf": section_results["issuer"],
+        "stock_classes_ocf": {
+            "file_type": "OCF_STOCK_CLASSES_FILE",
+            "items": [section_results["pref_stock_class"], section_results["common_stock_class"]],
+        },
+        "stakeholders_ocf": {
+            "file_type": "OCF_STAKEHOLDERS_FILE",
+            "items": section_results["stakeholders"],
+        },
+        "transactions_ocf": {
+            "file_type": "OCF_TRANSACTIONS_FILE",
+            "items": [*section_results["stock_issuances"], *section_results["vesting_events"]],
+        },
+        "stock_plans_ocf": {
+            "file_type": "OCF_STOCK_PLANS_FILE",
+            "items": [section_results["stock_plan"]],
+        },
+        "stock_legends_ocf": {
+            "file_type": "OCF_STOCK_LEGEND_TEMPLATES_FILE",
+            "items": [section_results["pref_stock_legend"], section_results["common_stock_legend"]],
+        },
+        # We don't collect this in incorporation questionnaires for obvious reasons. Most likely you won't need this.
+        "valuations_ocf": {
+            "file_type": "OCF_VALUATIONS_FILE",
+            "items": [],
+        },
+        "vesting_schedules_ocf": {
+            "file_type": "OCF_VESTING_TERMS_FILE",
+            "items": section_results["vesting_schedules"],
+        },
+    }
+
+
+def collect_pipeline_variable_names(
+    issuer_ocf_custom_datamap: Optional[Path] = None,
+    common_stock_class_custom_datamap: Optional[Path] = None,
+    common_stock_legend_custom_datamap: Optional[Path] = None,
+    pref_stock_legend_custom_datamap: Optional[Path] = None,
+    pref_stock_class_custom_datamap: Optional[Path] = None,
+    stock_plan_custom_datamap: Optional[Path] = None,
+    stakeholder_custom_datamap: Optional[Path] = None,
+    common_stock_issuance_custom_datamap: Optional[Path] = None,
+    pref_stock_issuance_custom_datamap: Optional[Path] = None,
+    vesting_event_custom_datamap: Optional[Path] = None,
+    vesting_schedule_custom_datamap: Optional[Path] = None,
+) -> set[str]:
+    """
+    Every CE variable name translate_ce_inc_questionnaire_datasheet_items_to_ocf() can read with these datamaps (see
+    collect_datamap_variable_names()). Custom datamap args match those of
+    translate_ce_inc_questionnaire_datasheet_items_to_ocf() and fall back to the same defaults.
+
+    Returns: Set of CE variable names
+
+    """
+    return _collect_sections_variable_names(dict(locals()))
+
+
+def _collect_sections_variable_names(args: Mapping[str, Any]) -> set[str]:
+    variable_names: set[str] = set()
+    for section in _PIPELINE_SECTIONS.values():
+        for datamap in section.load_datamaps(args):
+            variable_names.update(collect_datamap_variable_names(datamap))
+    return variable_names
 
 
 def translate_ce_inc_questionnaire_datasheet_items_to_ocf(
@@ -64,326 +338,563 @@ def translate_ce_inc_questionnaire_datasheet_items_to_ocf(
     vesting_schedule_custom_post_processors: Optional[dict[str, Callable]] = None,
     vesting_schedule_custom_value_overrides: Optional[dict[str, str]] = None,
     global_value_overrides: Optional[dict[str, str]] = None,
+    prune_datasheet_items: bool = False,
+    extra_variable_names: Optional[Iterable[str]] = None,
+    repetition_workers: Optional[int] = None,
+    use_compiled_datamaps: bool = False,
 ) -> CE2OCFPipelineReturnType:
-    if common_stock_class_custom_value_overrides is None:
-        common_stock_class_custom_value_overrides = {}
+    args = dict(locals())
+    args.pop("datasheet_items")
 
-    if issuer_value_overrides is None:
-        issuer_value_overrides = {}
+    # Opt-in: drop every datasheet item no datamap can read before traversing. Custom post-processors get the pruned
+    # items too, so pass any other variables they read in extra_variable_names.
+    if prune_datasheet_items:
+        datasheet_items = _prune_pipeline_datasheet_items(datasheet_items, [args], extra_variable_names)
 
-    if common_stock_legend_custom_value_overrides is None:
-        common_stock_legend_custom_value_overrides = {}
+    # Index and decode the datasheet once for every parser below
+    datasheet_items = normalize_datasheet(datasheet_items)
 
-    if pref_stock_legend_custom_value_overrides is None:
-        pref_stock_legend_custom_value_overrides = {}
-
-    if common_stock_class_custom_value_overrides is None:
-        common_stock_class_custom_value_overrides = {}
-
-    if pref_stock_class_custom_value_overrides is None:
-        pref_stock_class_custom_value_overrides = {}
+    GLOBAL_OVERRIDES = _build_global_overrides(
+        formation_date if formation_date is not None else datetime.now(tz=timezone.utc),
+        currency,
+        global_value_overrides,
+    )
 
-    if stock_plan_custom_value_overrides is None:
-        stock_plan_custom_value_overrides = {}
+    # Loop over the number of stockholders in the stakeholders datamap (this is safer than checking for repetitions
+    # as, oddly, I see 4 repetitions (with blank values) where I have specified NumberStockholders = 2. Must be
+    # something hard-coded somewhere. You can go above 4, though, which is good, so the safe bet is just to check
+    # NumberStockholders and drive data extraction logic based on that value
+
+    # Vesting schedules need {'vesting_schedule': generate_ocf_vesting_schedule_from_vesting_drivers} registered, which
+    # parse_ocf_vesting_schedules_from_ce_json() does
+    return _assemble_pipeline_return(
+        {
+            name: _parse_pipeline_section(section, datasheet_items, GLOBAL_OVERRIDES, args)
+            for name, section in _PIPELINE_SECTIONS.items()
+        }
+    )
 
-    if stakeholder_custom_value_overrides is None:
-        stakeholder_custom_value_overrides = {}
 
-    if common_stock_issuance_custom_value_overrides is None:
-        common_stock_issuance_custom_value_overrides = {}
+# Pipeline args that shape the datasheet every scenario shares
+_SHARED_DATASHEET_ARGS = ("prune_datasheet_items", "extra_variable_names")
 
-    if pref_stock_issuance_custom_value_overrides is None:
-        pref_stock_issuance_custom_value_overrides = {}
 
-    if vesting_schedule_custom_value_overrides is None:
-        vesting_schedule_custom_value_overrides = {}
+def translate_ce_inc_questionnaire_scenarios_to_ocf(
+    datasheet_items: list[ContractExpressVarObj],
+    scenarios: Iterable[Mapping[str, Any]],
+    **pipeline_kwargs: Any,
+) -> list[CE2OCFPipelineReturnType]:
+    """
+    Translate one datasheet under several override variants - e.g. different formation dates, currencies or
+    global_value_overrides - without re-parsing what the variants have in common. Each result is what
+    translate_ce_inc_questionnaire_datasheet_items_to_ocf(datasheet_items, **pipeline_kwargs, **scenario) returns.
 
-    if vesting_event_custom_value_overrides is None:
-        vesting_event_custom_value_overrides = {}
+    The datasheet is pruned and indexed once. Each pipeline section (issuer, stock legends, stock classes, stock plan,
+    stakeholders, stock issuances, vesting events, vesting schedules) is parsed again only for a scenario whose
+    custom datamaps, post-processors or values for the override keys its datamaps can read (see
+    collect_datamap_override_keys()) differ from every scenario parsed before it. A formation date variant only
+    re-parses the sections that read FORMATION_DATE, for instance, and shares the stakeholders parsed for the first
+    scenario.
 
-    if global_value_overrides is None:
-        global_value_overrides = {}
+    Shared sections are the same objects in every result they appear in, so copy a result before modifying it.
 
-    # Pass these down into every template so FORMATION_DATE and CURRENCY_TYPE can be set globally
-    GLOBAL_OVERRIDES = {
-        "FORMATION_DATE": (formation_date if formation_date is not None else datetime.now(tz=timezone.utc))
-        .date()
-        .isoformat(),
-        "CURRENCY_TYPE": currency,
-        "SEC_LAW_EXEMPTION": "4(a)(2)",
-        **global_value_overrides,
-    }
+    Args:
+        datasheet_items: List of ContractExpressVarObjs shared by every scenario
+        scenarios: translate_ce_inc_questionnaire_datasheet_items_to_ocf() kwargs for each variant, applied over
+                   pipeline_kwargs. prune_datasheet_items and extra_variable_names shape the shared datasheet, so they
+                   can only be passed in pipeline_kwargs.
+        **pipeline_kwargs: translate_ce_inc_questionnaire_datasheet_items_to_ocf() kwargs shared by every scenario
 
-    issuer_ocf = parse_ocf_issuer_from_ce_jsons(
-        datasheet_items,
-        custom_datamap_path=issuer_ocf_custom_datamap,
-        post_processors=issuer_ocf_post_processors,
-        value_overrides={**GLOBAL_OVERRIDES, **issuer_value_overrides},
-    )
+    Returns: One pipeline result per scenario, in order. Package each with
+             package_translated_ce_as_valid_ocf_files_contents().
 
-    common_stock_legend_ocf = parse_ocf_stock_legend_from_ce_jsons(
-        datasheet_items,
-        post_processors=common_stock_legend_custom_post_processors,
-        custom_datamap_path=common_stock_legend_custom_datamap,
-        value_overrides={**GLOBAL_OVERRIDES, **common_stock_legend_custom_value_overrides},
-    )
-    pref_stock_legend_ocf = parse_ocf_stock_legend_from_ce_jsons(
-        datasheet_items,
-        common_or_preferred="PREFERRED",
-        post_processors=pref_stock_legend_custom_post_processors,
-        custom_datamap_path=pref_stock_legend_custom_datamap,
-        value_overrides={**GLOBAL_OVERRIDES, **pref_stock_legend_custom_value_overrides},
-    )
-    stock_legends_ocf = {
-        "file_type": "OCF_STOCK_LEGEND_TEMPLATES_FILE",
-        "items": [pref_stock_legend_ocf, common_stock_legend_ocf],
+    """
+    pipeline_defaults = {
+        name: parameter.default
+        for name, parameter in inspect.signature(
+            translate_ce_inc_questionnaire_datasheet_items_to_ocf
+        ).parameters.items()
+        if name != "datasheet_items"
     }
 
-    common_stock_class_ocf = parse_ocf_stock_class_from_ce_jsons(
-        datasheet_items,
-        custom_datamap_path=common_stock_class_custom_datamap,
-        post_processors=common_stock_class_custom_post_processors,
-        value_overrides={**GLOBAL_OVERRIDES, **common_stock_class_custom_value_overrides},
-    )
-    pref_stock_class_ocf = parse_ocf_stock_class_from_ce_jsons(
-        datasheet_items,
-        common_or_preferred="PREFERRED",
-        custom_datamap_path=pref_stock_class_custom_datamap,
-        post_processors=pref_stock_class_custom_post_processors,
-        value_overrides={**GLOBAL_OVERRIDES, **pref_stock_class_custom_value_overrides},
-    )
-    stock_classes_ocf = {
-        "file_type": "OCF_STOCK_CLASSES_FILE",
-        "items": [pref_stock_class_ocf, common_stock_class_ocf],
-    }
+    unknown_args = set(pipeline_kwargs) - set(pipeline_defaults)
+    if unknown_args:
+        msg = f"Unknown pipeline args: {sorted(unknown_args)}"
+        raise ValueError(msg)
+
+    # Variants that don't set formation_date all get the same "now", like a single pipeline run
+    now = datetime.now(tz=timezone.utc)
+    scenario_args = []
+    for scenario in scenarios:
+        unknown_args = set(scenario) - set(pipeline_defaults)
+        if unknown_args:
+            msg = f"Unknown pipeline args in scenario: {sorted(unknown_args)}"
+            raise ValueError(msg)
+        shared_args = [arg for arg in _SHARED_DATASHEET_ARGS if arg in scenario]
+        if shared_args:
+            msg = f"{shared_args} apply to the datasheet every scenario shares - pass them as pipeline kwargs"
+            raise ValueError(msg)
 
-    stock_plans_ocf = {
-        "file_type": "OCF_STOCK_PLANS_FILE",
-        "items": [
-            parse_stock_plan_from_ce_jsons(
-                datasheet_items,
-                custom_datamap_path=stock_plan_custom_datamap,
-                post_processors=stock_plan_custom_post_processors,
-                value_overrides={
-                    **GLOBAL_OVERRIDES,
-                    **stock_plan_custom_value_overrides,
-                },
+        args = {**pipeline_defaults, **pipeline_kwargs, **scenario}
+        if args["formation_date"] is None:
+            args["formation_date"] = now
+        scenario_args.append(args)
+
+    if pipeline_kwargs.get("prune_datasheet_items"):
+        datasheet_items = _prune_pipeline_datasheet_items(
+            datasheet_items, scenario_args, pipeline_kwargs.get("extra_variable_names")
+        )
+    datasheet_items = normalize_datasheet(datasheet_items)
+
+    # (section name, custom datamap args) -> override keys of each of the section's datamaps
+    override_keys: dict[tuple, list[set[str]]] = {}
+    # Section name -> (what the section's result depends on, result) for every distinct variant parsed so far
+    parsed_sections: dict[str, list[tuple[tuple, Any]]] = {name: [] for name in _PIPELINE_SECTIONS}
+
+    results = []
+    for args in scenario_args:
+        global_overrides = _build_global_overrides(
+            args["formation_date"], args["currency"], args["global_value_overrides"]
+        )
+
+        section_results = {}
+        for name, section in _PIPELINE_SECTIONS.items():
+            section_args = [args[pipeline_arg] for pipeline_arg in section.pipeline_args.values()]
+            datamaps_key = (
+                name,
+                *[
+                    args[pipeline_arg]
+                    for pipeline_arg in section.pipeline_args.values()
+                    if pipeline_arg.endswith("_datamap")
+                ],
+            )
+            if datamaps_key not in override_keys:
+                override_keys[datamaps_key] = [
+                    collect_datamap_override_keys(datamap) for datamap in section.load_datamaps(args)
+                ]
+
+            overrides = [
+                OverrideScope.layered(global_overrides, args[pipeline_arg])
+                for pipeline_arg in section.value_override_args.values()
+            ]
+            dependencies = (
+                section_args,
+                [
+                    {key: scope[key] for key in keys if key in scope}
+                    for keys, scope in zip(override_keys[datamaps_key], overrides)
+                ],
             )
-        ],
-    }
-
-    # logger.debug("\n----- Stakeholder Information -----------------------")
-
-    # Loop over the number of stockholders (this is safer than checking for repetitions as, oddly, I see 4 repetitions
-    # (with blank values) where I have specified NumberStockholders = 2. Must be something hard-coded somewhere. You
-    # can go above 4, though, which is good, so the safe bet is just to check NumberStockholders and drive data
-    # extraction logic based on that value
-
-    stakeholders_ocf = {
-        "file_type": "OCF_STAKEHOLDERS_FILE",
-        "items": parse_ocf_stakeholders_from_ce_json(
-            datasheet_items,
-            custom_datamap_path=stakeholder_custom_datamap,
-            post_processors=stakeholder_custom_post_processors,
-            value_overrides={**GLOBAL_OVERRIDES, **stakeholder_custom_value_overrides},
-        ),
-    }
 
-    issuance_event_ocf = parse_ocf_stock_issuances_from_ce_json(
-        datasheet_items,
-        common_datamap_path=common_stock_issuance_custom_datamap,
-        common_post_processors=common_stock_issuance_custom_post_processors,
-        common_value_overrides={**GLOBAL_OVERRIDES, **common_stock_issuance_custom_value_overrides},
-        preferred_datamap_path=pref_stock_issuance_custom_datamap,
-        preferred_post_processors=pref_stock_issuance_custom_post_processors,
-        preferred_value_overrides={**GLOBAL_OVERRIDES, **pref_stock_issuance_custom_value_overrides},
-    )
-    vesting_event_ocf = parse_ocf_vesting_events_from_ce_json(
-        datasheet_items,
-        post_processors=vesting_event_custom_post_processors,
-        custom_datamap_path=vesting_event_custom_datamap,
-        value_overrides={**GLOBAL_OVERRIDES, **vesting_event_custom_value_overrides},
-    )
-    transactions_ocf = {
-        "file_type": "OCF_TRANSACTIONS_FILE",
-        "items": [*issuance_event_ocf, *vesting_event_ocf],
-    }
+            for parsed_dependencies, result in parsed_sections[name]:
+                if parsed_dependencies == dependencies:
+                    section_results[name] = result
+                    break
+            else:
+                section_results[name] = _parse_pipeline_section(section, datasheet_items, global_overrides, args)
+                parsed_sections[name].append((dependencies, section_results[name]))
 
-    # Need to register {'vesting_schedule': generate_ocf_vesting_schedule_from_vesting_drivers},
-    vesting_schedules_ocf = {
-        "file_type": "OCF_VESTING_TERMS_FILE",
-        "items": parse_ocf_vesting_schedules_from_ce_json(
-            datasheet_items,
-            post_processors=vesting_schedule_custom_post_processors,
-            custom_datamap_path=vesting_schedule_custom_datamap,
-            value_overrides={**GLOBAL_OVERRIDES, **vesting_schedule_custom_value_overrides},
-        ),
-    }
+        results.append(_assemble_pipeline_return(section_results))
 
-    # We don't collect this in incorporation questionnaires for obvious reasons. Most likely you won't need this.
-    valuations_ocf = {
-        "file_type": "OCF_VALUATIONS_FILE",
-        "items": [],
-    }
+    return results
 
-    # logger.debug("Returning ocf file contents...")
 
+def _prune_pipeline_datasheet_items(
+    datasheet_items: list[ContractExpressVarObj],
+    pipeline_args: Iterable[Mapping[str, Any]],
+    extra_variable_names: Optional[Iterable[str]],
+) -> list[ContractExpressVarObj]:
+    # Keep every item any of these pipeline configurations' datamaps can read
+    variable_names: set[str] = set()
+    for args in pipeline_args:
+        variable_names.update(_collect_sections_variable_names(args))
+    if extra_variable_names is not None:
+        variable_names.update(extra_variable_names)
+    return prune_ce_jsons_to_variable_names(datasheet_items, variable_names)
+
+
+def _build_manifest_json_contents(
+    ocf_obj: CE2OCFPipelineReturnType,
+    additional_comments: list[str],
+    manifest_file_lists: dict[str, list[dict]],
+) -> dict:
     return {
-        "issuer_ocf": issuer_ocf,
-        "stock_classes_ocf": stock_classes_ocf,
-        "stakeholders_ocf": stakeholders_ocf,
-        "transactions_ocf": transactions_ocf,
-        "stock_plans_ocf": stock_plans_ocf,
-        "stock_legends_ocf": stock_legends_ocf,
-        "valuations_ocf": valuations_ocf,
-        "vesting_schedules_ocf": vesting_schedules_ocf,
+        "file_type": "OCF_MANIFEST_FILE",
+        "ocf_version": PARSER_OCF_VERSION,
+        "issuer": ocf_obj["issuer_ocf"],
+        "as_of": datetime.now(tz=timezone.utc).date().isoformat(),
+        "generated_at": datetime.now(tz=timezone.utc).isoformat(),
+        "comments": [
+            f"Auto-generated by Gunderson Dettmer Contract Express Parser v{CAP_EXPRESS_ENGINE_VERSION}",
+            *additional_comments,
+        ],
+        **manifest_file_lists,
     }
 
 
 def package_translated_ce_as_valid_ocf_files_contents(
-    ocf_obj: CE2OCFPipelineReturnType, additional_comments: Optional[list[str]] = None
+    ocf_obj: CE2OCFPipelineReturnType,
+    additional_comments: Optional[list[str]] = None,
+    check_integrity: bool = False,
 ) -> OcfFileContentsDict:
+    """
+    Serialize pipeline output into OCF files and build the manifest for them.
+
+    Args:
+        ocf_obj: Output of translate_ce_inc_questionnaire_datasheet_items_to_ocf()
+        additional_comments: Extra comments for the manifest
+        check_integrity: If True, raise an OCFIntegrityError if any reference between the generated objects doesn't
+                         resolve (see CE2OCF.ocf.integrity.check_ocf_integrity())
+
+    Returns: OcfFileContentsDict
+
+    """
     if additional_comments is None:
         additional_comments = []
 
     stakeholders_file_path = "stakeholders.ocf.json"
     stakeholders_file_json_contents = ocf_obj["stakeholders_ocf"]
     stakeholders_file_bytes = dump_ocf_json_to_bytes(stakeholders_file_json_contents)
-    stakeholders_file_md5 = calculate_bytes_hash(stakeholders_file_bytes)
+    stakeholders_file_md5, stakeholders_file_crc32 = calculate_bytes_hash_and_crc32(stakeholders_file_bytes)
 
     stock_classes_file_path = "stock_classes.ocf.json"
     stock_classes_file_json_contents = ocf_obj["stock_classes_ocf"]
     stock_classes_file_bytes = dump_ocf_json_to_bytes(stock_classes_file_json_contents)
-    stock_classes_file_md5 = calculate_bytes_hash(stock_classes_file_bytes)
+    stock_classes_file_md5, stock_classes_file_crc32 = calculate_bytes_hash_and_crc32(stock_classes_file_bytes)
 
     stock_legends_file_path = "stock_legends.ocf.json"
     stock_legends_file_json_contents = ocf_obj["stock_legends_ocf"]
     stock_legends_file_bytes = dump_ocf_json_to_bytes(stock_legends_file_json_contents)
-    stock_legends_file_md5 = calculate_bytes_hash(stock_legends_file_bytes)
+    stock_legends_file_md5, stock_legends_file_crc32 = calculate_bytes_hash_and_crc32(stock_legends_file_bytes)
 
     stock_plans_file_path = "stock_plans.ocf.json"
     stock_plans_file_json_contents = ocf_obj["stock_plans_ocf"]
     stock_plans_file_bytes = dump_ocf_json_to_bytes(stock_plans_file_json_contents)
-    stock_plans_file_md5 = calculate_bytes_hash(stock_plans_file_bytes)
+    stock_plans_file_md5, stock_plans_file_crc32 = calculate_bytes_hash_and_crc32(stock_plans_file_bytes)
 
     transactions_file_path = "transactions.ocf.json"
     transactions_file_json_contents = ocf_obj["transactions_ocf"]
     transactions_file_bytes = dump_ocf_json_to_bytes(transactions_file_json_contents)
-    transactions_file_md5 = calculate_bytes_hash(transactions_file_bytes)
+    transactions_file_md5, transactions_file_crc32 = calculate_bytes_hash_and_crc32(transactions_file_bytes)
 
     vesting_schedules_file_path = "vesting_schedules.ocf.json"
     vesting_schedules_file_json_contents = ocf_obj["vesting_schedules_ocf"]
     vesting_schedules_file_bytes = dump_ocf_json_to_bytes(vesting_schedules_file_json_contents)
-    vesting_schedules_file_md5 = calculate_bytes_hash(vesting_schedules_file_bytes)
+    vesting_schedules_file_md5, vesting_schedules_file_crc32 = calculate_bytes_hash_and_crc32(
+        vesting_schedules_file_bytes
+    )
 
     valuations_file_path = "valuations.ocf.json"
     valuations_file_json_contents = ocf_obj["valuations_ocf"]
     valuations_file_bytes = dump_ocf_json_to_bytes(valuations_file_json_contents)
-    valuations_file_md5 = calculate_bytes_hash(valuations_file_bytes)
+    valuations_file_md5, valuations_file_crc32 = calculate_bytes_hash_and_crc32(valuations_file_bytes)
 
     manifest_file_path = "manifest.ocf.json"
-    manifest_file_json_contents = {
-        "file_type": "OCF_MANIFEST_FILE",
-        "ocf_version": PARSER_OCF_VERSION,
-        "issuer": ocf_obj["issuer_ocf"],
-        "as_of": datetime.now(tz=timezone.utc).date().isoformat(),
-        "generated_at": datetime.now(tz=timezone.utc).isoformat(),
-        "comments": [
-            f"Auto-generated by Gunderson Dettmer Contract Express Parser v{CAP_EXPRESS_ENGINE_VERSION}",
-            *additional_comments,
-        ],
-        "stock_plans_files": [{"filepath": stock_plans_file_path, "md5": stock_plans_file_md5}],
-        "stock_legend_templates_files": [{"filepath": stock_legends_file_path, "md5": stock_legends_file_md5}],
-        "stock_classes_files": [{"filepath": stock_classes_file_path, "md5": stock_classes_file_md5}],
-        "vesting_terms_files": [{"filepath": vesting_schedules_file_path, "md5": vesting_schedules_file_md5}],
-        "valuations_files": [],
-        "transactions_files": [{"filepath": transactions_file_path, "md5": transactions_file_md5}],
-        "stakeholders_files": [{"filepath": stakeholders_file_path, "md5": stakeholders_file_md5}],
-    }
+    manifest_file_json_contents = _build_manifest_json_contents(
+        ocf_obj,
+        additional_comments,
+        {
+            "stock_plans_files": [{"filepath": stock_plans_file_path, "md5": stock_plans_file_md5}],
+            "stock_legend_templates_files": [{"filepath": stock_legends_file_path, "md5": stock_legends_file_md5}],
+            "stock_classes_files": [{"filepath": stock_classes_file_path, "md5": stock_classes_file_md5}],
+            "vesting_terms_files": [{"filepath": vesting_schedules_file_path, "md5": vesting_schedules_file_md5}],
+            "valuations_files": [],
+            "transactions_files": [{"filepath": transactions_file_path, "md5": transactions_file_md5}],
+            "stakeholders_files": [{"filepath": stakeholders_file_path, "md5": stakeholders_file_md5}],
+        },
+    )
     manifest_file_bytes = dump_ocf_json_to_bytes(manifest_file_json_contents)
-    manifest_file_md5 = calculate_bytes_hash(manifest_file_bytes)
+    manifest_file_md5, manifest_file_crc32 = calculate_bytes_hash_and_crc32(manifest_file_bytes)
 
-    return {
+    ocf_files_contents: OcfFileContentsDict = {
         "OCF_STAKEHOLDERS_FILE": {
             "file_name": stakeholders_file_path,
             "contents": stakeholders_file_json_contents,
             "bytes": stakeholders_file_bytes,
             "md5": stakeholders_file_md5,
+            "crc32": stakeholders_file_crc32,
         },
         "OCF_STOCK_CLASSES_FILE": {
             "file_name": stock_classes_file_path,
             "contents": stock_classes_file_json_contents,
-            "bytes": dump_ocf_json_to_bytes(stock_classes_file_json_contents),
+            "bytes": stock_classes_file_bytes,
             "md5": stock_classes_file_md5,
+            "crc32": stock_classes_file_crc32,
         },
         "OCF_STOCK_LEGEND_TEMPLATES_FILE": {
             "file_name": stock_legends_file_path,
             "contents": stock_legends_file_json_contents,
             "bytes": stock_legends_file_bytes,
             "md5": stock_legends_file_md5,
+            "crc32": stock_legends_file_crc32,
         },
         "OCF_STOCK_PLANS_FILE": {
             "file_name": stock_plans_file_path,
             "contents": stock_plans_file_json_contents,
             "bytes": stock_plans_file_bytes,
             "md5": stock_plans_file_md5,
+            "crc32": stock_plans_file_crc32,
         },
         "OCF_TRANSACTIONS_FILE": {
             "file_name": transactions_file_path,
             "contents": transactions_file_json_contents,
             "bytes": transactions_file_bytes,
             "md5": transactions_file_md5,
+            "crc32": transactions_file_crc32,
         },
         "OCF_VALUATIONS_FILE": {
             "file_name": valuations_file_path,
             "contents": valuations_file_json_contents,
             "bytes": valuations_file_bytes,
             "md5": valuations_file_md5,
+            "crc32": valuations_file_crc32,
         },
         "OCF_VESTING_TERMS_FILE": {
             "file_name": vesting_schedules_file_path,
             "contents": vesting_schedules_file_json_contents,
             "bytes": vesting_schedules_file_bytes,
             "md5": vesting_schedules_file_md5,
+            "crc32": vesting_schedules_file_crc32,
         },
         "OCF_MANIFEST_FILE": {
             "file_name": manifest_file_path,
             "contents": manifest_file_json_contents,
             "bytes": manifest_file_bytes,
             "md5": manifest_file_md5,
+            "crc32": manifest_file_crc32,
         },
     }
 
+    if check_integrity:
+        assert_ocf_integrity(ocf_files_contents)
+
+    return ocf_files_contents
+
+
+# zlib compression levels, from none to smallest
+MIN_ZIP_COMPRESSLEVEL = 0
+MAX_ZIP_COMPRESSLEVEL = 9
+
+# file_type -> (key in pipeline output, file name stem, manifest key listing its files)
+OCF_FILE_TYPE_LAYOUT = {
+    "OCF_STAKEHOLDERS_FILE": ("stakeholders_ocf", "stakeholders", "stakeholders_files"),
+    "OCF_STOCK_CLASSES_FILE": ("stock_classes_ocf", "stock_classes", "stock_classes_files"),
+    "OCF_STOCK_LEGEND_TEMPLATES_FILE": ("stock_legends_ocf", "stock_legends", "stock_legend_templates_files"),
+    "OCF_STOCK_PLANS_FILE": ("stock_plans_ocf", "stock_plans", "stock_plans_files"),
+    "OCF_TRANSACTIONS_FILE": ("transactions_ocf", "transactions", "transactions_files"),
+    "OCF_VALUATIONS_FILE": ("valuations_ocf", "valuations", "valuations_files"),
+    "OCF_VESTING_TERMS_FILE": ("vesting_schedules_ocf", "vesting_schedules", "vesting_terms_files"),
+}
+
+
+_SHARD_ITEM_SEPARATOR = ", "
+
+
+def _encode_items(items: list[dict]) -> list[str]:
+    return [encode_ocf_json(item) for item in items]
+
+
+def _shard_envelope(file_type: str) -> tuple[str, str]:
+    # Everything in a shard file around its items - dump_ocf_json_to_bytes({"file_type": file_type, "items": [...]})
+    return f'{{"file_type": {json.dumps(file_type)}, "items": [', "]}"
+
+
+def _shard_ranges(
+    file_type: str, encoded_items: list[str], max_items_per_file: Optional[int], max_bytes_per_file: Optional[int]
+) -> list[tuple[int, int]]:
+    # A shard always gets at least one item, so a single item that doesn't fit under max_bytes_per_file gets a file to
+    # itself
+    envelope_bytes = sum(len(part.encode()) for part in _shard_envelope(file_type))
+    ranges = []
+    start, shard_bytes = 0, envelope_bytes
+    for index, encoded_item in enumerate(encoded_items):
+        item_bytes = len(encoded_item) if encoded_item.isascii() else len(encoded_item.encode())
+        if index > start:
+            item_bytes += len(_SHARD_ITEM_SEPARATOR)
+            if (max_items_per_file is not None and index - start >= max_items_per_file) or (
+                max_bytes_per_file is not None and shard_bytes + item_bytes > max_bytes_per_file
+            ):
+                ranges.append((start, index))
+                start, shard_bytes = index, envelope_bytes
+                item_bytes -= len(_SHARD_ITEM_SEPARATOR)
+        shard_bytes += item_bytes
+    ranges.append((start, len(encoded_items)))
+    return ranges
+
+
+def _serialize_shard(file_type: str, file_name: str, items: list[dict], encoded_items: list[str]) -> OcfFileParts:
+    # Same bytes as dump_ocf_json_to_bytes({"file_type": file_type, "items": items}) without re-encoding the items
+    envelope_start, envelope_end = _shard_envelope(file_type)
+    file_bytes = (envelope_start + _SHARD_ITEM_SEPARATOR.join(encoded_items) + envelope_end).encode()
+    md5, crc32 = calculate_bytes_hash_and_crc32(file_bytes)
+    return {
+        "file_name": file_name,
+        "contents": {"file_type": file_type, "items": items},
+        "bytes": file_bytes,
+        "md5": md5,
+        "crc32": crc32,
+    }
+
+
+def package_translated_ce_as_sharded_ocf_files_contents(
+    ocf_obj: CE2OCFPipelineReturnType,
+    additional_comments: Optional[list[str]] = None,
+    max_items_per_file: Optional[int] = None,
+    max_bytes_per_file: Optional[int] = None,
+    max_workers: Optional[int] = None,
+) -> OcfShardedFileContentsDict:
+    """
+    Like package_translated_ce_as_valid_ocf_files_contents(), but splits each type of file into as many files as it
+    takes to stay under max_items_per_file items / max_bytes_per_file bytes and lists every one in the manifest.
+
+    Types that fit in one file keep their usual file name (e.g. transactions.ocf.json); split types are numbered
+    (transactions-1.ocf.json, transactions-2.ocf.json, ...). As with the unsharded package, an empty valuations file
+    isn't listed in the manifest.
+
+    Args:
+        ocf_obj: Output of translate_ce_inc_questionnaire_datasheet_items_to_ocf()
+        additional_comments: Extra comments for the manifest
+        max_items_per_file: Most items in any one file. None for no limit.
+        max_bytes_per_file: Most bytes in any one file, unless a file with a single item is bigger. The manifest is
+                            never split and isn't held to this limit. None for no limit.
+        max_workers: Threads used to serialize and hash files. None for the ThreadPoolExecutor default.
+
+    Returns: OcfShardedFileContentsDict mapping each file type to its files in manifest order. The manifest is the one
+             OCF_MANIFEST_FILE entry.
+
+    """
+    if additional_comments is None:
+        additional_comments = []
+    for limit_name, limit in (("max_items_per_file", max_items_per_file), ("max_bytes_per_file", max_bytes_per_file)):
+        if limit is not None and limit < 1:
+            msg = f"{limit_name} must be at least 1, got {limit}"
+            raise ValueError(msg)
+
+    sharded_files: dict[str, list[OcfFileParts]] = {}
+    manifest_file_lists: dict[str, list[dict]] = {}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        items_by_file_type = {
+            file_type: ocf_obj[pipeline_key]["items"]  # type: ignore
+            for file_type, (pipeline_key, _, _) in OCF_FILE_TYPE_LAYOUT.items()
+        }
+        encoded_items_by_file_type = dict(
+            zip(items_by_file_type, executor.map(_encode_items, items_by_file_type.values()))
+        )
+
+        shard_futures = {}
+        for file_type, (_, file_stem, _) in OCF_FILE_TYPE_LAYOUT.items():
+            items = items_by_file_type[file_type]
+            encoded_items = encoded_items_by_file_type[file_type]
+            ranges = _shard_ranges(file_type, encoded_items, max_items_per_file, max_bytes_per_file)
+            file_names = (
+                [f"{file_stem}.ocf.json"]
+                if len(ranges) == 1
+                else [f"{file_stem}-{number}.ocf.json" for number in range(1, len(ranges) + 1)]
+            )
+            shard_futures[file_type] = [
+                executor.submit(_serialize_shard, file_type, file_name, items[start:end], encoded_items[start:end])
+                for file_name, (start, end) in zip(file_names, ranges)
+            ]
+
+        for file_type, futures in shard_futures.items():
+            shards = [future.result() for future in futures]
+            sharded_files[file_type] = shards
+            _, _, manifest_key = OCF_FILE_TYPE_LAYOUT[file_type]
+            manifest_file_lists[manifest_key] = (
+                []
+                if file_type == "OCF_VALUATIONS_FILE" and not items_by_file_type[file_type]
+                else [{"filepath": shard["file_name"], "md5": shard["md5"]} for shard in shards]
+            )
+
+    manifest_file_json_contents = _build_manifest_json_contents(ocf_obj, additional_comments, manifest_file_lists)
+    manifest_file_bytes = dump_ocf_json_to_bytes(manifest_file_json_contents)
+    manifest_file_md5, manifest_file_crc32 = calculate_bytes_hash_and_crc32(manifest_file_bytes)
+    sharded_files["OCF_MANIFEST_FILE"] = [
+        {
+            "file_name": "manifest.ocf.json",
+            "contents": manifest_file_json_contents,
+            "bytes": manifest_file_bytes,
+            "md5": manifest_file_md5,
+            "crc32": manifest_file_crc32,
+        }
+    ]
+
+    return sharded_files  # type: ignore
+
+
+def _compress_zip_member(
+    file_parts: OcfFileParts, compression: int, compresslevel: Optional[int]
+) -> PrecompressedZipMember:
+    # zlib releases the GIL while compressing, so members really do compress in parallel across threads. The CRC
+    # comes from the file parts when they were hashed, so the bytes are only read once more, to compress them.
+    file_bytes = file_parts["bytes"]
+    crc32 = file_parts["crc32"] if "crc32" in file_parts else zlib.crc32(file_bytes)
+    if compression == zipfile.ZIP_DEFLATED:
+        compressor = zlib.compressobj(
+            zlib.Z_DEFAULT_COMPRESSION if compresslevel is None else compresslevel, zlib.DEFLATED, -zlib.MAX_WBITS
+        )
+        file_bytes = compressor.compress(file_bytes) + compressor.flush()
+    return PrecompressedZipMember(file_parts["file_name"], len(file_parts["bytes"]), crc32, file_bytes)
+
 
 def package_ocf_files_contents_into_zip_archive(
-    ocf_file_contents: OcfFileContentsDict,
+    ocf_file_contents: Union[OcfFileContentsDict, OcfShardedFileContentsDict],
+    compression: int = zipfile.ZIP_DEFLATED,
+    compresslevel: Optional[int] = None,
+    max_workers: Optional[int] = None,
 ) -> bytes:
     """
 
     Args:
-        ocf_file_contents: Dict mapping ocf file type enums to OcfFileParts Dict:
+        ocf_file_contents: Dict mapping ocf file type enums to OcfFileParts Dict (or, for sharded packages, lists of
+            them):
 
             class OcfFileParts(TypedDict):
                 file_name: str
                 contents: dict
                 bytes: bytes
                 md5: str
+                crc32: int  # optional, computed here if missing
+
+        compression: zipfile.ZIP_DEFLATED (default) or zipfile.ZIP_STORED to skip compression, e.g. for internal
+                     transfers where archive size doesn't matter
+        compresslevel: zlib level for ZIP_DEFLATED, 0 (none) - 9 (smallest). None for zlib's default.
+        max_workers: If set, compress members in this many threads. Worth it for packages with several large files.
 
     Returns:
 
     """
+    if compression not in (zipfile.ZIP_DEFLATED, zipfile.ZIP_STORED):
+        msg = f"Unsupported compression {compression}, expected zipfile.ZIP_DEFLATED or zipfile.ZIP_STORED"
+        raise ValueError(msg)
+    if compresslevel is not None and not MIN_ZIP_COMPRESSLEVEL <= compresslevel <= MAX_ZIP_COMPRESSLEVEL:
+        msg = f"compresslevel must be between {MIN_ZIP_COMPRESSLEVEL} and {MAX_ZIP_COMPRESSLEVEL}, got {compresslevel}"
+        raise ValueError(msg)
+
+    members: list[OcfFileParts] = []
+    for _, file_parts in ocf_file_contents.items():
+        for contents in file_parts if isinstance(file_parts, list) else [file_parts]:
+            if not isinstance(contents, dict):
+                msg = f"Expected OcfFileParts, got {type(contents)}"
+                raise ValueError(msg)
+            members.append(contents)
+
+    # Members are compressed here, using the CRC-32 computed when each file was hashed, and written out with the
+    # headers ZipFile.writestr() would have written
+    if max_workers is None:
+        compressed_members = [_compress_zip_member(member, compression, compresslevel) for member in members]
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            compressed_members = list(
+                executor.map(lambda member: _compress_zip_member(member, compression, compresslevel), members)
+            )
 
-    zip_bytes = io.BytesIO()
-    zip_file = zipfile.ZipFile(zip_bytes, mode="w", compression=zipfile.ZIP_DEFLATED)
+    if fits_without_zip64(compressed_members):
+        return write_precompressed_zip_archive(compressed_members, compression)
 
-    for _, contents in ocf_file_contents.items():
-        if not isinstance(contents, dict):
-            msg = f"Expected OcfFileParts, got {type(contents)}"
-            raise ValueError(msg)
-        file_name = contents["file_name"]
-        bytes_content = contents["bytes"]
-        zip_file.writestr(file_name, bytes_content)
-
-    zip_file.close()
-    zip_bytes.seek(0)
+    # Multi-gigabyte packages need ZIP64 records, which zipfile knows how to write
+    zip_bytes = io.BytesIO()
+    with zipfile.ZipFile(zip_bytes, mode="w", compression=compression, compresslevel=compresslevel) as zip_file:
+        for member in members:
+            zip_file.writestr(member["file_name"], member["bytes"])
     return zip_bytes.getvalue()
@@ -4,14 +4,19 @@ converting dates, phone numbers, province codes, and more.
 """
 from __future__ import annotations
 
-import datetime
-
-import phonenumbers
-import us
+import functools
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, NamedTuple
 
+from CE2OCF.ce.datasheet import ce_value_as_date
+from CE2OCF.datamap.definitions import batch_post_processor
 from CE2OCF.utils.log_utils import logger
 from CE2OCF.utils.model_utils import is_iterable
 
+DEFAULT_POST_PROCESSOR_CACHE_SIZE = 4096
+
 GD_HUMAN_REPEAT_SELECTIONS_TO_VAR_NAMES = {
     "Paid With": "PaidWith",
     "Genus-level Description of Company Project": "BroadDescriptionAssignedTechnology",
@@ -23,16 +28,129 @@ GD_HUMAN_REPEAT_SELECTIONS_TO_VAR_NAMES = {
 }
 
 
+class PostProcessorCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class _PostProcessorCache:
+    """
+    Bounded LRU cache of post-processor results keyed on the raw value. All access goes through a lock so one cache can
+    be shared by the threads of a worker. Forked processes get a copy of the parent's cache (plus a fresh lock, in case
+    the fork happened while another thread held it) and carry on independently.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._results: OrderedDict[tuple[type, Any], Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def reset_lock(self):
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, value: Any, compute: Callable[[], Any]) -> Any:
+        # Key on type too so 1, 1.0 and True don't collide
+        key = (type(value), value)
+        with self._lock:
+            if key in self._results:
+                self._results.move_to_end(key)
+                self.hits += 1
+                return self._results[key]
+            self.misses += 1
+
+        # Don't hold the lock while computing... worst case two threads compute the same value once each
+        result = compute()
+
+        with self._lock:
+            self._results[key] = result
+            self._results.move_to_end(key)
+            while len(self._results) > self.maxsize:
+                self._results.popitem(last=False)
+
+        return result
+
+    def info(self) -> PostProcessorCacheInfo:
+        with self._lock:
+            return PostProcessorCacheInfo(self.hits, self.misses, self.maxsize, len(self._results))
+
+    def clear(self):
+        with self._lock:
+            self._results.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+_post_processor_caches: list[_PostProcessorCache] = []
+
+
+def _reset_post_processor_cache_locks():
+    for cache in _post_processor_caches:
+        cache.reset_lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_post_processor_cache_locks)
+
+
+def memoized_post_processor(func: Callable | None = None, *, maxsize: int = DEFAULT_POST_PROCESSOR_CACHE_SIZE):
+    """
+    Decorator that memoizes a field post-processor on the raw value it's passed. Usable bare (@memoized_post_processor)
+    or with a cache size (@memoized_post_processor(maxsize=128)).
+
+    ONLY use this for post-processors whose output depends solely on the value - the ce_jsons passed as the second arg
+    are NOT part of the cache key. Unhashable values (e.g. lists from multi-select questions) skip the cache. Cached
+    results are shared between calls, so don't return something callers will mutate.
+
+    The decorated function exposes cache_info() and cache_clear(), like functools.lru_cache.
+
+    Args:
+        func: Post-processor with signature (value, *args)
+        maxsize: Max number of distinct values to keep
+
+    Returns: Memoized post-processor
+
+    """
+
+    def decorator(post_processor: Callable) -> Callable:
+        cache = _PostProcessorCache(maxsize)
+        _post_processor_caches.append(cache)
+
+        @functools.wraps(post_processor)
+        def wrapper(value, *args):
+            try:
+                hash(value)
+            except TypeError:
+                return post_processor(value, *args)
+            return cache.get_or_compute(value, lambda: post_processor(value, *args))
+
+        wrapper.cache_info = cache.info  # type: ignore[attr-defined]
+        wrapper.cache_clear = cache.clear  # type: ignore[attr-defined]
+        return wrapper
+
+    if func is not None:
+        return decorator(func)
+    return decorator
+
+
+@memoized_post_processor
 def year_from_iso_date(val, *args) -> str | None:
     try:
-        return str(datetime.date.fromisoformat(val).year)
+        return str(ce_value_as_date(val).year)
     except Exception:
         return None
 
 
+@memoized_post_processor
 def convert_state_free_text_to_province_code(raw_state_name_input: str, *args) -> str | None:
     logger.debug(f"convert_state_free_text_to_province_code() - raw_state_name_input: {raw_state_name_input}")
 
+    # Imported on first use to keep package import time down
+    import us
+
     try:
         state = us.states.lookup(str(raw_state_name_input))
         logger.debug(f"convert_state_free_text_to_province_code() - Resulting state: {state}")
@@ -45,10 +163,14 @@ def convert_state_free_text_to_province_code(raw_state_name_input: str, *args) -
         return None
 
 
+@memoized_post_processor
 def convert_phone_number_to_international_standard(raw_phone_number: str, *args) -> str:
     logger.debug(f"convert_phone_number_to_international_standard() - raw input value: {raw_phone_number}")
     parsed_phone_number = None
 
+    # Imported on first use to keep package import time down
+    import phonenumbers
+
     try:
         parsed_phone_number = phonenumbers.parse(raw_phone_number, None)
     except phonenumbers.phonenumberutil.NumberParseException:
@@ -83,6 +205,50 @@ def convert_phone_number_to_international_standard(raw_phone_number: str, *args)
     return parsed_phone_number
 
 
+def _map_distinct_values(post_processor: Callable, values: list[Any], *args) -> list[Any]:
+    # Call post_processor once per distinct hashable value - repeated answers (same state, shared office number...) are
+    # common across stakeholders. Unhashable values are processed one by one.
+    results: dict[tuple[type, Any], Any] = {}
+    processed = []
+    for value in values:
+        try:
+            key = (type(value), value)
+            if key not in results:
+                results[key] = post_processor(value, *args)
+            processed.append(results[key])
+        except TypeError:
+            processed.append(post_processor(value, *args))
+    return processed
+
+
+@batch_post_processor
+def convert_states_free_text_to_province_codes(raw_state_name_inputs: list[str], *args) -> list[str | None]:
+    """
+    Batch version of convert_state_free_text_to_province_code()
+
+    Args:
+        raw_state_name_inputs: Free text state names, one per repetition
+        *args: Ignored (ce_jsons)
+
+    Returns: Province code (or None) for each input, in order
+    """
+    return _map_distinct_values(convert_state_free_text_to_province_code, raw_state_name_inputs)
+
+
+@batch_post_processor
+def convert_phone_numbers_to_international_standard(raw_phone_numbers: list[str], *args) -> list[str]:
+    """
+    Batch version of convert_phone_number_to_international_standard()
+
+    Args:
+        raw_phone_numbers: Phone numbers, one per repetition
+        *args: Ignored (ce_jsons)
+
+    Returns: Internationally formatted phone number (or "") for each input, in order
+    """
+    return _map_distinct_values(convert_phone_number_to_international_standard, raw_phone_numbers)
+
+
 def gunderson_repeat_var_processor(x, ce_jsons):
     """
     In our templates, the repeated_variables values are human-friendly strings which don't map
@@ -108,3 +274,28 @@ def gunderson_repeat_var_processor(x, ce_jsons):
             results.append(GD_HUMAN_REPEAT_SELECTIONS_TO_VAR_NAMES[x])
 
     return results
+
+
+def get_post_processor_cache_stats() -> dict[str, PostProcessorCacheInfo]:
+    """
+    Cache stats for the built-in memoized post-processors, keyed by function name
+
+    Returns: Dict of post-processor name to PostProcessorCacheInfo
+
+    """
+    return {
+        post_processor.__name__: post_processor.cache_info()  # type: ignore[attr-defined]
+        for post_processor in (
+            year_from_iso_date,
+            convert_state_free_text_to_province_code,
+            convert_phone_number_to_international_standard,
+        )
+    }
+
+
+def clear_post_processor_caches():
+    """
+    Empty the caches (and reset stats) of every post-processor decorated with memoized_post_processor
+    """
+    for cache in _post_processor_caches:
+        cache.clear()
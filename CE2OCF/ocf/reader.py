@@ -0,0 +1,243 @@
+"""
+Read OCF packages back - zip archives (like those from package_ocf_files_contents_into_zip_archive()) or directories of
+.ocf.json files.
+
+OcfPackageReader only parses the manifest up front. Member files are decoded the first time something needs them and
+each object lives in exactly one kind of file, so e.g. looking up a stakeholder decodes the stakeholders file and
+nothing else. Indexes by id, object_type and security_id are built on demand and cached on the reader.
+"""
+from __future__ import annotations
+
+import io
+import json
+import zipfile
+from pathlib import Path
+from typing import Any, Iterator
+
+from CE2OCF.types.dictionaries import OcfFileContentsDict
+from CE2OCF.utils.hash_utils import calculate_bytes_hash
+
+MANIFEST_FILE_NAME = "manifest.ocf.json"
+
+# Manifest key listing each type of file -> that file's file_type
+MANIFEST_FILE_LIST_KEYS = {
+    "stakeholders_files": "OCF_STAKEHOLDERS_FILE",
+    "stock_classes_files": "OCF_STOCK_CLASSES_FILE",
+    "stock_legend_templates_files": "OCF_STOCK_LEGEND_TEMPLATES_FILE",
+    "stock_plans_files": "OCF_STOCK_PLANS_FILE",
+    "transactions_files": "OCF_TRANSACTIONS_FILE",
+    "valuations_files": "OCF_VALUATIONS_FILE",
+    "vesting_terms_files": "OCF_VESTING_TERMS_FILE",
+}
+
+# Non-transaction object types -> the file_type they're stored in. Every TX_* object lives in transactions files.
+OBJECT_TYPE_FILE_TYPES = {
+    "STAKEHOLDER": "OCF_STAKEHOLDERS_FILE",
+    "STOCK_CLASS": "OCF_STOCK_CLASSES_FILE",
+    "STOCK_LEGEND_TEMPLATE": "OCF_STOCK_LEGEND_TEMPLATES_FILE",
+    "STOCK_PLAN": "OCF_STOCK_PLANS_FILE",
+    "VALUATION": "OCF_VALUATIONS_FILE",
+    "VESTING_TERMS": "OCF_VESTING_TERMS_FILE",
+}
+
+
+def file_type_for_object_type(object_type: str) -> str:
+    """
+    Args:
+        object_type: OCF object_type, e.g. STAKEHOLDER or TX_STOCK_ISSUANCE
+
+    Returns: file_type of the OCF files objects of this type are stored in
+
+    """
+    if object_type.startswith("TX_"):
+        return "OCF_TRANSACTIONS_FILE"
+    if object_type not in OBJECT_TYPE_FILE_TYPES:
+        msg = f"Unknown OCF object_type {object_type}"
+        raise ValueError(msg)
+    return OBJECT_TYPE_FILE_TYPES[object_type]
+
+
+class OcfPackageReader:
+    """
+    Lazy reader over one OCF package. Works as a context manager - zip archives stay open until close().
+
+    Args:
+        source: Path to an OCF zip archive or directory, or the bytes of a zip archive
+        verify_md5: Check each member file against the md5 recorded in the manifest as it's loaded
+    """
+
+    def __init__(self, source: str | Path | bytes, verify_md5: bool = False):
+        self.verify_md5 = verify_md5
+        self._zip_file: zipfile.ZipFile | None = None
+        self._directory: Path | None = None
+
+        if isinstance(source, (bytes, bytearray)):
+            self._zip_file = zipfile.ZipFile(io.BytesIO(source))
+        elif Path(source).is_dir():
+            self._directory = Path(source)
+        else:
+            self._zip_file = zipfile.ZipFile(source)
+
+        self.manifest: dict = json.loads(self._read_member(MANIFEST_FILE_NAME))
+
+        # file_type -> [(file path, md5)] in manifest order
+        self.file_paths: dict[str, list[tuple[str, str | None]]] = {
+            file_type: [(entry["filepath"], entry.get("md5")) for entry in self.manifest.get(manifest_key, [])]
+            for manifest_key, file_type in MANIFEST_FILE_LIST_KEYS.items()
+        }
+        self._manifest_md5s = {path: md5 for paths in self.file_paths.values() for path, md5 in paths}
+
+        self._file_contents: dict[str, dict] = {}
+        self._objects_by_file_type: dict[str, list[dict]] = {}
+        self._id_index: dict[str, list[dict]] | None = None
+        self._object_type_index: dict[str, list[dict]] = {}
+        self._object_type_indexed_file_types: set[str] = set()
+        self._security_id_index: dict[str, list[dict]] | None = None
+
+    def __enter__(self) -> OcfPackageReader:
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self._zip_file is not None:
+            self._zip_file.close()
+
+    def _read_member(self, file_path: str) -> bytes:
+        if self._directory is not None:
+            return (self._directory / file_path).read_bytes()
+
+        assert self._zip_file is not None
+        try:
+            return self._zip_file.read(file_path)
+        except KeyError:
+            msg = f"OCF package has no member {file_path}"
+            raise ValueError(msg) from None
+
+    @property
+    def issuer(self) -> dict:
+        return self.manifest.get("issuer", {})
+
+    def file_contents(self, file_path: str) -> dict:
+        """
+        Args:
+            file_path: Path of a member file, as listed in the manifest
+
+        Returns: Decoded file. Loaded on first request, then cached.
+
+        """
+        if file_path not in self._file_contents:
+            file_bytes = self._read_member(file_path)
+            if self.verify_md5:
+                expected_md5 = self._manifest_md5s.get(file_path)
+                if expected_md5 is not None and calculate_bytes_hash(file_bytes) != expected_md5:
+                    msg = f"OCF package member {file_path} doesn't match the md5 in its manifest"
+                    raise ValueError(msg)
+            self._file_contents[file_path] = json.loads(file_bytes)
+        return self._file_contents[file_path]
+
+    def objects_in_files(self, file_type: str) -> list[dict]:
+        """
+        Args:
+            file_type: OCF file_type, e.g. OCF_TRANSACTIONS_FILE
+
+        Returns: Items of every file of this type, in manifest order
+
+        """
+        if file_type not in self._objects_by_file_type:
+            if file_type not in self.file_paths:
+                msg = f"Unknown OCF file_type {file_type}"
+                raise ValueError(msg)
+            self._objects_by_file_type[file_type] = [
+                ocf_object
+                for file_path, _ in self.file_paths[file_type]
+                for ocf_object in self.file_contents(file_path).get("items", [])
+            ]
+        return self._objects_by_file_type[file_type]
+
+    def iter_objects(self) -> Iterator[dict]:
+        """
+        Returns: Iterator over every object in the package (not counting the issuer), file type by file type
+        """
+        for file_type in self.file_paths:
+            yield from self.objects_in_files(file_type)
+
+    def objects_of_type(self, object_type: str) -> list[dict]:
+        """
+        Args:
+            object_type: OCF object_type, e.g. STAKEHOLDER or TX_VESTING_START
+
+        Returns: All objects of that type. Only the files that can hold it are loaded.
+
+        """
+        file_type = file_type_for_object_type(object_type)
+        if file_type not in self._object_type_indexed_file_types:
+            for ocf_object in self.objects_in_files(file_type):
+                self._object_type_index.setdefault(ocf_object.get("object_type"), []).append(ocf_object)
+            self._object_type_indexed_file_types.add(file_type)
+        return self._object_type_index.get(object_type, [])
+
+    def objects_by_id(self, object_id: str) -> list[dict]:
+        """
+        Returns: Every object with this id (ids aren't necessarily unique across transactions). Loads the whole package
+                 the first time it's called.
+        """
+        if self._id_index is None:
+            id_index: dict[str, list[dict]] = {}
+            if "id" in self.issuer:
+                id_index[self.issuer["id"]] = [self.issuer]
+            for ocf_object in self.iter_objects():
+                id_index.setdefault(ocf_object.get("id"), []).append(ocf_object)
+            self._id_index = id_index
+        return self._id_index.get(object_id, [])
+
+    def get(self, object_id: str, default: Any = None) -> Any:
+        """
+        Returns: First object with this id or default
+        """
+        matches = self.objects_by_id(object_id)
+        return matches[0] if matches else default
+
+    def transactions_for_security(self, security_id: str) -> list[dict]:
+        """
+        Returns: Transactions referencing security_id, in file order. Only transactions files are loaded.
+        """
+        if self._security_id_index is None:
+            security_id_index: dict[str, list[dict]] = {}
+            for transaction in self.objects_in_files("OCF_TRANSACTIONS_FILE"):
+                if "security_id" in transaction:
+                    security_id_index.setdefault(transaction["security_id"], []).append(transaction)
+            self._security_id_index = security_id_index
+        return self._security_id_index.get(security_id, [])
+
+    def to_file_contents(self) -> OcfFileContentsDict:
+        """
+        Load the whole package as the OcfFileContentsDict the packaging functions produce. Packages with more than one
+        file of a type are merged into one file per type.
+        """
+        file_contents: Any = {}
+        for file_type, paths in self.file_paths.items():
+            if len(paths) == 1:
+                file_path = paths[0][0]
+                file_bytes = self._read_member(file_path)
+                contents = self.file_contents(file_path)
+            else:
+                file_path = MANIFEST_FILE_NAME.replace("manifest", file_type.lower())
+                contents = {"file_type": file_type, "items": self.objects_in_files(file_type)}
+                file_bytes = json.dumps(contents, ensure_ascii=False).encode()
+            file_contents[file_type] = {
+                "file_name": file_path,
+                "contents": contents,
+                "bytes": file_bytes,
+                "md5": calculate_bytes_hash(file_bytes),
+            }
+
+        manifest_bytes = self._read_member(MANIFEST_FILE_NAME)
+        file_contents["OCF_MANIFEST_FILE"] = {
+            "file_name": MANIFEST_FILE_NAME,
+            "contents": self.manifest,
+            "bytes": manifest_bytes,
+            "md5": calculate_bytes_hash(manifest_bytes),
+        }
+        return file_contents
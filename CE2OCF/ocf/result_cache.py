@@ -0,0 +1,330 @@
+"""
+Opt-in, on-disk cache for full CE -> OCF conversions. Results are keyed by a hash of everything that can change the
+output - the datasheet items, every datamap / definition file, the post-processors in play, overrides and the library
+version - so re-converting an identical datasheet (retries, re-exports, audit regenerations) just reads the packaged zip
+back off disk.
+"""
+from __future__ import annotations
+
+import datetime
+import functools
+import hashlib
+import inspect
+import json
+import os
+import time
+import types
+from pathlib import Path
+from typing import Any, Callable
+
+from CE2OCF import PARSER_OCF_VERSION, __version__
+from CE2OCF.datamap.definitions import FieldPostProcessorModel
+from CE2OCF.datamap.loaders import DEFAULTS_PATH
+from CE2OCF.ocf.datamaps import (
+    FullyVestedStockIssuanceDataMap,
+    IssuerDataMap,
+    RepeatableStockholderDataMap,
+    StockClassDataMap,
+    StockLegendDataMap,
+    StockPlanDataMap,
+    VestingScheduleInputsDataMap,
+    VestingStockIssuanceDataMap,
+)
+from CE2OCF.ocf.pipeline import (
+    package_ocf_files_contents_into_zip_archive,
+    package_translated_ce_as_valid_ocf_files_contents,
+    translate_ce_inc_questionnaire_datasheet_items_to_ocf,
+)
+from CE2OCF.types.dictionaries import ContractExpressVarObj
+from CE2OCF.utils.log_utils import logger
+
+DEFAULT_CACHE_MAX_SIZE_BYTES = 256 * 1024 * 1024
+CACHE_FILE_SUFFIX = ".ocf.zip"
+
+# translate_ce_inc_questionnaire_datasheet_items_to_ocf() clears and re-registers handlers on these, so whatever is
+# registered on them before a run has no effect on its output (and is different after every run).
+PIPELINE_RESET_DATAMAPS = (
+    IssuerDataMap,
+    StockPlanDataMap,
+    StockClassDataMap,
+    StockLegendDataMap,
+    RepeatableStockholderDataMap,
+    VestingStockIssuanceDataMap,
+    FullyVestedStockIssuanceDataMap,
+    VestingScheduleInputsDataMap,
+)
+
+# Pipeline args that change how the work is done but never what comes out
+EXECUTION_ONLY_PIPELINE_KWARGS = ("repetition_workers", "use_compiled_datamaps")
+
+# (path, mtime_ns, size) -> sha256 so we don't re-read unchanged datamap files on every lookup
+_file_digests: dict[tuple[str, int, int], str] = {}
+
+
+class OcfPackageCache:
+    """
+    Directory of packaged OCF zips named by cache key. Bounded to max_size_bytes with least-recently-used eviction
+    (reads bump a file's mtime). Writes go through a temp file + rename, so concurrent threads / processes sharing a
+    cache directory never see partial results.
+    """
+
+    def __init__(self, cache_dir: Path | str, max_size_bytes: int = DEFAULT_CACHE_MAX_SIZE_BYTES):
+        if max_size_bytes <= 0:
+            msg = "max_size_bytes must be > 0"
+            raise ValueError(msg)
+
+        self.cache_dir = Path(cache_dir)
+        self.max_size_bytes = max_size_bytes
+        self._last_touch_ns = 0
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _touch(self, path: Path) -> None:
+        # mtime is our LRU clock... make sure back-to-back accesses never tie
+        now_ns = max(time.time_ns(), self._last_touch_ns + 1)
+        self._last_touch_ns = now_ns
+        os.utime(path, ns=(now_ns, now_ns))
+
+    def _path_for_key(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{CACHE_FILE_SUFFIX}"
+
+    def get(self, key: str) -> bytes | None:
+        path = self._path_for_key(key)
+        try:
+            with open(path, "rb") as cached_fd:
+                contents = cached_fd.read()
+            self._touch(path)
+        except FileNotFoundError:
+            return None
+        return contents
+
+    def put(self, key: str, contents: bytes) -> None:
+        path = self._path_for_key(key)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as cached_fd:
+            cached_fd.write(contents)
+        os.replace(tmp_path, path)
+        self._touch(path)
+        self.evict()
+
+    def evict(self) -> None:
+        """
+        Delete least recently used entries until the cache fits in max_size_bytes
+        """
+        entries = []
+        total_size = 0
+        for path in self.cache_dir.glob(f"*{CACHE_FILE_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+            total_size += stat.st_size
+
+        for _, size, path in sorted(entries):
+            if total_size <= self.max_size_bytes:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            total_size -= size
+
+    def clear(self) -> None:
+        for path in self.cache_dir.glob(f"*{CACHE_FILE_SUFFIX}"):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def size_bytes(self) -> int:
+        return sum(path.stat().st_size for path in self.cache_dir.glob(f"*{CACHE_FILE_SUFFIX}"))
+
+
+def _file_digest(path: Path) -> str:
+    stat = path.stat()
+    stat_key = (str(path.resolve()), stat.st_mtime_ns, stat.st_size)
+    if stat_key not in _file_digests:
+        _file_digests[stat_key] = hashlib.sha256(path.read_bytes()).hexdigest()
+    return _file_digests[stat_key]
+
+
+def _code_digest(code: types.CodeType) -> str:
+    code_hash = hashlib.sha256(code.co_code)
+    code_hash.update(repr(code.co_names).encode())
+    for const in code.co_consts:
+        # Nested functions / lambdas show up as code objects whose repr includes a memory address
+        code_hash.update((_code_digest(const) if isinstance(const, types.CodeType) else repr(const)).encode())
+    return code_hash.hexdigest()
+
+
+def callable_fingerprint(func: Callable) -> str:
+    """
+    Identify a post-processor by module, qualified name and a hash of its bytecode (plus whatever it closes over or
+    has bound via functools.partial), so editing a post-processor invalidates cached results. Values captured by
+    closures are identified by repr(), so anything with an address-based repr just never gets a cache hit.
+
+    Args:
+        func: Post-processor
+
+    Returns: Fingerprint string
+
+    """
+    if isinstance(func, functools.partial):
+        return f"partial({callable_fingerprint(func.func)}, {func.args!r}, {sorted(func.keywords.items())!r})"
+
+    parts = [getattr(func, "__module__", "") or "", getattr(func, "__qualname__", type(func).__qualname__)]
+    if inspect.ismethod(func):
+        parts.append(repr(func.__self__))
+
+    try:
+        target = inspect.unwrap(func)
+    except ValueError:
+        target = func
+
+    code = getattr(target, "__code__", None)
+    if code is not None:
+        parts.append(_code_digest(code))
+        for cell in getattr(target, "__closure__", None) or ():
+            try:
+                cell_contents = cell.cell_contents
+            except ValueError:  # Empty cell
+                continue
+            parts.append(callable_fingerprint(cell_contents) if callable(cell_contents) else repr(cell_contents))
+    elif not isinstance(func, (types.BuiltinFunctionType, type)):
+        # Callable instance
+        parts.append(repr(func))
+
+    return "|".join(parts)
+
+
+def _registered_post_processor_fingerprints() -> list[tuple[str, str, str]]:
+    fingerprints = []
+    pending = list(FieldPostProcessorModel.__subclasses__())
+    seen = set()
+    while pending:
+        datamap_class = pending.pop()
+        if datamap_class in seen:
+            continue
+        seen.add(datamap_class)
+        pending.extend(datamap_class.__subclasses__())
+
+        if datamap_class in PIPELINE_RESET_DATAMAPS:
+            continue
+        for field_name, handler in datamap_class.get_postprocessors().items():
+            fingerprints.append(
+                (f"{datamap_class.__module__}.{datamap_class.__qualname__}", field_name, callable_fingerprint(handler))
+            )
+    return sorted(fingerprints)
+
+
+def _canonical_json_default(value: Any) -> Any:
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    if isinstance(value, Path):
+        return str(value)
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=repr)
+    return repr(value)
+
+
+def calculate_pipeline_cache_key(datasheet_items: list[ContractExpressVarObj], **pipeline_kwargs) -> str:
+    """
+    Hash everything that determines the output of translate_ce_inc_questionnaire_datasheet_items_to_ocf() for these
+    arguments: the datasheet items (order-preserving, key-order-insensitive), the contents of every default
+    datamap / definition file and any custom datamaps passed in, fingerprints of the post-processors passed in or
+    registered on nested datamaps, overrides, and the library + OCF versions.
+
+    Args:
+        datasheet_items: CE datasheet items
+        **pipeline_kwargs: Keyword args for translate_ce_inc_questionnaire_datasheet_items_to_ocf()
+
+    Returns: sha256 hex digest
+
+    """
+    key_hash = hashlib.sha256()
+    key_hash.update(f"{__version__}/{PARSER_OCF_VERSION}\n".encode())
+    key_hash.update(
+        json.dumps(datasheet_items, sort_keys=True, ensure_ascii=False, default=_canonical_json_default).encode()
+    )
+
+    for default_path in sorted(DEFAULTS_PATH.glob("*.json")):
+        key_hash.update(f"\n{default_path.name}:{_file_digest(default_path)}".encode())
+
+    # Fill in defaults so leaving an arg out and passing its default value produce the same key
+    bound_args = inspect.signature(translate_ce_inc_questionnaire_datasheet_items_to_ocf).bind(
+        datasheet_items, **pipeline_kwargs
+    )
+    bound_args.apply_defaults()
+    pipeline_kwargs = {
+        name: value
+        for name, value in bound_args.arguments.items()
+        if name != "datasheet_items" and name not in EXECUTION_ONLY_PIPELINE_KWARGS
+    }
+
+    for kwarg_name in sorted(pipeline_kwargs):
+        value = pipeline_kwargs[kwarg_name]
+        if value is None:
+            encoded = "null"
+        elif kwarg_name.endswith("_datamap"):
+            encoded = _file_digest(Path(value))
+        elif kwarg_name.endswith("_post_processors"):
+            encoded = json.dumps(sorted((field_name, callable_fingerprint(func)) for field_name, func in value.items()))
+        else:
+            encoded = json.dumps(value, sort_keys=True, ensure_ascii=False, default=_canonical_json_default)
+        key_hash.update(f"\n{kwarg_name}={encoded}".encode())
+
+    key_hash.update(f"\nregistered={json.dumps(_registered_post_processor_fingerprints())}".encode())
+
+    return key_hash.hexdigest()
+
+
+def cached_translate_ce_datasheet_items_to_ocf_zip(
+    datasheet_items: list[ContractExpressVarObj],
+    cache: OcfPackageCache | None = None,
+    **pipeline_kwargs,
+) -> bytes:
+    """
+    Translate + package datasheet_items into an OCF zip archive, reading the archive from cache if an identical
+    conversion has been cached before. With no cache, this is just
+    package_ocf_files_contents_into_zip_archive(package_translated_ce_as_valid_ocf_files_contents(
+    translate_ce_inc_questionnaire_datasheet_items_to_ocf(...))).
+
+    NOTE - a cache hit returns the exact bytes of the earlier run. Randomly generated ids (e.g. vesting start
+    transactions) will match that run rather than being regenerated.
+
+    Args:
+        datasheet_items: CE datasheet items
+        cache: OcfPackageCache to use, if any
+        **pipeline_kwargs: Keyword args for translate_ce_inc_questionnaire_datasheet_items_to_ocf()
+
+    Returns: Zip archive bytes
+
+    """
+    # Resolve the default "today" formation date up front so the cache key and the conversion agree on it
+    if pipeline_kwargs.get("formation_date") is None:
+        pipeline_kwargs["formation_date"] = datetime.datetime.now(tz=datetime.timezone.utc)
+    formation_date_key = pipeline_kwargs["formation_date"].date()
+
+    cache_key = None
+    if cache is not None:
+        cache_key = calculate_pipeline_cache_key(
+            datasheet_items, **{**pipeline_kwargs, "formation_date": formation_date_key}
+        )
+        cached = cache.get(cache_key)
+        if cached is not None:
+            logger.debug(f"cached_translate_ce_datasheet_items_to_ocf_zip() - cache hit for {cache_key}")
+            return cached
+
+    zip_bytes = package_ocf_files_contents_into_zip_archive(
+        package_translated_ce_as_valid_ocf_files_contents(
+            translate_ce_inc_questionnaire_datasheet_items_to_ocf(datasheet_items, **pipeline_kwargs)
+        )
+    )
+
+    if cache is not None and cache_key is not None:
+        try:
+            cache.put(cache_key, zip_bytes)
+        except OSError as e:
+            logger.warning(f"cached_translate_ce_datasheet_items_to_ocf_zip() - failed to write cache entry: {e}")
+
+    return zip_bytes
@@ -0,0 +1,177 @@
+"""
+Prebuilt, single-file bundle of the OCF json schemas, keyed by $id, so validation doesn't have to walk and parse the
+whole schema directory in every process.
+
+The bundle is built when the package is built (see hatch_build.py, or `hatch run build-schema-bundle` for a source
+checkout) and never written at runtime. It's stamped with the package version it was built for, and an installed
+package trusts that stamp without looking at the schema files. In a source checkout, where schema files get edited,
+the bundle also records the path, size and mtime of every schema file it was built from, plus a sha256 of each file's
+contents for when only the mtime differs, so editing, adding or removing a schema file without rebuilding the bundle
+makes load_schema_store() ignore it and read the schema directory instead.
+
+Imports nothing outside the standard library at module level, so the build hook can load it by path without the
+package (or its dependencies) being importable.
+"""
+from __future__ import annotations
+
+import functools
+import hashlib
+import json
+import logging
+import os
+import pickle
+from pathlib import Path
+from typing import Any
+
+# Same root logger as CE2OCF.utils.log_utils, which can't be imported from the build hook
+logger = logging.getLogger()
+
+schema_dir_resolved = (Path(__file__).parent / "schema").resolve()
+schema_bundle_path = schema_dir_resolved / "schemas.bundle.pickle"
+SCHEMA_FILE_EXTENSION = ".schema.json"
+
+# Bump if the bundle's layout changes
+_SCHEMA_BUNDLE_FORMAT = 3
+
+# A source checkout has pyproject.toml next to the package
+_SOURCE_CHECKOUT_MARKER = Path(__file__).resolve().parents[2] / "pyproject.toml"
+
+
+def _package_version() -> str:
+    from CE2OCF.__about__ import __version__
+
+    return __version__
+
+
+def _in_source_checkout() -> bool:
+    return _SOURCE_CHECKOUT_MARKER.is_file()
+
+
+def _find_schema_files(directory: Path | str, extension: str) -> dict[str, Path]:
+    # Path relative to directory -> path, for every file with extension under directory
+    extension = extension.lower()
+    schema_files = {}
+    for dirpath, _, files in os.walk(directory):
+        for name in files:
+            if extension and name.lower().endswith(extension):
+                schema_path = Path(dirpath) / name
+                schema_files[schema_path.relative_to(directory).as_posix()] = schema_path
+    return schema_files
+
+
+def _file_sha256(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def load_schemas(directory=schema_dir_resolved, extension=SCHEMA_FILE_EXTENSION, verbose: bool = False):
+    """
+    :return: Dict of schema ids to jsonschemas
+    """
+
+    schemastore = {}
+
+    for schema_path in _find_schema_files(directory, extension).values():
+        if verbose:
+            logger.info(f"\tFound schema at path: {schema_path}")
+        with open(schema_path) as schema_fd:
+            schema = json.load(schema_fd)
+            if "$id" in schema:
+                if verbose:
+                    logger.info(f"\t\tSchema Id is: {schema['$id']}")
+                schemastore[schema["$id"]] = schema
+
+    return schemastore
+
+
+def build_schema_bundle(
+    directory=schema_dir_resolved, bundle_path: Path = schema_bundle_path, version: str | None = None
+) -> dict:
+    """
+    Walk directory for schemas (see load_schemas()) and write them into a single pickle file keyed by $id, stamped
+    with version and the path, size, mtime and sha256 of each schema file. Runs as a build step, so that
+    load_schema_store() never has to walk the schema directory.
+
+    Args:
+        directory: Directory to look for *.schema.json files in
+        bundle_path: Where to write the bundle
+        version: Package version the bundle is built for. Defaults to the installed CE2OCF version.
+
+    Returns: Dict of schema ids to jsonschemas that was written to the bundle
+
+    """
+    schemastore = load_schemas(directory)
+    schema_files = {}
+    for relative_path, schema_path in _find_schema_files(directory, SCHEMA_FILE_EXTENSION).items():
+        schema_stat = schema_path.stat()
+        schema_files[relative_path] = {
+            "size": schema_stat.st_size,
+            "mtime_ns": schema_stat.st_mtime_ns,
+            "sha256": _file_sha256(schema_path),
+        }
+
+    # Write to a temp file and swap it in so a concurrent reader never sees a partially written bundle
+    bundle_path = Path(bundle_path)
+    tmp_path = bundle_path.with_name(f"{bundle_path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as bundle_fd:
+        pickle.dump(
+            {
+                "format": _SCHEMA_BUNDLE_FORMAT,
+                "version": version if version is not None else _package_version(),
+                "files": schema_files,
+                "schemas": schemastore,
+            },
+            bundle_fd,
+            protocol=pickle.HIGHEST_PROTOCOL,
+        )
+    os.replace(tmp_path, bundle_path)
+    return schemastore
+
+
+def _bundle_is_current(bundle: Any, directory: Path | str) -> bool:
+    if not isinstance(bundle, dict) or bundle.get("format") != _SCHEMA_BUNDLE_FORMAT:
+        return False
+    if bundle["version"] != _package_version():
+        return False
+    # Installed schema files only change along with the package version
+    if not _in_source_checkout():
+        return True
+
+    recorded_files = bundle["files"]
+    schema_files = _find_schema_files(directory, SCHEMA_FILE_EXTENSION)
+    if recorded_files.keys() != schema_files.keys():
+        return False
+
+    for relative_path, schema_path in schema_files.items():
+        recorded = recorded_files[relative_path]
+        schema_stat = schema_path.stat()
+        if schema_stat.st_size != recorded["size"]:
+            return False
+        # Installed files often get a new mtime, so only then compare contents
+        if schema_stat.st_mtime_ns != recorded["mtime_ns"] and _file_sha256(schema_path) != recorded["sha256"]:
+            return False
+    return True
+
+
+@functools.lru_cache(maxsize=None)
+def load_schema_store(bundle_path: Path = schema_bundle_path, directory: Path = schema_dir_resolved) -> dict:
+    """
+    Load the schema store from the prebuilt bundle at bundle_path. This is only read from disk once per process, so call
+    it before forking worker processes if you want them to share the loaded store. If the bundle is missing, was built
+    for another package version or (in a source checkout) doesn't match the schema files in directory, fall back to
+    walking the schema directory - the bundle is left alone, rebuild it with build_schema_bundle().
+
+    WARNING - the returned dict is shared by every caller in the process. Treat it as read-only.
+
+    Returns: Dict of schema ids to jsonschemas
+
+    """
+    try:
+        with open(bundle_path, "rb") as bundle_fd:
+            bundle = pickle.load(bundle_fd)  # noqa: S301 - the bundle is built with the package, next to the schemas
+        if _bundle_is_current(bundle, directory):
+            return bundle["schemas"]
+        logger.info(f"Schema bundle at {bundle_path} doesn't match the schemas in {directory}... not using it")
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, KeyError, TypeError) as e:
+        logger.debug(f"Could not load schema bundle at {bundle_path}: {e}")
+
+    return load_schemas(directory)
@@ -10,7 +10,6 @@
 #   1) I wanted multiple directories, not just one, so I made the input path argument an array of paths
 #   2) Using a Draft7Validator instead of Draft4
 import json
-import os
 from pathlib import Path
 from typing import Optional
 
@@ -21,13 +20,19 @@ from jsonschema import (
     ValidationError,
 )
 
+from CE2OCF.ocf.schema_bundle import (
+    build_schema_bundle,
+    load_schema_store,
+    load_schemas,
+    schema_bundle_path,
+    schema_dir_resolved,
+)
 from CE2OCF.types.exceptions import OCFValidationError
 from CE2OCF.utils.log_utils import logger
 
 manifest_schema_id = "https://schema.opencaptablecoalition.com/v/1.1.0/files/OCFManifestFile.schema.json"
 parent_dir = Path(__file__).parent
 schema_dir = parent_dir / "schema"
-schema_dir_resolved = schema_dir.resolve()
 file_type_to_ocf_id_dict = {
     "OCF_MANIFEST_FILE": "https://schema.opencaptablecoalition.com/v/1.1.0/files/OCFManifestFile.schema.json",
     "OCF_STAKEHOLDERS_FILE": "https://schema.opencaptablecoalition.com/v/1.1.0/files/StakeholdersFile.schema.json",
@@ -41,31 +46,8 @@ file_type_to_ocf_id_dict = {
 }
 
 
-def load_schemas(directory=schema_dir_resolved, extension=".schema.json", verbose: bool = False):
-    """
-    :return: Dict of schema ids to jsonschemas
-    """
-
-    schemastore = {}
-
-    extension = extension.lower()
-    for dirpath, _, files in os.walk(directory):
-        for name in files:
-            if extension and name.lower().endswith(extension):
-                if verbose:
-                    logger.info(f"\tFound schema at path: {dirpath + '/' + name}")
-                with open(dirpath + "/" + name) as schema_fd:
-                    schema = json.load(schema_fd)
-                    if "$id" in schema:
-                        if verbose:
-                            logger.info(f"\t\tSchema Id is: {schema['$id']}")
-                        schemastore[schema["$id"]] = schema
-
-    return schemastore
-
-
 def get_validator(against_ocf_id: str = manifest_schema_id) -> Draft7Validator:
-    schemastore = load_schemas()
+    schemastore = load_schema_store()
     resolver = RefResolver.from_schema(schemastore[against_ocf_id], store=schemastore)
     validator = Draft7Validator(schemastore[against_ocf_id], resolver=resolver)
     return validator
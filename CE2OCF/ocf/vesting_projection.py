@@ -0,0 +1,602 @@
+"""
+Answers "how much of this issuance is vested on date X" for the VESTING_TERMS built by CE2OCF.ocf.generators.
+
+compile_vesting_terms() walks a schedule's condition graph once and flattens it into:
+
+- a tranche table - offset from the vesting start date -> portion that vests then - for the time-based conditions that
+  hang off the VESTING_START_DATE condition, and
+- event rules for the VESTING_EVENT conditions (change in control, termination), each with the window - relative to
+  vesting start or to an earlier event - in which it applies.
+
+project_vested_amounts() evaluates those tables for many holders and many as-of dates in one pass. Holders that share
+vesting terms, a vesting start date and a scenario share a single row of vested portions, so each extra holder only
+costs scaling that row by their quantity and rounding it per the terms' allocation_type.
+"""
+from __future__ import annotations
+
+import bisect
+import calendar
+import datetime
+from decimal import Decimal
+from fractions import Fraction
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Mapping,
+    NamedTuple,
+    Sequence,
+)
+
+from CE2OCF.ocf.generators.ocf_id_generators import (
+    generate_accel_trigger_termination_event_id,
+    generate_cic_event_id,
+)
+from CE2OCF.types.enums import (
+    OcfPeriodTypeEnum,
+    OcfVestingDayOfMonthEnum,
+    VestingEventTypesEnum,
+)
+from CE2OCF.utils.log_utils import logger
+
+SUPPORTED_ALLOCATION_TYPES = ("CUMULATIVE_ROUNDING", "CUMULATIVE_ROUND_DOWN", "FRACTIONAL")
+ISSUANCE_OBJECT_TYPES = ("TX_STOCK_ISSUANCE", "TX_PLAN_SECURITY_ISSUANCE", "TX_EQUITY_COMPENSATION_ISSUANCE")
+
+_ZERO = Fraction(0)
+_ONE = Fraction(1)
+
+# Id suffixes of the event conditions generated for single / double trigger acceleration
+_CIC_EVENT_ID_SUFFIXES = tuple(generate_cic_event_id("", trigger) for trigger in ("Single", "Double"))
+_TERMINATION_EVENT_ID_SUFFIXES = tuple(
+    generate_accel_trigger_termination_event_id("", trigger) for trigger in ("Single", "Double")
+)
+
+
+class VestingHolder(NamedTuple):
+    """
+    One issuance to project. vesting_terms_id of None means the issuance is fully vested; a vesting_start_date of None
+    means vesting hasn't started (nothing is vested).
+    """
+
+    security_id: str
+    quantity: Decimal
+    vesting_terms_id: str | None = None
+    vesting_start_date: datetime.date | None = None
+
+
+class VestingScenario(NamedTuple):
+    """
+    Events to project vesting under. Time-based vesting stops at termination_date and only an involuntary termination
+    satisfies TERMINATION vesting events. A change in control after the holder's termination has no effect.
+    """
+
+    change_in_control_date: datetime.date | None = None
+    termination_date: datetime.date | None = None
+    involuntary_termination: bool = True
+
+
+NO_VESTING_EVENTS = VestingScenario()
+
+
+class _Offset(NamedTuple):
+    """
+    Time from an anchor date (vesting start or a vesting event). Month offsets land on day_of_month, per OCF.
+    """
+
+    months: int = 0
+    days: int = 0
+    day_of_month: str = OcfVestingDayOfMonthEnum.VESTING_START_DAY_OR_LAST_DAY_OF_MONTH.value
+
+    def plus(self, length: int, period_type: str, day_of_month: str | None) -> _Offset:
+        months, days = self.months, self.days
+        if period_type == OcfPeriodTypeEnum.DAYS:
+            days += length
+        elif period_type == OcfPeriodTypeEnum.MONTHS:
+            months += length
+        elif period_type == OcfPeriodTypeEnum.YEARS:
+            months += 12 * length
+        else:
+            msg = f"Unsupported vesting period type {period_type}"
+            raise ValueError(msg)
+        if day_of_month is None:
+            day_of_month = self.day_of_month
+        return _Offset(months, days, OcfVestingDayOfMonthEnum(day_of_month).value)
+
+    def date_from(self, anchor: datetime.date) -> datetime.date:
+        if self.months == 0:
+            return anchor + datetime.timedelta(days=self.days)
+
+        month_index = anchor.month - 1 + self.months
+        year, month = anchor.year + month_index // 12, month_index % 12 + 1
+        last_day = calendar.monthrange(year, month)[1]
+        if self.day_of_month == OcfVestingDayOfMonthEnum.VESTING_START_DAY_OR_LAST_DAY_OF_MONTH:
+            day = min(anchor.day, last_day)
+        else:
+            # "01" - "28" or "29_OR_LAST_DAY_OF_MONTH" etc.
+            day = min(int(self.day_of_month[:2]), last_day)
+        return datetime.date(year, month, day) + datetime.timedelta(days=self.days)
+
+
+class _VestingEventRule(NamedTuple):
+    condition_id: str
+    event_type: VestingEventTypesEnum
+    portion: Fraction
+    remainder: bool
+    anchor_condition_id: str | None  # None for the vesting start date
+    window_start: _Offset
+    window_ends: tuple  # of _Offset. Open ended if empty, otherwise closes at the earliest.
+
+
+def classify_vesting_event(condition: Mapping[str, Any]) -> VestingEventTypesEnum | None:
+    """
+    Default event classifier for compile_vesting_terms(). Recognizes the event conditions our generators emit - by id
+    for the single / double trigger events and by description for the time-served credit events.
+
+    Args:
+        condition: OCF VESTING_EVENT vesting condition
+
+    Returns: Event type that satisfies the condition or None if it isn't one we know about
+
+    """
+    condition_id = condition.get("id", "")
+    if condition_id.endswith(_CIC_EVENT_ID_SUFFIXES):
+        return VestingEventTypesEnum.CHANGE_IN_CONTROL
+    if condition_id.endswith(_TERMINATION_EVENT_ID_SUFFIXES):
+        return VestingEventTypesEnum.TERMINATION
+
+    description = condition.get("description", "").lower()
+    if "change in control" in description:
+        return VestingEventTypesEnum.CHANGE_IN_CONTROL
+    if "terminat" in description:
+        return VestingEventTypesEnum.TERMINATION
+    return None
+
+
+def _condition_portion(condition: Mapping[str, Any]) -> tuple[Fraction, bool]:
+    if "quantity" in condition:
+        if Decimal(condition["quantity"]) != 0:
+            msg = f"Vesting condition {condition['id']} vests a fixed quantity. Only portions can be projected."
+            raise ValueError(msg)
+        return _ZERO, False
+
+    portion = condition.get("portion")
+    if portion is None:
+        return _ZERO, False
+
+    # Our generators use 0 / 0 for conditions that only mark out a period
+    numerator, denominator = int(portion["numerator"]), int(portion["denominator"])
+    return (_ZERO if denominator == 0 else Fraction(numerator, denominator)), bool(portion.get("remainder", False))
+
+
+class CompiledVestingTerms:
+    """
+    Flattened VESTING_TERMS - see compile_vesting_terms().
+    """
+
+    __slots__ = ("vesting_terms_id", "allocation_type", "tranches", "event_rules", "_tranche_tables")
+
+    def __init__(
+        self,
+        vesting_terms_id: str,
+        allocation_type: str,
+        tranches: tuple[tuple[_Offset, Fraction], ...],
+        event_rules: tuple[_VestingEventRule, ...],
+    ):
+        self.vesting_terms_id = vesting_terms_id
+        self.allocation_type = allocation_type
+        self.tranches = tranches
+        self.event_rules = event_rules
+        self._tranche_tables: dict[datetime.date, tuple[list[datetime.date], list[Fraction]]] = {}
+
+    def __repr__(self):
+        return (
+            f"CompiledVestingTerms({self.vesting_terms_id!r}, {len(self.tranches)} tranches, "
+            f"{len(self.event_rules)} event rules)"
+        )
+
+    def tranche_table(self, vesting_start_date: datetime.date) -> tuple[list[datetime.date], list[Fraction]]:
+        """
+        Args:
+            vesting_start_date: Vesting start date
+
+        Returns: Sorted tranche dates and the cumulative portion vested on each, ignoring vesting events. Cached per
+                 vesting start date.
+
+        """
+        table = self._tranche_tables.get(vesting_start_date)
+        if table is None:
+            dates: list[datetime.date] = []
+            cumulative: list[Fraction] = []
+            total = _ZERO
+            for tranche_date, portion in sorted(
+                (offset.date_from(vesting_start_date), portion) for offset, portion in self.tranches
+            ):
+                total += portion
+                if dates and dates[-1] == tranche_date:
+                    cumulative[-1] = min(total, _ONE)
+                else:
+                    dates.append(tranche_date)
+                    cumulative.append(min(total, _ONE))
+            table = self._tranche_tables[vesting_start_date] = (dates, cumulative)
+        return table
+
+    def vested_portions(
+        self,
+        vesting_start_date: datetime.date,
+        as_of_dates: Sequence[datetime.date],
+        scenario: VestingScenario = NO_VESTING_EVENTS,
+    ) -> list[Fraction]:
+        """
+        Args:
+            vesting_start_date: Vesting start date (from the issuance's TX_VESTING_START)
+            as_of_dates: Dates to project vesting on, in any order
+            scenario: Change in control / termination to project under
+
+        Returns: Portion of the issuance vested on each as_of_date, in as_of_dates order
+
+        """
+        tranche_dates, cumulative = self.tranche_table(vesting_start_date)
+        termination_date = scenario.termination_date
+
+        def served(as_of: datetime.date) -> Fraction:
+            if termination_date is not None and termination_date < as_of:
+                as_of = termination_date
+            index = bisect.bisect_right(tranche_dates, as_of)
+            return cumulative[index - 1] if index else _ZERO
+
+        steps = self._event_steps(vesting_start_date, scenario, served)
+        step_dates = [step_date for step_date, _ in steps]
+
+        portions = []
+        for as_of in as_of_dates:
+            index = bisect.bisect_right(step_dates, as_of)
+            accelerated = steps[index - 1][1] if index else _ZERO
+            portions.append(min(_ONE, served(as_of) + accelerated))
+        return portions
+
+    def _event_steps(
+        self,
+        vesting_start_date: datetime.date,
+        scenario: VestingScenario,
+        served: Callable[[datetime.date], Fraction],
+    ) -> list[tuple[datetime.date, Fraction]]:
+        """
+        Returns: (event date, portion vested by events so far on top of time-based vesting) for each scenario event
+        """
+        termination_date = scenario.termination_date
+        events = []
+        if scenario.change_in_control_date is not None and (
+            termination_date is None or scenario.change_in_control_date <= termination_date
+        ):
+            events.append((scenario.change_in_control_date, 0, VestingEventTypesEnum.CHANGE_IN_CONTROL))
+        if termination_date is not None and scenario.involuntary_termination:
+            events.append((termination_date, 1, VestingEventTypesEnum.TERMINATION))
+        events.sort()
+
+        satisfied_on: dict[str, datetime.date] = {}
+        accelerated = _ZERO
+        steps = []
+        for event_date, _, event_type in events:
+            before = min(_ONE, served(event_date) + accelerated)
+            vested = before
+            for rule in self.event_rules:
+                if rule.event_type != event_type or rule.condition_id in satisfied_on:
+                    continue
+
+                anchor = (
+                    vesting_start_date
+                    if rule.anchor_condition_id is None
+                    else satisfied_on.get(rule.anchor_condition_id)
+                )
+                if anchor is None or event_date < rule.window_start.date_from(anchor):
+                    continue
+                if any(event_date >= window_end.date_from(anchor) for window_end in rule.window_ends):
+                    continue
+
+                satisfied_on[rule.condition_id] = event_date
+                if rule.remainder:
+                    vested += rule.portion * (_ONE - vested)
+                else:
+                    # Our generators express a non-remainder event portion as the holder's total vested share once the
+                    # event happens (e.g. months served plus months of credit over the schedule length)
+                    vested = max(vested, rule.portion)
+
+            accelerated += vested - before
+            steps.append((event_date, accelerated))
+        return steps
+
+
+class _VestingTermsCompiler:
+    def __init__(
+        self,
+        vesting_terms: Mapping[str, Any],
+        event_classifier: Callable[[Mapping[str, Any]], VestingEventTypesEnum | None],
+    ):
+        self.vesting_terms_id = vesting_terms.get("id", "")
+        self.conditions = {condition["id"]: condition for condition in vesting_terms["vesting_conditions"]}
+        self.event_classifier = event_classifier
+        self.tranches: list[tuple[_Offset, Fraction]] = []
+        self.event_rules: list[_VestingEventRule] = []
+        self._satisfied_at: dict[tuple[str | None, str], _Offset] = {}
+
+    def compile(self) -> tuple[tuple[tuple[_Offset, Fraction], ...], tuple[_VestingEventRule, ...]]:
+        start_conditions = [
+            condition for condition in self.conditions.values() if condition["trigger"]["type"] == "VESTING_START_DATE"
+        ]
+        if len(start_conditions) != 1:
+            msg = (
+                f"Vesting terms {self.vesting_terms_id} need exactly one VESTING_START_DATE condition, found "
+                f"{len(start_conditions)}"
+            )
+            raise ValueError(msg)
+
+        start_condition = start_conditions[0]
+        portion, _ = _condition_portion(start_condition)
+        if portion:
+            self.tranches.append((_Offset(), portion))
+        self._satisfied_at[(None, start_condition["id"])] = _Offset()
+        self._visit_children(start_condition, None, _Offset())
+        return tuple(self.tranches), tuple(self.event_rules)
+
+    def _condition(self, condition_id: str) -> Mapping[str, Any]:
+        if condition_id not in self.conditions:
+            msg = f"Vesting terms {self.vesting_terms_id} reference unknown vesting condition {condition_id}"
+            raise ValueError(msg)
+        return self.conditions[condition_id]
+
+    def _visit_children(
+        self,
+        condition: Mapping[str, Any],
+        anchor_id: str | None,
+        satisfied_at: _Offset,
+        period_start: _Offset | None = None,
+    ):
+        """
+        Children of the vesting start condition are independent tracks (base schedule, single and double trigger
+        acceleration). Children of a vesting event race - a time-based child that vests nothing closes the window of
+        its event siblings (e.g. double trigger acceleration expiring 12 months after a CiC). Events hanging off a
+        time-based condition that vests nothing (period_start is set) apply while that period runs.
+        """
+        children = [self._condition(child_id) for child_id in condition.get("next_condition_ids", [])]
+        is_event = condition["trigger"]["type"] == "VESTING_EVENT"
+
+        expirations = []
+        for child in children:
+            if child["trigger"]["type"] == "VESTING_SCHEDULE_RELATIVE":
+                child_satisfied_at, vests_nothing = self._visit_time_based(child, anchor_id, satisfied_at)
+                if is_event and vests_nothing:
+                    expirations.append(child_satisfied_at)
+
+        for child in children:
+            trigger_type = child["trigger"]["type"]
+            if trigger_type == "VESTING_EVENT":
+                if period_start is not None:
+                    window_start, window_ends = period_start, (satisfied_at,)
+                else:
+                    window_start, window_ends = satisfied_at, tuple(expirations)
+                self._visit_event(child, anchor_id, window_start, window_ends)
+            elif trigger_type != "VESTING_SCHEDULE_RELATIVE":
+                msg = f"Unsupported trigger type {trigger_type} on vesting condition {child['id']}"
+                raise ValueError(msg)
+
+    def _visit_time_based(
+        self, condition: Mapping[str, Any], anchor_id: str | None, parent_satisfied_at: _Offset
+    ) -> tuple[_Offset, bool]:
+        key = (anchor_id, condition["id"])
+        portion, remainder = _condition_portion(condition)
+        if key in self._satisfied_at:
+            return self._satisfied_at[key], not portion
+
+        trigger = condition["trigger"]
+        start = self._relative_start(trigger.get("relative_to_condition_id"), anchor_id, parent_satisfied_at)
+
+        period = trigger["period"]
+        length, period_type, day_of_month = period["length"], period["type"], period.get("day_of_month")
+        occurrences = period.get("occurrences", 1)
+
+        if portion:
+            if remainder or anchor_id is not None:
+                msg = (
+                    f"Vesting condition {condition['id']} can't be projected - only time-based vesting of a portion "
+                    f"of the total, counted from the vesting start date, is supported"
+                )
+                raise ValueError(msg)
+            for occurrence in range(1, occurrences + 1):
+                self.tranches.append((start.plus(length * occurrence, period_type, day_of_month), portion))
+
+        satisfied_at = start.plus(length * occurrences, period_type, day_of_month)
+        self._satisfied_at[key] = satisfied_at
+        self._visit_children(condition, anchor_id, satisfied_at, period_start=None if portion else start)
+        return satisfied_at, not portion
+
+    def _relative_start(
+        self,
+        relative_to: str | None,
+        anchor_id: str | None,
+        parent_satisfied_at: _Offset,
+        resolving: tuple[str, ...] = (),
+    ) -> _Offset:
+        """
+        When relative_to is satisfied. A time-based condition can be relative to one that isn't reachable through
+        next_condition_ids (e.g. the single trigger pre-cliff period), so those are timed from their own
+        relative_to_condition_id. Falls back to the parent's satisfaction if relative_to doesn't resolve.
+        """
+        if relative_to is None or relative_to not in self.conditions:
+            return parent_satisfied_at
+        if relative_to == anchor_id:
+            return _Offset()
+        if (anchor_id, relative_to) in self._satisfied_at:
+            return self._satisfied_at[(anchor_id, relative_to)]
+
+        trigger = self.conditions[relative_to]["trigger"]
+        if trigger["type"] == "VESTING_START_DATE" and anchor_id is None:
+            return _Offset()
+        if trigger["type"] == "VESTING_SCHEDULE_RELATIVE" and relative_to not in resolving:
+            start = self._relative_start(
+                trigger.get("relative_to_condition_id"), anchor_id, parent_satisfied_at, (*resolving, relative_to)
+            )
+            period = trigger["period"]
+            return start.plus(
+                period["length"] * period.get("occurrences", 1), period["type"], period.get("day_of_month")
+            )
+        return parent_satisfied_at
+
+    def _visit_event(
+        self,
+        condition: Mapping[str, Any],
+        anchor_id: str | None,
+        window_start: _Offset,
+        window_ends: tuple,
+    ):
+        event_type = self.event_classifier(condition)
+        if event_type is None:
+            logger.debug(f"Vesting event condition {condition['id']} has no known event type. It will never vest.")
+            return
+
+        portion, remainder = _condition_portion(condition)
+        self.event_rules.append(
+            _VestingEventRule(
+                condition_id=condition["id"],
+                event_type=event_type,
+                portion=portion,
+                remainder=remainder,
+                anchor_condition_id=anchor_id,
+                window_start=window_start,
+                window_ends=window_ends,
+            )
+        )
+        self._visit_children(condition, condition["id"], _Offset())
+
+
+def compile_vesting_terms(
+    vesting_terms: Mapping[str, Any],
+    event_classifier: Callable[[Mapping[str, Any]], VestingEventTypesEnum | None] = classify_vesting_event,
+) -> CompiledVestingTerms:
+    """
+    Compile an OCF VESTING_TERMS object - e.g. from generate_ocf_vesting_schedule_from_enumerations() - for projection.
+
+    Args:
+        vesting_terms: OCF VESTING_TERMS dict
+        event_classifier: Maps each VESTING_EVENT condition to the event that satisfies it (None if no scenario event
+                          does). The default understands the conditions our generators emit.
+
+    Returns: CompiledVestingTerms
+
+    """
+    allocation_type = vesting_terms.get("allocation_type", "CUMULATIVE_ROUNDING")
+    if allocation_type not in SUPPORTED_ALLOCATION_TYPES:
+        msg = f"Unsupported allocation_type {allocation_type} - supported types are {SUPPORTED_ALLOCATION_TYPES}"
+        raise ValueError(msg)
+
+    tranches, event_rules = _VestingTermsCompiler(vesting_terms, event_classifier).compile()
+    return CompiledVestingTerms(vesting_terms.get("id", ""), allocation_type, tranches, event_rules)
+
+
+def holders_from_ocf(ocf_objects: Iterable[Mapping[str, Any]]) -> list[VestingHolder]:
+    """
+    Pair each issuance with the date of its TX_VESTING_START event.
+
+    Args:
+        ocf_objects: OCF objects - issuances and TX_VESTING_START events. Anything else is ignored.
+
+    Returns: One VestingHolder per issuance, in issuance order
+
+    """
+    issuances = []
+    vesting_start_dates: dict[str, datetime.date] = {}
+    for ocf_object in ocf_objects:
+        object_type = ocf_object.get("object_type")
+        if object_type == "TX_VESTING_START":
+            start_date = datetime.date.fromisoformat(ocf_object["date"])
+            security_id = ocf_object["security_id"]
+            if security_id not in vesting_start_dates or start_date < vesting_start_dates[security_id]:
+                vesting_start_dates[security_id] = start_date
+        elif object_type in ISSUANCE_OBJECT_TYPES:
+            issuances.append(ocf_object)
+
+    return [
+        VestingHolder(
+            security_id=issuance["security_id"],
+            quantity=Decimal(issuance["quantity"]),
+            vesting_terms_id=issuance.get("vesting_terms_id") or None,
+            vesting_start_date=vesting_start_dates.get(issuance["security_id"]),
+        )
+        for issuance in issuances
+    ]
+
+
+def _allocate(quantity: Fraction, portions: list[Fraction], allocation_type: str) -> list[Decimal]:
+    """
+    Scale a row of vested portions by quantity, rounding per allocation_type. Sticks to integer math - this is the
+    per-holder part of a projection.
+    """
+    quantity_numerator, quantity_denominator = quantity.numerator, quantity.denominator
+    amounts = []
+    for portion in portions:
+        numerator = quantity_numerator * portion.numerator
+        denominator = quantity_denominator * portion.denominator
+        if allocation_type == "CUMULATIVE_ROUNDING":
+            amounts.append(Decimal((2 * numerator + denominator) // (2 * denominator)))
+        elif allocation_type == "CUMULATIVE_ROUND_DOWN":
+            amounts.append(Decimal(numerator // denominator))
+        else:
+            amounts.append(Decimal(numerator) / Decimal(denominator))
+    return amounts
+
+
+def project_vested_amounts(
+    vesting_terms: Iterable[Mapping[str, Any] | CompiledVestingTerms],
+    holders: Iterable[VestingHolder],
+    as_of_dates: Sequence[datetime.date],
+    scenarios: VestingScenario | Mapping[str, VestingScenario] | None = None,
+) -> list[list[Decimal]]:
+    """
+    Project vested amounts for every holder on every as_of_date.
+
+    Args:
+        vesting_terms: VESTING_TERMS dicts (or already compiled terms) the holders reference
+        holders: Issuances to project - see holders_from_ocf()
+        as_of_dates: Dates to project vesting on
+        scenarios: Change in control / termination events. Either one scenario for every holder or a mapping of
+                   security_id to scenario (holders not in it get no events). Default is no events.
+
+    Returns: One row per holder, in holders order, with the amount vested on each as_of_date
+
+    """
+    compiled_terms: dict[str, CompiledVestingTerms] = {}
+    for terms in vesting_terms:
+        compiled = terms if isinstance(terms, CompiledVestingTerms) else compile_vesting_terms(terms)
+        compiled_terms[compiled.vesting_terms_id] = compiled
+
+    as_of_dates = list(as_of_dates)
+    portion_rows: dict[tuple[str, datetime.date, VestingScenario], list[Fraction]] = {}
+    projections = []
+    for holder in holders:
+        quantity = Decimal(holder.quantity)
+        if holder.vesting_terms_id is None:
+            projections.append([quantity] * len(as_of_dates))
+            continue
+
+        terms = compiled_terms.get(holder.vesting_terms_id)
+        if terms is None:
+            msg = f"Holder {holder.security_id} references unknown vesting terms {holder.vesting_terms_id}"
+            raise ValueError(msg)
+
+        if holder.vesting_start_date is None:
+            projections.append([Decimal(0)] * len(as_of_dates))
+            continue
+
+        if scenarios is None:
+            scenario = NO_VESTING_EVENTS
+        elif isinstance(scenarios, VestingScenario):
+            scenario = scenarios
+        else:
+            scenario = scenarios.get(holder.security_id, NO_VESTING_EVENTS)
+
+        row_key = (terms.vesting_terms_id, holder.vesting_start_date, scenario)
+        portions = portion_rows.get(row_key)
+        if portions is None:
+            portions = portion_rows[row_key] = terms.vested_portions(holder.vesting_start_date, as_of_dates, scenario)
+
+        projections.append(_allocate(Fraction(quantity), portions, terms.allocation_type))
+    return projections
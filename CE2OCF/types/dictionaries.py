@@ -7,13 +7,18 @@ class ContractExpressVarObj(TypedDict):
     repetition: Optional[str]
 
 
-class OcfFileParts(TypedDict):
+class _RequiredOcfFileParts(TypedDict):
     file_name: str
     contents: dict
     bytes: bytes
     md5: str
 
 
+class OcfFileParts(_RequiredOcfFileParts, total=False):
+    # CRC-32 of bytes, computed in the same pass as md5. Zip packaging computes it if it's missing.
+    crc32: int
+
+
 class CicEventDefinition(TypedDict):
     description: str
     remainder: bool
@@ -72,6 +77,17 @@ class OcfFileContentsDict(TypedDict):
     OCF_MANIFEST_FILE: OcfFileParts
 
 
+class OcfShardedFileContentsDict(TypedDict):
+    OCF_STAKEHOLDERS_FILE: list[OcfFileParts]
+    OCF_STOCK_CLASSES_FILE: list[OcfFileParts]
+    OCF_STOCK_LEGEND_TEMPLATES_FILE: list[OcfFileParts]
+    OCF_STOCK_PLANS_FILE: list[OcfFileParts]
+    OCF_TRANSACTIONS_FILE: list[OcfFileParts]
+    OCF_VALUATIONS_FILE: list[OcfFileParts]
+    OCF_VESTING_TERMS_FILE: list[OcfFileParts]
+    OCF_MANIFEST_FILE: list[OcfFileParts]
+
+
 class VestingOcfFileContentsReturnType(TypedDict):
     items: list[dict]
     file_type: str
@@ -73,6 +73,15 @@ class VestingTypesEnum(str, enum.Enum):
     CUSTOM = "Custom"  # We're not going to support this via OCF
 
 
+class VestingEventTypesEnum(str, enum.Enum):
+    """
+    Events that can satisfy a VESTING_EVENT vesting condition when projecting vested amounts.
+    """
+
+    CHANGE_IN_CONTROL = "CHANGE_IN_CONTROL"
+    TERMINATION = "TERMINATION"
+
+
 class PaidWithOptionsEnum(str, enum.Enum):
     IP = "IP"
     CASH = "Cash"
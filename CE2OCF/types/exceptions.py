@@ -14,3 +14,13 @@ class OCFValidationError(ValueError):
 
     def __str__(self):
         return f"OCF Validation Error: {self.validation_error}"
+
+
+class OCFIntegrityError(ValueError):
+    def __init__(self, message: str, issues: list):
+        self.issues = issues
+        self.message = message
+        super().__init__(self.message)
+
+    def __str__(self):
+        return f"OCF Integrity Error: {self.message}"
@@ -0,0 +1,194 @@
+"""
+Immutable, interned versions of the plain dicts and lists we build OCF objects from. When hundreds of stakeholders share
+the same vesting terms, interning lets every reference point at a single copy of the object (and of any nested
+conditions that repeat across schedules), and the serialized json for each copy is computed once and reused every time
+it's written out.
+
+The intern table only holds weak references, so an interned object lives exactly as long as something outside the
+table still uses it - sharing lasts for as long as e.g. one pipeline run holds its output, and a long-running service
+doesn't accumulate every object it has ever interned.
+"""
+from __future__ import annotations
+
+import json
+import weakref
+from typing import Any, NoReturn
+
+
+def _raise_frozen(self, *args, **kwargs) -> NoReturn:
+    msg = f"{type(self).__name__} is immutable. Copy it to a dict / list first if you need to modify it."
+    raise TypeError(msg)
+
+
+class FrozenOcfDict(dict):
+    """
+    A dict that can't be modified after creation and caches its own json encoding. Still a dict, so json, jsonschema
+    and anything else that checks isinstance(x, dict) treat it like any other OCF object.
+    """
+
+    __setitem__ = __delitem__ = __ior__ = _raise_frozen
+    clear = pop = popitem = setdefault = update = _raise_frozen
+
+    def __reduce__(self):
+        return type(self), (dict(self),)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def ocf_json(self) -> str:
+        """
+        Returns: This object's json encoding, as produced by dump_ocf_json_to_bytes(), computed on first call
+        """
+        try:
+            return self.__dict__["_ocf_json"]
+        except KeyError:
+            encoded = encode_ocf_json(self)
+            self.__dict__["_ocf_json"] = encoded
+            return encoded
+
+
+class FrozenOcfList(list):
+    """
+    A list that can't be modified after creation and caches its own json encoding. See FrozenOcfDict.
+    """
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _raise_frozen
+    append = clear = extend = insert = pop = remove = reverse = sort = _raise_frozen
+
+    def __reduce__(self):
+        return type(self), (list(self),)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def ocf_json(self) -> str:
+        """
+        Returns: This object's json encoding, as produced by dump_ocf_json_to_bytes(), computed on first call
+        """
+        try:
+            return self.__dict__["_ocf_json"]
+        except KeyError:
+            encoded = encode_ocf_json(self)
+            self.__dict__["_ocf_json"] = encoded
+            return encoded
+
+
+# Interned objects keyed by their shape, dropped once nothing else references them. Values of frozen children are keyed
+# by identity, which is safe because a live entry's object holds its children, so their ids can't be reused while the
+# entry exists.
+_interned_ocf_objects: weakref.WeakValueDictionary[tuple, FrozenOcfDict | FrozenOcfList] = weakref.WeakValueDictionary()
+
+
+def _intern_key(value: Any) -> tuple:
+    if isinstance(value, (FrozenOcfDict, FrozenOcfList)):
+        return ("o", id(value))
+    # Include the type so 1, 1.0 and True (which encode differently) don't collide
+    return (type(value), value)
+
+
+def intern_ocf_object(ocf_obj: Any) -> Any:
+    """
+    Recursively convert dicts and lists in ocf_obj to FrozenOcfDicts / FrozenOcfLists, returning the existing copy of
+    any (sub)object with the same contents and key order that was interned before. Scalars are returned unchanged.
+
+    Args:
+        ocf_obj: Json-compatible OCF object
+
+    Returns: Interned, immutable equivalent of ocf_obj
+
+    """
+    if isinstance(ocf_obj, dict):
+        if isinstance(ocf_obj, FrozenOcfDict) and _interned_ocf_objects.get(_shape_key(ocf_obj)) is ocf_obj:
+            return ocf_obj
+        frozen_items = [(key, intern_ocf_object(value)) for key, value in ocf_obj.items()]
+        key = ("d", tuple((item_key, _intern_key(value)) for item_key, value in frozen_items))
+        interned = _interned_ocf_objects.get(key)
+        if interned is None:
+            interned = FrozenOcfDict(frozen_items)
+            _interned_ocf_objects[key] = interned
+        return interned
+
+    if isinstance(ocf_obj, (list, tuple)):
+        if isinstance(ocf_obj, FrozenOcfList) and _interned_ocf_objects.get(_shape_key(ocf_obj)) is ocf_obj:
+            return ocf_obj
+        frozen_values = [intern_ocf_object(value) for value in ocf_obj]
+        key = ("l", tuple(_intern_key(value) for value in frozen_values))
+        interned = _interned_ocf_objects.get(key)
+        if interned is None:
+            interned = FrozenOcfList(frozen_values)
+            _interned_ocf_objects[key] = interned
+        return interned
+
+    return ocf_obj
+
+
+def _shape_key(frozen_obj: FrozenOcfDict | FrozenOcfList) -> tuple:
+    if isinstance(frozen_obj, FrozenOcfDict):
+        return ("d", tuple((key, _intern_key(value)) for key, value in frozen_obj.items()))
+    return ("l", tuple(_intern_key(value) for value in frozen_obj))
+
+
+def interned_ocf_object_count() -> int:
+    """
+    Returns: Number of interned objects still referenced from outside the intern table
+    """
+    return len(_interned_ocf_objects)
+
+
+def clear_interned_ocf_objects():
+    """
+    Drop the intern table. Objects already handed out stay valid, they just won't be shared with objects interned later.
+    Unused objects leave the table on their own, so this is only needed to stop sharing with objects still in use.
+    """
+    _interned_ocf_objects.clear()
+
+
+def encode_ocf_json(ocf_obj: Any) -> str:
+    """
+    json.dumps(ocf_obj, ensure_ascii=False), except that FrozenOcfDicts / FrozenOcfLists nested anywhere in
+    ocf_obj contribute their cached encoding instead of being re-encoded. Output is identical to json.dumps.
+
+    Args:
+        ocf_obj: Json-compatible OCF object
+
+    Returns: Json string
+
+    """
+    if isinstance(ocf_obj, (FrozenOcfDict, FrozenOcfList)) and "_ocf_json" in ocf_obj.__dict__:
+        return ocf_obj.__dict__["_ocf_json"]
+
+    if isinstance(ocf_obj, FrozenOcfDict) or (isinstance(ocf_obj, dict) and _contains_frozen(ocf_obj.values())):
+        return (
+            "{"
+            + ", ".join(
+                f"{json.dumps(key, ensure_ascii=False)}: {_encode_value(value)}" for key, value in ocf_obj.items()
+            )
+            + "}"
+        )
+
+    if isinstance(ocf_obj, FrozenOcfList) or (isinstance(ocf_obj, (list, tuple)) and _contains_frozen(ocf_obj)):
+        return "[" + ", ".join(_encode_value(value) for value in ocf_obj) + "]"
+
+    return json.dumps(ocf_obj, ensure_ascii=False)
+
+
+def _encode_value(value: Any) -> str:
+    if isinstance(value, (FrozenOcfDict, FrozenOcfList)):
+        return value.ocf_json()
+    return encode_ocf_json(value)
+
+
+def _contains_frozen(values) -> bool:
+    # Only look one level down... OCF files are {"items": [ocf objects]} so that's where interned objects show up.
+    for value in values:
+        if isinstance(value, (FrozenOcfDict, FrozenOcfList)):
+            return True
+        if isinstance(value, (list, tuple)) and any(isinstance(v, (FrozenOcfDict, FrozenOcfList)) for v in value):
+            return True
+    return False
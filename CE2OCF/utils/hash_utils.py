@@ -1,6 +1,10 @@
 import hashlib
 import io
 import json
+import zlib
+from typing import Any, BinaryIO, Iterable, Optional
+
+from CE2OCF.utils.frozen_utils import encode_ocf_json
 
 
 def calculate_file_md5(filepath: str) -> str:
@@ -13,7 +17,8 @@ def calculate_file_md5(filepath: str) -> str:
 
 
 def dump_ocf_json_to_bytes(ocf_json: dict) -> bytes:
-    return json.dumps(ocf_json, ensure_ascii=False).encode()
+    # Same bytes as json.dumps(ocf_json, ensure_ascii=False), but reuses cached encodings of any interned objects
+    return encode_ocf_json(ocf_json).encode()
 
 
 def calculate_bytes_hash(file_contents_bytes: bytes) -> str:
@@ -25,3 +30,85 @@ def calculate_bytes_hash(file_contents_bytes: bytes) -> str:
         file_hash.update(chunk)
 
     return file_hash.hexdigest()
+
+
+def calculate_bytes_hash_and_crc32(file_contents_bytes: bytes) -> tuple[str, int]:
+    """
+    md5 hex digest (for the manifest) and CRC-32 (for zip packaging) of the same bytes, computed chunk by chunk in one
+    pass over them.
+    """
+    file_hash = hashlib.md5()  # noqa
+    crc = 0
+    with memoryview(file_contents_bytes) as file_view:
+        for start in range(0, len(file_view), 8192):
+            chunk = file_view[start : start + 8192]
+            file_hash.update(chunk)
+            crc = zlib.crc32(chunk, crc)
+    return file_hash.hexdigest(), crc
+
+
+class OcfJsonStreamWriter:
+    """
+    Writes one OCF file - {"file_type": ..., "items": [...]} - to a binary sink an item at a time, hashing the bytes as
+    they go out, so the file never has to be in memory as a whole. The bytes written are identical to
+    dump_ocf_json_to_bytes({"file_type": file_type, "items": items}).
+
+    Works as a context manager; leaving the block without an exception closes the file.
+
+    Args:
+        sink: Anything with a write(bytes) method - an open file, a BytesIO, a ZipFile.open(name, "w") handle...
+        file_type: OCF file_type, e.g. OCF_TRANSACTIONS_FILE
+    """
+
+    def __init__(self, sink: BinaryIO, file_type: str):
+        self.sink = sink
+        self.file_type = file_type
+        self.item_count = 0
+        self.size = 0
+        self.md5: Optional[str] = None
+        # CRC-32 of the same bytes, kept alongside the md5 - pass it on as OcfFileParts["crc32"] so zip packaging
+        # doesn't have to read the file again
+        self.crc32 = 0
+        self._hash = hashlib.md5()  # noqa
+        self._write(f'{{"file_type": {json.dumps(file_type, ensure_ascii=False)}, "items": [')
+
+    def __enter__(self) -> "OcfJsonStreamWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None and self.md5 is None:
+            self.close()
+
+    def _write(self, text: str):
+        chunk = text.encode()
+        self.sink.write(chunk)
+        self._hash.update(chunk)
+        self.crc32 = zlib.crc32(chunk, self.crc32)
+        self.size += len(chunk)
+
+    def write_item(self, item: Any):
+        """
+        Args:
+            item: Json-compatible OCF object. Interned (frozen) objects reuse their cached encoding.
+        """
+        if self.md5 is not None:
+            msg = f"Can't write to {self.file_type} stream after it's closed"
+            raise ValueError(msg)
+        self._write(encode_ocf_json(item) if self.item_count == 0 else ", " + encode_ocf_json(item))
+        self.item_count += 1
+
+    def write_items(self, items: Iterable[Any]):
+        for item in items:
+            self.write_item(item)
+
+    def close(self) -> tuple[str, int]:
+        """
+        Write the end of the file. Doesn't close the sink.
+
+        Returns: (md5 hex digest, size in bytes) of everything written, for the manifest
+
+        """
+        if self.md5 is None:
+            self._write("]}")
+            self.md5 = self._hash.hexdigest()
+        return self.md5, self.size
@@ -2,9 +2,6 @@ import logging
 import re
 from typing import Callable
 
-from sympy import Float
-from sympy.parsing.sympy_parser import parse_expr
-
 logger = logging.getLogger(__name__)
 
 
@@ -48,6 +45,9 @@ def eval_compiled_expression(template_str: str, max_digits: int = 10) -> str:
     Returns: Evaluated mathematical exp value as string
 
     """
+    # sympy takes a good chunk of a second to import, so only pay for it once a template actually needs math
+    from sympy import Float
+    from sympy.parsing.sympy_parser import parse_expr
 
     def replacer(match: re.Match) -> str:
         logger.debug(f"Expression resolver for match: {match}")
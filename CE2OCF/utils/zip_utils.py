@@ -0,0 +1,129 @@
+"""
+Minimal zip archive writer for members that are already compressed and whose CRC-32 is already known, following the
+PKWARE APPNOTE layout (local file headers, central directory, end of central directory record). zipfile.ZipFile has
+no public way to add a precompressed member, so this writes the same records ZipFile.writestr() would - readable by
+zipfile and any other zip tool - without going through ZipFile internals.
+
+Archives past the classic format's limits need ZIP64 records, which this doesn't write - check
+fits_without_zip64() first and use zipfile for those.
+"""
+import struct
+import time
+import zipfile
+from typing import Iterable, NamedTuple
+
+# Same layouts as zipfile's structFileHeader / structCentralDir / structEndArchive
+_LOCAL_FILE_HEADER = struct.Struct("<4s2B4HL2L2H")
+_CENTRAL_DIRECTORY_HEADER = struct.Struct("<4s4B4HL2L5H2L")
+_END_OF_CENTRAL_DIRECTORY = struct.Struct("<4s4H2LH")
+
+_LOCAL_FILE_HEADER_SIGNATURE = b"PK\003\004"
+_CENTRAL_DIRECTORY_SIGNATURE = b"PK\001\002"
+_END_OF_CENTRAL_DIRECTORY_SIGNATURE = b"PK\005\006"
+
+# Version 2.0 of the spec covers deflate, made on a unix system (for the permission bits in external attributes)
+_ZIP_VERSION = 20
+_UNIX_SYSTEM = 3
+_UTF8_FILE_NAME_FLAG = 0x800
+# -rw------- like ZipFile.writestr()
+_EXTERNAL_ATTRIBUTES = 0o600 << 16
+
+# Sizes, offsets and member counts at or above these need ZIP64 records
+_ZIP64_SIZE_LIMIT = (1 << 31) - 1
+_ZIP64_COUNT_LIMIT = (1 << 16) - 1
+
+
+class PrecompressedZipMember(NamedTuple):
+    file_name: str
+    file_size: int
+    crc32: int
+    compressed_bytes: bytes
+
+
+def fits_without_zip64(members: list[PrecompressedZipMember]) -> bool:
+    """
+    Returns: True if write_precompressed_zip_archive() can write these members
+    """
+    archive_size = sum(
+        len(member.compressed_bytes)
+        + len(member.file_name.encode()) * 2
+        + _LOCAL_FILE_HEADER.size
+        + _CENTRAL_DIRECTORY_HEADER.size
+        for member in members
+    )
+    return (
+        len(members) < _ZIP64_COUNT_LIMIT
+        and archive_size < _ZIP64_SIZE_LIMIT
+        and all(member.file_size < _ZIP64_SIZE_LIMIT for member in members)
+    )
+
+
+def _dos_date_time(timestamp: float) -> tuple[int, int]:
+    year, month, day, hour, minute, second = time.localtime(timestamp)[:6]
+    return (year - 1980) << 9 | month << 5 | day, hour << 11 | minute << 5 | second // 2
+
+
+def write_precompressed_zip_archive(members: Iterable[PrecompressedZipMember], compression: int) -> bytes:
+    """
+    Args:
+        members: Members in archive order, each compressed with compression (raw deflate for ZIP_DEFLATED)
+        compression: zipfile.ZIP_DEFLATED or zipfile.ZIP_STORED
+
+    Returns: Zip archive bytes
+
+    """
+    if compression not in (zipfile.ZIP_DEFLATED, zipfile.ZIP_STORED):
+        msg = f"Unsupported compression {compression}, expected zipfile.ZIP_DEFLATED or zipfile.ZIP_STORED"
+        raise ValueError(msg)
+
+    members = list(members)
+    if not fits_without_zip64(members):
+        msg = "Archive needs ZIP64 records, write it with zipfile instead"
+        raise ValueError(msg)
+
+    dos_date, dos_time = _dos_date_time(time.time())
+    chunks: list[bytes] = []
+    central_directory: list[bytes] = []
+    offset = 0
+    for member in members:
+        try:
+            file_name, flags = member.file_name.encode("ascii"), 0
+        except UnicodeEncodeError:
+            file_name, flags = member.file_name.encode(), _UTF8_FILE_NAME_FLAG
+
+        header_fields = (
+            flags,
+            compression,
+            dos_time,
+            dos_date,
+            member.crc32,
+            len(member.compressed_bytes),
+            member.file_size,
+            len(file_name),
+        )
+        local_header = _LOCAL_FILE_HEADER.pack(_LOCAL_FILE_HEADER_SIGNATURE, _ZIP_VERSION, 0, *header_fields, 0)
+        chunks.extend((local_header, file_name, member.compressed_bytes))
+        central_directory.append(
+            _CENTRAL_DIRECTORY_HEADER.pack(
+                _CENTRAL_DIRECTORY_SIGNATURE,
+                _ZIP_VERSION,
+                _UNIX_SYSTEM,
+                _ZIP_VERSION,
+                0,
+                *header_fields,
+                0,  # extra field length
+                0,  # comment length
+                0,  # disk number
+                0,  # internal attributes
+                _EXTERNAL_ATTRIBUTES,
+                offset,
+            )
+            + file_name
+        )
+        offset += len(local_header) + len(file_name) + len(member.compressed_bytes)
+
+    central_directory_bytes = b"".join(central_directory)
+    end_record = _END_OF_CENTRAL_DIRECTORY.pack(
+        _END_OF_CENTRAL_DIRECTORY_SIGNATURE, 0, 0, len(members), len(members), len(central_directory_bytes), offset, 0
+    )
+    return b"".join([*chunks, central_directory_bytes, end_record])
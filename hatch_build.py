@@ -0,0 +1,22 @@
+"""
+Build hook that writes the prebuilt OCF schema bundle (see CE2OCF/ocf/schema_bundle.py) before the package is built, so
+every wheel and sdist ships a bundle that matches its schema files and nothing has to write one at runtime.
+"""
+import importlib.util
+from pathlib import Path
+
+from hatchling.builders.hooks.plugin.interface import BuildHookInterface
+
+
+class SchemaBundleBuildHook(BuildHookInterface):
+    PLUGIN_NAME = "schema-bundle"
+
+    def initialize(self, version, build_data):  # noqa: ARG002 - signature set by BuildHookInterface
+        # Load the module by path - the package's dependencies aren't installed in the build environment, but
+        # schema_bundle.py only needs the standard library
+        spec = importlib.util.spec_from_file_location(
+            "_ce2ocf_schema_bundle", Path(self.root) / "CE2OCF" / "ocf" / "schema_bundle.py"
+        )
+        schema_bundle = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(schema_bundle)
+        schema_bundle.build_schema_bundle(version=self.metadata.version)
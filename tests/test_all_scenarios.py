@@ -51,6 +51,8 @@ from CE2OCF.ocf.generators.ocf_vesting_conditions import (
     generate_monthly_vesting_condition_id,
 )
 from CE2OCF.ocf.generators.vesting_enums_to_ocf import (
+    generate_ocf_vesting_schedule_from_enumerations,
+    generate_ocf_vesting_schedule_from_template,
     generate_ocf_vesting_schedule_from_vesting_drivers,
     generate_single_trigger_conditions_from_enumerations,
 )
@@ -1185,3 +1187,28 @@ class TestCeToOcfConversion(unittest.TestCase):
                     vesting_schedule_id=vesting_schedule_id,
                 )
                 self.assertEqual(expected_vesting_conditions, generated_conditions)
+
+    def test_vesting_schedule_templates_match_generated_schedules(self):
+        # Ids with characters json needs to escape make sure the stamped id round trips
+        vesting_schedule_id = 'Founder "A" \\ 4yr'
+
+        for schedule_choice, single_trigger, double_trigger in itertools.product(
+            [VestingTypesEnum.FOUR_YR_1_YR_CLIFF, VestingTypesEnum.FOUR_YR_NO_CLIFF, VestingTypesEnum.FULLY_VESTED],
+            [None, *SingleTriggerTypesEnum],
+            [None, *DoubleTriggerTypesEnum],
+        ):
+            with self.subTest(schedule=schedule_choice, single_trigger=single_trigger, double_trigger=double_trigger):
+                self.assertEqual(
+                    generate_ocf_vesting_schedule_from_enumerations(
+                        schedule_choice=schedule_choice.value,
+                        schedule_id=vesting_schedule_id,
+                        single_trigger=single_trigger,
+                        double_trigger=double_trigger,
+                    ),
+                    generate_ocf_vesting_schedule_from_template(
+                        schedule_choice=schedule_choice,
+                        schedule_id=vesting_schedule_id,
+                        single_trigger=single_trigger,
+                        double_trigger=double_trigger,
+                    ),
+                )
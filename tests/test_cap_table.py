@@ -0,0 +1,119 @@
+import json
+import unittest
+from decimal import Decimal
+
+from CE2OCF.ocf.cap_table import (
+    aggregate_cap_table_summaries,
+    summarize_cap_table,
+    summarize_cap_tables,
+)
+from CE2OCF.ocf.pipeline import (
+    package_translated_ce_as_valid_ocf_files_contents,
+    translate_ce_inc_questionnaire_datasheet_items_to_ocf,
+)
+from tests import fixture_dir
+
+
+def _issuance(security_id, stakeholder_id, quantity, stock_class_id="COMMON", **kwargs):
+    return {
+        "object_type": "TX_STOCK_ISSUANCE",
+        "security_id": security_id,
+        "stakeholder_id": stakeholder_id,
+        "stock_class_id": stock_class_id,
+        "quantity": quantity,
+        **kwargs,
+    }
+
+
+SYNTHETIC_OCF = {
+    "issuer_ocf": {"id": "ISSUER"},
+    "stock_classes_ocf": {
+        "items": [
+            {"id": "COMMON", "initial_shares_authorized": "1000000"},
+            {"id": "PREFERRED", "initial_shares_authorized": None},
+        ]
+    },
+    "stock_plans_ocf": {"items": [{"id": "PLAN", "initial_shares_reserved": "1000"}]},
+    "transactions_ocf": {
+        "items": [
+            _issuance("CS-1", "ALICE", "600.5"),
+            _issuance("CS-2", "BOB", "300"),
+            _issuance("PS-1", "BOB", "100", stock_class_id="PREFERRED"),
+            _issuance("CS-3", "CAROL", "50"),
+            {"object_type": "TX_STOCK_CANCELLATION", "security_id": "CS-2", "quantity": "100"},
+            {"object_type": "TX_STOCK_RETRACTION", "security_id": "CS-3"},
+            {
+                **_issuance("EC-1", "CAROL", "200"),
+                "object_type": "TX_EQUITY_COMPENSATION_ISSUANCE",
+                "stock_plan_id": "PLAN",
+            },
+        ]
+    },
+}
+
+
+class TestCapTable(unittest.TestCase):
+    def test_synthetic_cap_table(self):
+        summary = summarize_cap_table(SYNTHETIC_OCF)
+
+        self.assertEqual(summary.issuer_id, "ISSUER")
+        self.assertEqual(summary.shares_outstanding, Decimal("900.5"))
+        self.assertEqual(summary.shares_outstanding_by_class, {"COMMON": Decimal("800.5"), "PREFERRED": Decimal(100)})
+        self.assertEqual(summary.shares_authorized_by_class, {"COMMON": Decimal(1000000), "PREFERRED": None})
+        self.assertEqual(summary.plan_securities_outstanding, Decimal(200))
+        self.assertEqual(summary.plan_shares_available, Decimal(800))
+        self.assertEqual(summary.fully_diluted_shares, Decimal("1900.5"))
+        self.assertEqual(
+            summary.holdings_by_stakeholder,
+            {"ALICE": Decimal("600.5"), "BOB": Decimal(300), "CAROL": Decimal(200)},
+        )
+        self.assertEqual(summary.holdings_by_stakeholder_and_class[("BOB", "PREFERRED")], Decimal(100))
+
+        self.assertEqual(summary.stock_holdings_by_stakeholder, {"ALICE": Decimal("600.5"), "BOB": Decimal(300)})
+
+        ownership = summary.ownership_by_stakeholder()
+        self.assertEqual(ownership["BOB"], Decimal(300) / Decimal("1900.5"))
+        self.assertEqual(sum(summary.ownership_by_class().values()), 1)
+
+    def test_non_diluted_ownership_counts_stock_only(self):
+        # ALICE holds both stock and options
+        transactions = SYNTHETIC_OCF["transactions_ocf"]["items"]
+        mixed_holder_ocf = {
+            **SYNTHETIC_OCF,
+            "transactions_ocf": {
+                "items": [
+                    *transactions,
+                    {**transactions[-1], "security_id": "EC-2", "stakeholder_id": "ALICE", "quantity": "400"},
+                ]
+            },
+        }
+        summary = summarize_cap_table(mixed_holder_ocf)
+
+        ownership = summary.ownership_by_stakeholder(fully_diluted=False)
+        self.assertEqual(ownership["ALICE"], Decimal("600.5") / Decimal("900.5"))
+        self.assertEqual(ownership["CAROL"], 0)
+        self.assertAlmostEqual(sum(ownership.values()), Decimal(1), places=20)
+        self.assertAlmostEqual(sum(summary.ownership_by_stakeholder().values()), Decimal("1500.5") / Decimal("1900.5"))
+
+    def test_pipeline_output_and_packaged_files_agree(self):
+        with open(fixture_dir / "ce_datasheet_items_five_stockholders_full_answers.json") as ce_data:
+            ocf = translate_ce_inc_questionnaire_datasheet_items_to_ocf(json.loads(ce_data.read()))
+
+        summary = summarize_cap_table(ocf)
+        self.assertEqual(summary, summarize_cap_table(package_translated_ce_as_valid_ocf_files_contents(ocf)))
+
+        expected_outstanding = sum(
+            Decimal(item["quantity"] or 0)
+            for item in ocf["transactions_ocf"]["items"]
+            if item["object_type"] == "TX_STOCK_ISSUANCE"
+        )
+        self.assertEqual(summary.shares_outstanding, expected_outstanding)
+        self.assertEqual(sum(summary.holdings_by_stakeholder.values()), expected_outstanding)
+
+    def test_bulk_summaries(self):
+        summaries = summarize_cap_tables([SYNTHETIC_OCF] * 3)
+        self.assertEqual(len(summaries), 3)
+
+        totals = aggregate_cap_table_summaries(summaries)
+        self.assertEqual(totals["companies"], 3)
+        self.assertEqual(totals["fully_diluted_shares"], 3 * Decimal("1900.5"))
@@ -0,0 +1,258 @@
+import hashlib
+import hmac
+import json
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+import unittest
+import uuid
+from pathlib import Path
+from unittest import mock
+
+from CE2OCF.datamap import (
+    CompiledModel,
+    CompiledRepeatableDataMap,
+    CompiledStaticField,
+    compile_datamap,
+    compiled_datamap_artifact_path,
+    load_ce_to_ocf_issuer_datamap,
+    load_ce_to_ocf_stakeholder_datamap,
+    load_ce_to_ocf_stock_class_datamap,
+    load_ce_to_ocf_vesting_issuances_datamap,
+    load_vesting_events_driving_enums_datamap,
+    loaders,
+    set_compiled_datamap_cache_dir,
+    traverse_datamap,
+)
+from CE2OCF.datamap.compiled import (
+    DATAMAP_CACHE_DIR_ENV_VAR,
+    DATAMAP_CACHE_KEY_ENV_VAR,
+    _log_missing_cache_key,
+    _validated_datamaps,
+    validate_datamap_json,
+)
+from CE2OCF.ocf.datamaps import (
+    IssuerDataMap,
+    RepeatableFullyVestedStockIssuanceDataMap,
+    RepeatableStockholderDataMap,
+    RepeatableVestingEventDriversDataMap,
+    RepeatableVestingScheduleDriversDataMap,
+    RepeatableVestingStockIssuanceDataMap,
+    StockClassDataMap,
+    StockLegendDataMap,
+    StockPlanDataMap,
+)
+from CE2OCF.types.dictionaries import ContractExpressVarObj
+from tests import fixture_dir
+
+# Loads the issuer datamap compiled and prints how many times it had to be compiled
+_LOAD_COMPILED_ISSUER_DATAMAP = """
+from unittest import mock
+from CE2OCF.datamap import compile_datamap, load_ce_to_ocf_issuer_datamap
+with mock.patch("CE2OCF.datamap.compiled.compile_datamap", wraps=compile_datamap) as compile_mock:
+    load_ce_to_ocf_issuer_datamap(compiled=True)
+print(compile_mock.call_count)
+"""
+
+
+def _sequential_uuids():
+    return mock.patch("uuid.uuid4", side_effect=[uuid.UUID(int=i) for i in range(10_000)])
+
+
+class TestCompiledDatamaps(unittest.TestCase):
+    def setUp(self):
+        with open(fixture_dir / "ce_datasheet_items_five_stockholders_full_answers.json") as ce_data:
+            self.ce_jsons: list[ContractExpressVarObj] = json.loads(ce_data.read())
+
+    def test_compiled_datamaps_traverse_like_pydantic_models(self):
+        for loader in (
+            load_ce_to_ocf_issuer_datamap,
+            load_ce_to_ocf_stock_class_datamap,
+            load_ce_to_ocf_stakeholder_datamap,
+            load_ce_to_ocf_vesting_issuances_datamap,
+            load_vesting_events_driving_enums_datamap,
+        ):
+            with self.subTest(loader=loader.__name__):
+                with _sequential_uuids():
+                    from_model = traverse_datamap(loader(), None, self.ce_jsons, value_overrides={"PARSER_VERSION": ""})
+                with _sequential_uuids():
+                    compiled = loader(compiled=True)
+                    from_compiled = traverse_datamap(
+                        compiled, None, self.ce_jsons, value_overrides={"PARSER_VERSION": ""}
+                    )
+
+                self.assertIsInstance(compiled, CompiledModel)
+                self.assertEqual(from_compiled, from_model)
+
+    def test_compiled_node_types(self):
+        stakeholders = load_ce_to_ocf_stakeholder_datamap(compiled=True)
+        self.assertIsInstance(stakeholders, CompiledRepeatableDataMap)
+        self.assertIsInstance(stakeholders.repeated_pattern, CompiledModel)
+
+        issuer = load_ce_to_ocf_issuer_datamap(compiled=True)
+        self.assertIs(issuer.model_class, IssuerDataMap)
+        address = dict(issuer.fields)["address"]
+        self.assertIsInstance(address, CompiledModel)
+        self.assertIsInstance(dict(address.fields)["address_type"], CompiledStaticField)
+
+    def test_values_coerced_like_pydantic(self):
+        datamap_json = {
+            **json.loads(load_ce_to_ocf_stock_class_datamap().json()),
+            "votes_per_share": 1,
+            "not_a_field": "ignored",
+        }
+        fields = dict(compile_datamap(datamap_json, StockClassDataMap).fields)
+
+        self.assertEqual(fields["votes_per_share"], StockClassDataMap.parse_obj(datamap_json).votes_per_share)
+        self.assertEqual(fields["votes_per_share"], "1")
+        self.assertNotIn("not_a_field", fields)
+
+    def test_invalid_datamap_raises(self):
+        with self.assertRaisesRegex(ValueError, "Invalid IssuerDataMap datamap at <root>: .* is a required property"):
+            compile_datamap({"legal_name": "CompanyName"}, IssuerDataMap)
+
+    def test_packaged_datamaps_match_their_schemas(self):
+        # Compiling these skips schema validation, so this is what keeps them valid
+        for source_json, model_class in (
+            (loaders.DEFAULT_CE_TO_OCF_ISSUER_ONLY_PATH, IssuerDataMap),
+            (loaders.DEFAULT_CE_TO_OCF_COMMON_STOCK_CLASS_ONLY_PATH, StockClassDataMap),
+            (loaders.DEFAULT_CE_TO_OCF_PREFERRED_STOCK_CLASS_ONLY_PATH, StockClassDataMap),
+            (loaders.DEFAULT_CE_TO_OCF_DATAMAP_COMMON_STOCK_LEGEND_ONLY_PATH, StockLegendDataMap),
+            (loaders.DEFAULT_CE_TO_OCF_DATAMAP_PREFERRED_STOCK_LEGEND_ONLY_PATH, StockLegendDataMap),
+            (loaders.DEFAULT_CE_TO_OCF_STOCK_PLAN_ONLY_PATH, StockPlanDataMap),
+            (loaders.DEFAULT_CE_TO_OCF_STOCKHOLDERS_ONLY_PATH, RepeatableStockholderDataMap),
+            (loaders.DEFAULT_CE_TO_OCF_COMMON_STOCK_ISSUANCE_ONLY_PATH, RepeatableVestingStockIssuanceDataMap),
+            (loaders.DEFAULT_CE_TO_OCF_PREFERRED_STOCK_ISSUANCE_ONLY_PATH, RepeatableFullyVestedStockIssuanceDataMap),
+            (loaders.DEFAULT_CE_ENUMS_TO_OCF_VESTING_SCHEDULE_ONLY_PATH, RepeatableVestingScheduleDriversDataMap),
+            (loaders.DEFAULT_CE_ENUMS_TO_OCF_VESTING_EVENTS_ONLY_PATH, RepeatableVestingEventDriversDataMap),
+        ):
+            with self.subTest(source_json=source_json.name, model_class=model_class.__name__):
+                validate_datamap_json(json.loads(source_json.read_text()), model_class)
+
+    def test_packaged_datamaps_load_without_schema_validation(self):
+        with mock.patch("CE2OCF.datamap.compiled.validate_datamap_json") as validate:
+            load_ce_to_ocf_stakeholder_datamap(compiled=True)
+            validate.assert_not_called()
+
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                datamap_path = Path(tmp_dir) / loaders.DEFAULT_CE_TO_OCF_STOCKHOLDERS_ONLY_PATH.name
+                datamap_path.write_bytes(loaders.DEFAULT_CE_TO_OCF_STOCKHOLDERS_ONLY_PATH.read_bytes())
+                _validated_datamaps.clear()
+                load_ce_to_ocf_stakeholder_datamap(datamap_path, compiled=True)
+            validate.assert_called_once()
+
+    def test_schema_validation_runs_once_per_datamap(self):
+        with open(fixture_dir / "datamap_samples" / "ce_to_ocf_issuer_only.json") as datamap_file:
+            datamap_json = json.loads(datamap_file.read())
+
+        _validated_datamaps.discard((IssuerDataMap, "test-digest"))
+        with mock.patch("CE2OCF.datamap.compiled.validate_datamap_json") as validate:
+            compile_datamap(datamap_json, IssuerDataMap, datamap_digest="test-digest")
+            compile_datamap(datamap_json, IssuerDataMap, datamap_digest="test-digest")
+        validate.assert_called_once()
+
+
+class TestCompiledDatamapCache(unittest.TestCase):
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = self._tmp_dir.name
+        set_compiled_datamap_cache_dir(self.cache_dir, cache_key="test key")
+
+    def tearDown(self):
+        set_compiled_datamap_cache_dir(None)
+        self._tmp_dir.cleanup()
+
+    def test_artifact_reused_across_loads(self):
+        first = load_ce_to_ocf_issuer_datamap(compiled=True)
+
+        with mock.patch("CE2OCF.datamap.compiled.compile_datamap") as compile_mock:
+            second = load_ce_to_ocf_issuer_datamap(compiled=True)
+        compile_mock.assert_not_called()
+
+        first_fields, second_fields = dict(first.fields), dict(second.fields)
+        self.assertEqual(first_fields["legal_name"], second_fields["legal_name"])
+        self.assertEqual(repr(first_fields["address"]), repr(second_fields["address"]))
+
+        # default_factory values (here a generated issuer id) are generated fresh for every load, like parse_file
+        self.assertIn("id", first.factory_fields)
+        self.assertNotEqual(first_fields["id"], second_fields["id"])
+
+    def test_corrupt_artifact_is_rebuilt(self):
+        load_ce_to_ocf_issuer_datamap(compiled=True)
+        (artifact_path,) = Path(self.cache_dir).iterdir()
+        corrupt_artifact = hmac.new(b"test key", b"not a pickle", hashlib.sha256).digest() + b"not a pickle"
+        artifact_path.write_bytes(corrupt_artifact)
+
+        rebuilt = load_ce_to_ocf_issuer_datamap(compiled=True)
+        self.assertIs(rebuilt.model_class, IssuerDataMap)
+        self.assertNotEqual(artifact_path.read_bytes(), corrupt_artifact)
+        with mock.patch("CE2OCF.datamap.compiled.compile_datamap") as compile_mock:
+            self.assertIs(load_ce_to_ocf_issuer_datamap(compiled=True).model_class, IssuerDataMap)
+        compile_mock.assert_not_called()
+
+    def test_unsigned_artifact_is_not_unpickled(self):
+        set_compiled_datamap_cache_dir(self.cache_dir, cache_key="writer key")
+        load_ce_to_ocf_issuer_datamap(compiled=True)
+        (artifact_path,) = Path(self.cache_dir).iterdir()
+
+        # A valid pickle without a valid signature, e.g. planted by someone else who can write to the cache dir
+        artifact_path.write_bytes(b"\0" * 32 + pickle.dumps({"not": "a datamap"}))
+        with mock.patch("CE2OCF.datamap.compiled.pickle.loads") as loads_mock:
+            self.assertIs(load_ce_to_ocf_issuer_datamap(compiled=True).model_class, IssuerDataMap)
+        loads_mock.assert_not_called()
+
+        # ...and left alone, like artifacts signed with another key
+        self.assertEqual(artifact_path.read_bytes(), b"\0" * 32 + pickle.dumps({"not": "a datamap"}))
+
+    def test_artifact_signed_with_another_key_is_not_overwritten(self):
+        load_ce_to_ocf_issuer_datamap(compiled=True)
+        (artifact_path,) = Path(self.cache_dir).iterdir()
+        artifact = artifact_path.read_bytes()
+
+        set_compiled_datamap_cache_dir(self.cache_dir, cache_key="another key")
+        for _ in range(2):
+            with mock.patch("CE2OCF.datamap.compiled.compile_datamap", wraps=compile_datamap) as compile_mock:
+                self.assertIs(load_ce_to_ocf_issuer_datamap(compiled=True).model_class, IssuerDataMap)
+            compile_mock.assert_called_once()
+        self.assertEqual(artifact_path.read_bytes(), artifact)
+
+    def test_cache_dir_unused_without_key(self):
+        set_compiled_datamap_cache_dir(self.cache_dir)
+        _log_missing_cache_key.cache_clear()
+        with mock.patch.dict(os.environ), mock.patch("CE2OCF.datamap.compiled.logger") as logger_mock:
+            os.environ.pop(DATAMAP_CACHE_KEY_ENV_VAR, None)
+            load_ce_to_ocf_issuer_datamap(compiled=True)
+            load_ce_to_ocf_issuer_datamap(compiled=True)
+
+        self.assertEqual(list(Path(self.cache_dir).iterdir()), [])
+        logger_mock.warning.assert_not_called()
+        logger_mock.info.assert_called_once()
+
+    def test_artifact_shared_between_processes(self):
+        def load_in_subprocess(cache_key: str) -> int:
+            env = {**os.environ, DATAMAP_CACHE_DIR_ENV_VAR: self.cache_dir, DATAMAP_CACHE_KEY_ENV_VAR: cache_key}
+            args = [sys.executable, "-c", _LOAD_COMPILED_ISSUER_DATAMAP]
+            # Runs this interpreter on the fixed probe above, not on outside input
+            result = subprocess.run(args, env=env, capture_output=True, text=True, check=True)  # noqa: S603
+            return int(result.stdout.split()[-1])
+
+        self.assertEqual(load_in_subprocess("shared key"), 1)
+        (artifact_path,) = Path(self.cache_dir).iterdir()
+        artifact = artifact_path.read_bytes()
+
+        self.assertEqual(load_in_subprocess("shared key"), 0)
+        self.assertEqual(load_in_subprocess("another key"), 1)
+        self.assertEqual(artifact_path.read_bytes(), artifact)
+        self.assertEqual(load_in_subprocess("shared key"), 0)
+
+    def test_artifact_keyed_on_contents_and_model(self):
+        self.assertNotEqual(
+            compiled_datamap_artifact_path(self.cache_dir, IssuerDataMap, "a"),
+            compiled_datamap_artifact_path(self.cache_dir, IssuerDataMap, "b"),
+        )
+        self.assertNotEqual(
+            compiled_datamap_artifact_path(self.cache_dir, IssuerDataMap, "a"),
+            compiled_datamap_artifact_path(self.cache_dir, StockClassDataMap, "a"),
+        )
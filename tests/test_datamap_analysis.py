@@ -0,0 +1,80 @@
+import datetime
+import json
+import unittest
+
+from CE2OCF.datamap.analysis import (
+    collect_datamap_override_keys,
+    collect_datamap_variable_names,
+    prune_ce_jsons_to_variable_names,
+)
+from CE2OCF.datamap.loaders import (
+    load_ce_to_ocf_stakeholder_datamap,
+    load_ce_to_ocf_vesting_issuances_datamap,
+)
+from CE2OCF.ocf.pipeline import (
+    translate_ce_inc_questionnaire_datasheet_items_to_ocf,
+)
+from tests import fixture_dir
+
+
+class TestDatamapAnalysis(unittest.TestCase):
+    def test_collect_datamap_variable_names(self):
+        stakeholder_names = collect_datamap_variable_names(load_ce_to_ocf_stakeholder_datamap())
+        for name in ("NumberStockholders", "StockholderInfoSame", "Stockholder", "Stockholder_S1", "PhoneNumber_S1"):
+            self.assertIn(name, stakeholder_names)
+
+        # Mustache references in templates are collected, the reserved loop index isn't
+        issuance_names = collect_datamap_variable_names(
+            load_ce_to_ocf_vesting_issuances_datamap(), static_first_repetition_name_formatter=None
+        )
+        for name in ("Shares", "PricePerShare", "PaidWith", "Vesting", "SingleTrigger", "DoubleTrigger"):
+            self.assertIn(name, issuance_names)
+        self.assertNotIn("<<LOOP_INDEX>>", issuance_names)
+        self.assertNotIn("Shares_S1", issuance_names)
+
+        self.assertEqual(
+            collect_datamap_variable_names({"a": "Var", "b": {"static": "Nope"}, "c": {"val": "Nope"}, "d": "|{{X}}|"}),
+            {"Var", "Var_S1", "X", "X_S1"},
+        )
+
+    def test_collect_datamap_override_keys(self):
+        # Whole templates and the loop index can be overridden too
+        self.assertEqual(
+            collect_datamap_override_keys({"a": "Var", "b": {"static": "Nope"}, "d": "|{{X}}-{{<<LOOP_INDEX>>}}|"}),
+            {"Var", "X", "<<LOOP_INDEX>>", "|{{X}}-{{<<LOOP_INDEX>>}}|"},
+        )
+        self.assertLessEqual(
+            collect_datamap_variable_names(load_ce_to_ocf_stakeholder_datamap(), None),
+            collect_datamap_override_keys(load_ce_to_ocf_stakeholder_datamap()),
+        )
+
+    def test_prune_preserves_order(self):
+        ce_jsons = [
+            {"name": "A", "values": ["1"], "repetition": None},
+            {"name": "B", "values": ["2"], "repetition": None},
+            {"name": "A", "values": ["3"], "repetition": "[2]"},
+        ]
+        self.assertEqual(prune_ce_jsons_to_variable_names(ce_jsons, ["A"]), [ce_jsons[0], ce_jsons[2]])
+
+    def test_pruned_pipeline_output_matches(self):
+        with (fixture_dir / "ce_datasheet_items_five_stockholders_full_answers.json").open("r") as fixture_fd:
+            # Custom vesting can't be converted, so swap it out for a standard schedule
+            datasheet_items = [
+                {**item, "values": ["4yr with 1yr Cliff"]} if item["values"] == ["Custom"] else item
+                for item in json.load(fixture_fd)
+            ]
+
+        formation_date = datetime.datetime(2023, 1, 1, tzinfo=datetime.timezone.utc)
+        full = translate_ce_inc_questionnaire_datasheet_items_to_ocf(datasheet_items, formation_date=formation_date)
+        pruned = translate_ce_inc_questionnaire_datasheet_items_to_ocf(
+            datasheet_items, formation_date=formation_date, prune_datasheet_items=True
+        )
+
+        # Issuer, stock plan and vesting start ids are random uuids, so compare everything but those
+        for ocf_file_key in ("stock_classes_ocf", "stakeholders_ocf", "stock_legends_ocf", "vesting_schedules_ocf"):
+            self.assertEqual(full[ocf_file_key], pruned[ocf_file_key])
+        self.assertEqual({**full["issuer_ocf"], "id": ""}, {**pruned["issuer_ocf"], "id": ""})
+        self.assertEqual(
+            [item for item in full["transactions_ocf"]["items"] if item["object_type"] != "TX_VESTING_START"],
+            [item for item in pruned["transactions_ocf"]["items"] if item["object_type"] != "TX_VESTING_START"],
+        )
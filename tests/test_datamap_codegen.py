@@ -0,0 +1,166 @@
+import io
+import json
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+
+from CE2OCF.datamap import batch_post_processor
+from CE2OCF.datamap.codegen import (
+    generate_datamap_module_source,
+    generated_module_is_current,
+    load_generated_datamap_converter,
+    main,
+)
+from CE2OCF.datamap.crawler import traverse_datamap
+from CE2OCF.datamap.loaders import (
+    DEFAULT_CE_TO_OCF_COMMON_STOCK_ISSUANCE_ONLY_PATH,
+    DEFAULT_CE_TO_OCF_ISSUER_ONLY_PATH,
+    DEFAULT_CE_TO_OCF_STOCKHOLDERS_ONLY_PATH,
+)
+from CE2OCF.ocf.datamaps import (
+    AddressDataMap,
+    IssuerDataMap,
+    PhoneDataMap,
+    RepeatableStockholderDataMap,
+    RepeatableVestingStockIssuanceDataMap,
+    StockholderDataMap,
+)
+from CE2OCF.ocf.postprocessors import (
+    convert_phone_numbers_to_international_standard,
+    convert_state_free_text_to_province_code,
+)
+from CE2OCF.types.exceptions import VariableNotFoundError
+from tests import fixture_dir
+
+GENERATED_FIELDS = ("id", "date", "board_approval_date")
+
+
+def _without_generated_fields(ocf):
+    # Ids and dates from default factories are fresh uuids / today
+    if isinstance(ocf, dict):
+        return {
+            key: None if key in GENERATED_FIELDS else _without_generated_fields(value) for key, value in ocf.items()
+        }
+    if isinstance(ocf, list):
+        return [_without_generated_fields(item) for item in ocf]
+    return ocf
+
+
+class TestDatamapCodegen(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with open(fixture_dir / "ce_datasheet_items_five_stockholders_full_answers.json") as ce_data:
+            cls.ce_jsons = json.loads(ce_data.read())
+
+    def setUp(self):
+        # Other tests register handlers on these classes once per class, so put them back afterwards
+        self.registered_handlers = {
+            datamap_class: dict(datamap_class.get_postprocessors())
+            for datamap_class in (AddressDataMap, PhoneDataMap, StockholderDataMap, RepeatableStockholderDataMap)
+        }
+
+    def tearDown(self):
+        for datamap_class, handlers in self.registered_handlers.items():
+            datamap_class.clear_handlers()
+            datamap_class.register_handlers(handlers)
+
+    def assert_converts_like_crawler(self, datamap_path, model_class, **kwargs):
+        convert = load_generated_datamap_converter(datamap_path, model_class)
+        self.assertEqual(
+            _without_generated_fields(convert(self.ce_jsons, **kwargs)),
+            _without_generated_fields(
+                traverse_datamap(model_class.parse_file(datamap_path), None, self.ce_jsons, **kwargs)
+            ),
+        )
+
+    def test_matches_crawler(self):
+        for datamap_path, model_class in (
+            (DEFAULT_CE_TO_OCF_ISSUER_ONLY_PATH, IssuerDataMap),
+            (DEFAULT_CE_TO_OCF_STOCKHOLDERS_ONLY_PATH, RepeatableStockholderDataMap),
+            (DEFAULT_CE_TO_OCF_COMMON_STOCK_ISSUANCE_ONLY_PATH, RepeatableVestingStockIssuanceDataMap),
+        ):
+            with self.subTest(model_class=model_class.__name__):
+                self.assert_converts_like_crawler(datamap_path, model_class)
+                self.assert_converts_like_crawler(
+                    datamap_path, model_class, value_overrides={"PARSER_VERSION": "9", "NumberStockholders": "2"}
+                )
+
+    def test_post_processors_are_looked_up_per_call(self):
+        convert = load_generated_datamap_converter(
+            DEFAULT_CE_TO_OCF_STOCKHOLDERS_ONLY_PATH, RepeatableStockholderDataMap
+        )
+        raw_stakeholders = convert(self.ce_jsons)
+
+        AddressDataMap.register_handlers(
+            {"country_subdivision": lambda x, _: convert_state_free_text_to_province_code(x)}
+        )
+        PhoneDataMap.register_handlers({"phone_number": convert_phone_numbers_to_international_standard})
+        StockholderDataMap.register_handlers(
+            {
+                "issuer_assigned_id": lambda x, _: f"#{x}",
+                "primary_contact": batch_post_processor(
+                    lambda contacts, _: [contact["phone_numbers"] for contact in contacts]
+                ),
+            }
+        )
+        RepeatableStockholderDataMap.register_handlers({"repeated_variables": lambda _repeated_variables, _: []})
+
+        stakeholders = convert(self.ce_jsons)
+        self.assertNotEqual(stakeholders, raw_stakeholders)
+        self.assertEqual(
+            stakeholders[0]["primary_contact"], [{"phone_type": "HOME", "phone_number": "+1 123 456 7890"}]
+        )
+        self.assert_converts_like_crawler(DEFAULT_CE_TO_OCF_STOCKHOLDERS_ONLY_PATH, RepeatableStockholderDataMap)
+
+    def test_missing_variables(self):
+        namespace = {}
+        # Generated from the packaged issuer datamap
+        exec(  # noqa: S102
+            generate_datamap_module_source(json.loads(DEFAULT_CE_TO_OCF_ISSUER_ONLY_PATH.read_text()), IssuerDataMap),
+            namespace,
+        )
+        datamap = IssuerDataMap.parse_file(DEFAULT_CE_TO_OCF_ISSUER_ONLY_PATH)
+
+        self.assertEqual(
+            _without_generated_fields(namespace["convert"]([])),
+            _without_generated_fields(traverse_datamap(datamap, None, [])),
+        )
+        with self.assertRaisesRegex(VariableNotFoundError, "Variable legal_name not found"):
+            namespace["convert"]([], fail_on_missing_variable=True)
+
+    def test_regenerated_when_datamap_changes(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            datamap_path = Path(tmp_dir) / "stockholders.json"
+            module_path = Path(tmp_dir) / "stockholders_converter.py"
+            shutil.copy(DEFAULT_CE_TO_OCF_STOCKHOLDERS_ONLY_PATH, datamap_path)
+
+            convert = load_generated_datamap_converter(datamap_path, RepeatableStockholderDataMap, module_path)
+            self.assertTrue(generated_module_is_current(module_path, datamap_path, RepeatableStockholderDataMap))
+            self.assertIs(
+                load_generated_datamap_converter(datamap_path, RepeatableStockholderDataMap, module_path), convert
+            )
+
+            datamap_json = json.loads(datamap_path.read_text())
+            datamap_json["repeated_pattern"]["tax_ids"] = [{"static": "123"}]
+            datamap_path.write_text(json.dumps(datamap_json))
+            self.assertFalse(generated_module_is_current(module_path, datamap_path, RepeatableStockholderDataMap))
+
+            convert = load_generated_datamap_converter(datamap_path, RepeatableStockholderDataMap, module_path)
+            self.assertTrue(generated_module_is_current(module_path, datamap_path, RepeatableStockholderDataMap))
+            self.assertEqual(convert(self.ce_jsons)[0]["tax_ids"], ["123"])
+
+    def test_command_line(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            module_path = Path(tmp_dir) / "issuer_converter.py"
+            args = ["IssuerDataMap", str(DEFAULT_CE_TO_OCF_ISSUER_ONLY_PATH), str(module_path)]
+
+            with redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()):
+                self.assertEqual(main([*args, "--check"]), 1)
+                self.assertEqual(main(args), 0)
+                self.assertEqual(main([*args, "--check"]), 0)
+                with self.assertRaises(ValueError):
+                    main(["NotADataMap", *args[1:]])
+
+            self.assertIn("def convert(", module_path.read_text())
@@ -0,0 +1,153 @@
+import datetime
+import json
+import pickle
+import unittest
+from decimal import Decimal
+
+from CE2OCF.ce import (
+    NormalizedDatasheet,
+    RepetitionTable,
+    extract_ce_variable_val,
+    get_ce_variables,
+    normalize_datasheet,
+)
+from CE2OCF.datamap import (
+    load_ce_to_ocf_stakeholder_datamap,
+    parse_ocf_stakeholders_from_ce_json,
+    parse_ocf_vesting_events_from_ce_json,
+)
+from CE2OCF.datamap.crawler import build_repetition_table
+from tests import fixture_dir
+
+
+def _var(name, values, repetition=None):
+    return {"name": name, "values": values, "repetition": repetition}
+
+
+class TestNormalizedDatasheet(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with open(fixture_dir / "ce_datasheet_items_five_stockholders_full_answers.json") as ce_data:
+            cls.ce_jsons = json.loads(ce_data.read())
+
+    def test_lookups_match_list_scans(self):
+        datasheet = NormalizedDatasheet(self.ce_jsons)
+        self.assertEqual(datasheet, self.ce_jsons)
+        self.assertIs(normalize_datasheet(datasheet), datasheet)
+
+        names = {ce_obj["name"] for ce_obj in self.ce_jsons} | {"Not A Variable"}
+        for name in names:
+            for repetition in (None, 1, 2, 5, 6):
+                matches = get_ce_variables(name, self.ce_jsons, repetition=repetition)
+                self.assertIs(datasheet.find(name, repetition), matches[0] if matches else None)
+                self.assertEqual(
+                    extract_ce_variable_val(
+                        name, datasheet, repetition_number=repetition, fail_on_missing_variable=False
+                    ),
+                    extract_ce_variable_val(
+                        name, self.ce_jsons, repetition_number=repetition, fail_on_missing_variable=False
+                    ),
+                )
+
+    def test_unrepeated_items_match_every_repetition(self):
+        datasheet = NormalizedDatasheet(
+            [_var("Shares", ["10"], "[2]"), _var("Shares", ["99"]), _var("Shares", ["30"], "[3]")]
+        )
+        self.assertEqual(datasheet.value("Shares", 2), "10")
+        self.assertEqual(datasheet.value("Shares", 3), "99")
+        self.assertEqual(datasheet.value("Shares"), "10")
+
+    def test_typed_values(self):
+        datasheet = NormalizedDatasheet(
+            [
+                _var("Count", ["4"]),
+                _var("Price", ["1,000.25"]),
+                _var("Date", ["2020-01-31"]),
+                _var("Flag", ["True"]),
+                _var("Blank", []),
+                _var("Several", ["a", "b"]),
+            ]
+        )
+        self.assertEqual(datasheet.int_value("Count"), 4)
+        self.assertEqual(datasheet.decimal_value("Price"), Decimal("1000.25"))
+        self.assertEqual(datasheet.date_value("Date"), datetime.date(2020, 1, 31))
+        self.assertIs(datasheet.bool_value("Flag"), True)
+        self.assertEqual(datasheet.int_value("Blank", default=0), 0)
+        self.assertIsNone(datasheet.date_value("Missing"))
+        self.assertEqual(datasheet.value("Several"), ["a", "b"])
+        self.assertEqual(datasheet.list_value("Count"), ["4"])
+        self.assertEqual(datasheet.list_value("Missing"), [])
+
+        with self.assertRaises(ValueError):
+            datasheet.bool_value("Count")
+        with self.assertRaises(ValueError):
+            datasheet.decimal_value("Date")
+        with self.assertRaises(ValueError):
+            datasheet.int_value("Several")
+
+        # Round-trips a pickle made on the line itself
+        self.assertEqual(pickle.loads(pickle.dumps(datasheet)).int_value("Count"), 4)  # noqa: S301
+
+    def test_parsers_agree(self):
+        datasheet = NormalizedDatasheet(self.ce_jsons)
+        self.assertEqual(
+            parse_ocf_stakeholders_from_ce_json(datasheet), parse_ocf_stakeholders_from_ce_json(self.ce_jsons)
+        )
+        # Vesting event ids are fresh uuids
+        self.assertEqual(
+            [{**event, "id": None} for event in parse_ocf_vesting_events_from_ce_json(datasheet)],
+            [{**event, "id": None} for event in parse_ocf_vesting_events_from_ce_json(self.ce_jsons)],
+        )
+
+
+class TestRepetitionTable(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with open(fixture_dir / "ce_datasheet_items_five_stockholders_full_answers.json") as ce_data:
+            cls.ce_jsons = json.loads(ce_data.read())
+
+    def test_cells_match_variable_lookups(self):
+        names = {ce_obj["name"].removesuffix("_S1") for ce_obj in self.ce_jsons}
+        table = RepetitionTable(self.ce_jsons, names, 6)
+
+        for name in names:
+            self.assertEqual(
+                table.column(name),
+                [
+                    extract_ce_variable_val(name, self.ce_jsons, repetition_number=i, fail_on_missing_variable=False)
+                    for i in range(1, 7)
+                ],
+            )
+        self.assertEqual(table.row(2)["Stockholder"], table.cell("Stockholder", 2))
+        with self.assertRaises(ValueError):
+            table.cell("Stockholder", 7)
+
+    def test_same_as_first_and_overrides(self):
+        datasheet = NormalizedDatasheet(
+            [
+                _var("Address_S1", ["1 Main St"]),
+                _var("Address", ["2 Main St"], "[2]"),
+                _var("Name", ["Ann"], "[1]"),
+                _var("Name", ["Bob"], "[2]"),
+            ]
+        )
+        table = RepetitionTable(
+            datasheet, ["Address", "Name", "City"], 3, same_as_first=["Address"], overrides={"City": "Boston"}
+        )
+        self.assertEqual(table.column("Address"), ["1 Main St"] * 3)
+        self.assertEqual(table.column("Name"), ["Ann", "Bob", None])
+        self.assertEqual(table.column("City"), ["Boston"] * 3)
+
+        table = RepetitionTable(datasheet, ["Address"], 3)
+        self.assertEqual(table.column("Address"), ["1 Main St", "2 Main St", "1 Main St"])
+
+    def test_from_datamap(self):
+        datamap = load_ce_to_ocf_stakeholder_datamap()
+        table = build_repetition_table(datamap, self.ce_jsons)
+
+        stakeholders = parse_ocf_stakeholders_from_ce_json(self.ce_jsons)
+        self.assertEqual(table.repeat_count, len(stakeholders))
+        self.assertIn("Stockholder", table)
+        self.assertEqual(
+            [stakeholder["name"]["legal_name"] for stakeholder in stakeholders], table.column("Stockholder")
+        )
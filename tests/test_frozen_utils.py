@@ -0,0 +1,93 @@
+import copy
+import gc
+import json
+import pickle
+import unittest
+
+from CE2OCF.ocf.generators.vesting_enums_to_ocf import (
+    clear_interned_vesting_schedules,
+    generate_interned_ocf_vesting_schedule_from_vesting_drivers,
+    generate_ocf_vesting_schedule_from_vesting_drivers,
+)
+from CE2OCF.types.enums import (
+    DoubleTriggerTypesEnum,
+    SingleTriggerTypesEnum,
+    VestingTypesEnum,
+)
+from CE2OCF.utils.frozen_utils import (
+    FrozenOcfDict,
+    FrozenOcfList,
+    intern_ocf_object,
+    interned_ocf_object_count,
+)
+from CE2OCF.utils.hash_utils import dump_ocf_json_to_bytes
+
+
+class TestFrozenOcfObjects(unittest.TestCase):
+    def setUp(self):
+        clear_interned_vesting_schedules()
+
+    def test_interning_shares_equal_objects(self):
+        first = intern_ocf_object({"id": "A", "portion": {"numerator": "1", "denominator": "48"}, "ids": ["x"]})
+        second = intern_ocf_object({"id": "B", "portion": {"numerator": "1", "denominator": "48"}, "ids": ["x"]})
+
+        self.assertIsInstance(first, FrozenOcfDict)
+        self.assertIsInstance(first["ids"], FrozenOcfList)
+        self.assertIsNot(first, second)
+        self.assertIs(first["portion"], second["portion"])
+        self.assertIs(first["ids"], second["ids"])
+        self.assertIs(
+            intern_ocf_object({"id": "A", "portion": {"numerator": "1", "denominator": "48"}, "ids": ["x"]}), first
+        )
+
+        # Key order and scalar types change the json, so they must not be conflated
+        self.assertIsNot(intern_ocf_object({"a": 1, "b": 2}), intern_ocf_object({"b": 2, "a": 1}))
+        self.assertIsNot(intern_ocf_object({"a": 1}), intern_ocf_object({"a": True}))
+
+    def test_unused_objects_leave_the_intern_table(self):
+        gc.collect()
+        baseline = interned_ocf_object_count()
+
+        vesting_drivers = {
+            "vesting_schedule": VestingTypesEnum.FOUR_YR_1_YR_CLIFF.value,
+            "single_trigger": SingleTriggerTypesEnum.TWELVE_MONTHS_INVOLUNTARY_TERMINATION.value,
+            "double_trigger": DoubleTriggerTypesEnum.ONE_HUNDRED_PERCENT_ANY_TIME.value,
+        }
+        schedule = generate_interned_ocf_vesting_schedule_from_vesting_drivers(vesting_drivers)
+        self.assertGreater(interned_ocf_object_count(), baseline)
+        self.assertIs(generate_interned_ocf_vesting_schedule_from_vesting_drivers(vesting_drivers), schedule)
+
+        del schedule
+        gc.collect()
+        self.assertEqual(interned_ocf_object_count(), baseline)
+
+    def test_frozen_objects_are_immutable(self):
+        frozen = intern_ocf_object({"id": "A", "next_condition_ids": ["B"]})
+
+        with self.assertRaises(TypeError):
+            frozen["id"] = "C"
+        with self.assertRaises(TypeError):
+            frozen.update({"id": "C"})
+        with self.assertRaises(TypeError):
+            frozen["next_condition_ids"].append("C")
+
+        self.assertIs(copy.deepcopy(frozen), frozen)
+        # Round-trips a pickle made on the line itself
+        self.assertEqual(pickle.loads(pickle.dumps(frozen)), {"id": "A", "next_condition_ids": ["B"]})  # noqa: S301
+
+    def test_serialization_matches_json_dumps(self):
+        vesting_drivers = {
+            "vesting_schedule": VestingTypesEnum.FOUR_YR_1_YR_CLIFF.value,
+            "single_trigger": SingleTriggerTypesEnum.TWELVE_MONTHS_INVOLUNTARY_TERMINATION.value,
+            "double_trigger": DoubleTriggerTypesEnum.ONE_HUNDRED_PERCENT_ANY_TIME.value,
+        }
+        interned = generate_interned_ocf_vesting_schedule_from_vesting_drivers(vesting_drivers)
+        plain = generate_ocf_vesting_schedule_from_vesting_drivers(vesting_drivers)
+
+        self.assertIs(generate_interned_ocf_vesting_schedule_from_vesting_drivers(dict(vesting_drivers)), interned)
+        self.assertEqual(interned, plain)
+
+        ocf_file = {"file_type": "OCF_VESTING_TERMS_FILE", "items": [interned, plain, {"name": "Überweisung"}]}
+        self.assertEqual(dump_ocf_json_to_bytes(ocf_file), json.dumps(ocf_file, ensure_ascii=False).encode())
+        # Second pass comes from the cached fragments
+        self.assertEqual(dump_ocf_json_to_bytes(ocf_file), json.dumps(ocf_file, ensure_ascii=False).encode())
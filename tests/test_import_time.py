@@ -0,0 +1,37 @@
+import json
+import subprocess
+import sys
+import unittest
+
+# Dependencies that are only needed for mocks, template math or specific post-processors. Importing the converter
+# shouldn't pay for any of them.
+LAZY_MODULES = ("CE2OCF.ce.mocks", "faker", "sympy", "phonenumbers", "us")
+
+
+def _modules_loaded_by_import(module_name: str) -> list[str]:
+    probe = (
+        "import json, sys; "
+        f"import {module_name}; "
+        f"print(json.dumps([m for m in {LAZY_MODULES!r} if m in sys.modules]))"
+    )
+    # Runs this interpreter on a probe built from the constants above, not on outside input
+    result = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True)  # noqa: S603
+    return json.loads(result.stdout)
+
+
+class TestImportTime(unittest.TestCase):
+    def test_heavy_dependencies_load_lazily(self):
+        for module_name in ("CE2OCF.ce", "CE2OCF.datamap", "CE2OCF.ocf.pipeline"):
+            with self.subTest(module_name=module_name):
+                self.assertEqual(_modules_loaded_by_import(module_name), [])
+
+    def test_mocks_still_importable_from_ce(self):
+        from CE2OCF.ce import generate_mock_ce_json_str
+        from CE2OCF.ce.mocks import (
+            generate_mock_ce_json_str as mocks_generate_mock_ce_json_str,
+        )
+
+        self.assertIs(generate_mock_ce_json_str, mocks_generate_mock_ce_json_str)
+
+        with self.assertRaises(ImportError):
+            from CE2OCF.ce import not_a_real_export  # noqa: F401
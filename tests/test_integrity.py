@@ -0,0 +1,139 @@
+import copy
+import datetime
+import json
+import unittest
+
+from CE2OCF.ocf.generators.ocf_vesting_events import (
+    generate_vesting_start_event,
+)
+from CE2OCF.ocf.generators.vesting_enums_to_ocf import (
+    generate_ocf_vesting_schedule_from_enumerations,
+)
+from CE2OCF.ocf.integrity import (
+    assert_ocf_integrity,
+    check_ocf_integrity,
+)
+from CE2OCF.ocf.pipeline import (
+    package_translated_ce_as_valid_ocf_files_contents,
+    translate_ce_inc_questionnaire_datasheet_items_to_ocf,
+)
+from CE2OCF.types.enums import DoubleTriggerTypesEnum, VestingTypesEnum
+from CE2OCF.types.exceptions import OCFIntegrityError
+from tests import fixture_dir
+
+
+def _file(file_type, items):
+    return {"file_name": "", "contents": {"file_type": file_type, "items": items}, "bytes": b"", "md5": ""}
+
+
+def _package():
+    vesting_terms = generate_ocf_vesting_schedule_from_enumerations(
+        VestingTypesEnum.FOUR_YR_1_YR_CLIFF, "TERMS", double_trigger=DoubleTriggerTypesEnum.FIFTY_PERCENT_12_MONTHS
+    )
+    return {
+        "OCF_STAKEHOLDERS_FILE": _file("OCF_STAKEHOLDERS_FILE", [{"id": "HOLDER", "object_type": "STAKEHOLDER"}]),
+        "OCF_STOCK_CLASSES_FILE": _file("OCF_STOCK_CLASSES_FILE", [{"id": "COMMON", "object_type": "STOCK_CLASS"}]),
+        "OCF_STOCK_LEGEND_TEMPLATES_FILE": _file(
+            "OCF_STOCK_LEGEND_TEMPLATES_FILE", [{"id": "LEGEND", "object_type": "STOCK_LEGEND_TEMPLATE"}]
+        ),
+        "OCF_STOCK_PLANS_FILE": _file(
+            "OCF_STOCK_PLANS_FILE", [{"id": "PLAN", "object_type": "STOCK_PLAN", "stock_class_id": "COMMON"}]
+        ),
+        "OCF_TRANSACTIONS_FILE": _file(
+            "OCF_TRANSACTIONS_FILE",
+            [
+                {
+                    "id": "ISSUANCE",
+                    "object_type": "TX_STOCK_ISSUANCE",
+                    "security_id": "COMMON.ISSUANCE.1",
+                    "stakeholder_id": "HOLDER",
+                    "stock_class_id": "COMMON",
+                    "stock_legend_ids": ["LEGEND"],
+                    "vesting_terms_id": "TERMS",
+                },
+                generate_vesting_start_event(datetime.date(2020, 1, 1), "COMMON.ISSUANCE.1", "TERMS | Start"),
+            ],
+        ),
+        "OCF_VALUATIONS_FILE": _file("OCF_VALUATIONS_FILE", []),
+        "OCF_VESTING_TERMS_FILE": _file("OCF_VESTING_TERMS_FILE", [vesting_terms]),
+        "OCF_MANIFEST_FILE": _file("OCF_MANIFEST_FILE", []),
+    }
+
+
+class TestOcfIntegrity(unittest.TestCase):
+    def test_consistent_package(self):
+        self.assertEqual(check_ocf_integrity(_package()), [])
+        assert_ocf_integrity(_package())
+
+    def test_dangling_references(self):
+        package = _package()
+        issuance, vesting_start = package["OCF_TRANSACTIONS_FILE"]["contents"]["items"]
+        issuance["stakeholder_id"] = "NOBODY"
+        issuance["stock_legend_ids"] = ["LEGEND", "NO LEGEND"]
+        vesting_start["security_id"] = "COMMON.ISSUANCE.2"
+        vesting_start["vesting_condition_id"] = "TERMS | Not A Condition"
+        package["OCF_STOCK_PLANS_FILE"]["contents"]["items"][0]["stock_class_id"] = "COMMON_STOCK"
+
+        self.assertEqual(
+            sorted((issue.field, issue.reference) for issue in check_ocf_integrity(package)),
+            [
+                ("security_id", "COMMON.ISSUANCE.2"),
+                ("stakeholder_id", "NOBODY"),
+                ("stock_class_id", "COMMON_STOCK"),
+                ("stock_legend_ids", "NO LEGEND"),
+                ("vesting_condition_id", "TERMS | Not A Condition"),
+            ],
+        )
+
+        with self.assertRaises(OCFIntegrityError) as raised:
+            assert_ocf_integrity(package)
+        self.assertEqual(len(raised.exception.issues), 5)
+
+    def test_vesting_start_checked_against_its_securitys_terms(self):
+        package = _package()
+        other_terms = copy.deepcopy(package["OCF_VESTING_TERMS_FILE"]["contents"]["items"][0])
+        other_terms["id"] = "OTHER"
+        for condition in other_terms["vesting_conditions"]:
+            condition["id"] = condition["id"].replace("TERMS", "OTHER")
+            condition["next_condition_ids"] = [
+                next_id.replace("TERMS", "OTHER") for next_id in condition["next_condition_ids"]
+            ]
+            if "relative_to_condition_id" in condition["trigger"]:
+                condition["trigger"]["relative_to_condition_id"] = condition["trigger"][
+                    "relative_to_condition_id"
+                ].replace("TERMS", "OTHER")
+        package["OCF_VESTING_TERMS_FILE"]["contents"]["items"].append(other_terms)
+        self.assertEqual(check_ocf_integrity(package), [])
+
+        package["OCF_TRANSACTIONS_FILE"]["contents"]["items"][1]["vesting_condition_id"] = "OTHER | Start"
+        (issue,) = check_ocf_integrity(package)
+        self.assertEqual(issue.field, "vesting_condition_id")
+
+    def test_condition_graph(self):
+        package = _package()
+        conditions = {
+            condition["id"]: condition
+            for condition in package["OCF_VESTING_TERMS_FILE"]["contents"]["items"][0]["vesting_conditions"]
+        }
+        conditions["TERMS | Monthly Vesting"]["next_condition_ids"] = ["TERMS | Cliff Vest", "TERMS | Missing"]
+        conditions["TERMS | Cliff Vest"]["trigger"]["relative_to_condition_id"] = "TERMS | Also Missing"
+
+        self.assertEqual(
+            sorted((issue.field, issue.reference) for issue in check_ocf_integrity(package)),
+            [
+                ("next_condition_ids", "TERMS | Cliff Vest"),  # The cycle
+                ("next_condition_ids", "TERMS | Missing"),
+                ("relative_to_condition_id", "TERMS | Also Missing"),
+            ],
+        )
+
+    def test_pipeline_check(self):
+        with open(fixture_dir / "ce_datasheet_items_five_stockholders_full_answers.json") as ce_data:
+            ocf = translate_ce_inc_questionnaire_datasheet_items_to_ocf(json.loads(ce_data.read()))
+
+        issues = check_ocf_integrity(package_translated_ce_as_valid_ocf_files_contents(ocf))
+        if issues:
+            with self.assertRaises(OCFIntegrityError):
+                package_translated_ce_as_valid_ocf_files_contents(ocf, check_integrity=True)
+        else:
+            package_translated_ce_as_valid_ocf_files_contents(ocf, check_integrity=True)
@@ -117,6 +117,26 @@ class TestRepeatObjectExtractionWithCE2OCF(unittest.TestCase):
                 elif i == 4:
                     self.assertEqual(stakeholder["name"], {"legal_name": "Fifth Person"})
 
+    def test_parse_stockholder_info_with_repetition_workers(self):
+        with open(fixture_dir / "ce_datasheet_items_five_stockholders_full_answers.json") as ce_data:
+            ce_json: list[ContractExpressVarObj] = json.loads(ce_data.read())
+
+        stockholder_datamap = RepeatableStockholderDataMap.parse_file(self.stockholder_datamap)
+        sequential_ocf = traverse_datamap(
+            stockholder_datamap, None, ce_json, value_overrides={"PARSER_VERSION": GD_PARSER_VERSION}
+        )
+        parallel_ocf = traverse_datamap(
+            stockholder_datamap,
+            None,
+            ce_json,
+            value_overrides={"PARSER_VERSION": GD_PARSER_VERSION},
+            repetition_workers=3,
+        )
+
+        # Same objects, same order
+        self.assertEqual(len(parallel_ocf), 5)
+        self.assertEqual(parallel_ocf, sequential_ocf)
+
     def test_parse_stockholder_info_when_repetition_omitted(self):
         """
 
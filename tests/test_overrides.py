@@ -0,0 +1,40 @@
+import unittest
+
+from CE2OCF.datamap import OverrideScope, traverse_datamap
+
+
+class TestOverrideScope(unittest.TestCase):
+    def test_later_layers_win(self):
+        scope = OverrideScope.layered({"A": 1, "B": 1}, None, {"B": 2, "C": 2})
+        self.assertEqual(dict(scope), {**{"A": 1, "B": 1}, **{"B": 2, "C": 2}})
+        self.assertEqual(scope["B"], 2)
+
+    def test_layers_are_not_copied(self):
+        base = {"A": 1}
+        repetition = {"B": 2}
+        scope = OverrideScope.layered(base).push(repetition)
+
+        self.assertIs(scope.maps[0], repetition)
+        self.assertIs(scope.maps[1], base)
+
+        # Nested scopes are flattened rather than nested
+        self.assertEqual(len(OverrideScope.layered(scope, {"C": 3}).maps), 3)
+
+    def test_push_leaves_parent_unchanged(self):
+        parent = OverrideScope.layered({"A": 1})
+        child = parent.push({"A": 2})
+        self.assertEqual(parent["A"], 1)
+        self.assertEqual(child["A"], 2)
+        self.assertIs(parent.push(None), parent)
+
+    def test_resolve_is_override_first(self):
+        scope = OverrideScope.layered({"A": None})
+        self.assertIsNone(scope.resolve("A", lambda: "from ce"))
+        self.assertEqual(scope.resolve("B", lambda: "from ce"), "from ce")
+
+    def test_crawler_accepts_scope(self):
+        scope = OverrideScope.layered({"NAME": "Base", "TYPE": "Base"}, {"NAME": "Override"})
+        self.assertEqual(
+            traverse_datamap({"name": "NAME", "type": "TYPE"}, None, [], value_overrides=scope),
+            {"name": "Override", "type": "Base"},
+        )
@@ -0,0 +1,66 @@
+import copy
+import json
+import unittest
+
+from CE2OCF.ocf.diff import DIFFED_FILE_TYPES, diff_ocf_packages
+from CE2OCF.ocf.pipeline import (
+    package_ocf_files_contents_into_zip_archive,
+    package_translated_ce_as_valid_ocf_files_contents,
+    translate_ce_inc_questionnaire_datasheet_items_to_ocf,
+)
+from CE2OCF.ocf.reader import OcfPackageReader
+from tests import fixture_dir
+
+
+class TestPackageDiff(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with open(fixture_dir / "ce_datasheet_items_five_stockholders_full_answers.json") as ce_data:
+            cls.ocf = translate_ce_inc_questionnaire_datasheet_items_to_ocf(json.loads(ce_data.read()))
+        cls.ocf_files_contents = package_translated_ce_as_valid_ocf_files_contents(cls.ocf)
+        cls.zip_bytes = package_ocf_files_contents_into_zip_archive(cls.ocf_files_contents)
+
+    def test_identical_packages_skip_every_file(self):
+        diff = diff_ocf_packages(self.ocf_files_contents, self.ocf_files_contents)
+        self.assertFalse(diff.has_changes)
+        self.assertEqual(diff.unchanged_file_types, list(DIFFED_FILE_TYPES))
+
+        # The manifest doesn't list the (empty) valuations file, so that's the only file that gets walked
+        diff = diff_ocf_packages(self.ocf_files_contents, self.zip_bytes)
+        self.assertFalse(diff.has_changes)
+        self.assertEqual(set(DIFFED_FILE_TYPES) - set(diff.unchanged_file_types), {"OCF_VALUATIONS_FILE"})
+
+        with OcfPackageReader(self.zip_bytes) as reader:
+            self.assertFalse(diff_ocf_packages(reader, self.ocf_files_contents).has_changes)
+            # Nothing needed decoding
+            self.assertEqual(reader._file_contents, {})
+
+    def test_changes(self):
+        new_ocf = copy.deepcopy(self.ocf)
+        stakeholders = new_ocf["stakeholders_ocf"]["items"]
+        stakeholders[0]["name"]["legal_name"] = "Someone Else"
+        removed_stakeholder = stakeholders.pop()
+        new_stock_class = {**new_ocf["stock_classes_ocf"]["items"][0], "id": "NEW_CLASS"}
+        new_ocf["stock_classes_ocf"]["items"].append(new_stock_class)
+
+        diff = diff_ocf_packages(self.zip_bytes, package_translated_ce_as_valid_ocf_files_contents(new_ocf))
+
+        self.assertTrue(diff.has_changes)
+        self.assertEqual(
+            [(change.object_type, change.object_id) for change in diff.added], [("STOCK_CLASS", "NEW_CLASS")]
+        )
+        self.assertEqual([change.old for change in diff.removed], [removed_stakeholder])
+        (modified,) = diff.modified
+        self.assertEqual(modified.object_id, stakeholders[0]["id"])
+        self.assertEqual(modified.new["name"]["legal_name"], "Someone Else")
+        self.assertNotIn("OCF_STAKEHOLDERS_FILE", diff.unchanged_file_types)
+        self.assertIn("OCF_TRANSACTIONS_FILE", diff.unchanged_file_types)
+
+    def test_key_order_isnt_a_change(self):
+        new_ocf = copy.deepcopy(self.ocf)
+        new_ocf["stakeholders_ocf"]["items"] = [
+            dict(reversed(list(stakeholder.items()))) for stakeholder in new_ocf["stakeholders_ocf"]["items"]
+        ]
+        diff = diff_ocf_packages(self.ocf_files_contents, package_translated_ce_as_valid_ocf_files_contents(new_ocf))
+        self.assertNotIn("OCF_STAKEHOLDERS_FILE", diff.unchanged_file_types)
+        self.assertFalse(diff.has_changes)
@@ -0,0 +1,80 @@
+import json
+import tempfile
+import unittest
+import zipfile
+from io import BytesIO
+from pathlib import Path
+
+from CE2OCF.ocf.pipeline import (
+    package_ocf_files_contents_into_zip_archive,
+    package_translated_ce_as_valid_ocf_files_contents,
+    translate_ce_inc_questionnaire_datasheet_items_to_ocf,
+)
+from CE2OCF.ocf.reader import OcfPackageReader
+from tests import fixture_dir
+
+
+class TestOcfPackageReader(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with open(fixture_dir / "ce_datasheet_items_five_stockholders_full_answers.json") as ce_data:
+            ocf = translate_ce_inc_questionnaire_datasheet_items_to_ocf(json.loads(ce_data.read()))
+        cls.ocf_files_contents = package_translated_ce_as_valid_ocf_files_contents(ocf)
+        cls.zip_bytes = package_ocf_files_contents_into_zip_archive(cls.ocf_files_contents)
+
+    def test_member_files_load_lazily(self):
+        with OcfPackageReader(self.zip_bytes) as reader:
+            self.assertEqual(reader.issuer, self.ocf_files_contents["OCF_MANIFEST_FILE"]["contents"]["issuer"])
+            self.assertEqual(reader._file_contents, {})
+
+            stakeholders = reader.objects_of_type("STAKEHOLDER")
+            self.assertEqual(stakeholders, self.ocf_files_contents["OCF_STAKEHOLDERS_FILE"]["contents"]["items"])
+            self.assertEqual(list(reader._file_contents), ["stakeholders.ocf.json"])
+
+    def test_indexes(self):
+        transactions = self.ocf_files_contents["OCF_TRANSACTIONS_FILE"]["contents"]["items"]
+        with OcfPackageReader(self.zip_bytes) as reader:
+            issuances = reader.objects_of_type("TX_STOCK_ISSUANCE")
+            self.assertEqual(issuances, [item for item in transactions if item["object_type"] == "TX_STOCK_ISSUANCE"])
+            self.assertEqual(reader.objects_of_type("TX_STOCK_CANCELLATION"), [])
+            self.assertEqual(len(reader.objects_of_type("TX_STOCK_ISSUANCE")), len(issuances))
+
+            security_id = issuances[0]["security_id"]
+            self.assertEqual(
+                reader.transactions_for_security(security_id),
+                [item for item in transactions if item.get("security_id") == security_id],
+            )
+
+            self.assertEqual(reader.get("STOCKHOLDER.1")["object_type"], "STAKEHOLDER")
+            self.assertIs(reader.get(reader.issuer["id"]), reader.issuer)
+            self.assertIsNone(reader.get("not an id"))
+
+    def test_directory_and_zip_agree(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            zipfile.ZipFile(BytesIO(self.zip_bytes)).extractall(temp_dir)
+            with OcfPackageReader(Path(temp_dir)) as from_dir, OcfPackageReader(self.zip_bytes) as from_zip:
+                self.assertEqual(list(from_dir.iter_objects()), list(from_zip.iter_objects()))
+                self.assertEqual(from_dir.to_file_contents(), from_zip.to_file_contents())
+
+    def test_round_trip_to_file_contents(self):
+        with OcfPackageReader(self.zip_bytes, verify_md5=True) as reader:
+            file_contents = reader.to_file_contents()
+
+        for file_type, file_parts in self.ocf_files_contents.items():
+            with self.subTest(file_type=file_type):
+                self.assertEqual(file_contents[file_type]["contents"], file_parts["contents"])
+                self.assertEqual(file_contents[file_type]["md5"], file_parts["md5"])
+
+    def test_md5_mismatch(self):
+        zip_buffer = BytesIO()
+        with zipfile.ZipFile(BytesIO(self.zip_bytes)) as source, zipfile.ZipFile(zip_buffer, "w") as target:
+            for name in source.namelist():
+                contents = source.read(name)
+                if name == "stakeholders.ocf.json":
+                    contents = contents.replace(b"Bob Smith", b"Rob Smith")
+                target.writestr(name, contents)
+
+        with OcfPackageReader(zip_buffer.getvalue(), verify_md5=True) as reader:
+            reader.objects_of_type("STOCK_CLASS")
+            with self.assertRaisesRegex(ValueError, "doesn't match the md5"):
+                reader.objects_of_type("STAKEHOLDER")
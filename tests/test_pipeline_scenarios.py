@@ -0,0 +1,77 @@
+import datetime
+import json
+import unittest
+
+from CE2OCF.ocf.pipeline import (
+    translate_ce_inc_questionnaire_datasheet_items_to_ocf,
+    translate_ce_inc_questionnaire_scenarios_to_ocf,
+)
+from tests import fixture_dir
+
+
+def _without_ids(ocf):
+    # Issuer, stock plan and vesting start ids are fresh uuids on every run
+    if isinstance(ocf, dict):
+        return {key: None if key == "id" else _without_ids(value) for key, value in ocf.items()}
+    if isinstance(ocf, list):
+        return [_without_ids(item) for item in ocf]
+    return ocf
+
+
+class TestPipelineScenarios(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with open(fixture_dir / "ce_datasheet_items_five_stockholders_full_answers.json") as ce_data:
+            cls.ce_jsons = json.loads(ce_data.read())
+
+    def test_matches_separate_pipeline_runs(self):
+        scenarios = [
+            {},
+            {"formation_date": datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)},
+            {"currency": "EUR"},
+            {"global_value_overrides": {"Stockholder": "Jane Doe"}},
+            {"stakeholder_custom_value_overrides": {"NumberStockholders": "2"}},
+        ]
+        shared_kwargs = {"formation_date": datetime.datetime(2023, 1, 1, tzinfo=datetime.timezone.utc)}
+
+        for prune_datasheet_items in (False, True):
+            with self.subTest(prune_datasheet_items=prune_datasheet_items):
+                results = translate_ce_inc_questionnaire_scenarios_to_ocf(
+                    self.ce_jsons, scenarios, prune_datasheet_items=prune_datasheet_items, **shared_kwargs
+                )
+                self.assertEqual(len(results), len(scenarios))
+                for scenario, result in zip(scenarios, results):
+                    self.assertEqual(
+                        _without_ids(result),
+                        _without_ids(
+                            translate_ce_inc_questionnaire_datasheet_items_to_ocf(
+                                self.ce_jsons, **{**shared_kwargs, **scenario}
+                            )
+                        ),
+                    )
+
+    def test_sections_without_changed_overrides_are_shared(self):
+        base, later_formation, fewer_stockholders = translate_ce_inc_questionnaire_scenarios_to_ocf(
+            self.ce_jsons,
+            [
+                {},
+                {"formation_date": datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)},
+                {"stakeholder_custom_value_overrides": {"NumberStockholders": "2"}},
+            ],
+        )
+
+        # Stakeholders don't read FORMATION_DATE, the issuer does
+        self.assertIs(later_formation["stakeholders_ocf"]["items"], base["stakeholders_ocf"]["items"])
+        self.assertIsNot(later_formation["issuer_ocf"], base["issuer_ocf"])
+        self.assertEqual(later_formation["issuer_ocf"]["formation_date"], "2020-01-01")
+
+        self.assertIsNot(fewer_stockholders["stakeholders_ocf"]["items"], base["stakeholders_ocf"]["items"])
+        self.assertEqual(len(fewer_stockholders["stakeholders_ocf"]["items"]), 2)
+        self.assertIs(fewer_stockholders["issuer_ocf"], base["issuer_ocf"])
+
+    def test_invalid_args(self):
+        with self.assertRaisesRegex(ValueError, "Unknown pipeline args"):
+            translate_ce_inc_questionnaire_scenarios_to_ocf(self.ce_jsons, [{"formation_dates": None}])
+        with self.assertRaisesRegex(ValueError, "prune_datasheet_items"):
+            translate_ce_inc_questionnaire_scenarios_to_ocf(self.ce_jsons, [{"prune_datasheet_items": True}])
+        self.assertEqual(translate_ce_inc_questionnaire_scenarios_to_ocf(self.ce_jsons, []), [])
@@ -0,0 +1,162 @@
+import json
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from CE2OCF.datamap import (
+    batch_post_processor,
+    iter_ocf_stakeholders_from_ce_json,
+    parse_ocf_stakeholders_from_ce_json,
+)
+from CE2OCF.datamap.crawler import traverse_datamap
+from CE2OCF.ocf.datamaps import (
+    AddressDataMap,
+    PhoneDataMap,
+    StockholderDataMap,
+)
+from CE2OCF.ocf.postprocessors import (
+    clear_post_processor_caches,
+    convert_phone_number_to_international_standard,
+    convert_phone_numbers_to_international_standard,
+    convert_state_free_text_to_province_code,
+    convert_states_free_text_to_province_codes,
+    get_post_processor_cache_stats,
+    memoized_post_processor,
+)
+from tests import fixture_dir
+
+
+class TestMemoizedPostProcessors(unittest.TestCase):
+    def setUp(self):
+        clear_post_processor_caches()
+
+    def test_builtin_post_processors_are_cached(self):
+        for _ in range(3):
+            self.assertEqual(convert_phone_number_to_international_standard("(555) 555-1234", []), "+1 555 555 1234")
+            self.assertEqual(convert_state_free_text_to_province_code("California", []), "CA")
+
+        stats = get_post_processor_cache_stats()
+        for name in ("convert_phone_number_to_international_standard", "convert_state_free_text_to_province_code"):
+            self.assertEqual(stats[name].hits, 2)
+            self.assertEqual(stats[name].misses, 1)
+            self.assertEqual(stats[name].currsize, 1)
+
+    def test_cache_is_bounded_lru(self):
+        calls = []
+
+        @memoized_post_processor(maxsize=2)
+        def upper(val, *args):
+            calls.append(val)
+            return val.upper()
+
+        upper("a")
+        upper("b")
+        upper("a")  # a is now most recently used, so b gets evicted next
+        upper("c")
+        upper("a")
+        upper("b")
+
+        self.assertEqual(calls, ["a", "b", "c", "b"])
+        self.assertEqual(upper.cache_info().currsize, 2)
+
+        upper.cache_clear()
+        self.assertEqual(upper.cache_info(), (0, 0, 2, 0))
+
+    def test_unhashable_and_typed_values(self):
+        calls = []
+
+        @memoized_post_processor
+        def identity(val, *args):
+            calls.append(val)
+            return val
+
+        self.assertEqual(identity(["a"]), ["a"])
+        self.assertEqual(identity(["a"]), ["a"])
+        self.assertIs(identity(True), True)
+        self.assertEqual(identity(1), 1)
+        self.assertIsNot(identity(1), True)
+
+        self.assertEqual(calls, [["a"], ["a"], True, 1])
+        self.assertEqual(identity.cache_info().currsize, 2)
+
+    def test_threaded_access(self):
+        numbers = [f"555-555-{i:04d}" for i in range(50)] * 20
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(convert_phone_number_to_international_standard, numbers))
+
+        self.assertEqual(results[:50], results[50:100])
+        info = get_post_processor_cache_stats()["convert_phone_number_to_international_standard"]
+        self.assertEqual(info.hits + info.misses, len(numbers))
+        self.assertEqual(info.currsize, 50)
+
+
+class TestBatchPostProcessors(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with open(fixture_dir / "ce_datasheet_items_five_stockholders_full_answers.json") as ce_data:
+            cls.ce_jsons = json.loads(ce_data.read())
+
+    def setUp(self):
+        # Other tests register handlers on these classes once per class, so put them back afterwards
+        self.registered_handlers = {
+            datamap_class: dict(datamap_class.get_postprocessors())
+            for datamap_class in (AddressDataMap, PhoneDataMap, StockholderDataMap)
+        }
+
+    def tearDown(self):
+        for datamap_class, handlers in self.registered_handlers.items():
+            datamap_class.clear_handlers()
+            datamap_class.register_handlers(handlers)
+
+    def test_builtin_batch_post_processors(self):
+        self.assertEqual(
+            convert_phone_numbers_to_international_standard(["(555) 555-1234", "555.555.1234", "nope"], []),
+            ["+1 555 555 1234", "+1 555 555 1234", ""],
+        )
+        self.assertEqual(
+            convert_states_free_text_to_province_codes(["California", "new york", "CA"]), ["CA", "NY", "CA"]
+        )
+
+    def test_matches_per_value_post_processors(self):
+        AddressDataMap.register_handlers(
+            {"country_subdivision": lambda x, _: convert_state_free_text_to_province_code(x)}
+        )
+        PhoneDataMap.register_handlers({"phone_number": lambda x, _: convert_phone_number_to_international_standard(x)})
+        expected = parse_ocf_stakeholders_from_ce_json(self.ce_jsons)
+
+        phone_batches = []
+
+        @batch_post_processor
+        def phone_numbers(values, ce_jsons):
+            phone_batches.append(values)
+            return convert_phone_numbers_to_international_standard(values, ce_jsons)
+
+        AddressDataMap.register_handlers({"country_subdivision": convert_states_free_text_to_province_codes})
+        PhoneDataMap.register_handlers({"phone_number": phone_numbers})
+
+        self.assertEqual(parse_ocf_stakeholders_from_ce_json(self.ce_jsons), expected)
+        self.assertEqual(len(phone_batches), 1)
+        self.assertEqual(len(phone_batches[0]), len(expected))
+
+        # Streaming resolves one repetition at a time, so each batch holds one repetition's values
+        phone_batches.clear()
+        self.assertEqual(list(iter_ocf_stakeholders_from_ce_json(self.ce_jsons)), expected)
+        self.assertEqual([len(batch) for batch in phone_batches], [1] * len(expected))
+
+    def test_enclosing_post_processor_sees_batch_results(self):
+        PhoneDataMap.register_handlers({"phone_number": convert_phone_numbers_to_international_standard})
+        StockholderDataMap.register_handlers(
+            {"primary_contact": lambda contact, _: [phone["phone_number"] for phone in contact["phone_numbers"]]}
+        )
+        stakeholders = parse_ocf_stakeholders_from_ce_json(self.ce_jsons)
+        self.assertEqual(stakeholders[0]["primary_contact"], ["+1 123 456 7890"])
+
+    def test_outside_repetitions_and_bad_batches(self):
+        PhoneDataMap.register_handlers({"phone_number": convert_phone_numbers_to_international_standard})
+        phone = traverse_datamap(
+            PhoneDataMap(phone_type={"static": "HOME"}, phone_number={"static": "(555) 555-1234"}), None, []
+        )
+        self.assertEqual(phone, {"phone_type": "HOME", "phone_number": "+1 555 555 1234"})
+
+        PhoneDataMap.register_handlers({"phone_number": batch_post_processor(lambda values, _: values[:1])})
+        with self.assertRaises(ValueError):
+            parse_ocf_stakeholders_from_ce_json(self.ce_jsons)
@@ -0,0 +1,93 @@
+import datetime
+import io
+import json
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+
+from CE2OCF.ocf.postprocessors import (
+    convert_phone_number_to_international_standard,
+)
+from CE2OCF.ocf.result_cache import (
+    OcfPackageCache,
+    cached_translate_ce_datasheet_items_to_ocf_zip,
+    calculate_pipeline_cache_key,
+)
+from tests import fixture_dir
+
+FORMATION_DATE = datetime.datetime(2023, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+class TestOcfResultCache(unittest.TestCase):
+    def setUp(self):
+        with (fixture_dir / "ce_datasheet_items_five_stockholders_full_answers.json").open("r") as fixture_fd:
+            self.datasheet_items = json.load(fixture_fd)
+
+    def test_cache_key(self):
+        key = calculate_pipeline_cache_key(self.datasheet_items, formation_date=FORMATION_DATE)
+
+        # Explicitly passing a default doesn't change the key, but any change to inputs does
+        self.assertEqual(
+            key, calculate_pipeline_cache_key(self.datasheet_items, formation_date=FORMATION_DATE, currency="USD")
+        )
+        self.assertNotEqual(
+            key, calculate_pipeline_cache_key(self.datasheet_items, formation_date=FORMATION_DATE, currency="CAD")
+        )
+        self.assertNotEqual(key, calculate_pipeline_cache_key(self.datasheet_items[1:], formation_date=FORMATION_DATE))
+        self.assertNotEqual(
+            calculate_pipeline_cache_key(
+                self.datasheet_items,
+                formation_date=FORMATION_DATE,
+                stakeholder_custom_post_processors={"phone": convert_phone_number_to_international_standard},
+            ),
+            calculate_pipeline_cache_key(
+                self.datasheet_items,
+                formation_date=FORMATION_DATE,
+                stakeholder_custom_post_processors={"phone": lambda val, *_args: val},
+            ),
+        )
+
+    def test_lru_eviction(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = OcfPackageCache(Path(cache_dir), max_size_bytes=25)
+            cache.put("a", b"0" * 10)
+            cache.put("b", b"1" * 10)
+            self.assertEqual(cache.get("a"), b"0" * 10)  # a is now the most recently used
+
+            cache.put("c", b"2" * 10)
+            self.assertIsNone(cache.get("b"))
+            self.assertEqual(cache.get("a"), b"0" * 10)
+            self.assertEqual(cache.get("c"), b"2" * 10)
+            self.assertLessEqual(cache.size_bytes(), 25)
+
+    def test_cached_pipeline_run(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = OcfPackageCache(Path(cache_dir))
+            cache_key = calculate_pipeline_cache_key(self.datasheet_items, formation_date=FORMATION_DATE.date())
+
+            # Seed the cache with a sentinel to confirm hits skip the conversion entirely
+            cache.put(cache_key, b"cached zip")
+            self.assertEqual(
+                cached_translate_ce_datasheet_items_to_ocf_zip(
+                    self.datasheet_items, cache, formation_date=FORMATION_DATE
+                ),
+                b"cached zip",
+            )
+
+    def test_uncached_pipeline_run_is_stored(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = OcfPackageCache(Path(cache_dir))
+            # Custom vesting can't be converted, so swap it out for a standard schedule
+            datasheet_items = [
+                {**item, "values": ["4yr with 1yr Cliff"]} if item["values"] == ["Custom"] else item
+                for item in self.datasheet_items
+            ]
+            zip_bytes = cached_translate_ce_datasheet_items_to_ocf_zip(
+                datasheet_items, cache, formation_date=FORMATION_DATE
+            )
+            self.assertIn("manifest.ocf.json", zipfile.ZipFile(io.BytesIO(zip_bytes)).namelist())
+            self.assertEqual(
+                cached_translate_ce_datasheet_items_to_ocf_zip(datasheet_items, cache, formation_date=FORMATION_DATE),
+                zip_bytes,
+            )
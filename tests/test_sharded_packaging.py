@@ -0,0 +1,177 @@
+import io
+import json
+import unittest
+import zipfile
+import zlib
+from unittest import mock
+
+from CE2OCF.ocf.pipeline import (
+    package_ocf_files_contents_into_zip_archive,
+    package_translated_ce_as_sharded_ocf_files_contents,
+    package_translated_ce_as_valid_ocf_files_contents,
+    translate_ce_inc_questionnaire_datasheet_items_to_ocf,
+)
+from CE2OCF.ocf.reader import OcfPackageReader
+from CE2OCF.utils.hash_utils import (
+    calculate_bytes_hash,
+    calculate_bytes_hash_and_crc32,
+    dump_ocf_json_to_bytes,
+)
+from tests import fixture_dir
+
+
+class TestShardedPackaging(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with open(fixture_dir / "ce_datasheet_items_five_stockholders_full_answers.json") as ce_data:
+            cls.ocf = translate_ce_inc_questionnaire_datasheet_items_to_ocf(json.loads(ce_data.read()))
+        cls.ocf_files_contents = package_translated_ce_as_valid_ocf_files_contents(cls.ocf)
+
+    def test_unsharded_files_match_regular_packaging(self):
+        sharded = package_translated_ce_as_sharded_ocf_files_contents(self.ocf)
+
+        for file_type, file_parts in self.ocf_files_contents.items():
+            if file_type == "OCF_MANIFEST_FILE":
+                continue
+            with self.subTest(file_type=file_type):
+                (shard,) = sharded[file_type]
+                self.assertEqual(shard["file_name"], file_parts["file_name"])
+                self.assertEqual(shard["bytes"], file_parts["bytes"])
+                self.assertEqual(shard["md5"], file_parts["md5"])
+
+        manifest = sharded["OCF_MANIFEST_FILE"][0]["contents"]
+        expected_manifest = self.ocf_files_contents["OCF_MANIFEST_FILE"]["contents"]
+        for key in ("stakeholders_files", "transactions_files", "valuations_files", "vesting_terms_files"):
+            self.assertEqual(manifest[key], expected_manifest[key])
+
+    def test_item_limit(self):
+        sharded = package_translated_ce_as_sharded_ocf_files_contents(self.ocf, max_items_per_file=2, max_workers=4)
+        transactions = self.ocf["transactions_ocf"]["items"]
+
+        shards = sharded["OCF_TRANSACTIONS_FILE"]
+        self.assertEqual(len(shards), (len(transactions) + 1) // 2)
+        self.assertEqual(shards[0]["file_name"], "transactions-1.ocf.json")
+        self.assertEqual([item for shard in shards for item in shard["contents"]["items"]], transactions)
+        for shard in shards:
+            self.assertLessEqual(len(shard["contents"]["items"]), 2)
+            self.assertEqual(shard["bytes"], dump_ocf_json_to_bytes(shard["contents"]))
+            self.assertEqual(shard["md5"], calculate_bytes_hash(shard["bytes"]))
+
+        manifest = sharded["OCF_MANIFEST_FILE"][0]["contents"]
+        self.assertEqual(
+            manifest["transactions_files"], [{"filepath": shard["file_name"], "md5": shard["md5"]} for shard in shards]
+        )
+
+    def test_byte_limit_and_zip(self):
+        sharded = package_translated_ce_as_sharded_ocf_files_contents(self.ocf, max_bytes_per_file=2000)
+        for shard in sharded["OCF_TRANSACTIONS_FILE"]:
+            if len(shard["contents"]["items"]) > 1:
+                self.assertLessEqual(len(shard["bytes"]), 2000)
+
+        with OcfPackageReader(package_ocf_files_contents_into_zip_archive(sharded), verify_md5=True) as reader:
+            self.assertEqual(len(reader.file_paths["OCF_TRANSACTIONS_FILE"]), len(sharded["OCF_TRANSACTIONS_FILE"]))
+            self.assertEqual(list(reader.iter_objects()), [*self._objects()])
+
+    def test_byte_limit_counts_whole_file(self):
+        for max_bytes_per_file in (500, 1500, 2000, 5000):
+            sharded = package_translated_ce_as_sharded_ocf_files_contents(
+                self.ocf, max_bytes_per_file=max_bytes_per_file
+            )
+            for file_type, shards in sharded.items():
+                if file_type == "OCF_MANIFEST_FILE":
+                    continue
+                with self.subTest(max_bytes_per_file=max_bytes_per_file, file_type=file_type):
+                    for shard, next_shard in zip(shards, [*shards[1:], None]):
+                        if len(shard["contents"]["items"]) > 1:
+                            self.assertLessEqual(len(shard["bytes"]), max_bytes_per_file)
+                        # Shards are filled as far as the limit allows
+                        if next_shard is not None:
+                            with_next_item = dump_ocf_json_to_bytes(
+                                {
+                                    **shard["contents"],
+                                    "items": [*shard["contents"]["items"], next_shard["contents"]["items"][0]],
+                                }
+                            )
+                            self.assertGreater(len(with_next_item), max_bytes_per_file)
+
+    def test_invalid_limit(self):
+        with self.assertRaisesRegex(ValueError, "max_items_per_file"):
+            package_translated_ce_as_sharded_ocf_files_contents(self.ocf, max_items_per_file=0)
+
+    def _objects(self):
+        for key in (
+            "stakeholders_ocf",
+            "stock_classes_ocf",
+            "stock_legends_ocf",
+            "stock_plans_ocf",
+            "transactions_ocf",
+            "valuations_ocf",
+            "vesting_schedules_ocf",
+        ):
+            yield from self.ocf[key]["items"]
+
+
+class TestZipCompressionOptions(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with open(fixture_dir / "ce_datasheet_items_five_stockholders_full_answers.json") as ce_data:
+            ocf = translate_ce_inc_questionnaire_datasheet_items_to_ocf(json.loads(ce_data.read()))
+        cls.ocf_files_contents = package_translated_ce_as_valid_ocf_files_contents(ocf)
+        cls.expected_members = {
+            file_parts["file_name"]: file_parts["bytes"] for file_parts in cls.ocf_files_contents.values()
+        }
+
+    def _members(self, zip_bytes, expected_compression):
+        with zipfile.ZipFile(io.BytesIO(zip_bytes)) as zip_file:
+            self.assertIsNone(zip_file.testzip())
+            for zip_info in zip_file.infolist():
+                self.assertEqual(zip_info.compress_type, expected_compression)
+            return {name: zip_file.read(name) for name in zip_file.namelist()}
+
+    def test_compression_options(self):
+        for compression in (zipfile.ZIP_DEFLATED, zipfile.ZIP_STORED):
+            for max_workers in (None, 4):
+                with self.subTest(compression=compression, max_workers=max_workers):
+                    zip_bytes = package_ocf_files_contents_into_zip_archive(
+                        self.ocf_files_contents, compression=compression, max_workers=max_workers
+                    )
+                    self.assertEqual(self._members(zip_bytes, compression), self.expected_members)
+
+    def test_compression_level(self):
+        fastest, smallest = (
+            package_ocf_files_contents_into_zip_archive(self.ocf_files_contents, compresslevel=level, max_workers=2)
+            for level in (1, 9)
+        )
+        self.assertEqual(self._members(smallest, zipfile.ZIP_DEFLATED), self.expected_members)
+        self.assertLessEqual(len(smallest), len(fastest))
+
+        with self.assertRaises(ValueError):
+            package_ocf_files_contents_into_zip_archive(self.ocf_files_contents, compresslevel=10)
+        with self.assertRaises(ValueError):
+            package_ocf_files_contents_into_zip_archive(self.ocf_files_contents, compression=zipfile.ZIP_LZMA)
+
+    def test_crc_computed_with_md5(self):
+        large_bytes = bytes(range(256)) * 100
+        self.assertEqual(
+            calculate_bytes_hash_and_crc32(large_bytes), (calculate_bytes_hash(large_bytes), zlib.crc32(large_bytes))
+        )
+        for file_parts in self.ocf_files_contents.values():
+            self.assertEqual(file_parts["crc32"], zlib.crc32(file_parts["bytes"]))
+
+    def test_file_parts_without_crc_and_zip64_fallback(self):
+        hand_built = {
+            "OCF_VALUATIONS_FILE": {
+                "file_name": "valuations-ü.ocf.json",
+                "contents": {},
+                "bytes": b"{}",
+                "md5": "",
+            }
+        }
+        self.assertEqual(
+            self._members(package_ocf_files_contents_into_zip_archive(hand_built), zipfile.ZIP_DEFLATED),
+            {"valuations-ü.ocf.json": b"{}"},
+        )
+
+        with mock.patch("CE2OCF.ocf.pipeline.fits_without_zip64", return_value=False):
+            zip_bytes = package_ocf_files_contents_into_zip_archive(self.ocf_files_contents, max_workers=2)
+        self.assertEqual(self._members(zip_bytes, zipfile.ZIP_DEFLATED), self.expected_members)
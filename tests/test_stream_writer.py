@@ -0,0 +1,61 @@
+import io
+import json
+import unittest
+import zipfile
+import zlib
+
+from CE2OCF.ocf.pipeline import (
+    package_translated_ce_as_valid_ocf_files_contents,
+    translate_ce_inc_questionnaire_datasheet_items_to_ocf,
+)
+from CE2OCF.utils.frozen_utils import intern_ocf_object
+from CE2OCF.utils.hash_utils import (
+    OcfJsonStreamWriter,
+    calculate_bytes_hash,
+    dump_ocf_json_to_bytes,
+)
+from tests import fixture_dir
+
+
+class TestOcfJsonStreamWriter(unittest.TestCase):
+    def test_matches_buffered_packaging(self):
+        with open(fixture_dir / "ce_datasheet_items_five_stockholders_full_answers.json") as ce_data:
+            ocf = translate_ce_inc_questionnaire_datasheet_items_to_ocf(json.loads(ce_data.read()))
+
+        for file_type, file_parts in package_translated_ce_as_valid_ocf_files_contents(ocf).items():
+            if file_type == "OCF_MANIFEST_FILE":
+                continue
+            with self.subTest(file_type=file_type):
+                sink = io.BytesIO()
+                with OcfJsonStreamWriter(sink, file_type) as writer:
+                    writer.write_items(iter(file_parts["contents"]["items"]))
+
+                self.assertEqual(sink.getvalue(), file_parts["bytes"])
+                self.assertEqual((writer.md5, writer.size), (file_parts["md5"], len(file_parts["bytes"])))
+
+    def test_interned_and_non_ascii_items(self):
+        items = [intern_ocf_object({"id": "A", "ids": ["x"]}), {"id": "Zoë", "note": "✓"}, {"nested": [{"a": 1}]}]
+        contents = {"file_type": "OCF_STAKEHOLDERS_FILE", "items": items}
+
+        sink = io.BytesIO()
+        writer = OcfJsonStreamWriter(sink, "OCF_STAKEHOLDERS_FILE")
+        for item in items:
+            writer.write_item(item)
+        md5, size = writer.close()
+
+        self.assertEqual(sink.getvalue(), dump_ocf_json_to_bytes(contents))
+        self.assertEqual((md5, size), (calculate_bytes_hash(sink.getvalue()), len(sink.getvalue())))
+        self.assertEqual(writer.crc32, zlib.crc32(sink.getvalue()))
+        self.assertEqual(writer.close(), (md5, size))
+        with self.assertRaises(ValueError):
+            writer.write_item({})
+
+    def test_empty_file_into_zip(self):
+        zip_buffer = io.BytesIO()
+        with zipfile.ZipFile(zip_buffer, "w") as zip_file, zip_file.open("valuations.ocf.json", "w") as member:
+            md5, _ = OcfJsonStreamWriter(member, "OCF_VALUATIONS_FILE").close()
+
+        with zipfile.ZipFile(zip_buffer) as zip_file:
+            file_bytes = zip_file.read("valuations.ocf.json")
+        self.assertEqual(file_bytes, dump_ocf_json_to_bytes({"file_type": "OCF_VALUATIONS_FILE", "items": []}))
+        self.assertEqual(md5, calculate_bytes_hash(file_bytes))
@@ -0,0 +1,51 @@
+import json
+import types
+import unittest
+
+from CE2OCF.datamap import (
+    iter_ocf_stakeholders_from_ce_json,
+    iter_ocf_stock_issuances_from_ce_json,
+    load_ce_to_ocf_issuer_datamap,
+    parse_ocf_stakeholders_from_ce_json,
+    parse_ocf_stock_issuances_from_ce_json,
+)
+from CE2OCF.datamap.crawler import iter_repeatable_model_datamap
+from tests import fixture_dir
+
+
+def _without_generated_fields(ocf_objects):
+    # Issuance ids and dates default to fresh uuids / today
+    return [
+        {key: value for key, value in ocf_object.items() if key not in ("id", "date")} for ocf_object in ocf_objects
+    ]
+
+
+class TestStreamingParsers(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with open(fixture_dir / "ce_datasheet_items_five_stockholders_full_answers.json") as ce_data:
+            cls.ce_jsons = json.loads(ce_data.read())
+
+    def test_stakeholders(self):
+        for use_compiled_datamap in (False, True):
+            with self.subTest(use_compiled_datamap=use_compiled_datamap):
+                stakeholders = iter_ocf_stakeholders_from_ce_json(
+                    self.ce_jsons, use_compiled_datamap=use_compiled_datamap
+                )
+                self.assertIsInstance(stakeholders, types.GeneratorType)
+                self.assertEqual(
+                    list(stakeholders),
+                    parse_ocf_stakeholders_from_ce_json(self.ce_jsons, use_compiled_datamap=use_compiled_datamap),
+                )
+
+    def test_stock_issuances(self):
+        issuances = iter_ocf_stock_issuances_from_ce_json(self.ce_jsons)
+        self.assertIsInstance(next(issuances), dict)
+        self.assertEqual(
+            _without_generated_fields([*iter_ocf_stock_issuances_from_ce_json(self.ce_jsons)]),
+            _without_generated_fields(parse_ocf_stock_issuances_from_ce_json(self.ce_jsons)),
+        )
+
+    def test_requires_repeatable_datamap(self):
+        with self.assertRaises(ValueError):
+            iter_repeatable_model_datamap(load_ce_to_ocf_issuer_datamap(), None, self.ce_jsons)
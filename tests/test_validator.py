@@ -1,12 +1,19 @@
 import json
 import logging
 import os
+import pickle
+import shutil
+import tempfile
 import unittest
+from pathlib import Path
+from unittest import mock
 
 from jsonschema import Draft7Validator
 
 from CE2OCF.ocf.validator import (
+    build_schema_bundle,
     get_validator,
+    load_schema_store,
     load_schemas,
     schema_dir,
     validate_ocf_file_instance,
@@ -55,6 +62,61 @@ class TestOcfValidator(unittest.TestCase):
         )
         logger.info("Found https://schema.opencaptablecoalition.com/v/1.1.0/enums/VestingTriggerType.schema.json ")
 
+    def test_schema_bundle(self):
+        """
+        Test that the prebuilt schema bundle round-trips the schema store and is only used while it matches the schema
+        files it was built from
+        :return: No Return
+        """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            schemas_copy = Path(tmp_dir) / "schema"
+            shutil.copytree(schema_dir, schemas_copy)
+            bundle_path = Path(tmp_dir) / "schemas.bundle.pickle"
+
+            schema_store = build_schema_bundle(schemas_copy, bundle_path=bundle_path)
+            self.assertEqual(schema_store, load_schemas())
+            with mock.patch("CE2OCF.ocf.schema_bundle.load_schemas") as load_schemas_mock:
+                self.assertEqual(load_schema_store(bundle_path, schemas_copy), schema_store)
+            load_schemas_mock.assert_not_called()
+
+            # Touching a schema file without changing it keeps the bundle
+            first_schema = next(schemas_copy.rglob("*.schema.json"))
+            os.utime(first_schema, ns=(0, 0))
+            load_schema_store.cache_clear()
+            with mock.patch("CE2OCF.ocf.schema_bundle.load_schemas") as load_schemas_mock:
+                load_schema_store(bundle_path, schemas_copy)
+            load_schemas_mock.assert_not_called()
+
+            # Editing one without rebuilding the bundle falls back to the schema files, leaving the bundle alone
+            schema = json.loads(first_schema.read_text())
+            first_schema.write_text(json.dumps({**schema, "description": "Edited"}))
+            bundle_bytes = bundle_path.read_bytes()
+            load_schema_store.cache_clear()
+            self.assertEqual(load_schema_store(bundle_path, schemas_copy)[schema["$id"]]["description"], "Edited")
+            self.assertEqual(bundle_path.read_bytes(), bundle_bytes)
+
+            # An installed package trusts the bundle's version stamp without looking at the schema files...
+            load_schema_store.cache_clear()
+            with mock.patch("CE2OCF.ocf.schema_bundle._in_source_checkout", return_value=False), mock.patch(
+                "CE2OCF.ocf.schema_bundle._find_schema_files"
+            ) as find_schema_files_mock:
+                self.assertEqual(load_schema_store(bundle_path, schemas_copy), schema_store)
+            find_schema_files_mock.assert_not_called()
+
+            # ...as long as it was built for this version
+            build_schema_bundle(schemas_copy, bundle_path=bundle_path, version="0.0.0")
+            load_schema_store.cache_clear()
+            with mock.patch("CE2OCF.ocf.schema_bundle._in_source_checkout", return_value=False), mock.patch(
+                "CE2OCF.ocf.schema_bundle.load_schemas"
+            ) as load_schemas_mock:
+                load_schema_store(bundle_path, schemas_copy)
+            load_schemas_mock.assert_called_once_with(schemas_copy)
+
+            stale_path = Path(tmp_dir) / "stale.bundle.pickle"
+            with open(stale_path, "wb") as bundle_fd:
+                pickle.dump({"fingerprint": "0.0.0/0.0.0", "schemas": {}}, bundle_fd)
+            self.assertEqual(load_schema_store(bundle_path=stale_path), load_schemas())
+
     def test_load_validator(self):
         """
         Test that we can create an instance of our Python OCF validator.
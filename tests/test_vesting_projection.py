@@ -0,0 +1,137 @@
+import datetime
+import unittest
+from decimal import Decimal
+
+from CE2OCF.ocf.generators.ocf_vesting_events import (
+    generate_vesting_start_event,
+)
+from CE2OCF.ocf.generators.vesting_enums_to_ocf import (
+    generate_ocf_vesting_schedule_from_enumerations,
+)
+from CE2OCF.ocf.vesting_projection import (
+    VestingHolder,
+    VestingScenario,
+    compile_vesting_terms,
+    holders_from_ocf,
+    project_vested_amounts,
+)
+from CE2OCF.types.enums import (
+    DoubleTriggerTypesEnum,
+    SingleTriggerTypesEnum,
+    VestingTypesEnum,
+)
+
+VESTING_START = datetime.date(2020, 1, 15)
+
+
+def _project(vesting_terms, as_of_dates, scenario=None, quantity=4800):
+    holder = VestingHolder("SECURITY", Decimal(quantity), vesting_terms["id"], VESTING_START)
+    (row,) = project_vested_amounts([vesting_terms], [holder], as_of_dates, scenario)
+    return [int(amount) for amount in row]
+
+
+class TestVestingProjection(unittest.TestCase):
+    def setUp(self):
+        self.cliff_terms = generate_ocf_vesting_schedule_from_enumerations(
+            VestingTypesEnum.FOUR_YR_1_YR_CLIFF,
+            "CLIFF",
+            SingleTriggerTypesEnum.SIX_MONTHS_INVOLUNTARY_TERMINATION,
+            DoubleTriggerTypesEnum.TWENTY_FIVE_PERCENT_12_MONTHS,
+        )
+
+    def test_time_based_vesting(self):
+        self.assertEqual(
+            _project(
+                self.cliff_terms,
+                [
+                    datetime.date(2019, 12, 31),
+                    datetime.date(2021, 1, 14),
+                    datetime.date(2021, 1, 15),
+                    datetime.date(2021, 2, 15),
+                    datetime.date(2024, 1, 15),
+                    datetime.date(2030, 1, 1),
+                ],
+            ),
+            [0, 0, 1200, 1300, 4800, 4800],
+        )
+
+    def test_cumulative_rounding(self):
+        monthly_terms = generate_ocf_vesting_schedule_from_enumerations(VestingTypesEnum.FOUR_YR_NO_CLIFF, "MONTHLY")
+        as_of_dates = [datetime.date(2020, month, 15) for month in (2, 3, 4, 5)]
+
+        # 10 shares over 48 months - cumulative 0.21, 0.42, 0.63, 0.83
+        self.assertEqual(_project(monthly_terms, as_of_dates, quantity=10), [0, 0, 1, 1])
+        round_down_terms = {**monthly_terms, "allocation_type": "CUMULATIVE_ROUND_DOWN"}
+        self.assertEqual(_project(round_down_terms, as_of_dates, quantity=10), [0, 0, 0, 0])
+
+        with self.assertRaisesRegex(ValueError, "Unsupported allocation_type"):
+            compile_vesting_terms({**monthly_terms, "allocation_type": "FRONT_LOADED"})
+
+    def test_single_trigger_termination(self):
+        after_termination = [datetime.date(2030, 1, 1)]
+        for termination_date, involuntary, vested in (
+            (datetime.date(2020, 3, 1), True, 0),  # Before any acceleration applies
+            (datetime.date(2020, 8, 1), True, 1200),  # Month 6 - 6 months served + 6 months credit
+            (datetime.date(2021, 9, 20), True, 2600),  # Month 20
+            (datetime.date(2021, 9, 20), False, 2000),  # Voluntary - vesting just stops
+            (datetime.date(2023, 9, 20), True, 4800),  # Credit takes the holder past the end of the schedule
+        ):
+            with self.subTest(termination_date=termination_date, involuntary=involuntary):
+                scenario = VestingScenario(termination_date=termination_date, involuntary_termination=involuntary)
+                self.assertEqual(_project(self.cliff_terms, after_termination, scenario), [vested])
+
+    def test_double_trigger(self):
+        terms = generate_ocf_vesting_schedule_from_enumerations(
+            VestingTypesEnum.FOUR_YR_1_YR_CLIFF, "DOUBLE", double_trigger=DoubleTriggerTypesEnum.FIFTY_PERCENT_12_MONTHS
+        )
+        change_in_control = datetime.date(2021, 6, 15)
+
+        # Terminated within 12 months of the CiC - 1900 vested, half of the remaining 2900 accelerates
+        scenario = VestingScenario(change_in_control, datetime.date(2021, 9, 1))
+        self.assertEqual(
+            _project(terms, [datetime.date(2021, 8, 31), datetime.date(2021, 9, 1)], scenario), [1900, 3350]
+        )
+
+        # Acceleration expired
+        scenario = VestingScenario(change_in_control, datetime.date(2022, 7, 1))
+        self.assertEqual(_project(terms, [datetime.date(2030, 1, 1)], scenario), [2900])
+
+        # No CiC, no acceleration
+        scenario = VestingScenario(termination_date=datetime.date(2021, 9, 1))
+        self.assertEqual(_project(terms, [datetime.date(2030, 1, 1)], scenario), [1900])
+
+    def test_single_trigger_change_in_control(self):
+        terms = generate_ocf_vesting_schedule_from_enumerations(
+            VestingTypesEnum.FOUR_YR_NO_CLIFF, "CIC", SingleTriggerTypesEnum.SIX_MONTHS_ALL_TIMES
+        )
+        scenario = VestingScenario(change_in_control_date=datetime.date(2020, 3, 20))
+        as_of_dates = [datetime.date(2020, 3, 19), datetime.date(2020, 3, 20), datetime.date(2020, 4, 20)]
+
+        # 6 months of credit on top of service from the CiC on
+        self.assertEqual(_project(terms, as_of_dates, scenario), [200, 800, 900])
+
+    def test_batch_from_ocf(self):
+        terms = generate_ocf_vesting_schedule_from_enumerations(VestingTypesEnum.FOUR_YR_NO_CLIFF, "MONTHLY")
+        ocf_objects = [
+            {"object_type": "TX_STOCK_ISSUANCE", "security_id": "A", "quantity": "4800", "vesting_terms_id": "MONTHLY"},
+            {"object_type": "TX_STOCK_ISSUANCE", "security_id": "B", "quantity": "960", "vesting_terms_id": "MONTHLY"},
+            {"object_type": "TX_STOCK_ISSUANCE", "security_id": "C", "quantity": "100"},
+            generate_vesting_start_event(VESTING_START, "A", "MONTHLY | Start"),
+            generate_vesting_start_event(VESTING_START, "B", "MONTHLY | Start"),
+        ]
+        holders = holders_from_ocf(ocf_objects)
+        self.assertEqual([holder.security_id for holder in holders], ["A", "B", "C"])
+
+        as_of_dates = [datetime.date(2020, 2, 15), datetime.date(2022, 1, 15)]
+        scenarios = {"B": VestingScenario(termination_date=datetime.date(2020, 3, 1), involuntary_termination=False)}
+        self.assertEqual(
+            project_vested_amounts([compile_vesting_terms(terms)], holders, as_of_dates, scenarios),
+            [
+                [Decimal(100), Decimal(2400)],
+                [Decimal(20), Decimal(20)],
+                [Decimal(100), Decimal(100)],
+            ],
+        )
+
+        with self.assertRaisesRegex(ValueError, "unknown vesting terms"):
+            project_vested_amounts([], holders, as_of_dates)